@@ -0,0 +1,176 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+
+import json
+import os
+import tempfile
+import threading
+
+import pyutilib.th as unittest
+
+from pyomo.environ import (ConcreteModel, Var, Constraint, Objective,
+                           TransformationFactory, Integers)
+from pyomo.common.timing import (HierarchicalTimer, collect_timing,
+                                 timing_scope, increment_counter)
+
+class TestHierarchicalTimer(unittest.TestCase):
+    def test_scopes(self):
+        timer = HierarchicalTimer()
+        with timer.scope('a'):
+            with timer.scope('b'):
+                timer.increment('n')
+                timer.increment('n', 2)
+            timer.start('b')
+            timer.stop('b')
+            with timer.scope('c'):
+                pass
+        with timer.scope('b'):
+            pass
+
+        self.assertEqual(timer.get_calls('a'), 1)
+        self.assertEqual(timer.get_calls('a', 'b'), 2)
+        self.assertEqual(timer.get_calls('a', 'c'), 1)
+        self.assertEqual(timer.get_calls('b'), 1)
+        self.assertEqual(timer.get_counter('n', 'a', 'b'), 3)
+        self.assertEqual(timer.get_counter('n', 'a'), 0)
+        self.assertGreaterEqual(timer.get_total_time('a'),
+                                timer.get_total_time('a', 'b'))
+        with self.assertRaises(KeyError):
+            timer.get_calls('c')
+
+        timer.reset()
+        self.assertEqual(timer.to_dict()['children'], {})
+
+    def test_stop_errors(self):
+        timer = HierarchicalTimer()
+        with self.assertRaisesRegexp(
+                RuntimeError, "Cannot stop timer scope 'a': "
+                "the running scope is 'None'"):
+            timer.stop('a')
+        timer.start('a')
+        timer.start('b')
+        with self.assertRaisesRegexp(
+                RuntimeError, "Cannot stop timer scope 'a': "
+                "the running scope is 'b'"):
+            timer.stop('a')
+
+    def test_scope_exception(self):
+        timer = HierarchicalTimer()
+        with self.assertRaises(ValueError):
+            with timer.scope('a'):
+                raise ValueError()
+        self.assertEqual(timer.get_calls('a'), 1)
+        # the scope was closed, so 'b' is not a child of 'a'
+        with timer.scope('b'):
+            pass
+        self.assertEqual(timer.get_calls('b'), 1)
+
+    def test_export(self):
+        timer = HierarchicalTimer()
+        with timer.scope('a'):
+            with timer.scope('b'):
+                timer.increment('n', 5)
+
+        data = timer.to_dict()
+        self.assertEqual(sorted(data['children']), ['a'])
+        a = data['children']['a']
+        self.assertEqual(a['calls'], 1)
+        self.assertEqual(a['counters'], {})
+        self.assertEqual(a['children']['b']['counters'], {'n': 5})
+        self.assertEqual(json.loads(timer.to_json()), data)
+
+        lines = timer.to_folded().splitlines()
+        self.assertEqual([line.split()[0] for line in lines],
+                         ['a', 'a;b'])
+        for line in lines:
+            self.assertGreaterEqual(int(line.split()[1]), 0)
+
+        table = str(timer).splitlines()
+        self.assertEqual(table[0].split(), ['Scope', 'Calls', 'Time', '%'])
+        self.assertEqual(table[1].split()[:2], ['a', '1'])
+        self.assertEqual(table[2].split()[:2], ['b', '1'])
+        self.assertEqual(table[3].split(), ['[n]', '5'])
+
+
+class TestCollectTiming(unittest.TestCase):
+    def tearDown(self):
+        collect_timing(False)
+
+    def test_disabled(self):
+        self.assertIsNone(collect_timing(False))
+        with timing_scope('a'):
+            increment_counter('n')
+
+        timer = HierarchicalTimer()
+        self.assertIs(collect_timing(timer), timer)
+        with timing_scope('a'):
+            increment_counter('n')
+        collect_timing(False)
+        with timing_scope('a'):
+            increment_counter('n')
+        self.assertEqual(timer.get_calls('a'), 1)
+        self.assertEqual(timer.get_counter('n', 'a'), 1)
+
+    def test_threads(self):
+        # each thread has its own stack of running scopes, which starts
+        # at the root
+        timer = collect_timing()
+        started = [threading.Event(), threading.Event()]
+        errors = []
+        def solve(i):
+            try:
+                with timing_scope('solve(%s)' % i):
+                    started[i].set()
+                    # both scopes are running before either one stops
+                    started[1-i].wait(5)
+                    with timing_scope('write'):
+                        increment_counter('n')
+            except Exception as e:
+                errors.append(e)
+        with timing_scope('main'):
+            threads = [threading.Thread(target=solve, args=(i,))
+                       for i in range(2)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(timer.to_dict()['children']),
+                         ['main', 'solve(0)', 'solve(1)'])
+        for i in range(2):
+            self.assertEqual(timer.get_calls('solve(%s)' % i), 1)
+            self.assertEqual(timer.get_calls('solve(%s)' % i, 'write'), 1)
+            self.assertEqual(
+                timer.get_counter('n', 'solve(%s)' % i, 'write'), 1)
+
+    def test_model_operations(self):
+        m = ConcreteModel()
+        m.x = Var([1, 2], bounds=(0, 4))
+        m.c = Constraint(expr=m.x[1]*m.x[2] + m.x[2] <= 4)
+        m.o = Objective(expr=m.x[1] + m.x[2])
+
+        timer = collect_timing()
+        self.assertIsInstance(timer, HierarchicalTimer)
+        m.x.domain = Integers
+        TransformationFactory('core.relax_integrality').apply_to(m)
+        fd, fname = tempfile.mkstemp(suffix='.lp')
+        os.close(fd)
+        try:
+            m.write(fname, format='lp')
+        finally:
+            os.remove(fname)
+
+        self.assertEqual(timer.get_calls('apply_to(RelaxIntegrality)'), 1)
+        # the objective and the constraint
+        self.assertEqual(
+            timer.get_calls('write(lp)', 'generate_standard_repn'), 2)
+
+if __name__ == "__main__":
+    unittest.main()
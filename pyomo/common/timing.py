@@ -1,5 +1,8 @@
 import sys
+import json
 import logging
+import threading
+from timeit import default_timer
 from pyutilib.misc.timing import TicTocTimer
 
 _logger = logging.getLogger('pyomo.common.timing')
@@ -86,3 +89,252 @@ class TransformationTimer(object):
             return "TransformationTimer object for %s; %s elapsed seconds" % (
                 name,
                 self.timer.toc("") )
+
+
+class _TimerNode(object):
+    __slots__ = ('name', 'calls', 'total_time', 'counters', 'children')
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.total_time = 0.0
+        self.counters = {}
+        self.children = {}
+
+    def to_dict(self):
+        return {'time': self.total_time,
+                'calls': self.calls,
+                'counters': dict(self.counters),
+                'children': dict((name, child.to_dict())
+                                 for name, child in self.children.items())}
+
+
+class _TimerScope(object):
+    __slots__ = ('timer', 'name')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.timer.start(self.name)
+        return self
+
+    def __exit__(self, t, v, traceback):
+        self.timer.stop(self.name)
+
+
+class _NullScope(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, t, v, traceback):
+        pass
+
+_null_scope = _NullScope()
+
+
+class HierarchicalTimer(object):
+    """
+    A timer that records the time spent in nested scopes.
+
+    A scope that is started while another scope is running is recorded
+    as a child of the running scope, so the same name may appear in
+    several places in the hierarchy.  For each scope, the timer records
+    the total wall-clock time, the number of calls, and the counters
+    incremented while the scope was running.  The data can be exported
+    as a dictionary, as JSON, or in the "folded stacks" format read by
+    flame graph tools.
+
+    Each thread has its own stack of running scopes, which starts at
+    the (shared) root of the hierarchy, so scopes may be timed by
+    several threads at once.
+
+    Example
+    -------
+    >>> timer = HierarchicalTimer()
+    >>> with timer.scope('solve'):
+    ...     with timer.scope('write'):
+    ...         timer.increment('constraints', 10)
+    >>> timer.get_calls('solve', 'write')
+    1
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Discard all timing data"""
+        self._root = _TimerNode(None)
+        # the (node, start time) of the running scopes of each thread
+        self._local = threading.local()
+        # guards the updates of the shared nodes
+        self._lock = threading.Lock()
+
+    def _get_stack(self):
+        try:
+            return self._local.stack
+        except AttributeError:
+            stack = self._local.stack = [(self._root, None)]
+            return stack
+
+    def start(self, name):
+        """Start the scope name within the running scope"""
+        stack = self._get_stack()
+        parent = stack[-1][0]
+        node = parent.children.get(name, None)
+        if node is None:
+            with self._lock:
+                node = parent.children.setdefault(name, _TimerNode(name))
+        stack.append((node, default_timer()))
+
+    def stop(self, name):
+        """Stop the running scope, which must be name"""
+        now = default_timer()
+        stack = self._get_stack()
+        node, start_time = stack[-1]
+        if node.name != name or node is self._root:
+            raise RuntimeError(
+                "Cannot stop timer scope '%s': the running scope is '%s'"
+                % (name, node.name))
+        with self._lock:
+            node.total_time += now - start_time
+            node.calls += 1
+        stack.pop()
+
+    def scope(self, name):
+        """Return a context manager that times the scope name"""
+        return _TimerScope(self, name)
+
+    def increment(self, name, value=1):
+        """Increment the counter name of the running scope"""
+        counters = self._get_stack()[-1][0].counters
+        with self._lock:
+            counters[name] = counters.get(name, 0) + value
+
+    def _find(self, path):
+        node = self._root
+        for name in path:
+            node = node.children[name]
+        return node
+
+    def get_total_time(self, *path):
+        """Return the total time of the scope with the given path"""
+        return self._find(path).total_time
+
+    def get_calls(self, *path):
+        """Return the number of calls of the scope with the given path"""
+        return self._find(path).calls
+
+    def get_counter(self, name, *path):
+        """Return the counter name of the scope with the given path"""
+        return self._find(path).counters.get(name, 0)
+
+    def to_dict(self):
+        """
+        Return the timing data as nested dictionaries.  The children
+        of each scope map the scope names to dictionaries with the
+        keys 'time', 'calls', 'counters' and 'children'.
+        """
+        return self._root.to_dict()
+
+    def to_json(self, ostream=None, **kwds):
+        """
+        Return the timing data (see to_dict) as a JSON string, or write
+        it to ostream if it is not None.  The keywords are passed to
+        json.dumps.
+        """
+        kwds.setdefault('indent', 2)
+        kwds.setdefault('sort_keys', True)
+        data = json.dumps(self.to_dict(), **kwds)
+        if ostream is None:
+            return data
+        ostream.write(data)
+
+    def to_folded(self, ostream=None):
+        """
+        Return the timing data in the "folded stacks" format (one line
+        per scope with the ';'-separated path of the scope and the time
+        spent in the scope itself, excluding its children, in integer
+        microseconds), or write it to ostream if it is not None.  This
+        is the input format of flamegraph.pl and speedscope.
+        """
+        lines = []
+        def _fold(node, path):
+            for name in sorted(node.children):
+                child = node.children[name]
+                child_path = path + (str(name),)
+                own_time = child.total_time - sum(
+                    c.total_time for c in child.children.values())
+                lines.append("%s %d" % (";".join(child_path),
+                                        max(0, int(round(own_time*1e6)))))
+                _fold(child, child_path)
+        _fold(self._root, ())
+        data = "".join(line+"\n" for line in lines)
+        if ostream is None:
+            return data
+        ostream.write(data)
+
+    def __str__(self):
+        lines = ["%-40s %8s %10s %7s" % ('Scope', 'Calls', 'Time', '%')]
+        def _report(node, indent, total):
+            for name in sorted(node.children,
+                               key=lambda n: -node.children[n].total_time):
+                child = node.children[name]
+                lines.append("%-40s %8d %10.4f %7.1f" % (
+                    indent + str(name),
+                    child.calls,
+                    child.total_time,
+                    100.0*child.total_time/total if total else 100.0))
+                for counter in sorted(child.counters):
+                    lines.append("%-40s %8s" % (
+                        indent + '  [' + str(counter) + ']',
+                        child.counters[counter]))
+                _report(child, indent+'  ', child.total_time)
+        _report(self._root, '', sum(
+            c.total_time for c in self._root.children.values()))
+        return "\n".join(lines)
+
+
+_hierarchical_timer = None
+
+def collect_timing(timer=True):
+    """
+    Start collecting timing data for the Pyomo solve pipeline (solver
+    presolve / solve / postsolve, problem writers, standard repn
+    generation, solution loading, block cloning and transformations).
+
+    If timer is True, the data is collected in a new HierarchicalTimer;
+    otherwise, timer is the HierarchicalTimer used to collect the data.
+    Returns the timer.  collect_timing(False) stops collecting timing
+    data.
+    """
+    global _hierarchical_timer
+    if timer is True:
+        timer = HierarchicalTimer()
+    elif not timer:
+        timer = None
+    _hierarchical_timer = timer
+    return timer
+
+def timing_scope(name):
+    """
+    Return a context manager that times the scope name in the timer
+    of collect_timing (or does nothing, if no timing data is being
+    collected).
+    """
+    timer = _hierarchical_timer
+    if timer is None:
+        return _null_scope
+    return timer.scope(name)
+
+def increment_counter(name, value=1):
+    """
+    Increment the counter name of the running scope in the timer of
+    collect_timing (if timing data is being collected).
+    """
+    timer = _hierarchical_timer
+    if timer is not None:
+        timer.increment(name, value)
@@ -0,0 +1,172 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+
+from pyomo.contrib.pynumero.algorithms.solvers.cyipopt_solver import CyIpoptSolver
+from pyomo.contrib.pynumero.interfaces.nlp import AslNLP
+import pyomo.opt
+import multiprocessing
+import traceback
+import six
+import sys
+
+
+def _solve_nl(nl, x0, options, tee):
+    """
+    Solve the NLP in the NL-file contents nl with cyipopt.  This is
+    executed in a worker process of a CyIpoptWorkerPool, which loads
+    the ASL and Ipopt libraries once for all of the solves assigned
+    to it.  Returns a tuple (ok, result), where result is either the
+    tuple (x, info) returned by CyIpoptSolver.solve or the traceback
+    of the error that occured.
+    """
+    try:
+        nlp = AslNLP(None, nl_buffer=nl)
+        if (x0 is not None) and (x0.size != nlp.nx):
+            x0 = None
+        solver = CyIpoptSolver(nlp, options=options)
+        return True, solver.solve(x0=x0, tee=tee)
+    except:
+        return False, "".join(traceback.format_exception(*sys.exc_info()))
+
+
+def _structure_key(nl):
+    """
+    Return the header of the NL-file contents nl (without the model
+    name), which describes the problem structure (the numbers of
+    variables, constraints and nonzeros).
+    """
+    return tuple(nl.split('\n', 10)[1:10])
+
+
+class CyIpoptWorkerPool(object):
+    """
+    A pool of long-running worker processes that solve Pyomo models
+    with cyipopt.  Each worker loads the ASL and Ipopt libraries once,
+    so consecutive solves (e.g., in a model predictive control loop)
+    do not pay the cost of starting a solver process.
+
+    The models are written to NL format by this process and handed to
+    the workers, and the solution is loaded back into the model.  The
+    primal solution of each solve is kept, and is used as the starting
+    point of the next solve of a model with the same structure (i.e.,
+    the same NL-file header).
+
+    Parameters
+    ----------
+    processes: int
+        The number of worker processes.  The default is the number of
+        cores on this machine.
+    options: dict
+        Dictionary of Ipopt options
+    """
+
+    def __init__(self, processes=None, options=None):
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        self._processes = processes
+        self._options = options
+        if options is not None:
+            assert isinstance(options, dict)
+        else:
+            self._options = dict()
+        self._pool = None
+        self._warmstart = dict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, t, v, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Terminate the worker processes.
+        """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def clear_warmstart(self):
+        """
+        Discard the solutions kept for warm starts.
+        """
+        self._warmstart = dict()
+
+    def solve(self, model, tee=False, load_solutions=True, warmstart=True):
+        """
+        Solve a model and return the tuple (x, info) returned by
+        CyIpoptSolver.solve.
+
+        Parameters
+        ----------
+        model: ConcreteModel
+            Pyomo concrete model
+        tee: bool
+            If True, the worker prints the Ipopt output
+        load_solutions: bool
+            If True, the solution is loaded into the model
+        warmstart: bool
+            If True, the solve starts from the solution of the last
+            model with the same structure (if any)
+        """
+        return self.solve_all([model],
+                              tee=tee,
+                              load_solutions=load_solutions,
+                              warmstart=warmstart)[0]
+
+    def solve_all(self, models, tee=False, load_solutions=True, warmstart=True):
+        """
+        Solve a list of models concurrently and return the list of
+        tuples (x, info) returned by CyIpoptSolver.solve.  See the
+        solve method for the keyword arguments.
+        """
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(processes=self._processes)
+        tasks = []
+        for model in models:
+            nl, symbol_map = self._write_nl(model)
+            key = _structure_key(nl)
+            x0 = self._warmstart.get(key) if warmstart else None
+            tasks.append((key, symbol_map,
+                          self._pool.apply_async(
+                              _solve_nl, (nl, x0, self._options, tee))))
+        results = []
+        for key, symbol_map, task in tasks:
+            ok, result = task.get()
+            if not ok:
+                raise RuntimeError(
+                    "Worker process reported a processing error. "
+                    "Reason: \n%s" % (result,))
+            x, info = result
+            self._warmstart[key] = x
+            if load_solutions:
+                self._load_solution(symbol_map, x)
+            results.append(result)
+        return results
+
+    def _write_nl(self, model):
+        """
+        Write a model in NL format and return the file contents and the
+        symbol map.
+        """
+        nl_buffer = six.StringIO()
+        fname, symbol_map = pyomo.opt.WriterFactory('nl')(
+            model, nl_buffer, lambda x: True, {})
+        return nl_buffer.getvalue(), symbol_map
+
+    def _load_solution(self, symbol_map, x):
+        bySymbol = symbol_map.bySymbol
+        for i in range(x.size):
+            var = bySymbol.get("v%d" % i, None)
+            if var is not None:
+                var = var()
+                var.value = float(x[i])
+                var.stale = False
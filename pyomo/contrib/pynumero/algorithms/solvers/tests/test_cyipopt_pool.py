@@ -0,0 +1,85 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+
+import pyutilib.th as unittest
+import pyomo.environ as aml
+
+try:
+    import scipy.sparse as spa
+    import numpy as np
+except ImportError:
+    raise unittest.SkipTest("Pynumero needs scipy and numpy to run NLP tests")
+
+from pyomo.contrib.pynumero.extensions.asl import AmplInterface
+if not AmplInterface.available():
+    raise unittest.SkipTest(
+        "Pynumero needs the ASL extension to run CyIpoptWorkerPool tests")
+
+try:
+    import ipopt
+    from pyomo.contrib.pynumero.algorithms.solvers.cyipopt_pool import CyIpoptWorkerPool
+except ImportError:
+    raise unittest.SkipTest("Pynumero needs cyipopt to run CyIpoptWorkerPool tests")
+
+
+def create_model(ub):
+    m = aml.ConcreteModel()
+    m.x = aml.Var([1, 2], initialize=4.0)
+    m.d = aml.Constraint(expr=m.x[1] + m.x[2] <= 5)
+    m.o = aml.Objective(expr=m.x[1] ** 2 + 4 * m.x[2] ** 2 - 8 * m.x[1] - 16 * m.x[2])
+    m.x[1].setub(ub)
+    m.x[1].setlb(0.0)
+    m.x[2].setlb(0.0)
+
+    return m
+
+
+class TestCyIpoptWorkerPool(unittest.TestCase):
+
+    def test_solve(self):
+        model = create_model(3.0)
+        with CyIpoptWorkerPool(processes=1) as pool:
+            x, info = pool.solve(model)
+        x_sol = np.array([3.0, 1.99997807])
+        self.assertTrue(np.allclose(x, x_sol, rtol=1e-4))
+        self.assertAlmostEqual(aml.value(model.x[1]), 3.0, 3)
+        self.assertAlmostEqual(aml.value(model.x[2]), 2.0, 3)
+        self.assertAlmostEqual(aml.value(model.o), -31.0, 3)
+
+    def test_solve_no_load(self):
+        model = create_model(3.0)
+        with CyIpoptWorkerPool(processes=1) as pool:
+            x, info = pool.solve(model, load_solutions=False)
+        self.assertTrue(np.allclose(x, [3.0, 1.99997807], rtol=1e-4))
+        self.assertEqual(aml.value(model.x[1]), 4.0)
+
+    def test_warmstart(self):
+        with CyIpoptWorkerPool(processes=1) as pool:
+            x, info = pool.solve(create_model(3.0))
+            self.assertEqual(len(pool._warmstart), 1)
+            model = create_model(3.0)
+            x_warm, info = pool.solve(model)
+            self.assertTrue(np.allclose(x, x_warm, rtol=1e-4))
+            self.assertEqual(len(pool._warmstart), 1)
+            pool.clear_warmstart()
+            self.assertEqual(len(pool._warmstart), 0)
+
+    def test_solve_all(self):
+        models = [create_model(ub) for ub in (1.0, 2.0, 3.0)]
+        with CyIpoptWorkerPool(processes=2) as pool:
+            results = pool.solve_all(models)
+        self.assertEqual(len(results), 3)
+        for ub, model in zip((1.0, 2.0, 3.0), models):
+            self.assertAlmostEqual(aml.value(model.x[1]), ub, 3)
+            self.assertAlmostEqual(aml.value(model.x[2]), 2.0, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
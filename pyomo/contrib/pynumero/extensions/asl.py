@@ -12,6 +12,7 @@ from pkg_resources import resource_filename
 import numpy.ctypeslib as npct
 import numpy as np
 import platform
+import tempfile
 import ctypes
 import sys
 import os
@@ -33,9 +34,6 @@ class AmplInterface(object):
                 "ASL interface is not supported on this platform (%s)"
                 % (os.name,) )
 
-        if nl_buffer is not None:
-            raise NotImplementedError("AmplInterface only supported form NL-file for now")
-
         self.ASLib = ctypes.cdll.LoadLibrary(AmplInterface.libname)
 
         # define 1d array
@@ -196,11 +194,7 @@ class AmplInterface(object):
             b_data = filename.encode('utf-8')
             self._obj = self.ASLib.EXTERNAL_AmplInterface_new_file(b_data)
         elif nl_buffer is not None:
-            b_data = nl_buffer.encode('utf-8')
-            if os.name in ['nt', 'dos']:
-                self._obj = self.ASLib.EXTERNAL_AmplInterface_new_file(b_data)
-            else:
-                self._obj = self.ASLib.EXTERNAL_AmplInterface_new_str(b_data)
+            self._obj = self._new_from_buffer(nl_buffer)
 
         assert self._obj, "Error building ASL interface. Possible error in nl-file"
 
@@ -209,6 +203,22 @@ class AmplInterface(object):
         self._nnz_jac_g = self.get_nnz_jac_g()
         self._nnz_hess = self.get_nnz_hessian_lag()
 
+    def _new_from_buffer(self, nl_buffer):
+        # The library reads the NL-file contents with the ASL reader,
+        # which only opens files (the in-memory constructor of the
+        # library is disabled). So, the contents are handed over
+        # through a temporary file that is removed as soon as the
+        # library has read it.
+        fd, nl_file = tempfile.mkstemp(suffix='.nl')
+        try:
+            mode = 'wb' if isinstance(nl_buffer, bytes) else 'w'
+            with os.fdopen(fd, mode) as f:
+                f.write(nl_buffer)
+            return self.ASLib.EXTERNAL_AmplInterface_new_file(
+                nl_file.encode('utf-8'))
+        finally:
+            os.remove(nl_file)
+
     def __del__(self):
         self.ASLib.EXTERNAL_AmplInterface_free_memory(self._obj)
 
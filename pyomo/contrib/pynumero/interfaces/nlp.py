@@ -52,10 +52,7 @@ except ImportError as e:
 from scipy.sparse import coo_matrix, csr_matrix
 import abc
 import numpy as np
-import tempfile
-import os
 import six
-import shutil
 
 __all__ = ['AmplNLP', 'PyomoNLP']
 
@@ -840,13 +837,16 @@ class AslNLP(NLP):
         Array with column indices of nonzero elements in Jacobian of d(x)
     """
 
-    def __init__(self, model, **kwargs):
+    def __init__(self, model, nl_buffer=None, **kwargs):
         """
 
         Parameters
         ----------
         model : string
-            filename of the NL-file containing the model
+            filename of the NL-file containing the model (None if
+            nl_buffer is given)
+        nl_buffer : string, optional
+            contents of the NL-file containing the model
         kwargs
             Arbitrary keyword arguments
         """
@@ -855,7 +855,7 @@ class AslNLP(NLP):
         super(AslNLP, self).__init__(model)
 
         # ampl interface
-        self._asl = _asl.AmplInterface(self._model)
+        self._asl = _asl.AmplInterface(self._model, nl_buffer=nl_buffer)
 
         # ToDo: remove this after new pynumero libraries get merged in conda-forge
         self._future_libraries = self._asl.future_libraries
@@ -1458,34 +1458,26 @@ class PyomoNLP(AslNLP):
         model : ConcreteModel
             Pyomo concrete model
         """
-        temporal_dir = tempfile.mkdtemp()
-        try:
-            filename = os.path.join(temporal_dir, "pynumero_pyomo")
-            objectives = model.component_map(aml.Objective, active=True)
-            if len(objectives) == 0:
-                model._dummy_obj = aml.Objective(expr=0.0)
-
-            model.write(filename+'.nl', 'nl', io_options={"symbolic_solver_labels": True})
-
-            fname, symbolMap = pyomo.opt.WriterFactory('nl')(model, filename, lambda x:True, {})
-            varToIndex = pyomo.core.kernel.component_map.ComponentMap()
-            conToIndex = pyomo.core.kernel.component_map.ComponentMap()
-            for name, obj in six.iteritems(symbolMap.bySymbol):
-                if name[0] == 'v':
-                    varToIndex[obj()] = int(name[1:])
-                elif name[0] == 'c':
-                    conToIndex[obj()] = int(name[1:])
-
-            self._varToIndex = varToIndex
-            self._conToIndex = conToIndex
-
-            nl_file = filename+".nl"
-
-            super(PyomoNLP, self).__init__(nl_file)
-            self._model = model
-
-        finally:
-            shutil.rmtree(temporal_dir)
+        objectives = model.component_map(aml.Objective, active=True)
+        if len(objectives) == 0:
+            model._dummy_obj = aml.Objective(expr=0.0)
+
+        # write the NL-file into memory
+        nl_buffer = six.StringIO()
+        fname, symbolMap = pyomo.opt.WriterFactory('nl')(model, nl_buffer, lambda x:True, {})
+        varToIndex = pyomo.core.kernel.component_map.ComponentMap()
+        conToIndex = pyomo.core.kernel.component_map.ComponentMap()
+        for name, obj in six.iteritems(symbolMap.bySymbol):
+            if name[0] == 'v':
+                varToIndex[obj()] = int(name[1:])
+            elif name[0] == 'c':
+                conToIndex[obj()] = int(name[1:])
+
+        self._varToIndex = varToIndex
+        self._conToIndex = conToIndex
+
+        super(PyomoNLP, self).__init__(None, nl_buffer=nl_buffer.getvalue())
+        self._model = model
 
     def grad_objective(self, x, out=None, **kwargs):
 
@@ -37,6 +37,7 @@ from pyutilib.misc import tuplize, Container, PauseGC, Bunch
 
 import pyomo.common
 from pyomo.common.deprecation import deprecation_warning
+from pyomo.common.timing import timing_scope, increment_counter
 from pyomo.common.plugin import ExtensionPoint
 from pyomo.common._task import pyomo_api
 from pyomo.common.deprecation import deprecation_warning
@@ -226,75 +227,77 @@ class ModelSolutions(object):
         """
         Load solver results
         """
-        instance = self._instance()
-        #
-        # If there is a warning, then print a warning message.
-        #
-        if (results.solver.status == pyomo.opt.SolverStatus.warning):
-            logger.warning(
-                'Loading a SolverResults object with a '
-                'warning status into model=%s;\n'
-                '    message from solver=%s'
-                % (instance.name, results.solver.Message))
-        #
-        # If the solver status not one of either OK or Warning, then generate an error.
-        #
-        elif results.solver.status != pyomo.opt.SolverStatus.ok:
-            if (results.solver.status == pyomo.opt.SolverStatus.aborted) and \
-               (len(results.solution) > 0):
+        with timing_scope('load_from'):
+            instance = self._instance()
+            #
+            # If there is a warning, then print a warning message.
+            #
+            if (results.solver.status == pyomo.opt.SolverStatus.warning):
                 logger.warning(
-                    "Loading a SolverResults object with "
-                    "an 'aborted' status, but containing a solution")
-            else:
-                raise ValueError("Cannot load a SolverResults object "
-                                 "with bad status: %s"
-                                 % str(results.solver.status))
-        if clear:
+                    'Loading a SolverResults object with a '
+                    'warning status into model=%s;\n'
+                    '    message from solver=%s'
+                    % (instance.name, results.solver.Message))
             #
-            # Clear the solutions, but not the symbol map
+            # If the solver status not one of either OK or Warning, then generate an error.
             #
-            self.clear(clear_symbol_maps=False)
-        #
-        # Load all solutions
-        #
-        if len(results.solution) == 0:
-            return
-        smap = results.__dict__.get('_smap', None)
-        if not smap is None:
-            smap_id = id_func(smap)
-            self.add_symbol_map(smap)
-            results._smap = None
-        else:
-            smap_id = results.__dict__.get('_smap_id')
-        cache = {}
-        if not id is None:
-            self.add_solution(results.solution(id),
-                              smap_id,
-                              delete_symbol_map=False,
-                              cache=cache,
-                              ignore_invalid_labels=ignore_invalid_labels,
-                              default_variable_value=default_variable_value)
-        else:
-            for i in range(len(results.solution)):
-                self.add_solution(results.solution(i),
+            elif results.solver.status != pyomo.opt.SolverStatus.ok:
+                if (results.solver.status == pyomo.opt.SolverStatus.aborted) and \
+                   (len(results.solution) > 0):
+                    logger.warning(
+                        "Loading a SolverResults object with "
+                        "an 'aborted' status, but containing a solution")
+                else:
+                    raise ValueError("Cannot load a SolverResults object "
+                                     "with bad status: %s"
+                                     % str(results.solver.status))
+            if clear:
+                #
+                # Clear the solutions, but not the symbol map
+                #
+                self.clear(clear_symbol_maps=False)
+            #
+            # Load all solutions
+            #
+            if len(results.solution) == 0:
+                return
+            increment_counter('solutions', len(results.solution))
+            smap = results.__dict__.get('_smap', None)
+            if not smap is None:
+                smap_id = id_func(smap)
+                self.add_symbol_map(smap)
+                results._smap = None
+            else:
+                smap_id = results.__dict__.get('_smap_id')
+            cache = {}
+            if not id is None:
+                self.add_solution(results.solution(id),
                                   smap_id,
                                   delete_symbol_map=False,
                                   cache=cache,
                                   ignore_invalid_labels=ignore_invalid_labels,
                                   default_variable_value=default_variable_value)
+            else:
+                for i in range(len(results.solution)):
+                    self.add_solution(results.solution(i),
+                                      smap_id,
+                                      delete_symbol_map=False,
+                                      cache=cache,
+                                      ignore_invalid_labels=ignore_invalid_labels,
+                                      default_variable_value=default_variable_value)
 
-        if delete_symbol_map:
-            self.delete_symbol_map(smap_id)
-        #
-        # Load the first solution into the model
-        #
-        if not select is None:
-            self.select(
-                select,
-                allow_consistent_values_for_fixed_vars=allow_consistent_values_for_fixed_vars,
-                comparison_tolerance_for_fixed_vars=comparison_tolerance_for_fixed_vars,
-                ignore_invalid_labels=ignore_invalid_labels,
-                ignore_fixed_vars=ignore_fixed_vars)
+            if delete_symbol_map:
+                self.delete_symbol_map(smap_id)
+            #
+            # Load the first solution into the model
+            #
+            if not select is None:
+                self.select(
+                    select,
+                    allow_consistent_values_for_fixed_vars=allow_consistent_values_for_fixed_vars,
+                    comparison_tolerance_for_fixed_vars=comparison_tolerance_for_fixed_vars,
+                    ignore_invalid_labels=ignore_invalid_labels,
+                    ignore_fixed_vars=ignore_fixed_vars)
 
     def store_to(self, results, cuid=False):
         """
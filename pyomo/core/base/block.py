@@ -21,7 +21,7 @@ from operator import itemgetter, attrgetter
 from six import iteritems, iterkeys, itervalues, StringIO, string_types, \
     advance_iterator, PY3
 
-from pyomo.common.timing import ConstructionTimer
+from pyomo.common.timing import ConstructionTimer, timing_scope
 from pyomo.core.base.plugin import *  # ModelComponentFactory
 from pyomo.core.base.component import Component, ActiveComponentData, \
     ComponentUID
@@ -1151,21 +1151,28 @@ Components must now specify their rules explicitly using 'rule=' keywords.""" %
         # NonNegativeReals, etc) that are not "owned" by any blocks and
         # should be preserved as singletons.
         #
-        save_parent, self._parent = self._parent, None
-        try:
-            new_block = copy.deepcopy(
-                self, {
-                    '__block_scope__': {id(self): True, id(None): False},
-                    '__paranoid__': False,
-                    })
-        except:
-            new_block = copy.deepcopy(
-                self, {
-                    '__block_scope__': {id(self): True, id(None): False},
-                    '__paranoid__': True,
-                    })
-        finally:
-            self._parent = save_parent
+        # Setting __share_expressions__ lets the clone share the
+        # expressions that only refer to components outside this block
+        # (instead of duplicating them).
+        #
+        with timing_scope('clone'):
+            save_parent, self._parent = self._parent, None
+            try:
+                new_block = copy.deepcopy(
+                    self, {
+                        '__block_scope__': {id(self): True, id(None): False},
+                        '__paranoid__': False,
+                        '__share_expressions__': True,
+                        })
+            except:
+                new_block = copy.deepcopy(
+                    self, {
+                        '__block_scope__': {id(self): True, id(None): False},
+                        '__paranoid__': True,
+                        '__share_expressions__': True,
+                        })
+            finally:
+                self._parent = save_parent
 
         return new_block
 
@@ -1710,10 +1717,11 @@ Components must now specify their rules explicitly using 'rule=' keywords.""" %
 
         if solver_capability is None:
             def solver_capability(x): return True
-        (filename, smap) = problem_writer(self,
-                                          filename,
-                                          solver_capability,
-                                          io_options)
+        with timing_scope('write(%s)' % (format,)):
+            (filename, smap) = problem_writer(self,
+                                              filename,
+                                              solver_capability,
+                                              io_options)
         smap_id = id(smap)
         if not hasattr(self, 'solutions'):
             # This is a bit of a hack.  The write() method was moved
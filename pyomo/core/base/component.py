@@ -313,7 +313,7 @@ class Component(_ComponentBase):
         # to make sure that there is a base __getstate__() to call...
         #
         _base = super(Component,self)
-        if hasattr(_base, '__getstate__'):
+        if hasattr(_base, '__getstate__') and getattr(_base.__getstate__, '__func__', None) is not None:
             state = _base.__getstate__()
             for key,val in iteritems(self.__dict__):
                 if key not in state:
@@ -614,7 +614,7 @@ class ComponentData(_ComponentBase):
         need to resolve it to a concrete object.
         """
         _base = super(ComponentData,self)
-        if hasattr(_base, '__getstate__'):
+        if hasattr(_base, '__getstate__') and getattr(_base.__getstate__, '__func__', None) is not None:
             state = _base.__getstate__()
         else:
             state = {}
@@ -36,7 +36,7 @@ from pyomo.common import Factory
 from pyomo.common.plugin import (
     alias, implements, Interface, Plugin, PluginFactory, CreatePluginFactory,
     PluginError, ExtensionPoint )
-from pyomo.common.timing import TransformationTimer
+from pyomo.common.timing import TransformationTimer, timing_scope
 
 logger = logging.getLogger('pyomo.core')
 registered_callback = {}
@@ -241,7 +241,8 @@ class Transformation(object):
         timer = TransformationTimer(self, 'in-place')
         if not hasattr(model, '_transformation_data'):
             model._transformation_data = TransformationData()
-        self._apply_to(model, **kwds)
+        with timing_scope('apply_to(%s)' % (type(self).__name__,)):
+            self._apply_to(model, **kwds)
         timer.report()
 
     def create_using(self, model, **kwds):
@@ -251,7 +252,8 @@ class Transformation(object):
         timer = TransformationTimer(self, 'out-of-place')
         if not hasattr(model, '_transformation_data'):
             model._transformation_data = TransformationData()
-        new_model = self._create_using(model, **kwds)
+        with timing_scope('create_using(%s)' % (type(self).__name__,)):
+            new_model = self._create_using(model, **kwds)
         timer.report()
         return new_model
 
@@ -29,6 +29,8 @@ __all__ = (
 'FixedExpressionError',
 'NonConstantExpressionError',
 'evaluate_expression',
+'compile_expression',
+'CompiledExpression',
 'identify_components',
 'identify_variables',
 'identify_mutable_parameters',
@@ -76,13 +78,15 @@ __all__ = (
 '_generate_relational_expression',          # Only used within pyomo.core.expr
 )
 
+import __future__
 import math
 import logging
 import sys
 import traceback
+from array import array
 from copy import deepcopy
 from collections import deque
-from itertools import islice
+from itertools import islice, chain
 from six import next, string_types, itervalues
 from six.moves import xrange, builtins
 from weakref import ref
@@ -159,10 +163,12 @@ class clone_counter(object):
 
     This context manager counts the number of times that the
     :func:`clone_expression <pyomo.core.expr.current.clone_expression>`
-    function is executed.
+    function is executed, and the number of expression subtrees that
+    were shared (instead of duplicated) by a copy.
     """
 
     _count = 0
+    _shared = 0
 
     def __enter__(self):
         return self
@@ -176,6 +182,12 @@ class clone_counter(object):
         """
         return clone_counter._count
 
+    @property
+    def shared(self):
+        """A property that returns the number of shared subtrees.
+        """
+        return clone_counter._shared
+
 
 class nonlinear_expression(object):
     """ Context manager for mutable sums.
@@ -218,6 +230,7 @@ class linear_expression(object):
         """
         if self.e.__class__ == _MutableLinearExpression:
             self.e.__class__ = LinearExpression
+            _compact_linear_coefs(self.e)
 
 
 #-------------------------------------------------------
@@ -886,7 +899,9 @@ class ExpressionReplacementVisitor(object):
             which may be defined by the user.
         """
         if node.__class__ is LinearExpression:
-            _argList = [node.constant] + node.linear_coefs + node.linear_vars
+            _argList = [node.constant]
+            _argList.extend(node.linear_coefs)
+            _argList.extend(node.linear_vars)
             _len = len(_argList)
             _stack = [ (node, _argList, 0, _len, [False])]
         else:
@@ -929,8 +944,9 @@ class ExpressionReplacementVisitor(object):
                     _idx = 0
                     _result = [False]
                     if _sub.__class__ is LinearExpression:
-                        _argList = [_sub.constant] + _sub.linear_coefs \
-                                   + _sub.linear_vars
+                        _argList = [_sub.constant]
+                        _argList.extend(_sub.linear_coefs)
+                        _argList.extend(_sub.linear_vars)
                         _len = len(_argList)
                     else:
                         _argList = _sub._args_
@@ -1006,7 +1022,7 @@ class ExpressionReplacementVisitor(object):
 #  clone_expression
 # =====================================================
 
-def clone_expression(expr, substitute=None):
+def clone_expression(expr, substitute=None, share=False):
     """A function that is used to clone an expression.
 
     Cloning is equivalent to calling ``copy.deepcopy`` with no Block
@@ -1020,6 +1036,10 @@ def clone_expression(expr, substitute=None):
             the memo object used with ``copy.deepcopy``. Defaults
             to None, which indicates that no user-defined
             dictionary is used.
+        share (bool): If :const:`True`, then subtrees that are not
+            changed by the substitution are shared with the
+            original expression instead of being duplicated.
+            Defaults to :const:`False`.
 
     Returns:
         The cloned expression.
@@ -1027,11 +1047,77 @@ def clone_expression(expr, substitute=None):
     """
     clone_counter._count += 1
     memo = {'__block_scope__': {id(None): False}}
+    if share:
+        memo['__share_expressions__'] = True
     if substitute:
         memo.update(substitute)
     return deepcopy(expr, memo)
 
 
+def _copied_arguments(node):
+    """
+    Return the objects referenced by an expression node that are
+    copied when the node is copied.
+    """
+    if node.__class__ is LinearExpression:
+        return chain((node.constant,), node.linear_coefs,
+                     node.linear_vars)
+    elif isinstance(node, ExternalFunctionExpression):
+        return chain(node.args, (node._fcn,))
+    elif node.__class__ is GetItemExpression:
+        return chain(node.args, (node._base,))
+    return node.args
+
+def _share_expression(expr, memo):
+    """
+    Determine whether a copy of an expression can share the original.
+
+    An expression is shared if it contains no mutable expressions and
+    all of its leaves (and named expressions) are mapped to themselves
+    by the copy.  Every shared subtree is recorded in the memo, so the
+    rest of the copy reuses it; the ids of the subtrees that must be
+    duplicated are also recorded, so that no subtree is examined twice.
+
+    Returns:
+        :const:`True` if the copy of the expression is the expression.
+    """
+    unshared = memo.setdefault('__unshared_expressions__', set())
+    if id(expr) in unshared:
+        return False
+    _stack = [ (expr, iter(_copied_arguments(expr)), [True]) ]
+    while 1:
+        _obj, _args, _result = _stack[-1]
+        for _sub in _args:
+            if _sub.__class__ in nonpyomo_leaf_types:
+                continue
+            _id = id(_sub)
+            if _id in memo:
+                if memo[_id] is not _sub:
+                    _result[0] = False
+            elif _id in unshared:
+                _result[0] = False
+            elif _sub.is_expression_type() and \
+                 not _sub.is_named_expression_type():
+                _stack.append( (_sub, iter(_copied_arguments(_sub)), [True]) )
+                break
+            elif deepcopy(_sub, memo) is not _sub:
+                _result[0] = False
+        else:
+            _stack.pop()
+            if _result[0] and \
+               _obj.__class__ not in _unshareable_expression_types:
+                memo[id(_obj)] = _obj
+                clone_counter._shared += 1
+                ans = True
+            else:
+                unshared.add(id(_obj))
+                ans = False
+            if not _stack:
+                return ans
+            if not ans:
+                _stack[-1][-1][0] = False
+
+
 # =====================================================
 #  _sizeof_expression
 # =====================================================
@@ -1047,14 +1133,22 @@ def _sizeof_expression(expr):
         A non-negative integer that is the number of
         interior and leaf nodes in the expression tree.
     """
-    def enter(node):
-        return None, 1
-    def accept(node, data, child_result):
-        return data + child_result
-    return StreamBasedExpressionVisitor(
-        enterNode=enter,
-        acceptChildResult=accept,
-    ).walk_expression(expr)
+    #
+    # Only the number of nodes is needed, so this walks the tree with
+    # an explicit stack of argument lists rather than through the
+    # (callback-based) StreamBasedExpressionVisitor.
+    #
+    ans = 1
+    if expr.__class__ in nonpyomo_leaf_types or not expr.is_expression_type():
+        return ans
+    _stack = [expr.args]
+    while _stack:
+        for arg in _stack.pop():
+            ans += 1
+            if arg.__class__ not in nonpyomo_leaf_types \
+               and arg.is_expression_type():
+                _stack.append(arg.args)
+    return ans
 
 # =====================================================
 #  evaluate_expression
@@ -1179,6 +1273,210 @@ def evaluate_expression(exp, exception=True, constant=False):
         return None
 
 
+# =====================================================
+#  compile_expression
+# =====================================================
+
+# Sums with more terms than this are compiled to a call to sum() (on a
+# tuple) rather than a chain of binary additions, which the Python
+# compiler cannot handle for very long sums.
+_compiled_sum_chain_limit = 100
+
+def _compiled_sum(node, args):
+    if not args:
+        return "0"
+    if len(args) > _compiled_sum_chain_limit:
+        return "sum((%s,))" % (", ".join(args),)
+    return "(%s)" % (" + ".join(args),)
+
+_compiled_templates = None
+
+def _get_compiled_templates():
+    global _compiled_templates
+    if _compiled_templates is None:
+        _compiled_templates = {
+            SumExpression: _compiled_sum,
+            NPV_SumExpression: _compiled_sum,
+            ProductExpression:
+                lambda node, args: "(%s * %s)" % tuple(args),
+            ReciprocalExpression:
+                lambda node, args: "(1 / %s)" % tuple(args),
+            PowExpression:
+                lambda node, args: "(%s ** %s)" % tuple(args),
+            NegationExpression:
+                lambda node, args: "(- %s)" % tuple(args),
+            Expr_ifExpression:
+                lambda node, args: "(%s if %s else %s)"
+                % (args[1], args[0], args[2]),
+        }
+    return _compiled_templates
+
+
+class _CompilingVisitor(ExpressionValueVisitor):
+    """
+    Generate the body of a Python function that evaluates an
+    expression.  The code for each node is inlined into its parent
+    unless that would nest the generated code more than max_depth
+    levels, in which case the node is assigned to a temporary.  This
+    keeps the generated code compilable regardless of the depth of the
+    expression.
+
+    The visitor computes (code, depth) tuples for every node.
+    """
+
+    max_depth = 50
+
+    def __init__(self, var_index, namespace):
+        super(_CompilingVisitor, self).__init__()
+        self.var_index = var_index
+        self.namespace = namespace
+        self.lines = []
+        self.templates = _get_compiled_templates()
+
+    def name(self, obj, prefix):
+        name = "_%s%d" % (prefix, len(self.namespace))
+        self.namespace[name] = obj
+        return name
+
+    def constant(self, val):
+        if val.__class__ in native_numeric_types and val == val \
+           and val not in (float('inf'), float('-inf')):
+            return repr(val)
+        return self.name(val, 'c')
+
+    def leaf(self, node):
+        if node.__class__ in native_numeric_types:
+            return self.constant(node)
+        if node.is_variable_type():
+            idx = self.var_index.get(id(node), None)
+            if idx is not None:
+                return "x[%d]" % (idx,)
+        elif node.is_constant():
+            return self.constant(value(node))
+        # Fixed parameters and variables that are not part of the
+        # variable vector are evaluated when the function is called
+        return "_value(%s)" % (self.name(node, 'l'),)
+
+    def node_code(self, node, args):
+        if node.__class__ is LinearExpression or \
+           node.__class__ is _MutableLinearExpression:
+            args = [self.leaf(node.constant)]
+            args.extend("%s * %s" % (self.leaf(c), self.leaf(v))
+                        for c, v in zip(node.linear_coefs,
+                                        node.linear_vars))
+            return _compiled_sum(node, args)
+        for cls in node.__class__.__mro__:
+            template = self.templates.get(cls, None)
+            if template is not None:
+                return template(node, args)
+        if isinstance(node, UnaryFunctionExpression):
+            return "%s(%s)" % (self.name(node._fcn, 'f'), args[0])
+        return "%s._apply_operation([%s])" % (self.name(node, 'n'),
+                                             ", ".join(args))
+
+    def visit(self, node, values):
+        """ Visit nodes that have been expanded """
+        if node.is_named_expression_type():
+            return values[0]
+        code = self.node_code(node, [val[0] for val in values])
+        depth = 1 + max([val[1] for val in values] or [0])
+        if depth < self.max_depth:
+            return code, depth
+        name = "_t%d" % (len(self.lines),)
+        self.lines.append("%s = %s" % (name, code))
+        return name, 0
+
+    def visiting_potential_leaf(self, node):
+        """
+        Visiting a potential leaf.
+
+        Return True if the node is not expanded.
+        """
+        if node.__class__ in nonpyomo_leaf_types:
+            return True, (self.constant(node), 0)
+
+        if node.is_expression_type():
+            return False, None
+
+        return True, (self.leaf(node), 0)
+
+
+class CompiledExpression(object):
+    """
+    A Python function generated from one or more expressions (see
+    :func:`compile_expression`).
+
+    Calling the object with a sequence of variable values (ordered as
+    the `var_order` passed to :func:`compile_expression`) returns the
+    value of the expression, or a list with the value of each
+    expression when it was compiled from a list of expressions.
+
+    The structure of each expression is fixed when it is compiled.
+    Mutable parameters, and variables that are not in `var_order`,
+    are evaluated on every call.
+    """
+
+    def __init__(self, expr, var_order):
+        self._var_order = list(var_order)
+        self._var_index = dict((id(v), i)
+                               for i, v in enumerate(self._var_order))
+        self._batch = expr.__class__ in (list, tuple)
+        self._exprs = []
+        self._functions = []
+        self.update(expr)
+
+    def __call__(self, x):
+        if self._batch:
+            return [f(x) for f in self._functions]
+        return self._functions[0](x)
+
+    def update(self, expr):
+        """
+        Replace the compiled expression(s).  In batch mode, only the
+        expressions that are not the same objects as the ones compiled
+        previously are recompiled.
+        """
+        if self._batch:
+            exprs = list(expr)
+        else:
+            exprs = [expr]
+        old_exprs = self._exprs
+        old_functions = self._functions
+        self._functions = [
+            old_functions[i]
+            if i < len(old_exprs) and old_exprs[i] is e
+            else self._compile(e)
+            for i, e in enumerate(exprs)]
+        self._exprs = exprs
+
+    def _compile(self, expr):
+        namespace = {'_value': value}
+        visitor = _CompilingVisitor(self._var_index, namespace)
+        ans = visitor.dfs_postorder_stack(expr)[0]
+        src = "def _compiled(x):\n%s    return %s\n" % (
+            "".join("    %s\n" % line for line in visitor.lines), ans)
+        exec(compile(src, "<compiled expression>", "exec",
+                     __future__.division.compiler_flag, True), namespace)
+        return namespace['_compiled']
+
+
+def compile_expression(expr, var_order):
+    """
+    Generate a Python function that evaluates an expression.
+
+    Args:
+        expr: The root node of an expression tree, or a list of
+            expressions that are evaluated together.
+        var_order: A sequence of variables.  The compiled function is
+            called with a sequence of values for these variables (in
+            this order).
+
+    Returns:
+        A :class:`CompiledExpression` object.
+    """
+    return CompiledExpression(expr, var_order)
+
+
 # =====================================================
 #  identify_components
 # =====================================================
@@ -1400,6 +1698,10 @@ class _ToStringVisitor(ExpressionValueVisitor):
         self.verbose = verbose
         self.smap = smap
         self.compute_values = compute_values
+        # Generating the name of a component data object can be
+        # expensive, so the strings for (non-expression) leaves are
+        # cached for the duration of the walk.
+        self.leaf_strings = {}
 
     def visit(self, node, values):
         """ Visit nodes that have been expanded """
@@ -1434,15 +1736,17 @@ class _ToStringVisitor(ExpressionValueVisitor):
         if node.__class__ in nonpyomo_leaf_types:
             return True, str(node)
 
-        if node.is_variable_type():
-            if not node.fixed:
-                return True, node.to_string(verbose=self.verbose, smap=self.smap, compute_values=False)
-            return True, node.to_string(verbose=self.verbose, smap=self.smap, compute_values=self.compute_values)
-
-        if not node.is_expression_type():
-            return True, node.to_string(verbose=self.verbose, smap=self.smap, compute_values=self.compute_values)
+        if node.is_expression_type():
+            return False, None
 
-        return False, None
+        ans = self.leaf_strings.get(id(node), None)
+        if ans is None:
+            if node.is_variable_type() and not node.fixed:
+                ans = node.to_string(verbose=self.verbose, smap=self.smap, compute_values=False)
+            else:
+                ans = node.to_string(verbose=self.verbose, smap=self.smap, compute_values=self.compute_values)
+            self.leaf_strings[id(node)] = ans
+        return True, ans
 
 
 def expression_to_string(expr, verbose=None, labeler=None, smap=None, compute_values=False):
@@ -1565,6 +1869,24 @@ class ExpressionBase(NumericValue):
            state[i] = getattr(self,i)
         return state
 
+    def __deepcopy__(self, memo):
+        """
+        Copy the expression object
+
+        If the memo contains the ``__share_expressions__`` flag, then
+        subtrees that would not change are shared with this
+        expression instead of being duplicated.
+
+        Returns:
+            The copied expression.
+        """
+        if memo.get('__share_expressions__', False) and \
+           _share_expression(self, memo):
+            return self
+        ans = memo[id(self)] = self.__class__.__new__(self.__class__)
+        ans.__setstate__(deepcopy(self.__getstate__(), memo))
+        return ans
+
     def __nonzero__(self):      #pragma: no cover
         """
         Compute the value of the expression and convert it to
@@ -3057,6 +3379,42 @@ class LinearExpression(ExpressionBase):
 class _MutableLinearExpression(LinearExpression):
     __slots__ = ()
 
+#: The expression types that are never shared by a copy, because
+#: they may still be changed in place
+_unshareable_expression_types = set([
+    _MutableSumExpression,
+    _MutableLinearExpression,
+])
+
+
+def _compact_linear_coefs(expr):
+    """
+    Store the coefficients of a (non-mutable) linear expression in a
+    typed array when they are all floats or all integers.
+
+    This avoids allocating a Python object for every coefficient in
+    large sums.  The array returns the same values (and types) when it
+    is iterated, so the change is not visible to the expression
+    walkers and writers.
+    """
+    coefs = expr.linear_coefs
+    if coefs.__class__ is not list or not coefs:
+        return
+    ctype = coefs[0].__class__
+    if ctype is float:
+        typecode = 'd'
+    elif ctype is int:
+        typecode = 'l'
+    else:
+        return
+    for c in coefs:
+        if c.__class__ is not ctype:
+            return
+    try:
+        expr.linear_coefs = array(typecode, coefs)
+    except OverflowError:
+        pass
+
 
 #-------------------------------------------------------
 #
@@ -556,7 +556,7 @@ class NumericValue(object):
         parent's dict.
         """
         _base = super(NumericValue, self)
-        if hasattr(_base, '__getstate__'):
+        if hasattr(_base, '__getstate__') and getattr(_base.__getstate__, '__func__', None) is not None:
             return _base.__getstate__()
         else:
             return {}
@@ -21,6 +21,7 @@ else:
         import ordereddict
         _ordered_dict_ = ordereddict.OrderedDict
 
+from pyomo.common.timing import timing_scope
 from pyomo.core.expr.symbol_map import SymbolMap
 from pyomo.core.kernel.base import \
     (_no_ctype,
@@ -319,10 +320,11 @@ class block(IBlock):
 
         if _solver_capability is None:
             _solver_capability = lambda x: True
-        (filename_, smap) = problem_writer(self,
-                                           filename,
-                                           _solver_capability,
-                                           kwds)
+        with timing_scope('write(%s)' % (format,)):
+            (filename_, smap) = problem_writer(self,
+                                               filename,
+                                               _solver_capability,
+                                               kwds)
         assert filename_ == filename
 
         if _called_by_solver:
@@ -78,6 +78,7 @@ class ComponentMap(collections_MutableMapping):
             state = {}
         else:
             state = super(ComponentMap, self).__getstate__()
+            if not isinstance(state, dict): state = {}
         for cls in self.__class__.__mro__:
             if cls.__name__ == "ICategorizedObject":
                 break
@@ -0,0 +1,157 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+
+from pyomo.core.base import (Constraint, Objective, Expression,
+                             TransformationFactory)
+from pyomo.core.base.constraint import _GeneralConstraintData
+from pyomo.core.expr import current as EXPR
+from pyomo.core.expr.numvalue import nonpyomo_leaf_types
+from pyomo.core.plugins.transform.hierarchy import Transformation
+
+
+def _no_local_data(node):
+    return None
+
+def _function_name(node):
+    return node._name
+
+def _function_id(node):
+    return id(node._fcn)
+
+def _strict(node):
+    return node._strict
+
+#
+# The expression types that may be shared, mapped to a function that
+# returns the data (other than the arguments) that distinguishes two
+# nodes of that type.  Mutable expressions (e.g., the sums created by
+# "+=") are never shared.
+#
+_shareable_types = {
+    EXPR.NegationExpression: _no_local_data,
+    EXPR.NPV_NegationExpression: _no_local_data,
+    EXPR.PowExpression: _no_local_data,
+    EXPR.NPV_PowExpression: _no_local_data,
+    EXPR.ProductExpression: _no_local_data,
+    EXPR.NPV_ProductExpression: _no_local_data,
+    EXPR.MonomialTermExpression: _no_local_data,
+    EXPR.ReciprocalExpression: _no_local_data,
+    EXPR.NPV_ReciprocalExpression: _no_local_data,
+    EXPR.SumExpression: _no_local_data,
+    EXPR.NPV_SumExpression: _no_local_data,
+    EXPR.Expr_ifExpression: _no_local_data,
+    EXPR.EqualityExpression: _no_local_data,
+    EXPR.InequalityExpression: _strict,
+    EXPR.RangedExpression: _strict,
+    EXPR.UnaryFunctionExpression: _function_name,
+    EXPR.NPV_UnaryFunctionExpression: _function_name,
+    EXPR.AbsExpression: _function_name,
+    EXPR.NPV_AbsExpression: _function_name,
+    EXPR.ExternalFunctionExpression: _function_id,
+    EXPR.NPV_ExternalFunctionExpression: _function_id,
+}
+
+
+class _SharingVisitor(EXPR.ExpressionValueVisitor):
+    """
+    Rebuild an expression so that structurally identical subtrees
+    are replaced by a single (shared) node.
+    """
+
+    def __init__(self, table):
+        self.table = table
+
+    def visit(self, node, values):
+        """ Visit nodes that have been expanded """
+        args = node.args
+        unchanged = all(a is v for a, v in zip(args, values))
+        local_data = _shareable_types.get(node.__class__, None)
+        if local_data is None:
+            if unchanged:
+                return node
+            return node.create_node_with_local_data(tuple(values))
+        # Numbers are keyed by type and value (so that 2 and 2.0 are
+        # not merged); everything else by identity.
+        key = (node.__class__, local_data(node), tuple(
+            (v.__class__, v) if v.__class__ in nonpyomo_leaf_types
+            else id(v) for v in values))
+        ans = self.table.get(key, None)
+        if ans is None:
+            if unchanged:
+                ans = node
+            else:
+                ans = node.create_node_with_local_data(tuple(values))
+            # The entry keeps the shared node (and its arguments)
+            # alive, so the ids in the key are never reused.
+            self.table[key] = ans
+        return ans
+
+    def visiting_potential_leaf(self, node):
+        """
+        Visiting a potential leaf.
+
+        Return True if the node is not expanded.
+        """
+        if node.__class__ in nonpyomo_leaf_types:
+            return True, node
+        # Named expressions are already shared (their expressions are
+        # processed as separate components)
+        if not node.is_expression_type() or node.is_named_expression_type():
+            return True, node
+        return False, None
+
+
+@TransformationFactory.register(
+    'core.share_common_subexpressions',
+    doc="Share structurally identical subexpressions in the model "
+    "expressions.")
+class ShareCommonSubexpressions(Transformation):
+    """
+    Replace structurally identical subexpressions in the active
+    objectives and constraints (and all Expression components) of a
+    model by a single shared expression node.
+
+    Two subexpressions are identical when they are the same operator
+    applied to the same (identical) arguments; variables and
+    parameters are compared by identity and numbers by value.  Sharing
+    the nodes reduces the memory used by the expressions.
+    """
+
+    def __init__(self, **kwds):
+        kwds['name'] = "share_common_subexpressions"
+        super(ShareCommonSubexpressions, self).__init__(**kwds)
+
+    def _apply_to(self, model, **kwds):
+        visitor = _SharingVisitor({})
+        share = visitor.dfs_postorder_stack
+
+        for expression_data in model.component_data_objects(
+                Expression, descend_into=True):
+            if expression_data.expr is not None:
+                expr = share(expression_data.expr)
+                if expr is not expression_data.expr:
+                    expression_data.expr = expr
+
+        for objective_data in model.component_data_objects(
+                Objective, active=True, descend_into=True):
+            expr = share(objective_data.expr)
+            if expr is not objective_data.expr:
+                objective_data.expr = expr
+
+        for constraint_data in model.component_data_objects(
+                Constraint, active=True, descend_into=True):
+            if not isinstance(constraint_data, _GeneralConstraintData) \
+               or constraint_data.body is None:
+                continue
+            body = share(constraint_data.body)
+            if body is not constraint_data.body:
+                # Only the body changes, so the bounds (and the
+                # equality flag) are left as they are
+                constraint_data._body = body
@@ -0,0 +1,58 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+#
+
+
+import pyutilib.th as unittest
+import pyomo.environ as pe
+
+
+class TestShareCommonSubexpressions(unittest.TestCase):
+
+    def test_share(self):
+        m = pe.ConcreteModel()
+        m.T = pe.Var([1,2], initialize=300)
+        m.x = pe.Var([1,2], initialize=1)
+        m.E = pe.Param(initialize=8000)
+        m.R = pe.Param(initialize=8.314)
+        m.k = pe.Expression([1,2], rule=lambda m, t:
+                            pe.exp(-m.E/(m.R*m.T[t])))
+        m.c = pe.Constraint([1,2], rule=lambda m, t:
+                            pe.exp(-m.E/(m.R*m.T[t]))*m.x[t] >= 0.5)
+        m.d = pe.Constraint(expr=pe.exp(-m.E/(m.R*m.T[1])) + m.x[2]**2 == 1)
+        m.e = pe.Constraint(expr=pe.sin(-m.E/(m.R*m.T[1])) <= 1)
+        m.f = pe.Constraint(expr=2*m.x[1] + 2.0*m.x[1] <= 1)
+        m.o = pe.Objective(expr=m.x[1]**2 + m.x[2]**2)
+
+        values = dict((c, pe.value(c.body))
+                      for c in m.component_data_objects(pe.Constraint))
+        pe.TransformationFactory(
+            'core.share_common_subexpressions').apply_to(m)
+
+        # the results of the expressions do not change
+        for c, val in values.items():
+            self.assertEqual(pe.value(c.body), val)
+        self.assertEqual(m.d.lower, 1)
+        self.assertTrue(m.d.equality)
+
+        shared = m.k[1].expr
+        self.assertIs(m.c[1].body.arg(0), shared)
+        self.assertIs(m.d.body.arg(0), shared)
+        self.assertIsNot(m.c[2].body.arg(0), shared)
+        self.assertIs(m.c[2].body.arg(0), m.k[2].expr)
+        # shared argument of a different function
+        self.assertIs(m.e.body.arg(0), shared.arg(0))
+        # numbers are only shared if they have the same type
+        self.assertIsNot(m.f.body.arg(0), m.f.body.arg(1))
+        self.assertEqual(str(m.f.body), "2*x[1] + 2.0*x[1]")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -28,7 +28,8 @@ from pyomo.environ import *
 import pyomo.kernel
 from pyomo.core.expr import expr_common
 from pyomo.core.expr import current as EXPR
-from pyomo.core.expr.expr_pyomo5 import _sizeof_expression
+from pyomo.core.expr.expr_pyomo5 import _sizeof_expression, _ToStringVisitor
+from pyomo.core.expr.symbol_map import SymbolMap
 from pyomo.core.expr.numvalue import native_types, nonpyomo_leaf_types, NumericConstant, as_numeric, is_potentially_variable
 from pyomo.core.base.var import SimpleVar
 from pyomo.core.base.param import _ParamData, SimpleParam
@@ -4301,6 +4302,35 @@ class TestCloneExpression(unittest.TestCase):
             total = counter.count - start
             self.assertEqual(total, 2)
 
+    def test_share(self):
+        with EXPR.clone_counter() as counter:
+            start = counter.shared
+            expr1 = self.m.p*self.m.a**2 + sin(self.m.a) + exp(self.m.b)
+            expr2 = EXPR.clone_expression(expr1, share=True)
+            self.assertIs(expr1, expr2)
+            self.assertEqual(counter.shared - start, 5)
+            #
+            # Only the subtrees that contain substituted leaves are copied
+            #
+            start = counter.shared
+            expr2 = EXPR.clone_expression(
+                expr1, substitute={id(self.m.b): self.m.a}, share=True)
+            self.assertEqual( str(expr2), "p*a**2 + sin(a) + exp(a)" )
+            self.assertIsNot( expr1, expr2 )
+            self.assertIs( expr1.arg(0), expr2.arg(0) )
+            self.assertIs( expr1.arg(1), expr2.arg(1) )
+            self.assertIsNot( expr1.arg(2), expr2.arg(2) )
+            self.assertEqual(counter.shared - start, 3)
+            #
+            # Mutable expressions are always copied
+            #
+            with EXPR.nonlinear_expression() as expr1:
+                expr1 += self.m.a
+                expr1 += self.m.b
+                expr2 = EXPR.clone_expression(expr1, share=True)
+            self.assertIsNot( expr1, expr2 )
+            self.assertEqual( str(expr2), "a + b" )
+
     def test_ProductExpression_div(self):
         with EXPR.clone_counter() as counter:
             start = counter.count
@@ -6766,6 +6796,102 @@ Exit sum
 Finalize""")
 
 
+class _ReferenceToStringVisitor(_ToStringVisitor):
+    # The leaf handling of _ToStringVisitor before the leaf strings
+    # were cached
+    def visiting_potential_leaf(self, node):
+        if node is None:
+            return True, None
+
+        if node.__class__ in nonpyomo_leaf_types:
+            return True, str(node)
+
+        if node.is_variable_type():
+            if not node.fixed:
+                return True, node.to_string(verbose=self.verbose, smap=self.smap, compute_values=False)
+            return True, node.to_string(verbose=self.verbose, smap=self.smap, compute_values=self.compute_values)
+
+        if not node.is_expression_type():
+            return True, node.to_string(verbose=self.verbose, smap=self.smap, compute_values=self.compute_values)
+
+        return False, None
+
+
+class TestWalkerReferenceImplementations(unittest.TestCase):
+    # _sizeof_expression and expression_to_string give the same
+    # results as the visitor-based implementations they replaced
+
+    def setUp(self):
+        self.m = m = ConcreteModel()
+        m.x = Var([1,2,3], initialize=2)
+        m.y = Var(initialize=3)
+        m.p = Param(initialize=4, mutable=True)
+        m.q = Param([1,2], initialize={1:5, 2:6}, mutable=True)
+        m.e = Expression(expr=m.x[1]*m.y + m.p)
+        m.f = ExternalFunction(library='foo.so', function='bar')
+        m.y.fix()
+
+    def _expressions(self):
+        m = self.m
+        deep = m.x[1]
+        for i in range(5000):
+            deep = m.x[i%3+1]*deep if i%2 else sin(deep) + m.q[i%2+1]
+        return [
+            3,
+            m.x[1],
+            m.p,
+            m.e,
+            m.x[1] + m.x[1] + m.x[1],
+            m.x[1]**2 + m.y*m.x[2] - m.p/m.x[3],
+            m.e*m.e - m.q[1]*m.x[2],
+            sum(i*m.x[i] for i in m.x) + m.q[2],
+            EXPR.LinearExpression([m.p, 1, m.q[1], m.x[1], m.x[2]]),
+            EXPR.Expr_if(IF=m.x[1] >= m.p, THEN=exp(m.y), ELSE=-m.x[2]),
+            m.f(m.x[1], 'string_param', 1, m.q[2])*m.y,
+            abs(m.x[3] - m.p) + log(m.q[1]*m.y),
+            inequality(m.p, m.x[1] + m.x[2], m.q[2]),
+            deep,
+            sum((i+1)*m.x[i%3+1] for i in range(5000)),
+        ]
+
+    def test_sizeof_expression(self):
+        def enter(node):
+            return None, 1
+        def accept(node, data, child_result):
+            return data + child_result
+        walker = EXPR.StreamBasedExpressionVisitor(
+            enterNode=enter, acceptChildResult=accept)
+        for e in self._expressions():
+            self.assertEqual(_sizeof_expression(e), walker.walk_expression(e))
+
+    def test_expression_to_string(self):
+        for e in self._expressions():
+            if type(e) in native_numeric_types:
+                continue
+            for verbose in (False, True):
+                for compute_values in (False, True):
+                    ref = _ReferenceToStringVisitor(
+                        verbose, None, compute_values)
+                    self.assertEqual(
+                        EXPR.expression_to_string(
+                            e, verbose=verbose,
+                            compute_values=compute_values),
+                        ref.dfs_postorder_stack(e))
+
+    def test_expression_to_string_labeler(self):
+        for e in self._expressions():
+            if type(e) in native_numeric_types:
+                continue
+            smap = SymbolMap()
+            smap.default_labeler = NumericLabeler('x')
+            ref = _ReferenceToStringVisitor(False, smap, False)
+            ref_str = ref.dfs_postorder_stack(e)
+            self.assertEqual(
+                EXPR.expression_to_string(
+                    e, labeler=NumericLabeler('x')),
+                ref_str)
+
+
 class TestEvaluateExpression(unittest.TestCase):
 
     def test_constant(self):
@@ -6820,5 +6946,55 @@ class TestEvaluateExpression(unittest.TestCase):
         self.assertRaises(TemplateExpressionError, EXPR.evaluate_expression, e)
         self.assertRaises(TemplateExpressionError, EXPR.evaluate_expression, e, constant=True)
 
+
+class TestCompileExpression(unittest.TestCase):
+
+    def test_compile(self):
+        m = ConcreteModel()
+        m.x = Var([0,1,2,3], initialize=lambda m,i: i+0.5)
+        m.y = Var(initialize=3)
+        m.p = Param(mutable=True, initialize=2)
+        m.e = Expression(expr=m.x[1]**2)
+        exprs = [m.x[0],
+                 3,
+                 m.p*m.x[1] + sin(m.x[2])/m.x[3] - m.y,
+                 EXPR.Expr_if(IF=m.x[0] >= 1, THEN=m.e, ELSE=-m.x[2]),
+                 abs(m.x[1] - 4) + exp(m.p),
+                 sum(i*m.x[i] for i in range(4)) + m.p]
+        f = EXPR.compile_expression(exprs, [m.x[i] for i in range(4)])
+        x = [m.x[i].value for i in range(4)]
+        self.assertEqual(f(x), [value(e) for e in exprs])
+
+        # parameters and variables not in var_order are evaluated
+        # when the function is called
+        m.p = 5
+        m.y = 1
+        self.assertEqual(f(x), [value(e) for e in exprs])
+        x = [1, 2, 3, 4]
+        for i in range(4):
+            m.x[i] = x[i]
+        self.assertEqual(f(x), [value(e) for e in exprs])
+
+        g = EXPR.compile_expression(exprs[2], [m.x[i] for i in range(4)])
+        self.assertEqual(g(x), value(exprs[2]))
+
+        # only replaced expressions are recompiled
+        functions = list(f._functions)
+        exprs[1] = m.x[3]*m.y
+        f.update(exprs)
+        self.assertIs(f._functions[0], functions[0])
+        self.assertIsNot(f._functions[1], functions[1])
+        self.assertEqual(f(x), [value(e) for e in exprs])
+
+    def test_compile_deep_and_wide(self):
+        m = ConcreteModel()
+        m.x = Var([0,1,2], initialize=0.5)
+        e = m.x[0]
+        for i in range(2000):
+            e = m.x[i%3]*e if i%2 else sin(e)
+        w = sum((i+1)*m.x[i%3] for i in range(2000))
+        f = EXPR.compile_expression([e, w], [m.x[i] for i in range(3)])
+        self.assertEqual(f([0.5]*3), [value(e), value(w)])
+
 if __name__ == "__main__":
     unittest.main()
@@ -146,6 +146,34 @@ class Test(unittest.TestCase):
         expr = quicksum(model.x)
         self.assertEqual( expr, 6)
 
+    def test_sum_compact(self):
+        model = ConcreteModel()
+        model.A = Set(initialize=[1,2,3])
+        model.p = Param(model.A, initialize={1:1.5, 2:2.5, 3:-1.0})
+        model.q = Param(model.A, initialize={1:2, 2:3, 3:4})
+        model.r = Param(model.A, initialize={1:2, 2:0.5, 3:4})
+        model.x = Var(model.A, initialize=1)
+        # float and int coefficients are stored in typed arrays
+        expr = quicksum(model.p[i]*model.x[i] for i in model.A)
+        self.assertIs(expr.__class__, EXPR.LinearExpression)
+        self.assertEqual(expr.linear_coefs.typecode, 'd')
+        self.assertEqual(str(expr), "1.5*x[1] + 2.5*x[2] - x[3]")
+        self.assertEqual(value(expr), 3.0)
+        expr = sum_product(model.q, model.x)
+        self.assertEqual(expr.linear_coefs.typecode, 'l')
+        self.assertEqual(list(expr.linear_coefs), [2, 3, 4])
+        self.assertIs(expr.linear_coefs[0].__class__, int)
+        self.assertEqual(str(expr), "2*x[1] + 3*x[2] + 4*x[3]")
+        expr = sum_product(model.p, model.q, model.x)
+        self.assertEqual(list(expr.linear_coefs), [3.0, 7.5, -4.0])
+        # mixed types keep the original list
+        expr = sum_product(model.r, model.x)
+        self.assertIs(expr.linear_coefs.__class__, list)
+        # the compact expressions can be walked
+        expr = quicksum(model.p[i]*model.x[i] for i in model.A)
+        e3 = EXPR.replace_expressions(expr, {id(model.x[1]): model.x[2]})
+        self.assertEqual(str(e3), "1.5*x[2] + 2.5*x[2] - x[3]")
+
     def test_summation_error1(self):
         try:
             sum_product()
@@ -218,8 +218,8 @@ def sum_product(*args, **kwds):
                         expr += start
                         for i in index:
                             term = 1
-                            for j in params_:
-                                term *= params_[j][i]
+                            for p in params_:
+                                term *= p[i]
                             expr += term * v[i]
                 return expr
             #
@@ -0,0 +1,133 @@
+
+# parse_table_datacmds.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'ASTERISK BRACKETEDSTRING COLON COLONEQ COMMA DATA END EQ FLOAT_VAL INCLUDE INT_VAL LBRACE LBRACKET LOAD LPAREN NAMESPACE PARAM QUOTEDSTRING RBRACE RBRACKET RPAREN SEMICOLON SET STORE STRING TABLE TR WORD WORDWITHLBRACKETexpr : statements\n            | statements : statements statement\n                  | statement\n                  | statements NAMESPACE WORD LBRACE statements RBRACE\n                  | NAMESPACE WORD LBRACE statements RBRACE statement : SET WORD COLONEQ datastar SEMICOLON\n                 | SET WORDWITHLBRACKET args RBRACKET COLONEQ datastar SEMICOLON\n                 | SET WORD COLON itemstar COLONEQ datastar SEMICOLON\n                 | PARAM items COLONEQ datastar SEMICOLON\n                 | TABLE items COLONEQ datastar SEMICOLON\n                 | LOAD items SEMICOLON\n                 | STORE items SEMICOLON\n                 | INCLUDE WORD SEMICOLON\n                 | INCLUDE QUOTEDSTRING SEMICOLON\n                 | DATA SEMICOLON\n                 | END SEMICOLON\n    \n    datastar : data\n             |\n    \n    data : data WORD\n         | data STRING\n         | data QUOTEDSTRING\n         | data BRACKETEDSTRING\n         | data SET\n         | data TABLE\n         | data PARAM\n         | data INT_VAL\n         | data FLOAT_VAL\n         | data LPAREN\n         | data RPAREN\n         | data COMMA\n         | data ASTERISK\n         | WORD\n         | STRING\n         | QUOTEDSTRING\n         | BRACKETEDSTRING\n         | SET\n         | TABLE\n         | PARAM\n         | INT_VAL\n         | FLOAT_VAL\n         | LPAREN\n         | RPAREN\n         | COMMA\n         | ASTERISK\n    \n    args : arg\n         |\n    \n    arg : arg COMMA WORD\n         | arg COMMA STRING\n         | arg COMMA QUOTEDSTRING\n         | arg COMMA SET\n         | arg COMMA TABLE\n         | arg COMMA PARAM\n         | arg COMMA INT_VAL\n         | arg COMMA FLOAT_VAL\n         | WORD\n         | STRING\n         | QUOTEDSTRING\n         | SET\n         | TABLE\n         | PARAM\n         | INT_VAL\n         | FLOAT_VAL\n    \n    itemstar : items\n             |\n    \n    items : items WORD\n          | items STRING\n          | items QUOTEDSTRING\n          | items COMMA\n          | items COLON\n          | items LBRACE\n          | items RBRACE\n          | items LBRACKET\n          | items RBRACKET\n          | items TR\n          | items LPAREN\n          | items RPAREN\n          | items ASTERISK\n          | items EQ\n          | items SET\n          | items TABLE\n          | items PARAM\n          | items INT_VAL\n          | items FLOAT_VAL\n          | WORD\n          | STRING\n          | QUOTEDSTRING\n          | COMMA\n          | COLON\n          | LBRACKET\n          | RBRACKET\n          | LBRACE\n          | RBRACE\n          | TR\n          | LPAREN\n          | RPAREN\n          | ASTERISK\n          | EQ\n          | SET\n          | TABLE\n          | PARAM\n          | INT_VAL\n          | FLOAT_VAL\n    '
+    
+_lr_action_items = {'$end':([0,1,2,3,13,43,44,80,81,82,83,108,109,133,134,135,138,139,],[-2,0,-1,-4,-3,-16,-17,-12,-13,-14,-15,-6,-7,-10,-11,-5,-9,-8,]),'NAMESPACE':([0,2,3,13,43,44,46,80,81,82,83,84,85,107,108,109,133,134,135,138,139,],[4,14,-4,-3,-16,-17,4,-12,-13,-14,-15,4,14,14,-6,-7,-10,-11,-5,-9,-8,]),'SET':([0,2,3,6,7,8,9,13,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,43,44,46,47,48,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,90,91,92,93,94,95,96,97,98,99,100,102,104,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,133,134,135,138,139,],[5,5,-4,34,34,34,34,-3,49,-101,75,-85,-86,-87,-88,-89,-92,-93,-90,-91,-94,-95,-96,-97,-98,-99,-100,-102,-103,75,75,75,-16,-17,5,86,34,-82,86,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-76,-77,-78,-79,-80,-81,-83,-84,86,-12,-13,-14,-15,5,5,-37,-33,114,-34,-35,-36,-38,-39,-40,-41,-42,-43,-44,-45,75,128,5,-6,-7,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,86,86,-10,-11,-5,-9,-8,]),'PARAM':([0,2,3,6,7,8,9,13,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,43,44,46,47,48,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,90,91,92,93,94,95,96,97,98,99,100,102,104,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,133,134,135,138,139,],[6,6,-4,18,18,18,18,-3,56,-101,59,-85,-86,-87,-88,-89,-92,-93,-90,-91,-94,-95,-96,-97,-98,-99,-100,-102,-103,59,59,59,-16,-17,6,94,18,-82,94,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-76,-77,-78,-79,-80,-81,-83,-84,94,-12,-13,-14,-15,6,6,-37,-33,116,-34,-35,-36,-38,-39,-40,-41,-42,-43,-44,-45,59,130,6,-6,-7,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,94,94,-10,-11,-5,-9,-8,]),'TABLE':([0,2,3,6,7,8,9,13,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,43,44,46,47,48,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,90,91,92,93,94,95,96,97,98,99,100,102,104,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,133,134,135,138,139,],[7,7,-4,35,35,35,35,-3,55,-101,76,-85,-86,-87,-88,-89,-92,-93,-90,-91,-94,-95,-96,-97,-98,-99,-100,-102,-103,76,76,76,-16,-17,7,93,35,-82,93,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-76,-77,-78,-79,-80,-81,-83,-84,93,-12,-13,-14,-15,7,7,-37,-33,115,-34,-35,-36,-38,-39,-40,-41,-42,-43,-44,-45,76,129,7,-6,-7,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,93,93,-10,-11,-5,-9,-8,]),'LOAD':([0,2,3,13,43,44,46,80,81,82,83,84,85,107,108,109,133,134,135,138,139,],[8,8,-4,-3,-16,-17,8,-12,-13,-14,-15,8,8,8,-6,-7,-10,-11,-5,-9,-8,]),'STORE':([0,2,3,13,43,44,46,80,81,82,83,84,85,107,108,109,133,134,135,138,139,],[9,9,-4,-3,-16,-17,9,-12,-13,-14,-15,9,9,9,-6,-7,-10,-11,-5,-9,-8,]),'INCLUDE':([0,2,3,13,43,44,46,80,81,82,83,84,85,107,108,109,133,134,135,138,139,],[10,10,-4,-3,-16,-17,10,-12,-13,-14,-15,10,10,10,-6,-7,-10,-11,-5,-9,-8,]),'DATA':([0,2,3,13,43,44,46,80,81,82,83,84,85,107,108,109,133,134,135,138,139,],[11,11,-4,-3,-16,-17,11,-12,-13,-14,-15,11,11,11,-6,-7,-10,-11,-5,-9,-8,]),'END':([0,2,3,13,43,44,46,80,81,82,83,84,85,107,108,109,133,134,135,138,139,],[12,12,-4,-3,-16,-17,12,-12,-13,-14,-15,12,12,12,-6,-7,-10,-11,-5,-9,-8,]),'RBRACE':([3,6,7,8,9,13,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,43,44,48,59,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,80,81,82,83,85,102,107,108,109,133,134,135,138,139,],[-4,26,26,26,26,-3,-101,67,-85,-86,-87,-88,-89,-92,-93,-90,-91,-94,-95,-96,-97,-98,-99,-100,-102,-103,67,67,67,-16,-17,26,-82,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-76,-77,-78,-79,-80,-81,-83,-84,-12,-13,-14,-15,108,67,135,-6,-7,-10,-11,-5,-9,-8,]),'WORD':([4,5,6,7,8,9,10,14,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,47,48,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,86,87,89,90,91,92,93,94,95,96,97,98,99,100,102,104,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,],[15,16,20,20,20,20,41,45,52,-101,61,-85,-86,-87,-88,-89,-92,-93,-90,-91,-94,-95,-96,-97,-98,-99,-100,-102,-103,61,61,61,87,20,-82,87,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-76,-77,-78,-79,-80,-81,-83,-84,87,-37,-33,110,-34,-35,-36,-38,-39,-40,-41,-42,-43,-44,-45,61,125,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,87,87,]),'WORDWITHLBRACKET':([5,],[17,]),'STRING':([6,7,8,9,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,47,48,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,86,87,89,90,91,92,93,94,95,96,97,98,99,100,102,104,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,],[21,21,21,21,53,-101,62,-85,-86,-87,-88,-89,-92,-93,-90,-91,-94,-95,-96,-97,-98,-99,-100,-102,-103,62,62,62,90,21,-82,90,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-76,-77,-78,-79,-80,-81,-83,-84,90,-37,-33,111,-34,-35,-36,-38,-39,-40,-41,-42,-43,-44,-45,62,126,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,90,90,]),'QUOTEDSTRING':([6,7,8,9,10,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,47,48,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,86,87,89,90,91,92,93,94,95,96,97,98,99,100,102,104,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,],[22,22,22,22,42,54,-101,63,-85,-86,-87,-88,-89,-92,-93,-90,-91,-94,-95,-96,-97,-98,-99,-100,-102,-103,63,63,63,91,22,-82,91,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-76,-77,-78,-79,-80,-81,-83,-84,91,-37,-33,112,-34,-35,-36,-38,-39,-40,-41,-42,-43,-44,-45,63,127,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,91,91,]),'COMMA':([6,7,8,9,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,47,48,49,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,86,87,89,90,91,92,93,94,95,96,97,98,99,100,102,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,],[23,23,23,23,-101,64,-85,-86,-87,-88,-89,-92,-93,-90,-91,-94,-95,-96,-97,-98,-99,-100,-102,-103,64,64,64,99,23,-59,104,-56,-57,-58,-60,-61,-62,-63,-82,99,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-76,-77,-78,-79,-80,-81,-83,-84,99,-37,-33,121,-34,-35,-36,-38,-39,-40,-41,-42,-43,-44,-45,64,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,99,99,-48,-49,-50,-51,-52,-53,-54,-55,]),'COLON':([6,7,8,9,16,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,48,59,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,102,],[24,24,24,24,48,-101,65,-85,-86,-87,-88,-89,-92,-93,-90,-91,-94,-95,-96,-97,-98,-99,-100,-102,-103,65,65,65,24,-82,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-76,-77,-78,-79,-80,-81,-83,-84,65,]),'LBRACKET':([6,7,8,9,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,48,59,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,102,],[27,27,27,27,-101,68,-85,-86,-87,-88,-89,-92,-93,-90,-91,-94,-95,-96,-97,-98,-99,-100,-102,-103,68,68,68,27,-82,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-76,-77,-78,-79,-80,-81,-83,-84,68,]),'RBRACKET':([6,7,8,9,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,48,49,50,51,52,53,54,55,56,57,58,59,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,102,125,126,127,128,129,130,131,132,],[28,28,28,28,-47,-101,69,-85,-86,-87,-88,-89,-92,-93,-90,-91,-94,-95,-96,-97,-98,-99,-100,-102,-103,69,69,69,28,-59,103,-46,-56,-57,-58,-60,-61,-62,-63,-82,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-76,-77,-78,-79,-80,-81,-83,-84,69,-48,-49,-50,-51,-52,-53,-54,-55,]),'LBRACE':([6,7,8,9,15,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,45,48,59,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,102,],[25,25,25,25,46,-101,66,-85,-86,-87,-88,-89,-92,-93,-90,-91,-94,-95,-96,-97,-98,-99,-100,-102,-103,66,66,66,84,25,-82,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-76,-77,-78,-79,-80,-81,-83,-84,66,]),'TR':([6,7,8,9,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,48,59,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,102,],[29,29,29,29,-101,70,-85,-86,-87,-88,-89,-92,-93,-90,-91,-94,-95,-96,-97,-98,-99,-100,-102,-103,70,70,70,29,-82,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-76,-77,-78,-79,-80,-81,-83,-84,70,]),'LPAREN':([6,7,8,9,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,47,48,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,86,87,89,90,91,92,93,94,95,96,97,98,99,100,102,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,],[30,30,30,30,-101,71,-85,-86,-87,-88,-89,-92,-93,-90,-91,-94,-95,-96,-97,-98,-99,-100,-102,-103,71,71,71,97,30,-82,97,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-76,-77,-78,-79,-80,-81,-83,-84,97,-37,-33,119,-34,-35,-36,-38,-39,-40,-41,-42,-43,-44,-45,71,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,97,97,]),'RPAREN':([6,7,8,9,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,47,48,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,86,87,89,90,91,92,93,94,95,96,97,98,99,100,102,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,],[31,31,31,31,-101,72,-85,-86,-87,-88,-89,-92,-93,-90,-91,-94,-95,-96,-97,-98,-99,-100,-102,-103,72,72,72,98,31,-82,98,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-76,-77,-78,-79,-80,-81,-83,-84,98,-37,-33,120,-34,-35,-36,-38,-39,-40,-41,-42,-43,-44,-45,72,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,98,98,]),'ASTERISK':([6,7,8,9,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,47,48,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,86,87,89,90,91,92,93,94,95,96,97,98,99,100,102,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,],[32,32,32,32,-101,73,-85,-86,-87,-88,-89,-92,-93,-90,-91,-94,-95,-96,-97,-98,-99,-100,-102,-103,73,73,73,100,32,-82,100,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-76,-77,-78,-79,-80,-81,-83,-84,100,-37,-33,122,-34,-35,-36,-38,-39,-40,-41,-42,-43,-44,-45,73,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,100,100,]),'EQ':([6,7,8,9,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,48,59,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,102,],[33,33,33,33,-101,74,-85,-86,-87,-88,-89,-92,-93,-90,-91,-94,-95,-96,-97,-98,-99,-100,-102,-103,74,74,74,33,-82,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-76,-77,-78,-79,-80,-81,-83,-84,74,]),'INT_VAL':([6,7,8,9,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,47,48,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,86,87,89,90,91,92,93,94,95,96,97,98,99,100,102,104,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,],[36,36,36,36,57,-101,77,-85,-86,-87,-88,-89,-92,-93,-90,-91,-94,-95,-96,-97,-98,-99,-100,-102,-103,77,77,77,95,36,-82,95,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-76,-77,-78,-79,-80,-81,-83,-84,95,-37,-33,117,-34,-35,-36,-38,-39,-40,-41,-42,-43,-44,-45,77,131,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,95,95,]),'FLOAT_VAL':([6,7,8,9,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,47,48,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,86,87,89,90,91,92,93,94,95,96,97,98,99,100,102,104,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,],[37,37,37,37,58,-101,78,-85,-86,-87,-88,-89,-92,-93,-90,-91,-94,-95,-96,-97,-98,-99,-100,-102,-103,78,78,78,96,37,-82,96,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-76,-77,-78,-79,-80,-81,-83,-84,96,-37,-33,118,-34,-35,-36,-38,-39,-40,-41,-42,-43,-44,-45,78,132,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,96,96,]),'SEMICOLON':([11,12,18,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,39,40,41,42,47,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,86,87,88,89,90,91,92,93,94,95,96,97,98,99,100,105,106,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,136,137,],[43,44,-101,-85,-86,-87,-88,-89,-92,-93,-90,-91,-94,-95,-96,-97,-98,-99,-100,-102,-103,80,81,82,83,-19,-82,-19,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-76,-77,-78,-79,-80,-81,-83,-84,-19,-37,-33,109,-18,-34,-35,-36,-38,-39,-40,-41,-42,-43,-44,-45,133,134,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-19,-19,138,139,]),'COLONEQ':([16,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,48,59,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,101,102,103,],[47,-101,60,-85,-86,-87,-88,-89,-92,-93,-90,-91,-94,-95,-96,-97,-98,-99,-100,-102,-103,79,-65,-82,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-76,-77,-78,-79,-80,-81,-83,-84,123,-64,124,]),'BRACKETEDSTRING':([47,60,79,86,87,89,90,91,92,93,94,95,96,97,98,99,100,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,],[92,92,92,-37,-33,113,-34,-35,-36,-38,-39,-40,-41,-42,-43,-44,-45,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,92,92,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'expr':([0,],[1,]),'statements':([0,46,84,],[2,85,107,]),'statement':([0,2,46,84,85,107,],[3,13,3,3,13,13,]),'items':([6,7,8,9,48,],[19,38,39,40,102,]),'args':([17,],[50,]),'arg':([17,],[51,]),'datastar':([47,60,79,123,124,],[88,105,106,136,137,]),'data':([47,60,79,123,124,],[89,89,89,89,89,]),'itemstar':([48,],[101,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> expr","S'",1,None,None,None),
+  ('expr -> statements','expr',1,'p_expr','parse_datacmds.py',166),
+  ('expr -> <empty>','expr',0,'p_expr','parse_datacmds.py',167),
+  ('statements -> statements statement','statements',2,'p_statements','parse_datacmds.py',181),
+  ('statements -> statement','statements',1,'p_statements','parse_datacmds.py',182),
+  ('statements -> statements NAMESPACE WORD LBRACE statements RBRACE','statements',6,'p_statements','parse_datacmds.py',183),
+  ('statements -> NAMESPACE WORD LBRACE statements RBRACE','statements',5,'p_statements','parse_datacmds.py',184),
+  ('statement -> SET WORD COLONEQ datastar SEMICOLON','statement',5,'p_statement','parse_datacmds.py',206),
+  ('statement -> SET WORDWITHLBRACKET args RBRACKET COLONEQ datastar SEMICOLON','statement',7,'p_statement','parse_datacmds.py',207),
+  ('statement -> SET WORD COLON itemstar COLONEQ datastar SEMICOLON','statement',7,'p_statement','parse_datacmds.py',208),
+  ('statement -> PARAM items COLONEQ datastar SEMICOLON','statement',5,'p_statement','parse_datacmds.py',209),
+  ('statement -> TABLE items COLONEQ datastar SEMICOLON','statement',5,'p_statement','parse_datacmds.py',210),
+  ('statement -> LOAD items SEMICOLON','statement',3,'p_statement','parse_datacmds.py',211),
+  ('statement -> STORE items SEMICOLON','statement',3,'p_statement','parse_datacmds.py',212),
+  ('statement -> INCLUDE WORD SEMICOLON','statement',3,'p_statement','parse_datacmds.py',213),
+  ('statement -> INCLUDE QUOTEDSTRING SEMICOLON','statement',3,'p_statement','parse_datacmds.py',214),
+  ('statement -> DATA SEMICOLON','statement',2,'p_statement','parse_datacmds.py',215),
+  ('statement -> END SEMICOLON','statement',2,'p_statement','parse_datacmds.py',216),
+  ('datastar -> data','datastar',1,'p_datastar','parse_datacmds.py',242),
+  ('datastar -> <empty>','datastar',0,'p_datastar','parse_datacmds.py',243),
+  ('data -> data WORD','data',2,'p_data','parse_datacmds.py',252),
+  ('data -> data STRING','data',2,'p_data','parse_datacmds.py',253),
+  ('data -> data QUOTEDSTRING','data',2,'p_data','parse_datacmds.py',254),
+  ('data -> data BRACKETEDSTRING','data',2,'p_data','parse_datacmds.py',255),
+  ('data -> data SET','data',2,'p_data','parse_datacmds.py',256),
+  ('data -> data TABLE','data',2,'p_data','parse_datacmds.py',257),
+  ('data -> data PARAM','data',2,'p_data','parse_datacmds.py',258),
+  ('data -> data INT_VAL','data',2,'p_data','parse_datacmds.py',259),
+  ('data -> data FLOAT_VAL','data',2,'p_data','parse_datacmds.py',260),
+  ('data -> data LPAREN','data',2,'p_data','parse_datacmds.py',261),
+  ('data -> data RPAREN','data',2,'p_data','parse_datacmds.py',262),
+  ('data -> data COMMA','data',2,'p_data','parse_datacmds.py',263),
+  ('data -> data ASTERISK','data',2,'p_data','parse_datacmds.py',264),
+  ('data -> WORD','data',1,'p_data','parse_datacmds.py',265),
+  ('data -> STRING','data',1,'p_data','parse_datacmds.py',266),
+  ('data -> QUOTEDSTRING','data',1,'p_data','parse_datacmds.py',267),
+  ('data -> BRACKETEDSTRING','data',1,'p_data','parse_datacmds.py',268),
+  ('data -> SET','data',1,'p_data','parse_datacmds.py',269),
+  ('data -> TABLE','data',1,'p_data','parse_datacmds.py',270),
+  ('data -> PARAM','data',1,'p_data','parse_datacmds.py',271),
+  ('data -> INT_VAL','data',1,'p_data','parse_datacmds.py',272),
+  ('data -> FLOAT_VAL','data',1,'p_data','parse_datacmds.py',273),
+  ('data -> LPAREN','data',1,'p_data','parse_datacmds.py',274),
+  ('data -> RPAREN','data',1,'p_data','parse_datacmds.py',275),
+  ('data -> COMMA','data',1,'p_data','parse_datacmds.py',276),
+  ('data -> ASTERISK','data',1,'p_data','parse_datacmds.py',277),
+  ('args -> arg','args',1,'p_args','parse_datacmds.py',300),
+  ('args -> <empty>','args',0,'p_args','parse_datacmds.py',301),
+  ('arg -> arg COMMA WORD','arg',3,'p_arg','parse_datacmds.py',310),
+  ('arg -> arg COMMA STRING','arg',3,'p_arg','parse_datacmds.py',311),
+  ('arg -> arg COMMA QUOTEDSTRING','arg',3,'p_arg','parse_datacmds.py',312),
+  ('arg -> arg COMMA SET','arg',3,'p_arg','parse_datacmds.py',313),
+  ('arg -> arg COMMA TABLE','arg',3,'p_arg','parse_datacmds.py',314),
+  ('arg -> arg COMMA PARAM','arg',3,'p_arg','parse_datacmds.py',315),
+  ('arg -> arg COMMA INT_VAL','arg',3,'p_arg','parse_datacmds.py',316),
+  ('arg -> arg COMMA FLOAT_VAL','arg',3,'p_arg','parse_datacmds.py',317),
+  ('arg -> WORD','arg',1,'p_arg','parse_datacmds.py',318),
+  ('arg -> STRING','arg',1,'p_arg','parse_datacmds.py',319),
+  ('arg -> QUOTEDSTRING','arg',1,'p_arg','parse_datacmds.py',320),
+  ('arg -> SET','arg',1,'p_arg','parse_datacmds.py',321),
+  ('arg -> TABLE','arg',1,'p_arg','parse_datacmds.py',322),
+  ('arg -> PARAM','arg',1,'p_arg','parse_datacmds.py',323),
+  ('arg -> INT_VAL','arg',1,'p_arg','parse_datacmds.py',324),
+  ('arg -> FLOAT_VAL','arg',1,'p_arg','parse_datacmds.py',325),
+  ('itemstar -> items','itemstar',1,'p_itemstar','parse_datacmds.py',348),
+  ('itemstar -> <empty>','itemstar',0,'p_itemstar','parse_datacmds.py',349),
+  ('items -> items WORD','items',2,'p_items','parse_datacmds.py',358),
+  ('items -> items STRING','items',2,'p_items','parse_datacmds.py',359),
+  ('items -> items QUOTEDSTRING','items',2,'p_items','parse_datacmds.py',360),
+  ('items -> items COMMA','items',2,'p_items','parse_datacmds.py',361),
+  ('items -> items COLON','items',2,'p_items','parse_datacmds.py',362),
+  ('items -> items LBRACE','items',2,'p_items','parse_datacmds.py',363),
+  ('items -> items RBRACE','items',2,'p_items','parse_datacmds.py',364),
+  ('items -> items LBRACKET','items',2,'p_items','parse_datacmds.py',365),
+  ('items -> items RBRACKET','items',2,'p_items','parse_datacmds.py',366),
+  ('items -> items TR','items',2,'p_items','parse_datacmds.py',367),
+  ('items -> items LPAREN','items',2,'p_items','parse_datacmds.py',368),
+  ('items -> items RPAREN','items',2,'p_items','parse_datacmds.py',369),
+  ('items -> items ASTERISK','items',2,'p_items','parse_datacmds.py',370),
+  ('items -> items EQ','items',2,'p_items','parse_datacmds.py',371),
+  ('items -> items SET','items',2,'p_items','parse_datacmds.py',372),
+  ('items -> items TABLE','items',2,'p_items','parse_datacmds.py',373),
+  ('items -> items PARAM','items',2,'p_items','parse_datacmds.py',374),
+  ('items -> items INT_VAL','items',2,'p_items','parse_datacmds.py',375),
+  ('items -> items FLOAT_VAL','items',2,'p_items','parse_datacmds.py',376),
+  ('items -> WORD','items',1,'p_items','parse_datacmds.py',377),
+  ('items -> STRING','items',1,'p_items','parse_datacmds.py',378),
+  ('items -> QUOTEDSTRING','items',1,'p_items','parse_datacmds.py',379),
+  ('items -> COMMA','items',1,'p_items','parse_datacmds.py',380),
+  ('items -> COLON','items',1,'p_items','parse_datacmds.py',381),
+  ('items -> LBRACKET','items',1,'p_items','parse_datacmds.py',382),
+  ('items -> RBRACKET','items',1,'p_items','parse_datacmds.py',383),
+  ('items -> LBRACE','items',1,'p_items','parse_datacmds.py',384),
+  ('items -> RBRACE','items',1,'p_items','parse_datacmds.py',385),
+  ('items -> TR','items',1,'p_items','parse_datacmds.py',386),
+  ('items -> LPAREN','items',1,'p_items','parse_datacmds.py',387),
+  ('items -> RPAREN','items',1,'p_items','parse_datacmds.py',388),
+  ('items -> ASTERISK','items',1,'p_items','parse_datacmds.py',389),
+  ('items -> EQ','items',1,'p_items','parse_datacmds.py',390),
+  ('items -> SET','items',1,'p_items','parse_datacmds.py',391),
+  ('items -> TABLE','items',1,'p_items','parse_datacmds.py',392),
+  ('items -> PARAM','items',1,'p_items','parse_datacmds.py',393),
+  ('items -> INT_VAL','items',1,'p_items','parse_datacmds.py',394),
+  ('items -> FLOAT_VAL','items',1,'p_items','parse_datacmds.py',395),
+]
@@ -21,6 +21,7 @@ import logging
 
 from pyutilib.misc.config import ConfigBlock, ConfigList, ConfigValue
 from pyomo.common import Factory
+from pyomo.common.timing import timing_scope
 import pyutilib.common
 import pyutilib.misc
 import pyutilib.services
@@ -232,6 +233,22 @@ def _raise_ephemeral_error(name, keyword=""):
         "solve." % (name, keyword))
 
 
+_async_executor = None
+
+def _serial_executor():
+    """
+    Return the executor used by asynchronous solves.  The
+    TempfileManager is not thread-safe, so the work of these solves
+    that uses it (writing the problem files, running in-process solvers
+    and loading the results) is done in a single thread.
+    """
+    global _async_executor
+    if _async_executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _async_executor = ThreadPoolExecutor(max_workers=1)
+    return _async_executor
+
+
 class OptSolver(object):
     """A generic optimization solver"""
 
@@ -510,10 +527,81 @@ class OptSolver(object):
         """ Solve the problem """
 
         self.available(exception_flag=True)
+        _model = self._initialize_solve(args, kwds)
+
         #
-        # If the inputs are models, then validate that they have been
-        # constructed! Collect suffix names to try and import from solution.
+        # Handle ephemeral solvers options here. These
+        # will override whatever is currently in the options
+        # dictionary, but we will reset these options to
+        # their original value at the end of this method.
         #
+
+        orig_options = self._set_ephemeral_options(kwds)
+        try:
+            with timing_scope('solve(%s)' % (self.name,)):
+
+                # we're good to go.
+                initial_time = time.time()
+
+                with timing_scope('presolve'):
+                    self._presolve(*args, **kwds)
+
+                presolve_completion_time = time.time()
+                if self._report_timing:
+                    print("      %6.2f seconds required for presolve" % (presolve_completion_time - initial_time))
+
+                if not _model is None:
+                    self._initialize_callbacks(_model)
+
+                with timing_scope('apply_solver'):
+                    _status = self._apply_solver()
+                self._check_solver_status(_status)
+                solve_completion_time = time.time()
+                if self._report_timing:
+                    print("      %6.2f seconds required for solver" % (solve_completion_time - presolve_completion_time))
+
+                with timing_scope('postsolve'):
+                    result = self._postsolve()
+                    self._load_results(_model, result)
+                postsolve_completion_time = time.time()
+
+                if self._report_timing:
+                    print("      %6.2f seconds required for postsolve"
+                          % (postsolve_completion_time - solve_completion_time))
+
+        finally:
+            #
+            # Reset the options dict
+            #
+            self.options = orig_options
+
+        return result
+
+    def solve_async(self, *args, **kwds):
+        """
+        Solve the problem without blocking the asyncio event loop.
+        Returns an asyncio future for the results of the solve, so that
+        this method can be used as 'results = await opt.solve_async(model)'.
+        The solve is executed in the thread that is shared by all
+        asynchronous solves (see _serial_executor), so concurrent
+        solves run one after the other.  The event loop may be
+        specified with the 'loop' keyword.  Subclasses that run the
+        solver in a separate process override this method.
+        """
+        import asyncio
+        loop = kwds.pop('loop', None)
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        return loop.run_in_executor(_serial_executor(),
+                                    lambda: self.solve(*args, **kwds))
+
+    def _initialize_solve(self, args, kwds):
+        """
+        Validate the inputs to the solve method.  If the inputs are
+        models, then validate that they have been constructed and
+        collect the suffix names to import from the solution.  Returns
+        the model being solved (or None).
+        """
         from pyomo.core.base.block import _BlockData
         import pyomo.core.base.suffix
         from pyomo.core.kernel.block import IBlock
@@ -546,14 +634,14 @@ class OptSolver(object):
                     for name in model_suffixes:
                         if name not in kwds_suffixes:
                             kwds_suffixes.append(name)
+        return _model
 
-        #
-        # Handle ephemeral solvers options here. These
-        # will override whatever is currently in the options
-        # dictionary, but we will reset these options to
-        # their original value at the end of this method.
-        #
-
+    def _set_ephemeral_options(self, kwds):
+        """
+        Replace the options dictionary with a copy that is updated with
+        the 'options' and 'options_string' keywords.  Returns the
+        original options dictionary.
+        """
         orig_options = self.options
 
         self.options = pyutilib.misc.Options()
@@ -561,90 +649,70 @@ class OptSolver(object):
         self.options.update(kwds.pop('options', {}))
         self.options.update(
             self._options_string_to_dict(kwds.pop('options_string', '')))
-        try:
-
-            # we're good to go.
-            initial_time = time.time()
+        return orig_options
 
-            self._presolve(*args, **kwds)
-
-            presolve_completion_time = time.time()
-            if self._report_timing:
-                print("      %6.2f seconds required for presolve" % (presolve_completion_time - initial_time))
-
-            if not _model is None:
-                self._initialize_callbacks(_model)
-
-            _status = self._apply_solver()
-            if hasattr(self, '_transformation_data'):
-                del self._transformation_data
-            if not hasattr(_status, 'rc'):
-                logger.warning(
-                    "Solver (%s) did not return a solver status code.\n"
-                    "This is indicative of an internal solver plugin error.\n"
-                    "Please report this to the Pyomo developers." )
-            elif _status.rc:
+    def _check_solver_status(self, _status):
+        """
+        Raise an exception if the solver did not exit normally.
+        """
+        if hasattr(self, '_transformation_data'):
+            del self._transformation_data
+        if not hasattr(_status, 'rc'):
+            logger.warning(
+                "Solver (%s) did not return a solver status code.\n"
+                "This is indicative of an internal solver plugin error.\n"
+                "Please report this to the Pyomo developers." )
+        elif _status.rc:
+            logger.error(
+                "Solver (%s) returned non-zero return code (%s)"
+                % (self.name, _status.rc,))
+            if self._tee:
                 logger.error(
-                    "Solver (%s) returned non-zero return code (%s)"
-                    % (self.name, _status.rc,))
-                if self._tee:
-                    logger.error(
-                        "See the solver log above for diagnostic information." )
-                elif hasattr(_status, 'log') and _status.log:
-                    logger.error("Solver log:\n" + str(_status.log))
-                raise pyutilib.common.ApplicationError(
-                    "Solver (%s) did not exit normally" % self.name)
-            solve_completion_time = time.time()
-            if self._report_timing:
-                print("      %6.2f seconds required for solver" % (solve_completion_time - presolve_completion_time))
-
-            result = self._postsolve()
-            result._smap_id = self._smap_id
-            result._smap = None
-            if _model:
-                if isinstance(_model, IBlock):
-                    if len(result.solution) == 1:
-                        result.solution(0).symbol_map = \
-                            getattr(_model, "._symbol_maps")[result._smap_id]
-                        result.solution(0).default_variable_value = \
-                            self._default_variable_value
-                        if self._load_solutions:
-                            _model.load_solution(result.solution(0))
-                    else:
-                        assert len(result.solution) == 0
-                    # see the hack in the write method
-                    # we don't want this to stick around on the model
-                    # after the solve
-                    assert len(getattr(_model, "._symbol_maps")) == 1
-                    delattr(_model, "._symbol_maps")
-                    del result._smap_id
-                    if self._load_solutions and \
-                       (len(result.solution) == 0):
-                        logger.error("No solution is available")
-                else:
-                    if self._load_solutions:
-                        _model.solutions.load_from(
-                            result,
-                            select=self._select_index,
-                            default_variable_value=self._default_variable_value)
-                        result._smap_id = None
-                        result.solution.clear()
-                    else:
-                        result._smap = _model.solutions.symbol_map[self._smap_id]
-                        _model.solutions.delete_symbol_map(self._smap_id)
-            postsolve_completion_time = time.time()
-
-            if self._report_timing:
-                print("      %6.2f seconds required for postsolve"
-                      % (postsolve_completion_time - solve_completion_time))
-
-        finally:
-            #
-            # Reset the options dict
-            #
-            self.options = orig_options
+                    "See the solver log above for diagnostic information." )
+            elif hasattr(_status, 'log') and _status.log:
+                logger.error("Solver log:\n" + str(_status.log))
+            raise pyutilib.common.ApplicationError(
+                "Solver (%s) did not exit normally" % self.name)
 
-        return result
+    def _load_results(self, _model, result):
+        """
+        Tag the results with the symbol map of the model and load the
+        solution into the model (if requested).
+        """
+        from pyomo.core.kernel.block import IBlock
+        result._smap_id = self._smap_id
+        result._smap = None
+        if _model:
+            if isinstance(_model, IBlock):
+                if len(result.solution) == 1:
+                    result.solution(0).symbol_map = \
+                        getattr(_model, "._symbol_maps")[result._smap_id]
+                    result.solution(0).default_variable_value = \
+                        self._default_variable_value
+                    if self._load_solutions:
+                        _model.load_solution(result.solution(0))
+                else:
+                    assert len(result.solution) == 0
+                # see the hack in the write method
+                # we don't want this to stick around on the model
+                # after the solve
+                assert len(getattr(_model, "._symbol_maps")) == 1
+                delattr(_model, "._symbol_maps")
+                del result._smap_id
+                if self._load_solutions and \
+                   (len(result.solution) == 0):
+                    logger.error("No solution is available")
+            else:
+                if self._load_solutions:
+                    _model.solutions.load_from(
+                        result,
+                        select=self._select_index,
+                        default_variable_value=self._default_variable_value)
+                    result._smap_id = None
+                    result.solution.clear()
+                else:
+                    result._smap = _model.solutions.symbol_map[self._smap_id]
+                    _model.solutions.delete_symbol_map(self._smap_id)
 
     def _presolve(self, *args, **kwds):
 
@@ -98,9 +98,11 @@ class PyroAsynchronousActionManager(AsynchronousActionManager):
         ActionHandle objects.  If no arguments are provided, then this
         method will terminate after all queued actions are complete.
         """
-        # Collect event handlers from the arguments
-        ahs = self._flatten(*args)
-        if len(ahs):
+        # Collect event handlers from the arguments. Note that an
+        # empty list of action handles is not the same as no
+        # arguments (we must not wait on every queued action).
+        if len(args):
+            ahs = self._flatten(*args)
             while len(ahs) > 0:
                 ahs.difference_update([ah for ah in ahs if ah.id in self.results])
                 if len(ahs):
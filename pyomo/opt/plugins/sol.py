@@ -13,6 +13,8 @@
 #
 
 import re
+from array import array
+from itertools import islice
 
 import pyutilib.misc
 
@@ -23,7 +25,18 @@ from pyomo.opt import (SolverResults,
                        SolverStatus,
                        TerminationCondition)
 
-from six.moves import xrange
+from six.moves import xrange, map
+
+
+def _read_array(fin, n):
+    """
+    Read n values (one per line) from a file into an array of doubles.
+    """
+    values = array('d', map(float, islice(iter(fin.readline, ''), n)))
+    if len(values) != n:
+        raise ValueError("expected %d values, but found %d"
+                         % (n, len(values)))
+    return values
 
 
 @results.ReaderFactory.register(str(ResultsFormat.sol))
@@ -53,112 +66,59 @@ class ResultsReader_sol(results.AbstractResultsReader):
                 "SOL File Output:\n%s"
                 % (filename, str(e), fdata))
 
+    # The termination conditions for which the *.sol file contains a
+    # solution
+    _solution_conditions = (TerminationCondition.unknown,
+                            TerminationCondition.maxIterations,
+                            TerminationCondition.minFunctionValue,
+                            TerminationCondition.minStepLength,
+                            TerminationCondition.globallyOptimal,
+                            TerminationCondition.locallyOptimal,
+                            TerminationCondition.optimal,
+                            TerminationCondition.maxEvaluations,
+                            TerminationCondition.other,
+                            TerminationCondition.infeasible)
+
+    def load_values(self, filename, symbol_map, res=None, duals=None):
+        """
+        Load the values in a *.sol file directly into the model
+        components of a symbol map created by the NL writer, without
+        building a solution in the SolverResults object.  The variable
+        values are assigned in the column order of the NL file (the
+        symbols 'v0', 'v1', ...).  If duals is not None, it is a
+        mapping (e.g., an import Suffix) that is updated with the
+        constraint duals in the row order of the NL file (the symbols
+        'c0', 'c1', ...).  Suffix sections in the file are ignored.
+
+        Returns a SolverResults object (res, if it is not None) with
+        the solver status.
+        """
+        if res is None:
+            res = SolverResults()
+        with open(filename,"r") as f:
+            msg, x, y, objno_message, soln_status = self._read_values(f, res)
+        if res.solver.termination_condition in self._solution_conditions:
+            bySymbol = symbol_map.bySymbol
+            for i, val in enumerate(x):
+                var = bySymbol.get("v%d" % i, None)
+                if var is not None:
+                    var = var()
+                    var.value = val
+                    var.stale = False
+            if duals is not None:
+                for i, val in enumerate(y):
+                    con = bySymbol.get("c%d" % i, None)
+                    if con is not None:
+                        duals[con()] = val
+        self._set_problem_size(res, x, y)
+        return res
+
     def _load(self, fin, res, soln, suffixes):
 
         if res is None:
             res = SolverResults()
-        #
-        msg = ""
-        line = fin.readline()
-        if line.strip() == "":
-            line = fin.readline()
-        while line:
-            if line[0] == '\n' or (line[0] == '\r' and line[1] == '\n'):
-                break
-            msg += line
-            line = fin.readline()
-        z = []
-        line = fin.readline()
-        if line[:7] == "Options":
-            line = fin.readline()
-            nopts = int(line)
-            need_vbtol = False
-            if nopts > 4:           # WEH - when is this true?
-                nopts -= 2
-                need_vbtol = True
-            for i in xrange(nopts + 4):
-                line = fin.readline()
-                z += [int(line)]
-            if need_vbtol:          # WEH - when is this true?
-                line = fin.readline()
-                z += [float(line)]
-        else:
-            raise ValueError("no Options line found")
-        n = z[nopts + 3] # variables
-        m = z[nopts + 1] # constraints
-        x = []
-        y = []
-        i = 0
-        while i < m:
-            line = fin.readline()
-            y.append(float(line))
-            i += 1
-        i = 0
-        while i < n:
-            line = fin.readline()
-            x.append(float(line))
-            i += 1
-        objno = [0,0]
-        line = fin.readline()
-        if line:                    # WEH - when is this true?
-            if line[:5] != "objno":         #pragma:nocover
-                raise ValueError("expected 'objno', found '%s'" % (line))
-            t = line.split()
-            if len(t) != 3:
-                raise ValueError("expected two numbers in objno line, "
-                                 "but found '%s'" % (line))
-            objno = [int(t[1]), int(t[2])]
-        res.solver.message = msg.strip()
-        res.solver.message = res.solver.message.replace("\n","; ")
-        res.solver.message = pyutilib.misc.yaml_fix(res.solver.message)
-        ##res.solver.instanceName = osrl.header.instanceName
-        ##res.solver.systime = osrl.header.time
-        res.solver.status = SolverStatus.ok
-        soln_status = SolutionStatus.unknown
-        if (objno[1] >= 0) and (objno[1] <= 99):
-            objno_message = "OPTIMAL SOLUTION FOUND!"
-            res.solver.termination_condition = TerminationCondition.optimal
-            res.solver.status = SolverStatus.ok
-            soln_status = SolutionStatus.optimal
-        elif (objno[1] >= 100) and (objno[1] <= 199):
-            objno_message = "Optimal solution indicated, but ERROR LIKELY!"
-            res.solver.termination_condition = TerminationCondition.optimal
-            res.solver.status = SolverStatus.warning
-            soln_status = SolutionStatus.optimal
-        elif (objno[1] >= 200) and (objno[1] <= 299):
-            objno_message = "INFEASIBLE SOLUTION: constraints cannot be satisfied!"
-            res.solver.termination_condition = TerminationCondition.infeasible
-            res.solver.status = SolverStatus.warning
-            soln_status = SolutionStatus.infeasible
-        elif (objno[1] >= 300) and (objno[1] <= 399):
-            objno_message = "UNBOUNDED PROBLEM: the objective can be improved without limit!"
-            res.solver.termination_condition = TerminationCondition.unbounded
-            res.solver.status = SolverStatus.warning
-            soln_status = SolutionStatus.unbounded
-        elif (objno[1] >= 400) and (objno[1] <= 499):
-            objno_message = ("EXCEEDED MAXIMUM NUMBER OF ITERATIONS: the solver "
-                             "was stopped by a limit that you set!")
-            res.solver.termination_condition = TerminationCondition.maxIterations
-            res.solver.status = SolverStatus.warning
-            soln_status = SolutionStatus.stoppedByLimit
-        elif (objno[1] >= 500) and (objno[1] <= 599):
-            objno_message = ("FAILURE: the solver stopped by an error condition "
-                             "in the solver routines!")
-            res.solver.termination_condition = TerminationCondition.internalSolverError
-            res.solver.status = SolverStatus.error
-            soln_status = SolutionStatus.error
-        res.solver.id = objno[1]
-        ##res.problem.name = osrl.header.instanceName
-        if res.solver.termination_condition in [TerminationCondition.unknown,
-                        TerminationCondition.maxIterations,
-                        TerminationCondition.minFunctionValue,
-                        TerminationCondition.minStepLength,
-                        TerminationCondition.globallyOptimal,
-                        TerminationCondition.locallyOptimal,
-                        TerminationCondition.optimal,
-                        TerminationCondition.maxEvaluations,
-                        TerminationCondition.other,
-                        TerminationCondition.infeasible]:
+        msg, x, y, objno_message, soln_status = self._read_values(fin, res)
+        if res.solver.termination_condition in self._solution_conditions:
 
             if soln is None:
                 soln = res.solution.add()
@@ -251,6 +211,101 @@ class ResultsReader_sol(results.AbstractResultsReader):
                         fin.readline()
                 line = fin.readline()
 
+        self._set_problem_size(res, x, y)
+        return res
+
+    def _read_values(self, fin, res):
+        """
+        Read the message, the variable values and the constraint duals
+        in a *.sol file and set the solver status of the results.  The
+        values are read into arrays of doubles.  Returns a tuple
+        (message, x, y, objno_message, solution_status), leaving the
+        file positioned at the suffix sections.
+        """
+        msg = ""
+        line = fin.readline()
+        if line.strip() == "":
+            line = fin.readline()
+        while line:
+            if line[0] == '\n' or (line[0] == '\r' and line[1] == '\n'):
+                break
+            msg += line
+            line = fin.readline()
+        z = []
+        line = fin.readline()
+        if line[:7] == "Options":
+            line = fin.readline()
+            nopts = int(line)
+            need_vbtol = False
+            if nopts > 4:           # WEH - when is this true?
+                nopts -= 2
+                need_vbtol = True
+            for i in xrange(nopts + 4):
+                line = fin.readline()
+                z += [int(line)]
+            if need_vbtol:          # WEH - when is this true?
+                line = fin.readline()
+                z += [float(line)]
+        else:
+            raise ValueError("no Options line found")
+        n = z[nopts + 3] # variables
+        m = z[nopts + 1] # constraints
+        y = _read_array(fin, m)
+        x = _read_array(fin, n)
+        objno = [0,0]
+        line = fin.readline()
+        if line:                    # WEH - when is this true?
+            if line[:5] != "objno":         #pragma:nocover
+                raise ValueError("expected 'objno', found '%s'" % (line))
+            t = line.split()
+            if len(t) != 3:
+                raise ValueError("expected two numbers in objno line, "
+                                 "but found '%s'" % (line))
+            objno = [int(t[1]), int(t[2])]
+        res.solver.message = msg.strip()
+        res.solver.message = res.solver.message.replace("\n","; ")
+        res.solver.message = pyutilib.misc.yaml_fix(res.solver.message)
+        ##res.solver.instanceName = osrl.header.instanceName
+        ##res.solver.systime = osrl.header.time
+        res.solver.status = SolverStatus.ok
+        soln_status = SolutionStatus.unknown
+        objno_message = None
+        if (objno[1] >= 0) and (objno[1] <= 99):
+            objno_message = "OPTIMAL SOLUTION FOUND!"
+            res.solver.termination_condition = TerminationCondition.optimal
+            res.solver.status = SolverStatus.ok
+            soln_status = SolutionStatus.optimal
+        elif (objno[1] >= 100) and (objno[1] <= 199):
+            objno_message = "Optimal solution indicated, but ERROR LIKELY!"
+            res.solver.termination_condition = TerminationCondition.optimal
+            res.solver.status = SolverStatus.warning
+            soln_status = SolutionStatus.optimal
+        elif (objno[1] >= 200) and (objno[1] <= 299):
+            objno_message = "INFEASIBLE SOLUTION: constraints cannot be satisfied!"
+            res.solver.termination_condition = TerminationCondition.infeasible
+            res.solver.status = SolverStatus.warning
+            soln_status = SolutionStatus.infeasible
+        elif (objno[1] >= 300) and (objno[1] <= 399):
+            objno_message = "UNBOUNDED PROBLEM: the objective can be improved without limit!"
+            res.solver.termination_condition = TerminationCondition.unbounded
+            res.solver.status = SolverStatus.warning
+            soln_status = SolutionStatus.unbounded
+        elif (objno[1] >= 400) and (objno[1] <= 499):
+            objno_message = ("EXCEEDED MAXIMUM NUMBER OF ITERATIONS: the solver "
+                             "was stopped by a limit that you set!")
+            res.solver.termination_condition = TerminationCondition.maxIterations
+            res.solver.status = SolverStatus.warning
+            soln_status = SolutionStatus.stoppedByLimit
+        elif (objno[1] >= 500) and (objno[1] <= 599):
+            objno_message = ("FAILURE: the solver stopped by an error condition "
+                             "in the solver routines!")
+            res.solver.termination_condition = TerminationCondition.internalSolverError
+            res.solver.status = SolverStatus.error
+            soln_status = SolutionStatus.error
+        res.solver.id = objno[1]
+        return msg, x, y, objno_message, soln_status
+
+    def _set_problem_size(self, res, x, y):
         #
         # This is a bit of a hack to accommodate PICO.  If
         # the PICO parser has parsed the # of constraints, then
@@ -258,7 +313,6 @@ class ResultsReader_sol(results.AbstractResultsReader):
         # is that these may be inconsistent values!
         #
         if res.problem.number_of_constraints == 0:
-            res.problem.number_of_constraints = m
-        res.problem.number_of_variables = n
+            res.problem.number_of_constraints = len(y)
+        res.problem.number_of_variables = len(x)
         res.problem.number_of_objectives = 1
-        return res
@@ -13,6 +13,7 @@ __all__ = ['SystemCallSolver']
 import os
 import sys
 import time
+import shutil
 import logging
 
 import pyutilib.misc
@@ -23,10 +24,160 @@ from pyutilib.subprocess import run
 
 from pyomo.opt.base import *
 from pyomo.opt.base.solvers import *
+from pyomo.opt.base.solvers import _serial_executor
 from pyomo.opt.results import SolverStatus, SolverResults
 
 logger = logging.getLogger('pyomo.opt')
 
+class _AsyncSolve(object):
+    """
+    The state of a solve executed by SystemCallSolver.solve_async.
+
+    The problem is written and the results are loaded by the serial
+    executor, and the solver is run in an asyncio subprocess.  The
+    temporary files created by the solve are taken out of the
+    TempfileManager context once the problem is written (so the solves
+    do not share a context) and are removed when the solve is done.
+    Cancelling the future kills the solver process.
+    """
+
+    def __init__(self, opt, args, kwds, loop):
+        import asyncio
+        self.asyncio = asyncio
+        self.opt = opt
+        self.loop = loop
+        self.model = None
+        self.orig_options = None
+        self.process = None
+        self.communicate = None
+        self.timer = None
+        self.tempfiles = []
+        self.future = asyncio.Future(loop=loop)
+        self.future.add_done_callback(self._done)
+        self._run_in_executor(self._presolve, args, kwds).add_done_callback(
+            self._callback(self._start))
+
+    def _run_in_executor(self, fcn, *args):
+        self._pending = self.loop.run_in_executor(_serial_executor(), fcn, *args)
+        return self._pending
+
+    def _callback(self, fcn):
+        """
+        Return a callback that calls fcn with the result of a future,
+        or passes the error of the future on to the solve.
+        """
+        def _callback(f):
+            if f.cancelled():
+                self.future.cancel()
+            elif f.exception() is not None:
+                if not self.future.done():
+                    self.future.set_exception(f.exception())
+            elif not self.future.done():
+                try:
+                    fcn(f.result())
+                except Exception as e:
+                    self.future.set_exception(e)
+        return _callback
+
+    def _presolve(self, args, kwds):
+        opt = self.opt
+        opt.available(exception_flag=True)
+        self.model = opt._initialize_solve(args, kwds)
+        self.orig_options = opt._set_ephemeral_options(kwds)
+        try:
+            opt._presolve(*args, **kwds)
+        finally:
+            # the files of this solve (in the context pushed by
+            # _presolve) are removed by _cleanup.  TempfileManager has
+            # no public accessor for the files of a context.
+            self.tempfiles = list(TempfileManager._tempfiles[-1])
+            TempfileManager.pop(remove=False)
+        if self.model is not None:
+            opt._initialize_callbacks(self.model)
+        return opt._command
+
+    def _start(self, command):
+        if __debug__ and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Running %s", command.cmd)
+        self.input = None
+        if 'script' in command:
+            self.input = command.script.encode()
+        self.start_time = time.time()
+        PIPE = self.asyncio.subprocess.PIPE
+        self.loop.create_task(self.asyncio.create_subprocess_exec(
+            *command.cmd,
+            stdin=PIPE,
+            stdout=PIPE,
+            stderr=self.asyncio.subprocess.STDOUT,
+            env=command.env)).add_done_callback(self._spawned)
+
+    def _spawned(self, f):
+        if not f.cancelled() and f.exception() is None:
+            self.process = f.result()
+            if self.future.cancelled():
+                self._kill()
+        self._callback(self._started)(f)
+
+    def _started(self, process):
+        timelimit = self.opt._timelimit
+        if timelimit is not None:
+            self.timer = self.loop.call_later(
+                timelimit + max(1, 0.01*timelimit), self._kill)
+        self.communicate = self.loop.create_task(
+            process.communicate(self.input))
+        self.communicate.add_done_callback(self._callback(self._finished))
+
+    def _finished(self, output):
+        opt = self.opt
+        opt._last_solve_time = time.time() - self.start_time
+        opt._rc = self.process.returncode
+        opt._log = output[0].decode(errors='replace')
+        if opt._tee:
+            sys.stdout.write(opt._log)
+            sys.stdout.flush()
+        self._run_in_executor(
+            self._postsolve, Bunch(rc=opt._rc, log=opt._log)).\
+            add_done_callback(self._callback(self.future.set_result))
+
+    def _postsolve(self, status):
+        opt = self.opt
+        opt._check_solver_status(status)
+        # balance the context popped by _postsolve
+        TempfileManager.push()
+        result = opt._postsolve()
+        opt._load_results(self.model, result)
+        return result
+
+    def _kill(self):
+        if self.process is not None and self.process.returncode is None:
+            self.process.kill()
+
+    def _done(self, future):
+        if self.timer is not None:
+            self.timer.cancel()
+        if future.cancelled():
+            self._kill()
+            if self.communicate is not None:
+                self.communicate.cancel()
+        if self._pending.done():
+            self._cleanup()
+        else:
+            # wait for the executor to finish with the files
+            self._pending.add_done_callback(lambda f: self._cleanup())
+
+    def _cleanup(self):
+        if self.orig_options is not None:
+            self.opt.options = self.orig_options
+        if self.opt._keepfiles and not self.future.cancelled():
+            for filename in self.tempfiles:
+                print("Solver temporary file kept: '%s'" % filename)
+            return
+        for filename in self.tempfiles:
+            if os.path.isdir(filename):
+                shutil.rmtree(filename, ignore_errors=True)
+            elif os.path.exists(filename):
+                os.remove(filename)
+
 
 class SystemCallSolver(OptSolver):
     """ A generic command line solver """
@@ -46,6 +197,9 @@ class SystemCallSolver(OptSolver):
         # a solver plugin may not report execution time.
         self._last_solve_time = None
         self._define_signal_handlers = True
+        # the model whose solution is loaded directly from the
+        # results file (see _presolve)
+        self._direct_load_model = None
 
         if executable is not None:
             self.set_executable(name=executable, validate=validate)
@@ -198,9 +352,26 @@ class SystemCallSolver(OptSolver):
 
         self._keepfiles = kwds.pop("keepfiles", False)
         self._define_signal_handlers = kwds.pop('use_signal_handling',True)
+        save_results = kwds.pop('save_results', True)
 
         OptSolver._presolve(self, *args, **kwds)
 
+        #
+        # If save_results is False, then the solution is loaded
+        # directly from the results file into the model (when the
+        # results reader supports this), and the SolverResults object
+        # does not contain a solution.
+        #
+        from pyomo.core.base.block import _BlockData
+        self._direct_load_model = None
+        if (not save_results) and self._load_solutions and \
+           (self._select_index == 0) and \
+           (len(args) > 0) and isinstance(args[0], _BlockData) and \
+           hasattr(self._results_reader, 'load_values') and \
+           (self._smap_id is not None) and \
+           all(suffix == 'dual' for suffix in self._suffixes):
+            self._direct_load_model = args[0]
+
         #
         # Verify that the input problems exists
         #
@@ -225,6 +396,29 @@ class SystemCallSolver(OptSolver):
            os.path.exists(self._soln_file):
             os.remove(self._soln_file)
 
+    def solve_async(self, *args, **kwds):
+        """
+        Solve the problem without blocking the asyncio event loop.
+        Returns an asyncio future for the results of the solve, so that
+        this method can be used as 'results = await opt.solve_async(model)'.
+
+        The solver is run with asyncio.create_subprocess_exec, and
+        cancelling the future kills the solver process.  Writing the
+        problem and loading the results are done in a separate thread
+        that is shared by all asynchronous solves.  A solver object
+        executes one solve at a time, so concurrent solves should use
+        separate solver objects.
+        """
+        import asyncio
+        loop = kwds.pop('loop', None)
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        if type(self)._execute_command is not SystemCallSolver._execute_command:
+            # the command is not executed by a subprocess (e.g.,
+            # by a mock solver)
+            return OptSolver.solve_async(self, *args, loop=loop, **kwds)
+        return _AsyncSolve(self, args, kwds, loop).future
+
     def _apply_solver(self):
         if registered_executable('timer'):
             self._timer = registered_executable('timer').get_path()
@@ -332,7 +526,12 @@ class SystemCallSolver(OptSolver):
         log_file_completion_time = time.time()
         if self._report_timing is True:
             print("      %6.2f seconds required to read logfile " % (log_file_completion_time - start_time))
-        if self._results_reader is None:
+        if self._direct_load_model is not None:
+            results = self._load_values(results)
+            results_reader_completion_time = time.time()
+            if self._report_timing is True:
+                print("      %6.2f seconds required to read solution file" % (results_reader_completion_time - log_file_completion_time))
+        elif self._results_reader is None:
             self.process_soln_file(results)
             soln_file_completion_time = time.time()
             if self._report_timing is True:
@@ -365,6 +564,30 @@ class SystemCallSolver(OptSolver):
 
         return results
 
+    def _load_values(self, results):
+        """
+        Load the solution in the results file directly into the model
+        and return the results object without a solution.
+        """
+        from pyomo.core.base.suffix import active_import_suffix_generator
+        model = self._direct_load_model
+        self._direct_load_model = None
+        symbol_map = model.solutions.symbol_map[self._smap_id]
+        duals = None
+        if 'dual' in self._suffixes:
+            duals = dict(active_import_suffix_generator(model)).get('dual')
+            if duals is not None:
+                duals.clear_all_values()
+        model._flag_vars_as_stale()
+        results = self._results_reader.load_values(self._results_file,
+                                                   symbol_map,
+                                                   res=results,
+                                                   duals=duals)
+        # the symbol map is not needed to load the (empty) results
+        model.solutions.delete_symbol_map(self._smap_id)
+        self._smap_id = None
+        return results
+
     def _default_results_format(self, prob_format):
         """ Returns the default results format for different problem
             formats.
@@ -135,5 +135,47 @@ class Test(unittest.TestCase):
             self.assertEqual(m.iis[m.v1], 1)
             self.assertEqual(m.iis[m.c0], 4)
 
+    def test_load_values(self):
+        import pyomo.kernel as pmo
+        from pyomo.core.expr.symbol_map import SymbolMap
+        m = pmo.block()
+        m.x = pmo.variable_list(pmo.variable() for i in range(32))
+        m.c = pmo.constraint_list(pmo.constraint() for i in range(24))
+        m.dual = pmo.suffix(direction=pmo.suffix.IMPORT)
+        symbol_map = SymbolMap()
+        for i, v in enumerate(m.x):
+            symbol_map.addSymbol(v, 'v%d' % i)
+        for i, c in enumerate(m.c):
+            symbol_map.addSymbol(c, 'c%d' % i)
+        with pyomo.opt.ReaderFactory("sol") as reader:
+            if reader is None:
+                raise IOError("Reader 'sol' is not registered")
+            result = reader.load_values(currdir+"test4_sol.sol",
+                                        symbol_map,
+                                        duals=m.dual)
+        self.assertEqual(result.solver.termination_condition,
+                         TerminationCondition.optimal)
+        self.assertEqual(len(result.solution), 0)
+        self.assertEqual(result.problem.number_of_variables, 32)
+        self.assertEqual(result.problem.number_of_constraints, 24)
+        self.assertEqual(m.x[0].value, 0)
+        self.assertEqual(m.x[4].value, 46.666666666666664)
+        self.assertEqual(m.x[31].value, 100)
+        self.assertFalse(m.x[0].stale)
+        self.assertEqual(len(m.dual), 24)
+        self.assertEqual(m.dual[m.c[2]], 0.12599999999999997)
+
+    def test_load_values_infeasible(self):
+        from pyomo.core.expr.symbol_map import SymbolMap
+        with pyomo.opt.ReaderFactory("sol") as reader:
+            if reader is None:
+                raise IOError("Reader 'sol' is not registered")
+            result = reader.load_values(currdir+"infeasible1.sol",
+                                        SymbolMap())
+        self.assertEqual(result.solver.termination_condition,
+                         TerminationCondition.infeasible)
+        self.assertEqual(result.solver.status,
+                         SolverStatus.warning)
+
 if __name__ == "__main__":
     unittest.main()
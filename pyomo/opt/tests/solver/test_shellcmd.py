@@ -12,13 +12,25 @@
 #
 
 import os
+import sys
+import time
 
 import pyutilib.th as unittest
 from pyutilib.common import ApplicationError
+from pyutilib.misc import Bunch
+from pyutilib.services import TempfileManager
 
-from pyomo.opt.base import UnknownSolver
+try:
+    import asyncio
+    asyncio_available = sys.version_info >= (3,5)
+except ImportError:
+    asyncio_available = False
+
+from pyomo.opt.base import OptSolver, UnknownSolver
 from pyomo.opt.base.solvers import SolverFactory
 from pyomo.opt.solver import SystemCallSolver
+from pyomo.opt.base.formats import ResultsFormat
+from pyomo.opt.results import SolverResults
 
 thisdir = os.path.dirname(os.path.abspath(__file__))
 exedirname = "exe_dir"
@@ -284,5 +296,116 @@ class TestSystemCallSolver(unittest.TestCase):
                 self.assertEqual(opt._user_executable, isexe_abspath)
                 self.assertEqual(opt.executable(), isexe_abspath)
 
+
+class _PythonSolver(SystemCallSolver):
+    """A solver that runs a python script"""
+
+    def __init__(self, script):
+        SystemCallSolver.__init__(self, type='_python_solver')
+        self._script = script
+        self._results_format = ResultsFormat.soln
+        # the script does not read a problem file
+        self._problem_files = [os.path.abspath(__file__)]
+
+    def _default_executable(self):
+        return sys.executable
+
+    def create_command_line(self, executable, problem_files):
+        return Bunch(cmd=[executable, '-c', self._script],
+                     log_file=None, env=None)
+
+    def process_output(self, rc):
+        results = SolverResults()
+        results.solver.message = self._log.strip()
+        return results
+
+
+class _TempfileSolver(_PythonSolver):
+    """A solver that creates a temporary file when it writes the
+    problem"""
+
+    def create_command_line(self, executable, problem_files):
+        self.tempdir = TempfileManager.tempdir
+        self.tempfile = TempfileManager.create_tempfile(suffix='.test.log')
+        return _PythonSolver.create_command_line(
+            self, executable, problem_files)
+
+
+class _InProcessSolver(OptSolver):
+    """A solver that runs in the calling thread and, like the direct
+    solvers, keeps a log file in a TempfileManager context while it
+    solves"""
+
+    def __init__(self):
+        OptSolver.__init__(self, type='_in_process_solver')
+
+    def solve(self, *args, **kwds):
+        TempfileManager.push()
+        try:
+            log_file = TempfileManager.create_tempfile(suffix='.test.log')
+            time.sleep(0.2)
+            return os.path.exists(log_file)
+        finally:
+            TempfileManager.pop()
+
+
+@unittest.skipIf(not asyncio_available, "asyncio is not available")
+class TestSolveAsync(unittest.TestCase):
+
+    def _run(self, *futures):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(asyncio.gather(
+                *[f(loop) for f in futures]))
+        finally:
+            loop.close()
+
+    def test_solve_async(self):
+        opts = [_PythonSolver("import time; time.sleep(0.5); print(%s)" % i)
+                for i in range(3)]
+        results = self._run(*(lambda loop, opt=opt: opt.solve_async(loop=loop)
+                              for opt in opts))
+        self.assertEqual([str(r.solver.message) for r in results],
+                         ['0', '1', '2'])
+
+    def test_solve_async_tempfiles(self):
+        # the temporary files are created in the default directory and
+        # removed when the solve is done
+        tempdir = TempfileManager.tempdir
+        opt = _TempfileSolver("print(1)")
+        results = self._run(lambda loop: opt.solve_async(loop=loop))
+        self.assertEqual(str(results[0].solver.message), '1')
+        self.assertIs(opt.tempdir, tempdir)
+        self.assertIs(TempfileManager.tempdir, tempdir)
+        self.assertFalse(os.path.exists(opt.tempfile))
+
+    def test_solve_async_in_process(self):
+        # solvers without a separate process share the TempfileManager,
+        # so their solves must not overlap
+        opts = [_InProcessSolver() for i in range(2)]
+        results = self._run(*(lambda loop, opt=opt: opt.solve_async(loop=loop)
+                              for opt in opts))
+        self.assertEqual(results, [True, True])
+
+    def test_solve_async_error(self):
+        opt = _PythonSolver("import sys; sys.exit(1)")
+        with self.assertRaises(ApplicationError):
+            self._run(lambda loop: opt.solve_async(loop=loop))
+
+    def test_solve_async_cancel(self):
+        opt = _PythonSolver("import time; time.sleep(60)")
+        options = opt.options
+        loop = asyncio.new_event_loop()
+        try:
+            f = opt.solve_async(loop=loop)
+            loop.call_later(0.5, f.cancel)
+            with self.assertRaises(asyncio.CancelledError):
+                loop.run_until_complete(f)
+            # let the loop collect the killed process
+            loop.run_until_complete(asyncio.sleep(0.1))
+            self.assertIs(opt.options, options)
+        finally:
+            loop.close()
+
 if __name__ == "__main__":
     unittest.main()
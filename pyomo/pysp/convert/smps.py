@@ -14,7 +14,7 @@ import sys
 import time
 import operator
 import shutil
-import filecmp
+import hashlib
 import logging
 import itertools
 from collections import namedtuple
@@ -44,11 +44,10 @@ from pyomo.pysp.util.config import (PySPConfigValue,
                                     safe_register_unique_option,
                                     _domain_must_be_str)
 from pyomo.pysp.scenariotree.manager import \
-    (ScenarioTreeManagerClientSerial,
-     ScenarioTreeManagerClientPyro)
+    ScenarioTreeManagerFactory
 from pyomo.pysp.util.misc import launch_command
 
-from six import iteritems, itervalues
+from six import iteritems, itervalues, StringIO
 
 thisfile = os.path.abspath(__file__)
 
@@ -283,6 +282,86 @@ def build_repns(model):
 
     return repn_cache
 
+def _digest(data):
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+def _deterministic_digest(model, symbol_map):
+    """Computes a digest of the data that the LP/MPS writer
+    would output for a model whose repns have been built with
+    build_repns. Two scenarios with the same digest have
+    identical deterministic sections in their core problem
+    files. SOS constraints are included even though
+    map_constraint_stages currently rejects them."""
+    digest = hashlib.sha1()
+    labels = symbol_map.byObject
+    name_buffer = {}
+    def _update(*items):
+        digest.update((" ".join(repr(item) for item in items)+"\n").\
+                      encode('utf-8'))
+
+    for var in model.component_data_objects(Var,
+                                            descend_into=True):
+        if id(var) in labels:
+            _update(labels[id(var)],
+                    var.lb,
+                    var.ub,
+                    var.is_binary(),
+                    var.is_integer(),
+                    var.fixed,
+                    var.value if var.fixed else None)
+
+    for block in model.block_data_objects(active=True,
+                                          descend_into=True):
+        for objective_object in block.component_data_objects(
+                Objective,
+                active=True,
+                descend_into=False):
+            repn = block._repn[objective_object]
+            _update(objective_object.getname(True, name_buffer),
+                    objective_object.sense,
+                    repn.constant)
+            _update(*sorted((labels[id(var)], coef) for var, coef
+                            in zip(repn.linear_vars, repn.linear_coefs)))
+            _update(*sorted((labels[id(var1)], labels[id(var2)], coef)
+                            for (var1, var2), coef
+                            in zip(repn.quadratic_vars,
+                                   repn.quadratic_coefs)))
+        for constraint_data in block.component_data_objects(
+                Constraint,
+                active=True,
+                descend_into=False):
+            repn = block._repn[constraint_data]
+            # the writer moves the body constant to the rhs
+            body_constant = value(repn.constant)
+            if body_constant is None:
+                body_constant = 0.0
+            lower = constraint_data.lower
+            if lower is not None:
+                lower = value(lower) - body_constant
+            upper = constraint_data.upper
+            if upper is not None:
+                upper = value(upper) - body_constant
+            _update(constraint_data.getname(True, name_buffer),
+                    lower,
+                    upper)
+            _update(*sorted((labels[id(var)], coef) for var, coef
+                            in zip(repn.linear_vars, repn.linear_coefs)))
+            _update(*sorted((labels[id(var1)], labels[id(var2)], coef)
+                            for (var1, var2), coef
+                            in zip(repn.quadratic_vars,
+                                   repn.quadratic_coefs)))
+        for soscondata in block.component_data_objects(
+                SOSConstraint,
+                active=True,
+                descend_into=False):
+            _update(soscondata.getname(True, name_buffer),
+                    soscondata.level)
+            _update(*((labels[id(var)] if id(var) in labels else
+                       var.getname(True, name_buffer), weight)
+                      for var, weight in soscondata.get_items()))
+
+    return digest.hexdigest()
+
 def _convert_external_setup(worker, scenario, *args, **kwds):
     reference_model = scenario._instance
     #
@@ -335,12 +414,21 @@ def _convert_external_setup_without_cleanup(
         basename,
         file_format,
         enforce_derived_nonanticipativity,
-        io_options):
+        io_options,
+        reference_scenario_name=None,
+        keep_scenario_files=True):
     import pyomo.environ
     assert os.path.exists(output_directory)
     assert file_format in ('lp', 'mps')
 
     io_options = dict(io_options)
+    # Only the reference scenario needs to leave files behind
+    # (unless they are explicitly requested). All other scenarios
+    # send the contents of their .sto file and a digest of the
+    # remaining files back to the caller, which compares them with
+    # those of the reference scenario.
+    write_scenario_files = keep_scenario_files or \
+        (scenario.name == reference_scenario_name)
     scenario_tree = worker.scenario_tree
     reference_model = scenario._instance
     rootnode = scenario_tree.findRootNode()
@@ -466,9 +554,12 @@ def _convert_external_setup_without_cleanup(
     # Write the LP/MPS file once to obtain the symbol map
     #
     with WriterFactory(file_format) as writer:
-        output_filename = \
-            os.path.join(output_directory,
-                         basename+".setup."+file_format+"."+scenario.name)
+        if write_scenario_files:
+            output_filename = \
+                os.path.join(output_directory,
+                             basename+".setup."+file_format+"."+scenario.name)
+        else:
+            output_filename = os.devnull
         assert 'column_order' not in io_options
         assert 'row_order' not in io_options
         output_fname, symbol_map = writer(reference_model,
@@ -563,8 +654,12 @@ def _convert_external_setup_without_cleanup(
     #
     # Write the ordered LP/MPS file
     #
-    output_filename = os.path.join(output_directory,
-                                   basename+"."+file_format+"."+scenario.name)
+    if write_scenario_files:
+        output_filename = \
+            os.path.join(output_directory,
+                         basename+"."+file_format+"."+scenario.name)
+    else:
+        output_filename = os.devnull
     symbols_filename = os.path.join(output_directory,
                                     basename+"."+file_format+".symbols."+scenario.name)
     with WriterFactory(file_format) as writer:
@@ -580,15 +675,16 @@ def _convert_external_setup_without_cleanup(
         assert output_fname == output_filename
         # write the lp file symbol paired with the scenario
         # tree id for each variable in the root node
-        with open(symbols_filename, "w") as f:
-            st_symbol_map = reference_model._ScenarioTreeSymbolMap
-            lines = []
-            for id_ in sorted(rootnode._variable_ids):
-                var = st_symbol_map.bySymbol[id_]
-                if not var.is_expression_type():
-                    lp_label = symbol_map.byObject[id(var)]
-                    lines.append("%s %s\n" % (lp_label, id_))
-            f.writelines(lines)
+        if write_scenario_files:
+            with open(symbols_filename, "w") as f:
+                st_symbol_map = reference_model._ScenarioTreeSymbolMap
+                lines = []
+                for id_ in sorted(rootnode._variable_ids):
+                    var = st_symbol_map.bySymbol[id_]
+                    if not var.is_expression_type():
+                        lp_label = symbol_map.byObject[id(var)]
+                        lines.append("%s %s\n" % (lp_label, id_))
+                f.writelines(lines)
 
     # re-generate these maps as the LP/MPS symbol map
     # is likely different
@@ -618,18 +714,17 @@ def _convert_external_setup_without_cleanup(
     #
     firststage_variable_count = 0
     secondstage_variable_count = 0
-    with open(os.path.join(output_directory,
-                           basename+".col."+scenario.name),'w') as f_col:
-        # first-stage variables
-        for (symbol, _, _) in StageToVariableMap[firststage.name]:
-            f_col.write(symbol+"\n")
-            firststage_variable_count += 1
-        # second-stage variables
-        for (symbol, _, _) in StageToVariableMap[secondstage.name]:
-            f_col.write(symbol+"\n")
-            secondstage_variable_count += 1
-        f_col.write("ONE_VAR_CONSTANT\n")
+    f_col = StringIO()
+    # first-stage variables
+    for (symbol, _, _) in StageToVariableMap[firststage.name]:
+        f_col.write(symbol+"\n")
+        firststage_variable_count += 1
+    # second-stage variables
+    for (symbol, _, _) in StageToVariableMap[secondstage.name]:
+        f_col.write(symbol+"\n")
         secondstage_variable_count += 1
+    f_col.write("ONE_VAR_CONSTANT\n")
+    secondstage_variable_count += 1
 
     #
     # Write the explicit row ordering (constraints) used
@@ -637,92 +732,90 @@ def _convert_external_setup_without_cleanup(
     #
     firststage_constraint_count = 0
     secondstage_constraint_count = 0
-    with open(os.path.join(output_directory,
-                           basename+".row."+scenario.name),'w') as f_row:
+    f_row = StringIO()
+    # the objective is always the first row in SMPS format
+    f_row.write(symbol_map.byObject[id(objective_object)]+"\n")
+    # first-stage constraints
+    for (symbols, _) in StageToConstraintMap[firststage.name]:
+        # because range constraints are split into two
+        # constraints (hopefully our ordering of the r_l_
+        # and r_u_ forms is the same as the LP/MPS file!)
+        for symbol in symbols:
+            f_row.write(symbol+"\n")
+            firststage_constraint_count += 1
+    # second-stage constraints
+    for (symbols, _) in StageToConstraintMap[secondstage.name]:
+        # because range constraints are split into two
+        # constraints (hopefully our ordering of the r_l_
+        # and r_u_ forms is the same as the LP/MPS file!)
+        for symbol in symbols:
+            f_row.write(symbol+"\n")
+            secondstage_constraint_count += 1
+    f_row.write("c_e_ONE_VAR_CONSTANT")
+    secondstage_constraint_count += 1
+
+    #
+    # Write the .tim file
+    #
+    f_tim = StringIO()
+    f_tim.write("TIME %s\n" % (basename))
+    if file_format == 'mps':
+        f_tim.write("PERIODS IMPLICIT\n")
+        f_tim.write("    %s %s TIME1\n"
+                    % (StageToVariableMap[firststage.name][0][0],
+                       symbol_map.byObject[id(objective_object)]))
+        symbols = StageToConstraintMap[secondstage.name][0][0]
+        if len(symbols) == 1:
+            # equality constraint
+            assert (symbols[0].startswith('c_e_') or \
+                    symbols[0].startswith('c_l_') or \
+                    symbols[0].startswith('c_u_'))
+            stage2_row_start = symbols[0]
+        else:
+            # range constraint (assumed the LP/MPS writer outputs
+            # the lower range constraint first)
+            symbols = sorted(symbols)
+            assert (symbols[0].startswith('r_l_') or \
+                    symbols[0].startswith('r_u_'))
+            stage2_row_start = symbols[0]
+        # don't assume there is always a second stage variable
+        if len(StageToVariableMap[secondstage.name]) > 0:
+            f_tim.write("    %s "
+                        % (StageToVariableMap[secondstage.name][0][0]))
+        else:
+            f_tim.write("    ONE_VAR_CONSTANT ")
+        f_tim.write("%s TIME2\n" % (stage2_row_start))
+    else:
+        assert file_format == "lp"
+        f_tim.write("PERIODS EXPLICIT\n")
+        f_tim.write("    TIME1\n")
+        f_tim.write("    TIME2\n")
+        line_template = "    %s %s\n"
+        f_tim.write("ROWS\n")
         # the objective is always the first row in SMPS format
-        f_row.write(symbol_map.byObject[id(objective_object)]+"\n")
+        f_tim.write(line_template
+                    % (symbol_map.byObject[id(objective_object)],
+                       "TIME1"))
         # first-stage constraints
         for (symbols, _) in StageToConstraintMap[firststage.name]:
-            # because range constraints are split into two
-            # constraints (hopefully our ordering of the r_l_
-            # and r_u_ forms is the same as the LP/MPS file!)
             for symbol in symbols:
-                f_row.write(symbol+"\n")
-                firststage_constraint_count += 1
+                f_tim.write(line_template % (symbol, "TIME1"))
         # second-stage constraints
         for (symbols, _) in StageToConstraintMap[secondstage.name]:
-            # because range constraints are split into two
-            # constraints (hopefully our ordering of the r_l_
-            # and r_u_ forms is the same as the LP/MPS file!)
             for symbol in symbols:
-                f_row.write(symbol+"\n")
-                secondstage_constraint_count += 1
-        f_row.write("c_e_ONE_VAR_CONSTANT")
-        secondstage_constraint_count += 1
-
-    #
-    # Write the .tim file
-    #
-    with open(os.path.join(output_directory,
-                           basename+".tim."+scenario.name),'w') as f_tim:
-        f_tim.write("TIME %s\n" % (basename))
-        if file_format == 'mps':
-            f_tim.write("PERIODS IMPLICIT\n")
-            f_tim.write("    %s %s TIME1\n"
-                        % (StageToVariableMap[firststage.name][0][0],
-                           symbol_map.byObject[id(objective_object)]))
-            symbols = StageToConstraintMap[secondstage.name][0][0]
-            if len(symbols) == 1:
-                # equality constraint
-                assert (symbols[0].startswith('c_e_') or \
-                        symbols[0].startswith('c_l_') or \
-                        symbols[0].startswith('c_u_'))
-                stage2_row_start = symbols[0]
-            else:
-                # range constraint (assumed the LP/MPS writer outputs
-                # the lower range constraint first)
-                symbols = sorted(symbols)
-                assert (symbols[0].startswith('r_l_') or \
-                        symbols[0].startswith('r_u_'))
-                stage2_row_start = symbols[0]
-            # don't assume there is always a second stage variable
-            if len(StageToVariableMap[secondstage.name]) > 0:
-                f_tim.write("    %s "
-                            % (StageToVariableMap[secondstage.name][0][0]))
-            else:
-                f_tim.write("    ONE_VAR_CONSTANT ")
-            f_tim.write("%s TIME2\n" % (stage2_row_start))
-        else:
-            assert file_format == "lp"
-            f_tim.write("PERIODS EXPLICIT\n")
-            f_tim.write("    TIME1\n")
-            f_tim.write("    TIME2\n")
-            line_template = "    %s %s\n"
-            f_tim.write("ROWS\n")
-            # the objective is always the first row in SMPS format
-            f_tim.write(line_template
-                        % (symbol_map.byObject[id(objective_object)],
-                           "TIME1"))
-            # first-stage constraints
-            for (symbols, _) in StageToConstraintMap[firststage.name]:
-                for symbol in symbols:
-                    f_tim.write(line_template % (symbol, "TIME1"))
-            # second-stage constraints
-            for (symbols, _) in StageToConstraintMap[secondstage.name]:
-                for symbol in symbols:
-                    f_tim.write(line_template % (symbol, "TIME2"))
-            f_tim.write(line_template % ("c_e_ONE_VAR_CONSTANT", "TIME2"))
-
-            f_tim.write("COLS\n")
-            # first-stage variables
-            for (symbol, _, _) in StageToVariableMap[firststage.name]:
-                f_tim.write(line_template % (symbol, "TIME1"))
-            # second-stage variables
-            for (symbol, _, _) in StageToVariableMap[secondstage.name]:
                 f_tim.write(line_template % (symbol, "TIME2"))
-            f_tim.write(line_template % ("ONE_VAR_CONSTANT", "TIME2"))
+        f_tim.write(line_template % ("c_e_ONE_VAR_CONSTANT", "TIME2"))
 
-        f_tim.write("ENDATA\n")
+        f_tim.write("COLS\n")
+        # first-stage variables
+        for (symbol, _, _) in StageToVariableMap[firststage.name]:
+            f_tim.write(line_template % (symbol, "TIME1"))
+        # second-stage variables
+        for (symbol, _, _) in StageToVariableMap[secondstage.name]:
+            f_tim.write(line_template % (symbol, "TIME2"))
+        f_tim.write(line_template % ("ONE_VAR_CONSTANT", "TIME2"))
+
+    f_tim.write("ENDATA\n")
 
     stochastic_lp_labels = set()
     stochastic_constraint_count = 0
@@ -746,293 +839,314 @@ def _convert_external_setup_without_cleanup(
     stochastic_rhs_count = 0
     stochastic_matrix_count = 0
     stochastic_cost_count = 0
-    with open(os.path.join(output_directory,
-                           basename+".sto.struct."+scenario.name),'w') as f_coords:
-        with open(os.path.join(output_directory,
-                               basename+".sto."+scenario.name),'w') as f_sto:
-            scenario_probability = scenario.probability
-            f_sto.write(" BL BLOCK1 PERIOD2 %.17g\n"
-                        % (_no_negative_zero(scenario_probability)))
-
-            #
-            # Stochastic RHS
-            #
-            rhs_template = "    RHS    %s    %.17g\n"
-            if stochastic_rhs is not None:
-                for con, include_bound in stochastic_rhs_entries:
-                    assert isinstance(con, _ConstraintData)
-                    if not empty_rhs_annotation:
-                        # verify that this constraint was
-                        # flagged by PySP or the user as second-stage
-                        if id(con) not in secondstage_constraint_ids:
-                            raise RuntimeError(
-                                "The constraint %s has been declared "
-                                "in the %s annotation but it was not identified as "
-                                "a second-stage constraint. To correct this issue, "
-                                "remove the constraint from this annotation."
-                                % (con.name,
-                                   StochasticConstraintBoundsAnnotation.__name__))
-
-                    constraint_repn = \
-                        repn_cache[id(con.parent_block())][con]
-
-                    if not constraint_repn.is_linear():
-                        raise RuntimeError("Only linear constraints are "
-                                           "accepted for conversion to SMPS format. "
-                                           "Constraint %s is not linear."
-                                           % (constraint_data.name))
-
-                    body_constant = constraint_repn.constant
+    f_coords = StringIO()
+    f_sto = StringIO()
+    scenario_probability = scenario.probability
+    f_sto.write(" BL BLOCK1 PERIOD2 %.17g\n"
+                % (_no_negative_zero(scenario_probability)))
+
+    #
+    # Stochastic RHS
+    #
+    rhs_template = "    RHS    %s    %.17g\n"
+    if stochastic_rhs is not None:
+        for con, include_bound in stochastic_rhs_entries:
+            assert isinstance(con, _ConstraintData)
+            if not empty_rhs_annotation:
+                # verify that this constraint was
+                # flagged by PySP or the user as second-stage
+                if id(con) not in secondstage_constraint_ids:
+                    raise RuntimeError(
+                        "The constraint %s has been declared "
+                        "in the %s annotation but it was not identified as "
+                        "a second-stage constraint. To correct this issue, "
+                        "remove the constraint from this annotation."
+                        % (con.name,
+                           StochasticConstraintBoundsAnnotation.__name__))
+
+            constraint_repn = \
+                repn_cache[id(con.parent_block())][con]
+
+            if not constraint_repn.is_linear():
+                raise RuntimeError("Only linear constraints are "
+                                   "accepted for conversion to SMPS format. "
+                                   "Constraint %s is not linear."
+                                   % (constraint_data.name))
+
+            body_constant = constraint_repn.constant
+            # We are going to rewrite the core problem file
+            # with all stochastic values set to zero. This will
+            # allow an easy test for missing user annotations.
+            constraint_repn.constant = 0
+            if body_constant is None:
+                body_constant = 0.0
+            symbols = constraint_symbols[con]
+            assert len(symbols) > 0
+            for con_label in symbols:
+                if con_label.startswith('c_e_') or \
+                   con_label.startswith('c_l_'):
+                    assert (include_bound is True) or \
+                           (include_bound[0] is True)
+                    stochastic_rhs_count += 1
+                    f_sto.write(rhs_template %
+                                (con_label,
+                                 _no_negative_zero(
+                                     value(con.lower) - \
+                                     value(body_constant))))
+                    f_coords.write("RHS %s\n" % (con_label))
                     # We are going to rewrite the core problem file
                     # with all stochastic values set to zero. This will
                     # allow an easy test for missing user annotations.
-                    constraint_repn.constant = 0
-                    if body_constant is None:
-                        body_constant = 0.0
-                    symbols = constraint_symbols[con]
-                    assert len(symbols) > 0
-                    for con_label in symbols:
-                        if con_label.startswith('c_e_') or \
-                           con_label.startswith('c_l_'):
-                            assert (include_bound is True) or \
-                                   (include_bound[0] is True)
-                            stochastic_rhs_count += 1
-                            f_sto.write(rhs_template %
-                                        (con_label,
-                                         _no_negative_zero(
-                                             value(con.lower) - \
-                                             value(body_constant))))
-                            f_coords.write("RHS %s\n" % (con_label))
-                            # We are going to rewrite the core problem file
-                            # with all stochastic values set to zero. This will
-                            # allow an easy test for missing user annotations.
-                            modified_constraint_lb[con] = con.lower
-                            con._lower = _deterministic_check_constant
-                            if con_label.startswith('c_e_'):
-                                modified_constraint_ub[con] = con.upper
-                                con._upper = _deterministic_check_constant
-                        elif con_label.startswith('r_l_') :
-                            if (include_bound is True) or \
-                               (include_bound[0] is True):
-                                stochastic_rhs_count += 1
-                                f_sto.write(rhs_template %
-                                            (con_label,
-                                             _no_negative_zero(
-                                                 value(con.lower) - \
-                                                 value(body_constant))))
-                                f_coords.write("RHS %s\n" % (con_label))
-                                # We are going to rewrite the core problem file
-                                # with all stochastic values set to zero. This will
-                                # allow an easy test for missing user annotations.
-                                modified_constraint_lb[con] = con.lower
-                                con._lower = _deterministic_check_constant
-                        elif con_label.startswith('c_u_'):
-                            assert (include_bound is True) or \
-                                   (include_bound[1] is True)
-                            stochastic_rhs_count += 1
-                            f_sto.write(rhs_template %
-                                        (con_label,
-                                         _no_negative_zero(
-                                             value(con.upper) - \
-                                             value(body_constant))))
-                            f_coords.write("RHS %s\n" % (con_label))
-                            # We are going to rewrite the core problem file
-                            # with all stochastic values set to zero. This will
-                            # allow an easy test for missing user annotations.
-                            modified_constraint_ub[con] = con.upper
-                            con._upper = _deterministic_check_constant
-                        elif con_label.startswith('r_u_'):
-                            if (include_bound is True) or \
-                               (include_bound[1] is True):
-                                stochastic_rhs_count += 1
-                                f_sto.write(rhs_template %
-                                            (con_label,
-                                             _no_negative_zero(
-                                                 value(con.upper) - \
-                                                 value(body_constant))))
-                                f_coords.write("RHS %s\n" % (con_label))
-                                # We are going to rewrite the core problem file
-                                # with all stochastic values set to zero. This will
-                                # allow an easy test for missing user annotations.
-                                modified_constraint_ub[con] = con.upper
-                                con._upper = _deterministic_check_constant
-                        else:
-                            assert False
-
-            #
-            # Stochastic Matrix
-            #
-            matrix_template = "    %s    %s    %.17g\n"
-            if stochastic_matrix is not None:
-                for con, var_list in stochastic_matrix_entries:
-                    assert isinstance(con, _ConstraintData)
-                    if not empty_matrix_annotation:
-                        # verify that this constraint was
-                        # flagged by PySP or the user as second-stage
-                        if id(con) not in secondstage_constraint_ids:
-                            raise RuntimeError(
-                                "The constraint %s has been declared "
-                                "in the %s annotation but it was not identified as "
-                                "a second-stage constraint. To correct this issue, "
-                                "remove the constraint from this annotation."
-                                % (con.name,
-                                   StochasticConstraintBodyAnnotation.__name__))
-
-                    constraint_repn = \
-                        repn_cache[id(con.parent_block())][con]
-
-                    if not constraint_repn.is_linear():
-                        raise RuntimeError("Only linear constraints are "
-                                           "accepted for conversion to SMPS format. "
-                                           "Constraint %s is not linear."
-                                           % (constraint_data.name))
-
-                    assert len(constraint_repn.linear_vars) > 0
-                    if var_list is None:
-                        var_list = constraint_repn.linear_vars
-                    assert len(var_list) > 0
-                    symbols = constraint_symbols[con]
-                    # sort the variable list by the column ordering
-                    # so that we have deterministic output
-                    var_list = list(var_list)
-                    var_list.sort(key=lambda _v: column_order[_v])
-                    new_coefs = list(constraint_repn.linear_coefs)
-                    for var in var_list:
-                        assert isinstance(var, _VarData)
-                        assert not var.fixed
-                        var_coef = None
-                        for i, (_var, coef) in enumerate(zip(constraint_repn.linear_vars,
-                                                             constraint_repn.linear_coefs)):
-                            if _var is var:
-                                var_coef = coef
-                                # We are going to rewrite with core problem file
-                                # with all stochastic values set to zero. This will
-                                # allow an easy test for missing user annotations.
-                                new_coefs[i] = _deterministic_check_value
-                                break
-                        if var_coef is None:
-                            raise RuntimeError(
-                                "The coefficient for variable %s has "
-                                "been marked as stochastic in constraint %s using "
-                                "the %s annotation, but the variable does not appear"
-                                " in the canonical constraint expression."
-                                % (var.name,
-                                   con.name,
-                                   StochasticConstraintBodyAnnotation.__name__))
-                        var_label = symbol_map.byObject[id(var)]
-
-                        for con_label in symbols:
-                            stochastic_matrix_count += 1
-                            f_sto.write(matrix_template
-                                        % (var_label,
-                                           con_label,
-                                           _no_negative_zero(value(var_coef))))
-                            f_coords.write("%s %s\n" % (var_label, con_label))
-
-                    constraint_repn.linear_coefs = tuple(new_coefs)
-
-
-            #
-            # Stochastic Objective
-            #
-            obj_template = "    %s    %s    %.17g\n"
-            if stochastic_objective is not None:
-                if stochastic_objective.has_declarations:
-                    sorted_values = stochastic_objective.expand_entries()
-                    assert len(sorted_values) <= 1
-                    if len(sorted_values) == 0:
-                        raise RuntimeError(
-                            "The %s annotation was declared "
-                            "with explicit entries but no active Objective "
-                            "objects were recovered from those entries."
-                            % (StochasticObjectiveAnnotation.__name__))
-                    obj, (objective_variables, include_constant) = \
-                        sorted_values[0]
-                    assert obj is objective_object
+                    modified_constraint_lb[con] = con.lower
+                    con._lower = _deterministic_check_constant
+                    if con_label.startswith('c_e_'):
+                        modified_constraint_ub[con] = con.upper
+                        con._upper = _deterministic_check_constant
+                elif con_label.startswith('r_l_') :
+                    if (include_bound is True) or \
+                       (include_bound[0] is True):
+                        stochastic_rhs_count += 1
+                        f_sto.write(rhs_template %
+                                    (con_label,
+                                     _no_negative_zero(
+                                         value(con.lower) - \
+                                         value(body_constant))))
+                        f_coords.write("RHS %s\n" % (con_label))
+                        # We are going to rewrite the core problem file
+                        # with all stochastic values set to zero. This will
+                        # allow an easy test for missing user annotations.
+                        modified_constraint_lb[con] = con.lower
+                        con._lower = _deterministic_check_constant
+                elif con_label.startswith('c_u_'):
+                    assert (include_bound is True) or \
+                           (include_bound[1] is True)
+                    stochastic_rhs_count += 1
+                    f_sto.write(rhs_template %
+                                (con_label,
+                                 _no_negative_zero(
+                                     value(con.upper) - \
+                                     value(body_constant))))
+                    f_coords.write("RHS %s\n" % (con_label))
+                    # We are going to rewrite the core problem file
+                    # with all stochastic values set to zero. This will
+                    # allow an easy test for missing user annotations.
+                    modified_constraint_ub[con] = con.upper
+                    con._upper = _deterministic_check_constant
+                elif con_label.startswith('r_u_'):
+                    if (include_bound is True) or \
+                       (include_bound[1] is True):
+                        stochastic_rhs_count += 1
+                        f_sto.write(rhs_template %
+                                    (con_label,
+                                     _no_negative_zero(
+                                         value(con.upper) - \
+                                         value(body_constant))))
+                        f_coords.write("RHS %s\n" % (con_label))
+                        # We are going to rewrite the core problem file
+                        # with all stochastic values set to zero. This will
+                        # allow an easy test for missing user annotations.
+                        modified_constraint_ub[con] = con.upper
+                        con._upper = _deterministic_check_constant
                 else:
-                    objective_variables, include_constant = \
-                        stochastic_objective.default
-
-                if not objective_repn.is_linear():
-                    raise RuntimeError("Only linear stochastic objectives are "
-                                       "accepted for conversion to SMPS format. "
-                                       "Objective %s is not linear."
-                                       % (objective_object.name))
-
-                if objective_variables is None:
-                    objective_variables = objective_repn.linear_vars
-                stochastic_objective_label = symbol_map.byObject[id(objective_object)]
-                # sort the variable list by the column ordering
-                # so that we have deterministic output
-                objective_variables = list(objective_variables)
-                objective_variables.sort(key=lambda _v: column_order[_v])
-                assert (len(objective_variables) > 0) or include_constant
-                new_coefs = list(objective_repn.linear_coefs)
-                for var in objective_variables:
-                    assert isinstance(var, _VarData)
-                    var_coef = None
-                    for i, (_var, coef) in enumerate(zip(objective_repn.linear_vars,
-                                                        objective_repn.linear_coefs)):
-                        if _var is var:
-                            var_coef = coef
-                            # We are going to rewrite the core problem file
-                            # with all stochastic values set to zero. This will
-                            # allow an easy test for missing user annotations.
-                            new_coefs[i] = _deterministic_check_value
-                            break
-                    if var_coef is None:
-                        raise RuntimeError(
-                            "The coefficient for variable %s has "
-                            "been marked as stochastic in objective %s using "
-                            "the %s annotation, but the variable does not appear"
-                            " in the canonical objective expression."
-                            % (var.name,
-                               objective_object.name,
-                               StochasticObjectiveAnnotation.__name__))
-                    var_label = symbol_map.byObject[id(var)]
-                    stochastic_cost_count += 1
-
-                    f_sto.write(obj_template
+                    assert False
+
+    #
+    # Stochastic Matrix
+    #
+    matrix_template = "    %s    %s    %.17g\n"
+    if stochastic_matrix is not None:
+        for con, var_list in stochastic_matrix_entries:
+            assert isinstance(con, _ConstraintData)
+            if not empty_matrix_annotation:
+                # verify that this constraint was
+                # flagged by PySP or the user as second-stage
+                if id(con) not in secondstage_constraint_ids:
+                    raise RuntimeError(
+                        "The constraint %s has been declared "
+                        "in the %s annotation but it was not identified as "
+                        "a second-stage constraint. To correct this issue, "
+                        "remove the constraint from this annotation."
+                        % (con.name,
+                           StochasticConstraintBodyAnnotation.__name__))
+
+            constraint_repn = \
+                repn_cache[id(con.parent_block())][con]
+
+            if not constraint_repn.is_linear():
+                raise RuntimeError("Only linear constraints are "
+                                   "accepted for conversion to SMPS format. "
+                                   "Constraint %s is not linear."
+                                   % (constraint_data.name))
+
+            assert len(constraint_repn.linear_vars) > 0
+            if var_list is None:
+                var_list = constraint_repn.linear_vars
+            assert len(var_list) > 0
+            symbols = constraint_symbols[con]
+            # sort the variable list by the column ordering
+            # so that we have deterministic output
+            var_list = list(var_list)
+            var_list.sort(key=lambda _v: column_order[_v])
+            new_coefs = list(constraint_repn.linear_coefs)
+            for var in var_list:
+                assert isinstance(var, _VarData)
+                assert not var.fixed
+                var_coef = None
+                for i, (_var, coef) in enumerate(zip(constraint_repn.linear_vars,
+                                                     constraint_repn.linear_coefs)):
+                    if _var is var:
+                        var_coef = coef
+                        # We are going to rewrite with core problem file
+                        # with all stochastic values set to zero. This will
+                        # allow an easy test for missing user annotations.
+                        new_coefs[i] = _deterministic_check_value
+                        break
+                if var_coef is None:
+                    raise RuntimeError(
+                        "The coefficient for variable %s has "
+                        "been marked as stochastic in constraint %s using "
+                        "the %s annotation, but the variable does not appear"
+                        " in the canonical constraint expression."
+                        % (var.name,
+                           con.name,
+                           StochasticConstraintBodyAnnotation.__name__))
+                var_label = symbol_map.byObject[id(var)]
+
+                for con_label in symbols:
+                    stochastic_matrix_count += 1
+                    f_sto.write(matrix_template
                                 % (var_label,
-                                   stochastic_objective_label,
+                                   con_label,
                                    _no_negative_zero(value(var_coef))))
-                    f_coords.write("%s %s\n"
-                                   % (var_label,
-                                      stochastic_objective_label))
+                    f_coords.write("%s %s\n" % (var_label, con_label))
 
-                objective_repn.linear_coefs = tuple(new_coefs)
-                if include_constant:
-                    obj_constant = objective_repn.constant
+            constraint_repn.linear_coefs = tuple(new_coefs)
+
+
+    #
+    # Stochastic Objective
+    #
+    obj_template = "    %s    %s    %.17g\n"
+    if stochastic_objective is not None:
+        if stochastic_objective.has_declarations:
+            sorted_values = stochastic_objective.expand_entries()
+            assert len(sorted_values) <= 1
+            if len(sorted_values) == 0:
+                raise RuntimeError(
+                    "The %s annotation was declared "
+                    "with explicit entries but no active Objective "
+                    "objects were recovered from those entries."
+                    % (StochasticObjectiveAnnotation.__name__))
+            obj, (objective_variables, include_constant) = \
+                sorted_values[0]
+            assert obj is objective_object
+        else:
+            objective_variables, include_constant = \
+                stochastic_objective.default
+
+        if not objective_repn.is_linear():
+            raise RuntimeError("Only linear stochastic objectives are "
+                               "accepted for conversion to SMPS format. "
+                               "Objective %s is not linear."
+                               % (objective_object.name))
+
+        if objective_variables is None:
+            objective_variables = objective_repn.linear_vars
+        stochastic_objective_label = symbol_map.byObject[id(objective_object)]
+        # sort the variable list by the column ordering
+        # so that we have deterministic output
+        objective_variables = list(objective_variables)
+        objective_variables.sort(key=lambda _v: column_order[_v])
+        assert (len(objective_variables) > 0) or include_constant
+        new_coefs = list(objective_repn.linear_coefs)
+        for var in objective_variables:
+            assert isinstance(var, _VarData)
+            var_coef = None
+            for i, (_var, coef) in enumerate(zip(objective_repn.linear_vars,
+                                                objective_repn.linear_coefs)):
+                if _var is var:
+                    var_coef = coef
                     # We are going to rewrite the core problem file
                     # with all stochastic values set to zero. This will
                     # allow an easy test for missing user annotations.
-                    objective_repn.constant = 0
-                    if obj_constant is None:
-                        obj_constant = 0.0
-                    stochastic_cost_count += 1
-                    f_sto.write(obj_template % ("ONE_VAR_CONSTANT",
-                                                stochastic_objective_label,
-                                                _no_negative_zero(obj_constant)))
-                    f_coords.write("%s %s\n"
-                                   % ("ONE_VAR_CONSTANT",
-                                      stochastic_objective_label))
-
-    #
-    # Write the deterministic part of the LP/MPS-file to its own
-    # file for debugging purposes
-    #
-    reference_model_name = reference_model.name
-    reference_model._name = "ZeroStochasticData"
-    det_output_filename = \
-        os.path.join(output_directory,
-                     basename+"."+file_format+".det."+scenario.name)
-    with WriterFactory(file_format) as writer:
-        output_fname, symbol_map = writer(reference_model,
-                                          det_output_filename,
-                                          lambda x: True,
-                                          io_options)
-        assert output_fname == det_output_filename
-    reference_model._name = reference_model_name
+                    new_coefs[i] = _deterministic_check_value
+                    break
+            if var_coef is None:
+                raise RuntimeError(
+                    "The coefficient for variable %s has "
+                    "been marked as stochastic in objective %s using "
+                    "the %s annotation, but the variable does not appear"
+                    " in the canonical objective expression."
+                    % (var.name,
+                       objective_object.name,
+                       StochasticObjectiveAnnotation.__name__))
+            var_label = symbol_map.byObject[id(var)]
+            stochastic_cost_count += 1
+
+            f_sto.write(obj_template
+                        % (var_label,
+                           stochastic_objective_label,
+                           _no_negative_zero(value(var_coef))))
+            f_coords.write("%s %s\n"
+                           % (var_label,
+                              stochastic_objective_label))
+
+        objective_repn.linear_coefs = tuple(new_coefs)
+        if include_constant:
+            obj_constant = objective_repn.constant
+            # We are going to rewrite the core problem file
+            # with all stochastic values set to zero. This will
+            # allow an easy test for missing user annotations.
+            objective_repn.constant = 0
+            if obj_constant is None:
+                obj_constant = 0.0
+            stochastic_cost_count += 1
+            f_sto.write(obj_template % ("ONE_VAR_CONSTANT",
+                                        stochastic_objective_label,
+                                        _no_negative_zero(obj_constant)))
+            f_coords.write("%s %s\n"
+                           % ("ONE_VAR_CONSTANT",
+                              stochastic_objective_label))
+
+    #
+    # Summarize the deterministic part of the LP/MPS-file (with
+    # all stochastic values set to zero) so that it can be
+    # compared across scenarios without writing it out
+    #
+    digests = {}
+    digests["det"] = _deterministic_digest(reference_model, symbol_map)
+    digests["row"] = _digest(f_row.getvalue())
+    digests["col"] = _digest(f_col.getvalue())
+    digests["tim"] = _digest(f_tim.getvalue())
+    digests["sto.struct"] = _digest(f_coords.getvalue())
+
+    if write_scenario_files:
+        for suffix, f in ((".col.", f_col),
+                          (".row.", f_row),
+                          (".tim.", f_tim),
+                          (".sto.struct.", f_coords),
+                          (".sto.", f_sto)):
+            with open(os.path.join(output_directory,
+                                   basename+suffix+scenario.name),
+                      'w') as f_out:
+                f_out.write(f.getvalue())
+
+        #
+        # Write the deterministic part of the LP/MPS-file to its own
+        # file for debugging purposes
+        #
+        reference_model_name = reference_model.name
+        reference_model._name = "ZeroStochasticData"
+        det_output_filename = \
+            os.path.join(output_directory,
+                         basename+"."+file_format+".det."+scenario.name)
+        with WriterFactory(file_format) as writer:
+            output_fname, symbol_map = writer(reference_model,
+                                              det_output_filename,
+                                              lambda x: True,
+                                              io_options)
+            assert output_fname == det_output_filename
+        reference_model._name = reference_model_name
 
     # reset bounds on any constraints that were modified
     for con, lower in iteritems(modified_constraint_lb):
@@ -1040,13 +1154,15 @@ def _convert_external_setup_without_cleanup(
     for con, upper in iteritems(modified_constraint_ub):
         con._upper = as_numeric(upper)
 
-    return (firststage_variable_count,
-            secondstage_variable_count,
-            firststage_constraint_count,
-            secondstage_constraint_count,
-            stochastic_cost_count,
-            stochastic_rhs_count,
-            stochastic_matrix_count)
+    return ((firststage_variable_count,
+             secondstage_variable_count,
+             firststage_constraint_count,
+             secondstage_constraint_count,
+             stochastic_cost_count,
+             stochastic_rhs_count,
+             stochastic_matrix_count),
+            f_sto.getvalue(),
+            digests)
 
 def convert_external(output_directory,
                      basename,
@@ -1083,7 +1199,10 @@ def convert_external(output_directory,
     if not os.path.exists(scenario_directory):
         os.mkdir(scenario_directory)
 
-    counts = scenario_tree_manager.invoke_function(
+    reference_scenario = scenario_tree.scenarios[0]
+    reference_scenario_name = reference_scenario.name
+
+    results = scenario_tree_manager.invoke_function(
         "_convert_external_setup",
         thisfile,
         invocation_type=InvocationType.PerScenario,
@@ -1091,10 +1210,9 @@ def convert_external(output_directory,
                        basename,
                        core_format,
                        enforce_derived_nonanticipativity,
-                       io_options))
-
-    reference_scenario = scenario_tree.scenarios[0]
-    reference_scenario_name = reference_scenario.name
+                       io_options,
+                       reference_scenario_name,
+                       keep_scenario_files))
 
     (firststage_variable_count,
      secondstage_variable_count,
@@ -1102,7 +1220,8 @@ def convert_external(output_directory,
      secondstage_constraint_count,
      stochastic_cost_count,
      stochastic_rhs_count,
-     stochastic_matrix_count) = counts[reference_scenario_name]
+     stochastic_matrix_count) = results[reference_scenario_name][0]
+    reference_digests = results[reference_scenario_name][2]
 
     #
     # Copy the reference scenario's core, row, col, and tim
@@ -1174,7 +1293,7 @@ def convert_external(output_directory,
                  core_det_filename)
 
     #
-    # Merge the per-scenario .sto files into one
+    # Merge the per-scenario .sto blocks into one file
     #
     sto_filename = os.path.join(output_directory,
                                 basename+".sto")
@@ -1183,12 +1302,7 @@ def convert_external(output_directory,
         fdst.write('STOCH '+basename+'\n')
         fdst.write('BLOCKS DISCRETE REPLACE\n')
         for scenario in scenario_tree.scenarios:
-            scenario_sto_filename = \
-                os.path.join(scenario_directory,
-                             basename+".sto."+scenario.name)
-            assert os.path.exists(scenario_sto_filename)
-            with open(scenario_sto_filename, 'r') as fsrc:
-                shutil.copyfileobj(fsrc, fdst)
+            fdst.write(results[scenario.name][1])
         fdst.write('ENDATA\n')
     input_files["sto"] = sto_filename
 
@@ -1214,147 +1328,91 @@ def convert_external(output_directory,
         print("   - Stoch. Cost Entries: %d"
               % (stochastic_cost_count))
 
+    #
+    # The per-scenario row, col, tim, sto.struct, and deterministic
+    # core problem data are compared with those of the reference
+    # scenario using the digests computed by each scenario. The
+    # per-scenario files only exist if the keep_scenario_files
+    # option is used.
+    #
     if not disable_consistency_checks:
         if verbose:
             print("\nStarting scenario structure consistency checks "
-                  "across scenario files stored in %s."
-                  % (scenario_directory))
-            print("This may take some time. If this test is "
-                  "prohibitively slow or can not be executed on "
-                  "your system, disable it by activating the "
-                  "disable_consistency_check option.")
-        has_diff = False
-        try:
-            if not os.system('diff --help > /dev/null'):
-                has_diff = True
-            else:
-                has_diff = False
-        except:
-            has_diff = False
+                  "against reference scenario %s."
+                  % (reference_scenario_name))
         if verbose:
             print(" - Checking row and column ordering...")
         for scenario in scenario_tree.scenarios:
-            scenario_core_row_filename = \
-                os.path.join(scenario_directory,
-                             basename+".row."+scenario.name)
-            if has_diff:
-                rc = os.system('diff -q '+scenario_core_row_filename+' '+
-                               core_row_filename)
-            else:
-                rc = not filecmp.cmp(scenario_core_row_filename,
-                                     core_row_filename,
-                                     shallow=False)
-            if rc:
+            scenario_digests = results[scenario.name][2]
+            if scenario_digests["row"] != reference_digests["row"]:
                 raise ValueError(
                     "The row ordering indicated in file '%s' does not match "
-                    "that for scenario %s indicated in file '%s'. This "
-                    "suggests that one or more locations of stochastic data "
-                    "have not been annotated. If you feel this message is "
-                    "in error, please report this issue to the PySP "
-                    "developers."
+                    "that for scenario %s. This suggests that one or more "
+                    "locations of stochastic data have not been annotated. "
+                    "If you feel this message is in error, please report "
+                    "this issue to the PySP developers."
                     % (core_row_filename,
-                       scenario.name,
-                       scenario_core_row_filename))
+                       scenario.name))
 
-            scenario_core_col_filename = \
-                os.path.join(scenario_directory,
-                             basename+".col."+scenario.name)
-            if has_diff:
-                rc = os.system('diff -q '+scenario_core_col_filename+' '+
-                               core_col_filename)
-            else:
-                rc = not filecmp.cmp(scenario_core_col_filename,
-                                     core_col_filename,
-                                     shallow=False)
-            if rc:
+            if scenario_digests["col"] != reference_digests["col"]:
                 raise ValueError(
                     "The column ordering indicated in file '%s' does not "
-                    "match that for scenario %s indicated in file '%s'. "
-                    "This suggests that the set of variables on the model "
-                    "changes across scenarios. This is not allowed by the "
-                    "SMPS format. If you feel this is a developer error, "
-                    "please report this issue to the PySP developers."
+                    "match that for scenario %s. This suggests that the "
+                    "set of variables on the model changes across "
+                    "scenarios. This is not allowed by the SMPS format. "
+                    "If you feel this is a developer error, please report "
+                    "this issue to the PySP developers."
                     % (core_col_filename,
-                       scenario.name,
-                       scenario_core_col_filename))
+                       scenario.name))
 
         if verbose:
             print(" - Checking time-stage classifications...")
         for scenario in scenario_tree.scenarios:
-            scenario_tim_filename = \
-                os.path.join(scenario_directory,
-                             basename+".tim."+scenario.name)
-            if has_diff:
-                rc = os.system('diff -q '+scenario_tim_filename+' '+
-                               tim_filename)
-            else:
-                rc = not filecmp.cmp(scenario_tim_filename,
-                                     tim_filename,
-                                     shallow=False)
-            if rc:
+            scenario_digests = results[scenario.name][2]
+            if scenario_digests["tim"] != reference_digests["tim"]:
                 raise ValueError(
-                    "Main .tim file '%s' does not match .tim file for "
-                    "scenario %s located at '%s'. This indicates there was "
-                    "a problem translating the reference model to SMPS "
-                    "format. Please make sure the problem structure is "
-                    "identical over all scenarios (e.g., no. of variables, "
-                    "no. of constraints), or report this issue to the PySP "
+                    "Main .tim file '%s' does not match the .tim file for "
+                    "scenario %s. This indicates there was a problem "
+                    "translating the reference model to SMPS format. "
+                    "Please make sure the problem structure is identical "
+                    "over all scenarios (e.g., no. of variables, no. of "
+                    "constraints), or report this issue to the PySP "
                     "developers if you feel that it is a developer error."
                     % (tim_filename,
-                       scenario.name,
-                       scenario_tim_filename))
+                       scenario.name))
 
         if verbose:
             print(" - Checking sparse locations of stochastic elements...")
         for scenario in scenario_tree.scenarios:
-            scenario_sto_struct_filename = \
-                os.path.join(scenario_directory,
-                             basename+".sto.struct."+scenario.name)
-            if has_diff:
-                rc = os.system('diff -q '+scenario_sto_struct_filename+' '+
-                               sto_struct_filename)
-            else:
-                rc = not filecmp.cmp(scenario_sto_struct_filename,
-                                     sto_struct_filename,
-                                     shallow=False)
-            if rc:
+            scenario_digests = results[scenario.name][2]
+            if scenario_digests["sto.struct"] != \
+               reference_digests["sto.struct"]:
                 raise ValueError(
                     "The structure of stochastic entries indicated in file "
-                    "'%s' does not match that for scenario %s indicated in "
-                    "file '%s'. This suggests that the set of variables "
-                    "appearing in some expression declared as stochastic is "
-                    "changing across scenarios. If you feel this is a "
-                    "developer error, please report this issue to the PySP "
-                    "developers." % (sto_struct_filename,
-                                     scenario.name,
-                                     scenario_sto_struct_filename))
+                    "'%s' does not match that for scenario %s. This "
+                    "suggests that the set of variables appearing in some "
+                    "expression declared as stochastic is changing across "
+                    "scenarios. If you feel this is a developer error, "
+                    "please report this issue to the PySP developers."
+                    % (sto_struct_filename,
+                       scenario.name))
 
         if verbose:
             print(" - Checking deterministic sections in the core "
                   "problem file...")
         for scenario in scenario_tree.scenarios:
-            scenario_core_det_filename = \
-                os.path.join(scenario_directory,
-                             basename+"."+core_format+".det."+scenario.name)
-            if has_diff:
-                rc = os.system('diff -q '+scenario_core_det_filename+' '+
-                               core_det_filename)
-            else:
-                rc = not filecmp.cmp(scenario_core_det_filename,
-                                     core_det_filename,
-                                     shallow=False)
-            if rc:
+            scenario_digests = results[scenario.name][2]
+            if scenario_digests["det"] != reference_digests["det"]:
                 raise ValueError(
                     "One or more deterministic parts of the problem found "
-                    "in file '%s' do not match those for scenario %s found "
-                    "in file %s. This suggests that one or more locations "
-                    "of stochastic data have not been been annotated on the "
+                    "in file '%s' do not match those for scenario %s. "
+                    "This suggests that one or more locations of "
+                    "stochastic data have not been been annotated on the "
                     "reference Pyomo model. If this seems like a tolerance "
                     "issue or a developer error, please report this issue "
                     "to the PySP developers."
                     % (core_det_filename,
-                       scenario.name,
-                       scenario_core_det_filename))
+                       scenario.name))
 
     if not keep_auxiliary_files:
         _safe_remove_file(core_row_filename)
@@ -1365,62 +1423,21 @@ def convert_external(output_directory,
     if not keep_scenario_files:
         if verbose:
             print("Cleaning temporary per-scenario files")
-        for scenario in scenario_tree.scenarios:
-
-            scenario_core_row_filename = \
-                os.path.join(scenario_directory,
-                             basename+".row."+scenario.name)
-            assert os.path.exists(scenario_core_row_filename)
-            _safe_remove_file(scenario_core_row_filename)
-
-            scenario_core_col_filename = \
-                os.path.join(scenario_directory,
-                             basename+".col."+scenario.name)
-            assert os.path.exists(scenario_core_col_filename)
-            _safe_remove_file(scenario_core_col_filename)
-
-            scenario_tim_filename = \
-                os.path.join(scenario_directory,
-                             basename+".tim."+scenario.name)
-            assert os.path.exists(scenario_tim_filename)
-            _safe_remove_file(scenario_tim_filename)
-
-            scenario_sto_struct_filename = \
-                os.path.join(scenario_directory,
-                             basename+".sto.struct."+scenario.name)
-            assert os.path.exists(scenario_sto_struct_filename)
-            _safe_remove_file(scenario_sto_struct_filename)
-
-            scenario_sto_filename = \
+        # only the reference scenario wrote its files
+        for suffix in (".row.",
+                       ".col.",
+                       ".tim.",
+                       ".sto.struct.",
+                       ".sto.",
+                       "."+core_format+".det.",
+                       ".setup."+core_format+".",
+                       "."+core_format+".",
+                       "."+core_format+".symbols."):
+            scenario_filename = \
                 os.path.join(scenario_directory,
-                             basename+".sto."+scenario.name)
-            assert os.path.exists(scenario_sto_filename)
-            _safe_remove_file(scenario_sto_filename)
-
-            scenario_core_det_filename = \
-                os.path.join(scenario_directory,
-                             basename+"."+core_format+".det."+scenario.name)
-            assert os.path.exists(scenario_core_det_filename)
-            _safe_remove_file(scenario_core_det_filename)
-
-            scenario_core_setup_filename = \
-                os.path.join(scenario_directory,
-                             basename+".setup."+core_format+"."+scenario.name)
-            assert os.path.exists(scenario_core_setup_filename)
-            _safe_remove_file(scenario_core_setup_filename)
-
-            scenario_core_filename = \
-                os.path.join(scenario_directory,
-                             basename+"."+core_format+"."+scenario.name)
-            assert os.path.exists(scenario_core_filename)
-            _safe_remove_file(scenario_core_filename)
-
-            scenario_core_filename = \
-                os.path.join(scenario_directory,
-                             basename+"."+core_format+".symbols."+scenario.name)
-            assert os.path.exists(scenario_core_filename)
-            _safe_remove_file(scenario_core_filename)
-
+                             basename+suffix+reference_scenario_name)
+            assert os.path.exists(scenario_filename)
+            _safe_remove_file(scenario_filename)
 
         # only delete this directory if it is empty,
         # it might have previously existed and contains
@@ -2146,10 +2163,11 @@ def convertsmps_register_options(options=None):
             description=(
                 "Disables consistency checks that attempt to find issues "
                 "with the SMPS conversion. By default, these checks are run "
-                "after conversion takes place and leave behind a temporary "
-                "directory with per-scenario output files if the checks fail. "
-                "This option is not recommended, but can be used if the "
-                "consistency checks are prohibitively slow."
+                "after conversion takes place by comparing a summary of "
+                "each scenario with that of the reference scenario. Use "
+                "the keep_scenario_files option to inspect the per-scenario "
+                "output files if the checks fail. This option is not "
+                "recommended."
             ),
             doc=None,
             visibility=0))
@@ -2160,10 +2178,11 @@ def convertsmps_register_options(options=None):
             False,
             domain=bool,
             description=(
-                "Keeps around the per-scenario SMPS files created for testing "
-                "whether a conversion is valid (whether or not the validation "
-                "checks are performed). These files can be useful for "
-                "debugging purposes."
+                "Writes and keeps around the per-scenario SMPS files used "
+                "for testing whether a conversion is valid (whether or not "
+                "the validation checks are performed). By default, only the "
+                "files for the reference scenario are written. These files "
+                "can be useful for debugging purposes."
             ),
             doc=None,
             visibility=0))
@@ -2180,9 +2199,7 @@ def convertsmps_register_options(options=None):
             ),
             doc=None,
             visibility=0))
-    safe_register_common_option(options, "scenario_tree_manager")
-    ScenarioTreeManagerClientSerial.register_options(options)
-    ScenarioTreeManagerClientPyro.register_options(options)
+    ScenarioTreeManagerFactory.register_options(options)
 
     return options
 
@@ -2211,13 +2228,7 @@ def run_convertsmps(options):
         logger.warn("DEPRECATED: The use of the --explicit option "
                     "is no longer necessary. It is the default behavior")
 
-    manager_class = None
-    if options.scenario_tree_manager == 'serial':
-        manager_class = ScenarioTreeManagerClientSerial
-    elif options.scenario_tree_manager == 'pyro':
-        manager_class = ScenarioTreeManagerClientPyro
-
-    with manager_class(options) as scenario_tree_manager:
+    with ScenarioTreeManagerFactory(options) as scenario_tree_manager:
         scenario_tree_manager.initialize()
         convert_external(
             options.output_directory,
@@ -8,7 +8,18 @@
 #  This software is distributed under the 3-clause BSD License.
 #  ___________________________________________________________________________
 
+import logging
+import shutil
+import tempfile
+from operator import itemgetter
+
+from six import itervalues
+
 from pyomo.core.base import *
+from pyomo.core.base.label import cpxlp_label_from_name
+from pyomo.repn import generate_standard_repn
+from pyomo.repn.plugins.cpxlp import (ProblemWriter_cpxlp,
+                                      _no_negative_zero)
 from pyomo.opt import (ProblemFormat,
                        SolverFactory,
                        SolverManagerFactory,
@@ -19,6 +30,8 @@ from pyomo.pysp.phutils import (isVariableNameIndexed,
                                 extractVariableNameAndIndex,
                                 extractComponentIndices)
 
+logger = logging.getLogger('pyomo.pysp')
+
 #
 # a routine to create the extensive form, given an input scenario tree and instances.
 # IMPT: unlike scenario instances, the extensive form instance is *not* self-contained.
@@ -348,6 +361,383 @@ def write_ef(binding_instance,
 
     return smap_id
 
+#
+# write the EF to an LP file without constructing it in memory. the
+# scenario instances are built one at a time by the instance factory
+# of the scenario tree, and the rows, bounds and integer declarations
+# of each instance are written to temporary files before the instance
+# is released. only the objective terms and the labels of the
+# non-anticipative variables are kept for all scenarios, and these are
+# used to write the objective and the non-anticipativity constraints
+# once all scenarios have been processed. the resulting file matches
+# the one written by write_ef for the instance returned by
+# create_ef_instance (CVaR and chance constraints are not supported).
+#
+
+def write_ef_streaming(scenario_tree,
+                       output_filename,
+                       ef_instance_name="MASTER",
+                       symbolic_solver_labels=False,
+                       output_fixed_variable_bounds=False,
+                       objective_sense=None,
+                       verbose_output=False):
+
+    if not output_filename.endswith(".lp"):
+        raise ValueError("The extensive form can only be streamed to a "
+                         "file in LP format - output filename=%s"
+                         % (output_filename))
+    factory = getattr(scenario_tree, "_scenario_instance_factory", None)
+    if factory is None:
+        raise ValueError("Cannot stream the extensive form. The scenario "
+                         "tree was not generated by a scenario tree "
+                         "instance factory.")
+
+    writer = ProblemWriter_cpxlp()
+    referenced_variable_ids = writer._referenced_variable_ids
+    # the TextLabeler caches names by object id, which can be
+    # reused once a scenario instance is released, so a new one is
+    # created for each scenario
+    labeler = None
+    if not symbolic_solver_labels:
+        labeler = NumericLabeler('x')
+    sort_order = SortComponents.indices
+
+    binding_instance = ConcreteModel(name=ef_instance_name)
+    opt_sense = None
+    objective_linear_terms = []
+    objective_quadratic_terms = []
+    objective_constant = 0
+    # node name -> variable id -> scenario name -> (label, fixed value)
+    node_links = {}
+
+    rows_file = tempfile.TemporaryFile(mode="w+")
+    sos_file = tempfile.TemporaryFile(mode="w+")
+    bounds_file = tempfile.TemporaryFile(mode="w+")
+    integer_file = tempfile.TemporaryFile(mode="w+")
+    binary_file = tempfile.TemporaryFile(mode="w+")
+    try:
+        for scenario in scenario_tree.scenarios:
+
+            if verbose_output:
+                print("Writing scenario %s to the extensive form"
+                      % (scenario.name))
+
+            scenario_labeler = labeler
+            if symbolic_solver_labels:
+                scenario_labeler = TextLabeler()
+
+            compressed_tree = scenario_tree.make_compressed(
+                [scenario.name],
+                normalize=False)
+            scenario_instance = factory.construct_scenario_instance(
+                scenario.name,
+                compressed_tree,
+                verbose=verbose_output)
+            compressed_tree.linkInInstances(
+                {scenario.name: scenario_instance},
+                objective_sense=objective_sense,
+                create_variable_ids=True)
+            compressed_scenario = compressed_tree.get_scenario(scenario.name)
+            if opt_sense is None:
+                opt_sense = compressed_scenario._objective_sense
+            elif compressed_scenario._objective_sense != opt_sense:
+                raise ValueError("The objective sense of scenario %s does "
+                                 "not match that of the other scenarios"
+                                 % (scenario.name))
+            compressed_scenario._instance_objective.deactivate()
+
+            # the scenario instance is a sub-block of the binding
+            # instance while it is written, so that it is labeled as
+            # it would be in the extensive form instance
+            binding_instance.add_component(scenario.name, scenario_instance)
+
+            referenced_variable_ids.clear()
+            variable_list = list(scenario_instance.component_data_objects(
+                Var, sort=sort_order))
+            symbol_map = SymbolMap()
+            variable_symbol_map = SymbolMap()
+            variable_symbol_map.addSymbols(
+                (vardata, scenario_labeler(vardata))
+                for vardata in variable_list)
+            variable_symbols = variable_symbol_map.byObject
+
+            #
+            # Objective terms
+            #
+            repn = generate_standard_repn(
+                scenario._probability * \
+                compressed_scenario._instance_cost_expression)
+            if repn.polynomial_degree() is None:
+                raise RuntimeError(
+                    "Cannot write legal LP file.  The cost of scenario "
+                    "'%s' has nonlinear terms that are not quadratic."
+                    % (scenario.name))
+            for vardata, coef in zip(repn.linear_vars, repn.linear_coefs):
+                referenced_variable_ids[id(vardata)] = vardata
+                objective_linear_terms.append(
+                    (variable_symbols[id(vardata)], coef))
+            for (var1, var2), coef in zip(repn.quadratic_vars,
+                                          repn.quadratic_coefs):
+                referenced_variable_ids[id(var1)] = var1
+                referenced_variable_ids[id(var2)] = var2
+                objective_quadratic_terms.append(
+                    (tuple(sorted((variable_symbols[id(var1)],
+                                   variable_symbols[id(var2)]))),
+                     coef))
+            objective_constant += repn.constant
+
+            #
+            # Non-anticipative variables
+            #
+            for tree_node in compressed_scenario.node_list[:-1]:
+                variable_links = node_links.setdefault(tree_node.name, {})
+                for variable_id in tree_node._standard_variable_ids:
+                    vardata = tree_node._variable_datas[variable_id][0][0]
+                    if vardata.fixed:
+                        link = (None, value(vardata))
+                    else:
+                        referenced_variable_ids[id(vardata)] = vardata
+                        link = (variable_symbols[id(vardata)], None)
+                    variable_links.setdefault(variable_id, {})\
+                        [scenario.name] = link
+
+            #
+            # Constraints
+            #
+            for block in scenario_instance.block_data_objects(
+                    active=True, sort=sort_order):
+                for constraint_data in block.component_data_objects(
+                        Constraint,
+                        active=True,
+                        sort=sort_order,
+                        descend_into=False):
+                    if (not constraint_data.has_lb()) and \
+                       (not constraint_data.has_ub()):
+                        assert not constraint_data.equality
+                        continue # non-binding, so skip
+                    if constraint_data._linear_canonical_form:
+                        repn = constraint_data.canonical_form()
+                    else:
+                        repn = generate_standard_repn(constraint_data.body)
+                    if repn.polynomial_degree() is None:
+                        raise ValueError(
+                            "Cannot write legal LP file.  Constraint '%s' "
+                            "has a body with nonlinear terms."
+                            % (constraint_data.name))
+                    body = []
+                    offset = writer._print_expr_canonical(repn,
+                                                          body,
+                                                          None,
+                                                          variable_symbols,
+                                                          False,
+                                                          None)
+                    rows = []
+                    writer._print_constraint_rows(
+                        scenario_labeler(constraint_data),
+                        constraint_data,
+                        body,
+                        offset,
+                        rows)
+                    rows_file.write("".join(rows))
+                for soscondata in block.component_data_objects(
+                        SOSConstraint,
+                        active=True,
+                        sort=sort_order,
+                        descend_into=False):
+                    if soscondata.level > 2:
+                        raise ValueError(
+                            "Solver does not support SOS level %s "
+                            "constraints" % (soscondata.level))
+                    sos_lines = []
+                    writer.printSOS(symbol_map,
+                                    scenario_labeler,
+                                    variable_symbol_map,
+                                    soscondata,
+                                    sos_lines)
+                    sos_file.write("".join(sos_lines))
+
+            #
+            # Bounds
+            #
+            for vardata in variable_list:
+                if id(vardata) not in referenced_variable_ids:
+                    continue
+                name_to_output = variable_symbols[id(vardata)]
+                bounds = []
+                section = writer._print_variable_bounds(
+                    binding_instance,
+                    name_to_output,
+                    vardata,
+                    output_fixed_variable_bounds,
+                    bounds)
+                bounds_file.write("".join(bounds))
+                if section == "binary":
+                    binary_file.write('  %s\n' % (name_to_output))
+                elif section == "general":
+                    integer_file.write('  %s\n' % (name_to_output))
+
+            binding_instance.del_component(scenario.name)
+            referenced_variable_ids.clear()
+            del scenario_instance
+            del compressed_tree
+            del compressed_scenario
+            del variable_list
+            del symbol_map
+            del variable_symbol_map
+            del variable_symbols
+
+        with open(output_filename, "w") as output_file:
+            output_file.write("\\* Source Pyomo model name=%s *\\\n\n"
+                              % (ef_instance_name,))
+
+            #
+            # Objective
+            #
+            if opt_sense == maximize:
+                output_file.write("max \n")
+            else:
+                output_file.write("min \n")
+            binding_instance.MASTER = Objective(sense=opt_sense)
+            if symbolic_solver_labels:
+                output_file.write(
+                    TextLabeler()(binding_instance.MASTER)+':\n')
+            else:
+                output_file.write(labeler(binding_instance.MASTER)+':\n')
+            force_objective_constant = False
+            if (len(objective_linear_terms) == 0) and \
+               (len(objective_quadratic_terms) == 0):
+                logger.warning("Constant objective detected, replacing "
+                               "with a placeholder to prevent solver "
+                               "failure.")
+                force_objective_constant = True
+            output_file.write("".join(
+                writer.linear_coef_string_template % (coef, name)
+                for name, coef in sorted(objective_linear_terms,
+                                         key=itemgetter(0))))
+            if len(objective_quadratic_terms) > 0:
+                output_file.write("+ [\n")
+                for (name1, name2), coef in sorted(objective_quadratic_terms,
+                                                   key=itemgetter(0)):
+                    output_file.write(writer.quad_coef_string_template
+                                      % (2*coef))
+                    if name1 == name2:
+                        output_file.write("%s ^ 2\n" % (name1))
+                    else:
+                        output_file.write("%s * %s\n" % (name1, name2))
+                output_file.write("] / 2\n")
+            if force_objective_constant or (objective_constant != 0.0):
+                output_file.write(writer.obj_string_template
+                                  % (objective_constant, 'ONE_VAR_CONSTANT'))
+            del objective_linear_terms
+            del objective_quadratic_terms
+
+            output_file.write("\n")
+            output_file.write("s.t.\n")
+            output_file.write("\n")
+
+            #
+            # Non-anticipativity constraints (these are declared on
+            # the binding instance, so they appear before the rows of
+            # the scenario instances)
+            #
+            master_bounds = []
+            for stage in scenario_tree.stages[:-1]: # skip the leaf stage
+                for tree_node in stage.nodes:
+                    variable_links = node_links.pop(tree_node.name, {})
+                    master_blend_variable_name = \
+                        "MASTER_BLEND_VAR_"+str(tree_node.name)
+                    master_blend_constraint_name = \
+                        "MASTER_BLEND_CONSTRAINT_"+str(tree_node.name)
+                    master_variable_index = Set(
+                        initialize=sorted(variable_links),
+                        ordered=True)
+                    binding_instance.add_component(
+                        master_blend_variable_name+"_index",
+                        master_variable_index)
+                    master_variable = Var(master_variable_index)
+                    binding_instance.add_component(
+                        master_blend_variable_name,
+                        master_variable)
+                    node_labeler = labeler
+                    if symbolic_solver_labels:
+                        node_labeler = TextLabeler()
+                    constraint_count = 0
+                    for variable_id in master_variable_index:
+                        master_symbol = \
+                            node_labeler(master_variable[variable_id])
+                        scenario_links = variable_links[variable_id]
+                        # Don't blend variables that are fixed on
+                        # every scenario instance
+                        if all(symbol is None for symbol, fixed_value
+                               in itervalues(scenario_links)):
+                            continue
+                        master_bounds.append(master_symbol)
+                        for node_scenario in tree_node.scenarios:
+                            symbol, fixed_value = \
+                                scenario_links[node_scenario.name]
+                            constraint_count += 1
+                            if symbolic_solver_labels:
+                                con_symbol = cpxlp_label_from_name(
+                                    "%s[%d]" % (master_blend_constraint_name,
+                                                constraint_count))
+                            else:
+                                con_symbol = labeler()
+                            output_file.write('c_e_%s_:\n' % (con_symbol))
+                            if symbol is None:
+                                output_file.write(
+                                    writer.linear_coef_string_template
+                                    % (1, master_symbol))
+                                bound = 0.0 + fixed_value
+                            else:
+                                output_file.write("".join(
+                                    writer.linear_coef_string_template
+                                    % (coef, name)
+                                    for name, coef in sorted(
+                                        [(master_symbol, 1), (symbol, -1)],
+                                        key=itemgetter(0))))
+                                bound = 0.0
+                            output_file.write(
+                                writer.eq_string_template
+                                % (_no_negative_zero(bound)))
+                            output_file.write("\n")
+                    binding_instance.del_component(master_variable)
+                    binding_instance.del_component(master_variable_index)
+
+            rows_file.seek(0)
+            shutil.copyfileobj(rows_file, output_file)
+
+            output_file.write('c_e_ONE_VAR_CONSTANT: \n')
+            output_file.write('ONE_VAR_CONSTANT = 1.0\n')
+            output_file.write("\n")
+
+            #
+            # Bounds
+            #
+            output_file.write("bounds\n")
+            for master_symbol in master_bounds:
+                output_file.write("    -inf <= %s <= +inf\n"
+                                  % (master_symbol))
+            bounds_file.seek(0)
+            shutil.copyfileobj(bounds_file, output_file)
+            if integer_file.tell() > 0:
+                output_file.write("general\n")
+                integer_file.seek(0)
+                shutil.copyfileobj(integer_file, output_file)
+            if binary_file.tell() > 0:
+                output_file.write("binary\n")
+                binary_file.seek(0)
+                shutil.copyfileobj(binary_file, output_file)
+            if sos_file.tell() > 0:
+                output_file.write("SOS\n")
+                sos_file.seek(0)
+                shutil.copyfileobj(sos_file, output_file)
+
+            output_file.write("end\n")
+
+    finally:
+        for f in (rows_file, sos_file, bounds_file, integer_file, binary_file):
+            f.close()
+
 #
 # solve the EF binding instance and load the solution
 #
@@ -57,7 +57,11 @@ from pyomo.pysp.solutionioextensions import \
     (IPySPSolutionSaverExtension,
      IPySPSolutionLoaderExtension)
 from pyomo.pysp.solutionwriter import ISolutionWriterExtension
-from pyomo.pysp.ef import write_ef, create_ef_instance
+from pyomo.pysp.ef import (write_ef,
+                           write_ef_streaming,
+                           create_ef_instance)
+from pyomo.pysp.scenariotree.instance_factory import \
+    ScenarioTreeInstanceFactory
 
 logger = logging.getLogger('pyomo.pysp')
 
@@ -612,6 +616,23 @@ def runef_register_options(options=None):
             ),
             doc=None,
             visibility=0))
+    safe_register_unique_option(
+        options,
+        "streaming_ef",
+        PySPConfigValue(
+            False,
+            domain=bool,
+            description=(
+                "Construct and write the extensive form one scenario "
+                "at a time, releasing each scenario instance after "
+                "its rows have been written. Only the nonanticipativity "
+                "linking data is kept in memory. This option can not "
+                "be combined with --solve, CVaR or chance constraints, "
+                "and only the LP file format is supported. Default "
+                "is False."
+            ),
+            doc=None,
+            visibility=0))
     ScenarioTreeManagerClientSerial.register_options(options)
     ExtensiveFormAlgorithm.register_options(options)
 
@@ -695,6 +716,17 @@ def runef(options,
     solution_savers = sort_extensions_by_precedence(solution_savers)
     solution_writers = sort_extensions_by_precedence(solution_writers)
 
+    if options.streaming_ef:
+        _runef_streaming(options,
+                         solution_loaders=solution_loaders,
+                         solution_savers=solution_savers,
+                         solution_writers=solution_writers)
+        print("")
+        print("Total EF execution time=%.2f seconds"
+              % (time.time() - start_time))
+        print("")
+        return 0
+
     with ScenarioTreeManagerClientSerial(options) \
          as manager:
         manager.initialize()
@@ -804,6 +836,71 @@ def runef(options,
 
     return 0
 
+#
+# Write the extensive form without ever holding more than one
+# scenario instance in memory (see write_ef_streaming).
+#
+
+def _runef_streaming(options,
+                     solution_loaders=(),
+                     solution_savers=(),
+                     solution_writers=()):
+
+    if options.solve:
+        raise ValueError("The streaming_ef option can not be used "
+                         "when solving the extensive form")
+    if options.generate_weighted_cvar:
+        raise ValueError("The streaming_ef option can not be combined "
+                         "with the generate_weighted_cvar option")
+    if options.cc_indicator_var is not None:
+        raise ValueError("The streaming_ef option can not be combined "
+                         "with the cc_indicator_var option")
+    if len(solution_loaders) or len(solution_savers) or \
+       len(solution_writers):
+        print("WARNING: Solution extensions will not be called "
+              "when the extensive form is streamed to a file.")
+
+    filename = options.output_file
+    if os.path.splitext(filename)[1] not in ['.nl','.lp','.mps']:
+        filename += '.lp'
+
+    start_time = time.time()
+    if options.verbose:
+        print("Importing model and scenario tree files")
+
+    with ScenarioTreeInstanceFactory(
+            options.model_location,
+            options.scenario_tree_location) as factory:
+
+        if options.output_times or options.verbose:
+            print("Time to import model and scenario tree "
+                  "structure files=%.2f seconds"
+                  %(time.time() - start_time))
+
+        scenario_tree = factory.generate_scenario_tree(
+            downsample_fraction=options.scenario_tree_downsample_fraction,
+            random_seed=options.scenario_tree_random_seed,
+            verbose=options.verbose)
+        scenario_tree.validate()
+
+        start_time = time.time()
+        if options.verbose:
+            print("Starting to stream extensive form")
+
+        write_ef_streaming(
+            scenario_tree,
+            filename,
+            symbolic_solver_labels=options.symbolic_solver_labels,
+            objective_sense=options.objective_sense_stage_based,
+            verbose_output=options.verbose)
+
+        print("Extensive form written to file="+filename)
+        if options.verbose or options.output_times:
+            print("Time to write output file=%.2f seconds"
+                  % (time.time() - start_time))
+
+    return filename
+
 #
 # The main driver routine for the runef script
 #
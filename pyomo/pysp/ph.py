@@ -15,7 +15,8 @@ import sys
 import time
 import inspect
 import uuid
-from operator import itemgetter
+from operator import itemgetter, mul, truediv
+from itertools import repeat
 from math import fabs, sqrt
 
 try:
@@ -66,10 +67,82 @@ from pyomo.pysp import phsolverserverutils
 from pyomo.opt.parallel.local import SolverManager_Serial
 
 from six import iterkeys, itervalues, iteritems
-from six.moves import xrange
+from six.moves import xrange, zip, map
 
 logger = logging.getLogger('pyomo.pysp')
 
+def _values_getter(keys):
+    """
+    Return a function that maps a dictionary to the tuple of its
+    values for keys (in order).  The lookups are performed by
+    operator.itemgetter, so that rows of tree node / scenario data
+    are extracted without a Python-level loop.
+    """
+    if len(keys) == 0:
+        return lambda values: ()
+    elif len(keys) == 1:
+        key = keys[0]
+        return lambda values: (values[key],)
+    return itemgetter(*keys)
+
+def _update_scenario_weights(variable_ids,
+                             get_values,
+                             weight_values,
+                             rho_values,
+                             var_values,
+                             xbar_row,
+                             blend_row,
+                             nu_value,
+                             minimizing,
+                             dual_mode):
+    """
+    Update the PH weights of one scenario for the (non-stale)
+    variables of a tree node.  variable_ids is the tuple of the tree
+    node variable ids, get_values is the _values_getter for
+    variable_ids, and xbar_row and blend_row are the tree node xbars
+    and blend values in the same order.  Returns the list of the
+    updated weights, with None for the stale variables.
+    """
+    x_row = get_values(var_values)
+    stale = None in x_row
+    if dual_mode and (not stale or any(x is not None for x in x_row)):
+        # **Adding these asserts simply because we haven't thought
+        # **about what this means for other steps in the code
+        assert all(blend == 1.0 for x, blend in zip(x_row, blend_row)
+                   if x is not None)
+        assert nu_value == 1.0
+        assert minimizing
+    # we are currently not updating weights if blending is disabled
+    # for a variable.  this is done on the premise that unless you
+    # are actively trying to move the variable toward the mean, the
+    # weights will blow up and be huge by the time that blending is
+    # activated.
+    rows = zip(get_values(weight_values),
+               get_values(rho_values),
+               x_row,
+               xbar_row,
+               blend_row)
+    if stale:
+        update_ids = [variable_id for variable_id, x
+                      in zip(variable_ids, x_row) if x is not None]
+        rows = [row for row in rows if row[2] is not None]
+    else:
+        update_ids = variable_ids
+    if dual_mode:
+        weights = [blend * rho * nu_value * (x - xbar)
+                   for w, rho, x, xbar, blend in rows]
+    elif minimizing:
+        weights = [w + blend * rho * nu_value * (x - xbar)
+                   for w, rho, x, xbar, blend in rows]
+    else:
+        weights = [w - blend * rho * nu_value * (x - xbar)
+                   for w, rho, x, xbar, blend in rows]
+    weight_values.update(zip(update_ids, weights))
+    if stale:
+        updated = iter(weights)
+        weights = [None if x is None else next(updated) for x in x_row]
+    return weights
+
 # PH iteratively solves scenario sub-problems, so we don't want to
 # waste a ton of time preprocessing unless some specific aspects of
 # the scenario instances change.  for example, a variable was fixed,
@@ -3415,37 +3488,41 @@ class ProgressiveHedging(_PHBase):
             for tree_node in stage._tree_nodes:
 
                 xbars = tree_node._xbars
+                averages = tree_node._averages
+                minimums = tree_node._minimums
+                maximums = tree_node._maximums
+                node_probability = tree_node._probability
+
+                # extract the scenario solutions as rows (one per
+                # scenario) and transpose them, so that the statistics
+                # of each variable are computed over a column of
+                # scenario values.
+                variable_ids = tuple(tree_node._standard_variable_ids)
+                get_values = _values_getter(variable_ids)
+                scenario_probabilities = \
+                    [scenario._probability for scenario in tree_node._scenarios]
+                columns = zip(*[get_values(scenario._x[tree_node._name])
+                                for scenario in tree_node._scenarios])
+
+                for variable_id, values in zip(variable_ids, columns):
+
+                    if None in values:
+                        # stale
+                        continue
 
-                scenario_solutions = \
-                    [(scenario._probability, scenario._x[tree_node._name]) \
-                     for scenario in tree_node._scenarios]
-
-                for variable_id in tree_node._standard_variable_ids:
+                    avg_value = sum(map(mul, scenario_probabilities, values),
+                                    0.0)
+                    avg_value /= node_probability
+                    minimums[variable_id] = min(values)
+                    maximums[variable_id] = max(values)
 
-                    stale = False
-                    values = []
-                    avg_value = 0.0
-                    for probability, var_values in scenario_solutions:
-                        val = var_values[variable_id]
-                        if val is not None:
-                            avg_value += probability * val
-                            values.append(val)
+                    if self._ph_xbar_updates_enabled:
+                        if (overrelax) and (current_iteration >= 1):
+                            xbars[variable_id] = self._nu*avg_value + (1-self._nu)*averages[variable_id]
                         else:
-                            stale = True
-
-                    if not stale:
-
-                        avg_value /= tree_node._probability
-                        tree_node._minimums[variable_id] = min(values)
-                        tree_node._maximums[variable_id] = max(values)
+                            xbars[variable_id] = avg_value
 
-                        if self._ph_xbar_updates_enabled:
-                            if (overrelax) and (current_iteration >= 1):
-                                xbars[variable_id] = self._nu*avg_value + (1-self._nu)*tree_node._averages[variable_id]
-                            else:
-                                xbars[variable_id] = avg_value
-
-                        tree_node._averages[variable_id] = avg_value
+                    averages[variable_id] = avg_value
 
         end_time = time.time()
         self._cumulative_xbar_time += (end_time - start_time)
@@ -3474,8 +3551,11 @@ class ProgressiveHedging(_PHBase):
 
         # cache the lookups - don't want to do them deep in the index
         # loop.
-        over_relaxing = self._overrelax
-        objective_sense = self._objective_sense
+        dual_mode = self._dual_mode is True
+        minimizing = self._objective_sense == minimize
+        nu_value = 1.0
+        if self._overrelax:
+            nu_value = self._nu
 
         # no blending over the final stage, so no weights to worry
         # about.
@@ -3483,77 +3563,51 @@ class ProgressiveHedging(_PHBase):
 
             for tree_node in stage._tree_nodes:
 
-                tree_node_xbars = None
-                if self._dual_mode is True:
+                if dual_mode:
                     tree_node_xbars = tree_node._xbars
                 else:
                     tree_node_xbars = tree_node._averages
-                blend_values = tree_node._blend
+                node_probability = tree_node._probability
+                variable_ids = tuple(tree_node._standard_variable_ids)
+                get_values = _values_getter(variable_ids)
+                xbar_row = get_values(tree_node_xbars)
+                blend_row = get_values(tree_node._blend)
 
                 # These will be updated inside this loop
                 tree_node_wbars = tree_node._wbars = \
-                    dict((var_id,0) for var_id in tree_node._variable_ids)
-
-                for scenario in tree_node._scenarios:
-
-                    instance = scenario._instance
-
-                    weight_values = scenario._w[tree_node._name]
-                    rho_values = scenario._rho[tree_node._name]
-                    var_values = scenario._x[tree_node._name]
-
-                    for variable_id in tree_node._standard_variable_ids:
-
-                        varval = var_values[variable_id]
-
-                        if varval is not None:
-
-                            # we are currently not updating weights if
-                            # blending is disabled for a variable.
-                            # this is done on the premise that unless
-                            # you are actively trying to move the
-                            # variable toward the mean, the weights
-                            # will blow up and be huge by the time
-                            # that blending is activated.
-
-                            nu_value = 1.0
-                            if over_relaxing:
-                                nu_value = self._nu
-
-                            if not self._dual_mode:
-
-                                if objective_sense == minimize:
-                                    weight_values[variable_id] += \
-                                        blend_values[variable_id] * \
-                                        rho_values[variable_id] * \
-                                        nu_value * \
-                                        (varval - \
-                                         tree_node_xbars[variable_id])
-                                else:
-                                    weight_values[variable_id] -= \
-                                        blend_values[variable_id] * \
-                                        rho_values[variable_id] * \
-                                        nu_value * \
-                                        (varval - \
-                                         tree_node_xbars[variable_id])
-                            else:
-                                # **Adding these asserts simply
-                                # **because we haven't thought about
-                                # **what this means for other steps in
-                                # **the code
-                                assert blend_values[variable_id] == 1.0
-                                assert nu_value == 1.0
-                                assert objective_sense == minimize
-                                weight_values[variable_id] = \
-                                    blend_values[variable_id] * \
-                                    (rho_values[variable_id]) * \
-                                    nu_value * \
-                                    (varval - \
-                                     tree_node_xbars[variable_id])
-
-                            tree_node_wbars[variable_id] += \
-                                scenario._probability * \
-                                weight_values[variable_id] / tree_node._probability
+                    dict.fromkeys(tree_node._variable_ids, 0)
+
+                weight_rows = [
+                    _update_scenario_weights(
+                        variable_ids,
+                        get_values,
+                        scenario._w[tree_node._name],
+                        scenario._rho[tree_node._name],
+                        scenario._x[tree_node._name],
+                        xbar_row,
+                        blend_row,
+                        nu_value,
+                        minimizing,
+                        dual_mode)
+                    for scenario in tree_node._scenarios]
+
+                scenario_probabilities = \
+                    [scenario._probability for scenario in tree_node._scenarios]
+                for variable_id, weights in zip(variable_ids,
+                                                zip(*weight_rows)):
+                    if None in weights:
+                        tree_node_wbars[variable_id] = sum(
+                            (probability * w / node_probability
+                             for probability, w
+                             in zip(scenario_probabilities, weights)
+                             if w is not None),
+                            0)
+                    else:
+                        tree_node_wbars[variable_id] = sum(
+                            map(truediv,
+                                map(mul, scenario_probabilities, weights),
+                                repeat(node_probability)),
+                            0)
 
         end_time = time.time()
         self._cumulative_weight_time += (end_time - start_time)
@@ -3567,68 +3621,34 @@ class ProgressiveHedging(_PHBase):
 
         # cache the lookups - don't want to do them deep in the index
         # loop.
-        over_relaxing = self._overrelax
-        objective_sense = self._objective_sense
+        dual_mode = self._dual_mode is True
+        minimizing = self._objective_sense == minimize
+        nu_value = 1.0
+        if self._overrelax:
+            nu_value = self._nu
 
         for tree_node in scenario._node_list[:-1]:
 
-            weight_values = scenario._w[tree_node._name]
-            rho_values = scenario._rho[tree_node._name]
-            var_values = scenario._x[tree_node._name]
-
-            tree_node_xbars = None
-            if self._dual_mode is True:
+            if dual_mode:
                 tree_node_xbars = tree_node._xbars
             else:
                 tree_node_xbars = tree_node._averages
-            blend_values = tree_node._blend
+
+            variable_ids = tuple(tree_node._standard_variable_ids)
+            get_values = _values_getter(variable_ids)
 
             # Note: This does not update wbar
-            for variable_id in tree_node._standard_variable_ids:
-
-                varval = var_values[variable_id]
-
-                if varval is not None:
-
-                    # we are currently not updating weights if
-                    # blending is disabled for a variable.  this is
-                    # done on the premise that unless you are actively
-                    # trying to move the variable toward the mean, the
-                    # weights will blow up and be huge by the time
-                    # that blending is activated.
-
-                    nu_value = 1.0
-                    if over_relaxing:
-                        nu_value = self._nu
-
-                    if self._dual_mode is False:
-                        if objective_sense == minimize:
-                            weight_values[variable_id] += \
-                                blend_values[variable_id] * \
-                                rho_values[variable_id] * \
-                                nu_value * \
-                                (varval - \
-                                 tree_node_xbars[variable_id])
-                        else:
-                            weight_values[variable_id] -= \
-                                blend_values[variable_id] * \
-                                rho_values[variable_id] * \
-                                nu_value * \
-                                (varval - \
-                                 tree_node_xbars[variable_id])
-                    else:
-                        # **Adding these asserts simply because we
-                        # **haven't thought about what this means for
-                        # **other steps in the code
-                        assert blend_values[variable_id] == 1.0
-                        assert nu_value == 1.0
-                        assert objective_sense == minimize
-                        weight_values[variable_id] = \
-                            blend_values[variable_id] * \
-                            rho_values[variable_id] * \
-                            nu_value * \
-                            (varval - \
-                             tree_node_xbars[variable_id])
+            _update_scenario_weights(
+                variable_ids,
+                get_values,
+                scenario._w[tree_node._name],
+                scenario._rho[tree_node._name],
+                scenario._x[tree_node._name],
+                get_values(tree_node_xbars),
+                get_values(tree_node._blend),
+                nu_value,
+                minimizing,
+                dual_mode)
 
         end_time = time.time()
         self._cumulative_weight_time += (end_time - start_time)
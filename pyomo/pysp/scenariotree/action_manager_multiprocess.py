@@ -0,0 +1,254 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+
+__all__ = ("ScenarioTreeActionManagerMultiprocess",)
+
+import sys
+import logging
+import traceback
+import multiprocessing
+try:
+    import cPickle as pickle
+except:                                           #pragma:nocover
+    import pickle
+
+from pyutilib.pyro import TaskProcessingError
+from pyomo.opt.parallel.manager import ActionStatus
+from pyomo.pysp.scenariotree.action_manager_pyro import \
+    ScenarioTreeActionManagerPyro
+from pyomo.pysp.scenariotree.server_pyro import ScenarioTreeServerPyro
+
+from six import iteritems, itervalues
+from six.moves import xrange, queue
+
+logger = logging.getLogger('pyomo.pysp')
+
+# Server processes are forked where possible so that they inherit
+# the worker types registered and the model modules imported by
+# this process (a spawned process would start without them).
+try:
+    _mp = multiprocessing.get_context('fork')
+except (AttributeError, ValueError):              #pragma:nocover
+    _mp = multiprocessing
+
+class _ScenarioTreeServerProcess(ScenarioTreeServerPyro):
+    """A scenario tree server that runs in a process launched by
+    ScenarioTreeActionManagerMultiprocess. Tasks are received over
+    a multiprocessing queue rather than from a Pyro dispatcher."""
+
+    def __init__(self, name, verbose=False):
+        # Note: the TaskWorker base class is not initialized, as
+        #       that would attempt to connect to a Pyro dispatcher
+        self.WORKERNAME = name
+        self._verbose = verbose
+        self._worker_error = False
+        self._worker_shutdown = False
+        self._modules_imported = {}
+        self._init_server()
+
+    def run(self, task_queue, result_queue):
+        """Process tasks until a shutdown request or the end of
+        the task queue (None) is received."""
+        while not self._worker_shutdown:
+            task = task_queue.get()
+            if task is None:
+                break
+            try:
+                result = pickle.dumps(
+                    self._process(pickle.loads(task['data'])))
+            except:
+                logger.error(
+                    "Scenario tree server %s caught an exception of type "
+                    "%s while processing a task. Going idle."
+                    % (self.WORKERNAME, sys.exc_info()[0].__name__))
+                traceback.print_exception(*sys.exc_info())
+                self._worker_error = True
+                result = pickle.dumps(
+                    TaskProcessingError(traceback.format_exc()))
+            if task['generateResponse']:
+                result_queue.put((task['id'], result))
+        self.reset()
+
+def _run_scenariotreeserver(name, verbose, task_queue, result_queue):
+    _ScenarioTreeServerProcess(name, verbose=verbose).run(task_queue,
+                                                          result_queue)
+
+class _ServerProcessClient(object):
+    """Places tasks on the queue of a single scenario tree server
+    process. Implements the methods of pyutilib.pyro.Client used by
+    the action manager. The id of each transmitted task that
+    generates a response is recorded in the pending_tasks dict
+    (mapped to the server name) until the response is collected."""
+
+    def __init__(self, server_name, task_queue, pending_tasks):
+        self._server_name = server_name
+        self._task_queue = task_queue
+        self._pending_tasks = pending_tasks
+
+    def add_task(self, task, verbose=False, override_type=None):
+        assert override_type in (None, self._server_name)
+        if task['generateResponse']:
+            self._pending_tasks[task['id']] = self._server_name
+        self._task_queue.put(task)
+
+    def add_tasks(self, tasks, verbose=False):
+        for queue_name, task_list in iteritems(tasks):
+            for task in task_list:
+                self.add_task(task, override_type=queue_name)
+
+    def shutdown(self):
+        self._task_queue.put(None)
+
+    def close(self):
+        pass
+
+#
+# an asynchronous action manager for scenario tree servers launched
+# on this machine using the multiprocessing module
+#
+
+class ScenarioTreeActionManagerMultiprocess(ScenarioTreeActionManagerPyro):
+
+    def __init__(self, verbose=0):
+        super(ScenarioTreeActionManagerMultiprocess, self).__init__(
+            verbose=verbose)
+        self._server_processes = {}
+        self._result_queue = None
+        # maps the id of each task transmitted to a server process
+        # to the server name, until its response is collected
+        self._pending_tasks = {}
+
+    def acquire_servers(self, servers_requested, timeout=None):
+        """Launch the requested number of scenario tree server
+        processes. The timeout argument is ignored."""
+
+        if self._verbose:
+            print("Launching %s scenario tree server processes"
+                  % (servers_requested))
+
+        assert len(self.server_pool) == 0
+        assert len(self._dispatcher_name_to_client) == 0
+        assert self._result_queue is None
+
+        self._result_queue = _mp.Queue()
+        for i in xrange(servers_requested):
+            server_name = "ScenarioTreeServerMultiprocess_%d" % (i)
+            task_queue = _mp.Queue()
+            process = _mp.Process(
+                target=_run_scenariotreeserver,
+                name=server_name,
+                args=(server_name,
+                      self._verbose,
+                      task_queue,
+                      self._result_queue))
+            process.daemon = True
+            process.start()
+            self._server_processes[server_name] = process
+            # each server process is treated as a dispatcher with a
+            # single queue
+            self._dispatcher_name_to_client[server_name] = \
+                _ServerProcessClient(server_name,
+                                     task_queue,
+                                     self._pending_tasks)
+            self.server_pool.append(server_name)
+
+    def release_servers(self):
+
+        if self._verbose:
+            print("Releasing scenario tree server processes")
+
+        for server_name in self.server_pool:
+            self._dispatcher_name_to_client[server_name].shutdown()
+        for server_name in self.server_pool:
+            process = self._server_processes[server_name]
+            process.join(10)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+        self.server_pool = []
+        self._server_processes = {}
+        self._result_queue = None
+        self._pending_tasks.clear()
+
+    def _get_dispatcher_name(self, queue_name):
+        return queue_name
+
+    def _download_results(self):
+
+        # block until at least one result is available, then collect
+        # any other results that are waiting
+        results = []
+        while len(results) == 0:
+            if len(self._pending_tasks) == 0:
+                # nothing has been transmitted that will generate a
+                # response (e.g., the action was queued while
+                # transmission was paused, or its task failed to be
+                # queued), so waiting would never terminate
+                raise RuntimeError(
+                    "The %s is waiting for results, but no tasks "
+                    "awaiting a response have been transmitted to "
+                    "the scenario tree server processes"
+                    % (type(self).__name__))
+            try:
+                results.append(self._result_queue.get(timeout=1))
+            except queue.Empty:
+                for server_name in set(itervalues(self._pending_tasks)):
+                    if not self._server_processes[server_name].is_alive():
+                        raise RuntimeError(
+                            "Scenario tree server process %s exited "
+                            "with pending tasks" % (server_name))
+        while True:
+            try:
+                results.append(self._result_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        # results that were removed from the queue are all recorded
+        # before reporting the first processing error
+        error_msg = None
+        for task_id, task_result in results:
+            self.queued_action_counter -= 1
+            self._pending_tasks.pop(task_id, None)
+            task_result = pickle.loads(task_result)
+            ah = self.event_handle.get(task_id, None)
+            if ah is None:
+                # if we are here, this is really bad news!
+                raise RuntimeError(
+                    "The %s found results for task with id=%s"
+                    " - but no corresponding action handle "
+                    "could be located! Showing task result "
+                    "below:\n%s" % (type(self).__name__,
+                                    task_id,
+                                    task_result))
+            if type(task_result) is TaskProcessingError:
+                ah.status = ActionStatus.error
+                self.event_handle[ah.id].update(ah)
+                msg = ("ScenarioTreeServer reported a processing "
+                       "error for task with id=%s. Reason: \n%s"
+                       % (task_id, task_result.args[0]))
+                if not self.ignore_task_errors:
+                    if error_msg is None:
+                        error_msg = msg
+                else:
+                    # record an empty result so that waiting on
+                    # this action handle terminates
+                    self.results[ah.id] = None
+                    if self.ignore_task_errors == 1:
+                        logger.warning(msg)
+                    # any value other than 0 or 1 will
+                    # silently ignore task errors
+            else:
+                ah.status = ActionStatus.done
+                self.event_handle[ah.id].update(ah)
+                self.results[ah.id] = task_result
+
+        if error_msg is not None:
+            raise RuntimeError(error_msg)
@@ -11,10 +11,12 @@
 __all__ = ("InvocationType",
            "ScenarioTreeManagerClientSerial",
            "ScenarioTreeManagerClientPyro",
+           "ScenarioTreeManagerClientMultiprocess",
            "ScenarioTreeManagerFactory")
 
 import math
 import sys
+import multiprocessing
 import time
 import itertools
 import inspect
@@ -46,6 +48,8 @@ from pyomo.pysp.scenariotree.instance_factory import \
     ScenarioTreeInstanceFactory
 from pyomo.pysp.scenariotree.action_manager_pyro \
     import ScenarioTreeActionManagerPyro
+from pyomo.pysp.scenariotree.action_manager_multiprocess \
+    import ScenarioTreeActionManagerMultiprocess
 from pyomo.pysp.scenariotree.server_pyro \
     import ScenarioTreeServerPyro
 from pyomo.pysp.ef import create_ef_instance
@@ -2626,15 +2630,18 @@ class _ScenarioTreeManagerClientPyroAdvanced(ScenarioTreeManagerClient,
     # Extended interface for Pyro
     #
 
+    def _create_action_manager(self):
+        return ScenarioTreeActionManagerPyro(
+            verbose=self._options.verbose,
+            host=self._options.pyro_host,
+            port=self._options.pyro_port)
+
     def acquire_scenariotreeservers(self, num_servers, timeout=None):
         """Acquire a pool of scenario tree servers and initialize the
         action manager."""
 
         assert self._action_manager is None
-        self._action_manager = ScenarioTreeActionManagerPyro(
-            verbose=self._options.verbose,
-            host=self._options.pyro_host,
-            port=self._options.pyro_port)
+        self._action_manager = self._create_action_manager()
         self._action_manager.acquire_servers(num_servers, timeout=timeout)
 
         scenario_instance_factory = \
@@ -3820,6 +3827,37 @@ class ScenarioTreeManagerClientPyro(_ScenarioTreeManagerClientPyroAdvanced,
         return self.get_server_for_worker(
             self.get_worker_for_bundle(bundle_name))
 
+class ScenarioTreeManagerClientMultiprocess(ScenarioTreeManagerClientPyro,
+                                            PySPConfiguredObject):
+    """A scenario tree manager that distributes the scenario tree
+    over a pool of scenario tree server processes launched on this
+    machine. Scenario tree operations are performed asynchronously
+    using the same workers as the Pyro-based manager."""
+
+    @classmethod
+    def _declare_options(cls, options=None):
+        if options is None:
+            options = PySPConfigBlock()
+
+        safe_declare_common_option(options,
+                                   "multiprocess_scenariotreeservers")
+
+        return options
+
+    def _create_action_manager(self):
+        return ScenarioTreeActionManagerMultiprocess(
+            verbose=self._options.verbose)
+
+    def acquire_scenariotreeservers(self, num_servers, timeout=None):
+        """Launch a pool of scenario tree server processes and
+        initialize the action manager."""
+        processes = self._options.multiprocess_scenariotreeservers
+        if processes == 0:
+            processes = multiprocessing.cpu_count()
+        return super(ScenarioTreeManagerClientMultiprocess, self).\
+            acquire_scenariotreeservers(min(num_servers, processes),
+                                        timeout=timeout)
+
 def ScenarioTreeManagerFactory(options, *args, **kwds):
     type_ = options.scenario_tree_manager
     try:
@@ -3839,6 +3877,8 @@ ScenarioTreeManagerFactory.registered_types['serial'] = \
     ScenarioTreeManagerClientSerial
 ScenarioTreeManagerFactory.registered_types['pyro'] = \
     ScenarioTreeManagerClientPyro
+ScenarioTreeManagerFactory.registered_types['multiprocess'] = \
+    ScenarioTreeManagerClientMultiprocess
 
 def _register_scenario_tree_manager_options(*args, **kwds):
     if len(args) == 0:
@@ -3860,6 +3900,8 @@ def _register_scenario_tree_manager_options(*args, **kwds):
                                                      **kwds)
     ScenarioTreeManagerClientPyro.register_options(options,
                                                    **kwds)
+    ScenarioTreeManagerClientMultiprocess.register_options(options,
+                                                           **kwds)
 
     return options
 
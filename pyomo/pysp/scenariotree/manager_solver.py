@@ -80,6 +80,8 @@ class ScenarioTreeManagerSolver(PySPConfiguredObject):
                                    "solver")
         safe_declare_common_option(options,
                                    "solver_io")
+        safe_declare_common_option(options,
+                                   "persistent_solver")
         safe_declare_common_option(options,
                                    "solver_manager")
         safe_declare_common_option(options,
@@ -515,10 +517,6 @@ class _ScenarioTreeManagerSolverWorker(ScenarioTreeManagerSolver,
                 "%s is an abstract class for subclassing" % self.__class__)
 
         super(_ScenarioTreeManagerSolverWorker, self).__init__(*args, **kwds)
-        # TODO: Does this import need to be delayed because
-        #       it is in a plugins subdirectory?
-        from pyomo.solvers.plugins.solvers.persistent_solver import \
-            PersistentSolver
 
         assert self.manager is not None
 
@@ -559,24 +557,14 @@ class _ScenarioTreeManagerSolverWorker(ScenarioTreeManagerSolver,
         for scenario in self.manager.scenario_tree._scenarios:
             assert scenario._instance is not None
             solver = self._scenario_solvers[scenario.name] = \
-                SolverFactory(self.get_option("solver"),
-                              solver_io=self.get_option("solver_io"))
-            if isinstance(solver, PersistentSolver) and \
-               self.get_option("disable_advanced_preprocessing"):
-                raise ValueError("Advanced preprocessing can not be disabled "
-                                 "when persistent solvers are used")
+                self._create_solver()
             if self._preprocessor is not None:
                 self._preprocessor.add_scenario(scenario,
                                                 scenario._instance,
                                                 solver)
         for bundle in self.manager.scenario_tree._scenario_bundles:
             solver = self._bundle_solvers[bundle.name] = \
-                SolverFactory(self.get_option("solver"),
-                              solver_io=self.get_option("solver_io"))
-            if isinstance(solver, PersistentSolver) and \
-               self.get_option("disable_advanced_preprocessing"):
-                raise ValueError("Advanced preprocessing can not be disabled "
-                                 "when persistent solvers are used")
+                self._create_solver()
             bundle_instance = \
                 self.manager._bundle_binding_instance_map[bundle.name]
             if self._preprocessor is not None:
@@ -584,6 +572,33 @@ class _ScenarioTreeManagerSolverWorker(ScenarioTreeManagerSolver,
                                               bundle_instance,
                                               solver)
 
+    def _create_solver(self):
+        """Create the solver plugin for a scenario or bundle."""
+        # TODO: Does this import need to be delayed because
+        #       it is in a plugins subdirectory?
+        from pyomo.solvers.plugins.solvers.persistent_solver import \
+            PersistentSolver
+
+        solver_name = self.get_option("solver")
+        if self.get_option("persistent_solver") and \
+           (not solver_name.endswith("_persistent")):
+            solver_name += "_persistent"
+        solver = SolverFactory(solver_name,
+                               solver_io=self.get_option("solver_io"))
+        if isinstance(solver, PersistentSolver):
+            if self.get_option("disable_advanced_preprocessing"):
+                raise ValueError("Advanced preprocessing can not be disabled "
+                                 "when persistent solvers are used")
+            if self.get_option("solver_manager") != "serial":
+                # the solver model is maintained in this process
+                raise ValueError("Persistent solvers can only be used with "
+                                 "the serial solver manager")
+        elif self.get_option("persistent_solver"):
+            raise ValueError("The persistent_solver option was set, but "
+                             "the solver %s does not have a persistent "
+                             "solver interface" % (self.get_option("solver")))
+        return solver
+
     #
     # Override some methods for ScenarioTreeManager that
     # were implemented by _ScenarioTreeManagerWorker:
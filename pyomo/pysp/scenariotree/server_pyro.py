@@ -97,6 +97,12 @@ class ScenarioTreeServerPyro(TaskWorker):
         self.type = self.WORKERNAME
         self.block = True
         self.timeout = None
+        self._init_server(mpi=mpi)
+
+    def _init_server(self, mpi=None):
+        """Initialize the state of this server that does not depend
+        on how tasks are delivered to it. Called after the
+        WORKERNAME and _verbose attributes have been set."""
         self._worker_map = {}
         self._init_verbose = self._verbose
 
@@ -0,0 +1,24 @@
+#
+# a model whose scenarios differ only in the
+# weights of an SOS constraint
+#
+from pyomo.pysp.tests.convert.utils import *
+
+pysp_scenario_tree_model_callback = \
+    simple_twostage_scenario_tree
+
+def pysp_instance_creation_callback(scenario_name, node_names):
+    model = simple_twostage_model()
+    if scenario_name == "Scenario1":
+        weights = [1, 2]
+    elif scenario_name == "Scenario2":
+        weights = [1, 3]
+    else:
+        assert False
+    model.s = SOSConstraint(
+        rule=lambda m: ([m.x, m.y], weights),
+        sos=1)
+    model.cc = Constraint(expr=model.x + model.y >= 1)
+    model.smat = StochasticConstraintBoundsAnnotation()
+    model.smat.declare(model.cc, lb=True, ub=False)
+    return model
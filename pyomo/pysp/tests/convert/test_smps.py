@@ -25,6 +25,10 @@ from pyomo.pysp.util.misc import (_get_test_nameserver,
                                   _poll,
                                   _kill)
 from pyomo.environ import *
+from pyomo.core.expr.symbol_map import SymbolMap
+from pyomo.pysp.convert.smps import (build_repns,
+                                     _deterministic_digest)
+from pyomo.pysp.tests.convert.utils import simple_twostage_model
 
 from six import StringIO
 
@@ -198,26 +202,80 @@ class TestConvertSMPSSimple(unittest.TestCase):
                       ignore_errors=True)
         os.remove(outfile)
 
+    def test_bad_sos_weights(self):
+        # the SMPS formats do not support SOS constraints, so
+        # this must fail rather than report the .cor file of the
+        # reference scenario as shared by all scenarios
+        cmd, output_dir = self._get_cmd(
+            join(thisdir, "model_bad_sos_weights.py"),
+            options={'--core-format': 'lp'})
+        outfile = output_dir+".out"
+        rc = pyutilib.subprocess.run(cmd, outfile=outfile)
+        self.assertNotEqual(rc[0], 0)
+        self._assert_contains(
+            outfile,
+            b"TypeError: SOSConstraints are not allowed with this format. "
+            b"Invalid constraint: s")
+        shutil.rmtree(output_dir,
+                      ignore_errors=True)
+        os.remove(outfile)
+
+class TestConvertSMPSDigest(unittest.TestCase):
+
+    def _get_digest(self, weights, level=1):
+        model = simple_twostage_model()
+        model.s = SOSConstraint(
+            rule=lambda m: ([m.x, m.y], weights),
+            sos=level)
+        build_repns(model)
+        symbol_map = SymbolMap()
+        symbol_map.addSymbols([(model.x, "x1"), (model.y, "x2")])
+        return _deterministic_digest(model, symbol_map)
+
+    def test_sos(self):
+        self.assertEqual(self._get_digest([1, 2]),
+                         self._get_digest([1, 2]))
+        self.assertNotEqual(self._get_digest([1, 2]),
+                            self._get_digest([1, 3]))
+        self.assertNotEqual(self._get_digest([1, 2]),
+                            self._get_digest([1, 2], level=2))
+
 class _SMPSTesterBase(object):
 
     baseline_basename = None
     model_location = None
     scenario_tree_location = None
+    # the maximum number of seconds a single conversion may run
+    timelimit = 600
 
     def setUp(self):
         self._tempfiles = []
         self.options = {}
         self.options['--scenario-tree-manager'] = 'serial'
 
+    def tearDown(self):
+        # remove anything left behind by a failed test
+        if '--output-directory' in self.options:
+            shutil.rmtree(self.options['--output-directory'],
+                          ignore_errors=True)
+        self._cleanup()
+
     def _run_cmd(self, cmd):
         class_name, test_name = self.id().split('.')[-2:]
         outname = os.path.join(thisdir,
                                class_name+"."+test_name+".out")
         self._tempfiles.append(outname)
-        with open(outname, "w") as f:
-            subprocess.check_call(cmd,
-                                  stdout=f,
-                                  stderr=subprocess.STDOUT)
+        rc, _ = pyutilib.subprocess.run(cmd,
+                                        outfile=outname,
+                                        timelimit=self.timelimit)
+        if rc != 0:
+            with open(outname, 'r') as f:
+                output = f.read()
+            self.fail("Command failed with return code %s%s. "
+                      "Output:\n%s"
+                      % (rc,
+                         " (time limit reached)" if rc == -1 else "",
+                         output))
 
     def _cleanup(self):
         for fname in self._tempfiles:
@@ -296,6 +354,27 @@ class _SMPSTesterBase(object):
                        dc=dc.subdirs[subdir])
         shutil.rmtree(outputdir, ignore_errors=True)
 
+    def _diff_input_files(self, baselinedir, outputdir):
+        # only the SMPS input files should be left behind
+        self.assertEqual(
+            sorted(os.listdir(outputdir)),
+            sorted(self.baseline_basename+suffix for suffix
+                   in ('.cor', '.cor.symbols', '.sto', '.tim')))
+        for name in os.listdir(outputdir):
+            fromfile = join(baselinedir, name)
+            tofile = join(outputdir, name)
+            with open(fromfile, 'r') as f_from:
+                fromlines = f_from.readlines()
+            with open(tofile, 'r') as f_to:
+                tolines = f_to.readlines()
+            diff = list(difflib.context_diff(fromlines, tolines,
+                                             fromfile+" (baseline)",
+                                             tofile+" (output)"))
+            if len(diff) > 0:
+                self.fail("Output file does not match baseline:\n"+
+                          "".join(diff))
+        shutil.rmtree(outputdir, ignore_errors=True)
+
     def test_scenarios_LP(self):
         self._setup(self.options)
         self.options['--core-format'] = 'lp'
@@ -305,6 +384,28 @@ class _SMPSTesterBase(object):
                    self.options['--output-directory'])
         self._cleanup()
 
+    def test_scenarios_LP_without_scenario_files(self):
+        self._setup(self.options)
+        self.options['--core-format'] = 'lp'
+        del self.options['--keep-scenario-files']
+        del self.options['--keep-auxiliary-files']
+        cmd = self._get_cmd()
+        self._run_cmd(cmd)
+        self._diff_input_files(os.path.join(baselinedir, self.baseline_basename+'_LP_baseline'),
+                               self.options['--output-directory'])
+        self._cleanup()
+
+    def test_scenarios_MPS_without_scenario_files(self):
+        self._setup(self.options)
+        self.options['--core-format'] = 'mps'
+        del self.options['--keep-scenario-files']
+        del self.options['--keep-auxiliary-files']
+        cmd = self._get_cmd()
+        self._run_cmd(cmd)
+        self._diff_input_files(os.path.join(baselinedir, self.baseline_basename+'_MPS_baseline'),
+                               self.options['--output-directory'])
+        self._cleanup()
+
     def test_scenarios_LP_ignore_derived(self):
         self._setup(self.options)
         self.options['--core-format'] = 'lp'
@@ -558,6 +659,17 @@ def create_test_classes(test_class_suffix,
     globals()[class_names[-1]] = type(
         class_names[-1], (TestConvertSMPS_Serial, unittest.TestCase), {})
 
+    @unittest.category(*categories)
+    class TestConvertSMPS_Multiprocess(_base,
+                                       _SMPSTesterBase):
+        def setUp(self):
+            _SMPSTesterBase.setUp(self)
+            self.options['--scenario-tree-manager'] = 'multiprocess'
+            self.options['--multiprocess-scenariotreeservers'] = 2
+    class_names.append(TestConvertSMPS_Multiprocess.__name__ + "_"+test_class_suffix)
+    globals()[class_names[-1]] = type(
+        class_names[-1], (TestConvertSMPS_Multiprocess, unittest.TestCase), {})
+
     @unittest.skipIf(not (using_pyro3 or using_pyro4),
                      "Pyro or Pyro4 is not available")
     @unittest.category('parallel')
@@ -36,10 +36,13 @@ from pyomo.pysp.scenariotree.manager import (ScenarioTreeManager,
                                              _ScenarioTreeManagerWorker,
                                              ScenarioTreeManagerClientSerial,
                                              ScenarioTreeManagerClientPyro,
+                                             ScenarioTreeManagerClientMultiprocess,
                                              ScenarioTreeManagerFactory,
                                              InvocationType)
 from pyomo.pysp.scenariotree.manager_worker_pyro import \
     ScenarioTreeManagerWorkerPyro
+from pyomo.pysp.scenariotree.action_manager_multiprocess import \
+    ScenarioTreeActionManagerMultiprocess
 from pyomo.pysp.scenariotree.server_pyro import (RegisterWorker,
                                                  ScenarioTreeServerPyro)
 from pyomo.pysp.scenariotree.tree_structure_model import \
@@ -133,6 +136,15 @@ class _ScenarioTreeManagerClientTestSerial(ScenarioTreeManagerClientSerial):
 if "ScenarioTreeManagerWorkerTest" not in ScenarioTreeServerPyro._registered_workers:
     RegisterWorker("ScenarioTreeManagerWorkerTest", _ScenarioTreeManagerWorkerTest)
 
+class _ScenarioTreeManagerWorkerTestInitError(ScenarioTreeManagerWorkerPyro):
+
+    def __init__(self, *args, **kwds):
+        raise RuntimeError("Worker initialization failed")
+
+if "ScenarioTreeManagerWorkerTestInitError" not in ScenarioTreeServerPyro._registered_workers:
+    RegisterWorker("ScenarioTreeManagerWorkerTestInitError",
+                   _ScenarioTreeManagerWorkerTestInitError)
+
 _init_kwds = {'registered_worker_name': 'ScenarioTreeManagerWorkerTest'}
 
 def _Single(worker):
@@ -259,7 +271,7 @@ class _ScenarioTreeManagerTesterBase(object):
             manager.unpause_transmit()
             self.assertEqual(manager._transmission_paused, False)
         if dill_available or \
-           isinstance(manager, ScenarioTreeManagerClientPyro):
+           (not isinstance(manager, ScenarioTreeManagerClientPyro)):
             print("")
             print("Running InvocationType.Single... (using dill)")
             results = manager.invoke_function(
@@ -671,7 +683,7 @@ class _ScenarioTreeManagerTesterBase(object):
                     async_call=True)
 
             if dill_available or \
-               isinstance(manager, ScenarioTreeManagerClientPyro):
+               (not isinstance(manager, ScenarioTreeManagerClientPyro)):
                 print("")
                 print("Running InvocationType.Single... (using dill)")
                 results = manager.invoke_function_on_worker(
@@ -1508,5 +1520,94 @@ class TestScenarioTreeManagerClientPyro_HandshakeAtStartup(
         _ScenarioTreeManagerClientPyroTesterBase._setup(self, options, servers=servers)
         options.pyro_handshake_at_startup = True
 
+@unittest.category('parallel')
+class TestScenarioTreeManagerClientMultiprocess(
+        unittest.TestCase,
+        _ScenarioTreeManagerClientPyroTesterBase):
+
+    cls = ScenarioTreeManagerClientMultiprocess
+
+    def setUp(self):
+        self.options = PySPConfigBlock()
+        ScenarioTreeManagerClientMultiprocess.register_options(
+            self.options,
+            registered_worker_name='ScenarioTreeManagerWorkerTest')
+    def _setup(self, options, servers=None):
+        _ScenarioTreeManagerTesterBase._setup(self, options)
+        if servers is not None:
+            options.multiprocess_scenariotreeservers = servers
+
+    def test_init_error(self):
+        # the workers fail to initialize on the servers, the
+        # manager must still shut down (rather than wait forever
+        # for responses from the servers)
+        self._setup(self.options, servers=2)
+        worker_name = 'ScenarioTreeManagerWorkerTestInitError'
+        with self.assertRaises(RuntimeError):
+            with self.cls(self.options,
+                          registered_worker_name=worker_name) as manager:
+                manager.initialize()
+
+@unittest.category('parallel')
+class TestScenarioTreeActionManagerMultiprocess(unittest.TestCase):
+
+    def test_wait_paused(self):
+        manager = ScenarioTreeActionManagerMultiprocess()
+        try:
+            manager.acquire_servers(1)
+            self.assertEqual(len(manager.server_pool), 1)
+            manager.pause()
+            ah = manager.queue(queue_name=manager.server_pool[0],
+                               action="ScenarioTreeServerPyro_reset",
+                               generate_response=True)
+            # nothing has been transmitted
+            with self.assertRaises(RuntimeError):
+                manager.wait_all([ah])
+            with self.assertRaises(RuntimeError):
+                manager.wait_all()
+            # an empty list of action handles does not wait
+            # on the queued action
+            manager.wait_all([])
+            manager.unpause()
+            manager.wait_all([ah])
+            self.assertEqual(manager.get_results(ah), True)
+        finally:
+            manager.close()
+
+    def test_task_error(self):
+        manager = ScenarioTreeActionManagerMultiprocess()
+        try:
+            manager.acquire_servers(2)
+            self.assertEqual(len(manager.server_pool), 2)
+            ahs = []
+            manager.pause()
+            for server_name in manager.server_pool:
+                ahs.append(manager.queue(
+                    queue_name=server_name,
+                    action="ScenarioTreeServerPyro_release",
+                    worker_name="_not_a_worker_",
+                    generate_response=True))
+            manager.unpause()
+            with self.assertRaises(RuntimeError):
+                manager.wait_all(ahs)
+            # results for the failed tasks were collected, so
+            # waiting again reports the problem rather than blocking
+            if not all(ah.id in manager.results for ah in ahs):
+                with self.assertRaises(RuntimeError):
+                    manager.wait_all(ahs)
+            manager.ignore_task_errors = 2
+            ahs = []
+            for server_name in manager.server_pool:
+                ahs.append(manager.queue(
+                    queue_name=server_name,
+                    action="ScenarioTreeServerPyro_release",
+                    worker_name="_not_a_worker_",
+                    generate_response=True))
+            manager.wait_all(ahs)
+            for ah in ahs:
+                self.assertIs(manager.get_results(ah), None)
+        finally:
+            manager.close()
+
 if __name__ == "__main__":
     unittest.main()
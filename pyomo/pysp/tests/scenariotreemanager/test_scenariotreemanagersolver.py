@@ -24,6 +24,7 @@ from pyomo.pysp.util.config import PySPConfigBlock
 from pyomo.pysp.scenariotree.manager import \
     (ScenarioTreeManagerClientSerial,
      ScenarioTreeManagerClientPyro,
+     ScenarioTreeManagerClientMultiprocess,
      InvocationType)
 from pyomo.pysp.scenariotree.instance_factory import \
     ScenarioTreeInstanceFactory
@@ -95,6 +96,7 @@ def tearDownModule():
 
 solver = {}
 solver['glpk','lp'] = False
+solver['gurobi_persistent','python'] = False
 def setUpModule():
     global solver
     import pyomo.environ
@@ -742,6 +744,39 @@ class TestScenarioTreeManagerSolverSerial(
         sp.initialize()
         return sp
 
+    def test_persistent_solver_errors(self):
+        problem = _SP_Feasible
+        options = ScenarioTreeManagerSolverFactory.register_options()
+        options.solver = 'glpk'
+        options.persistent_solver = True
+        with self._init(problem.get_factory()) as sp:
+            with self.assertRaisesRegexp(
+                    ValueError, "does not have a persistent solver"):
+                ScenarioTreeManagerSolverFactory(sp, options)
+        options.solver = 'gurobi'
+        options.disable_advanced_preprocessing = True
+        with self._init(problem.get_factory()) as sp:
+            with self.assertRaisesRegexp(
+                    ValueError, "Advanced preprocessing can not be disabled"):
+                ScenarioTreeManagerSolverFactory(sp, options)
+
+    def test_solve_scenarios_persistent(self):
+        if not solver['gurobi_persistent','python']:
+            self.skipTest("The gurobi_persistent solver is not available")
+        problem = _SP_Feasible
+        options = ScenarioTreeManagerSolverFactory.register_options()
+        options.solver = 'gurobi'
+        options.persistent_solver = True
+        with self._init(problem.get_factory()) as sp:
+            with ScenarioTreeManagerSolverFactory(sp, options) as manager:
+                results = manager.solve_scenarios(check_status=False)
+                problem.validate_solve(self, sp, results)
+                # the second solve reuses the solver models
+                for scenario in sp.scenario_tree.scenarios:
+                    sp.preprocessor.objective_updated[scenario.name] = True
+                results = manager.solve_scenarios(check_status=False)
+            problem.validate_solve(self, sp, results)
+
 @unittest.skipIf(not has_networkx, "Networkx is not available")
 @unittest.skipIf(not has_dill, "Dill is not available")
 @unittest.skipIf(not (using_pyro3 or using_pyro4), "Pyro or Pyro4 is not available")
@@ -770,5 +805,28 @@ class TestScenarioTreeManagerSolverPyro(
         sp.initialize()
         return sp
 
+@unittest.skipIf(not has_networkx, "Networkx is not available")
+@unittest.skipIf(not has_dill, "Dill is not available")
+@unittest.category('parallel')
+class TestScenarioTreeManagerSolverMultiprocess(
+        unittest.TestCase,
+        _ScenarioTreeManagerSolverTesterBase):
+
+    @classmethod
+    def setUpClass(cls):
+        if not solver['glpk','lp']:
+            raise unittest.SkipTest(
+                "The glpk solver is not available")
+
+    @unittest.nottest
+    def _init(self, factory):
+        options = ScenarioTreeManagerClientMultiprocess.register_options()
+        options.multiprocess_scenariotreeservers = 3
+        sp = ScenarioTreeManagerClientMultiprocess(
+            options,
+            factory=factory)
+        sp.initialize()
+        return sp
+
 if __name__ == "__main__":
     unittest.main()
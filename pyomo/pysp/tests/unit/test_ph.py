@@ -828,6 +828,105 @@ class TestPH(unittest.TestCase):
             ef_output_file,
             baseline_dir+"farmer_maximize_ef.baseline.lp")
 
+    def test_farmer_ef_streaming(self):
+        farmer_examples_dir = pysp_examples_dir + "farmer"
+        model_dir = farmer_examples_dir + os.sep + "models"
+        instance_dir = farmer_examples_dir + os.sep + "scenariodata"
+        ef_output_file = this_test_file_directory+"test_farmer_ef_streaming.lp"
+        argstring = "runef --symbolic-solver-labels --streaming-ef -m "+model_dir+" -s "+instance_dir+" --output-file="+ef_output_file
+        print("Testing command: " + argstring)
+
+        pyutilib.misc.setup_redirect(
+            this_test_file_directory+"farmer_ef_streaming.out")
+        args = argstring.split()
+        pyomo.pysp.ef_writer_script.main(args=args[1:])
+        pyutilib.misc.reset_redirect()
+        os.remove(this_test_file_directory+"farmer_ef_streaming.out")
+        self.assertFileEqualsBaseline(
+            ef_output_file,
+            baseline_dir+"farmer_ef.baseline.lp")
+
+    def test_farmer_maximize_ef_streaming(self):
+        farmer_examples_dir = pysp_examples_dir + "farmer"
+        model_dir = farmer_examples_dir + os.sep + "maxmodels"
+        instance_dir = farmer_examples_dir + os.sep + "scenariodata"
+        ef_output_file = this_test_file_directory+"farmer_maximize_ef_streaming.lp"
+        argstring = "runef --symbolic-solver-labels --streaming-ef -m "+model_dir+" -s "+instance_dir+" -o max --output-file="+ef_output_file
+        print("Testing command: " + argstring)
+
+        pyutilib.misc.setup_redirect(
+            this_test_file_directory+"farmer_maximize_ef_streaming.out")
+        args = argstring.split()
+        pyomo.pysp.ef_writer_script.main(args=args[1:])
+        pyutilib.misc.reset_redirect()
+        os.remove(this_test_file_directory+"farmer_maximize_ef_streaming.out")
+        self.assertFileEqualsBaseline(
+            ef_output_file,
+            baseline_dir+"farmer_maximize_ef.baseline.lp")
+
+    def test_ef_streaming_fixed_variables(self):
+        from pyomo.pysp.ef import write_ef_streaming
+        from pyomo.pysp.scenariotree.instance_factory import \
+            ScenarioTreeInstanceFactory
+        from pyomo.pysp.scenariotree.tree_structure_model import \
+            CreateAbstractScenarioTreeModel
+        from pyomo.pysp.util.misc import load_external_module
+        testdatadir = this_test_file_directory+"testdata"+os.sep
+        model = load_external_module(
+            testdatadir+"reference_test_model.py")[0].model
+        ef_output_file = this_test_file_directory+"ef_streaming_fixed.lp"
+        def _write(fixed_scenarios):
+            # the first-stage variable is fixed on the scenario
+            # instances, not on the scenario tree
+            def scenario_model_callback(scenario_tree,
+                                        scenario_name,
+                                        node_list):
+                instance = model.create_instance()
+                instance.p = float(scenario_name[1:])
+                if scenario_name in fixed_scenarios:
+                    instance.x.fix(5)
+                return instance
+            scenario_tree_model = CreateAbstractScenarioTreeModel().\
+                create_instance(
+                    testdatadir+"reference_test_scenario_tree.dat")
+            with ScenarioTreeInstanceFactory(
+                    model=scenario_model_callback,
+                    scenario_tree=scenario_tree_model) as factory:
+                scenario_tree = factory.generate_scenario_tree()
+                write_ef_streaming(scenario_tree,
+                                   ef_output_file,
+                                   symbolic_solver_labels=True,
+                                   output_fixed_variable_bounds=True)
+            with open(ef_output_file) as f:
+                lines = f.read().splitlines()
+            os.remove(ef_output_file)
+            return lines
+
+        # fixed on every scenario instance, so it is not blended
+        lines = _write(("s1", "s2", "s3"))
+        self.assertFalse(any("MASTER_BLEND" in line for line in lines))
+
+        # fixed on one scenario instance
+        lines = _write(("s1",))
+        self.assertEqual(
+            lines[lines.index("c_e_MASTER_BLEND_CONSTRAINT_root(1)_:"):
+                  lines.index("c_l_s1_c_:")],
+            ["c_e_MASTER_BLEND_CONSTRAINT_root(1)_:",
+             "+1 MASTER_BLEND_VAR_root(x)",
+             "= 5",
+             "",
+             "c_e_MASTER_BLEND_CONSTRAINT_root(2)_:",
+             "+1 MASTER_BLEND_VAR_root(x)",
+             "-1 s2_x",
+             "= 0",
+             "",
+             "c_e_MASTER_BLEND_CONSTRAINT_root(3)_:",
+             "+1 MASTER_BLEND_VAR_root(x)",
+             "-1 s3_x",
+             "= 0",
+             ""])
+        self.assertIn("    -inf <= MASTER_BLEND_VAR_root(x) <= +inf", lines)
+
     def test_farmer_piecewise_ef(self):
         farmer_examples_dir = pysp_examples_dir + "farmerWpiecewise"
         model_dir = farmer_examples_dir + os.sep + "models"
@@ -2589,5 +2688,45 @@ class TestPHParallel(unittest.TestCase):
             self.fail("Differences identified relative to all baseline output file alternatives")
         _remove(this_test_file_directory+"networkflow1ef10_linearized_cplex_with_bundles_with_phpyro.out")
 
+class TestPHWeightUpdates(unittest.TestCase):
+
+    def test_values_getter(self):
+        from pyomo.pysp.ph import _values_getter
+        values = {'a': 1, 'b': 2, 'c': 3}
+        self.assertEqual(_values_getter(())(values), ())
+        self.assertEqual(_values_getter(('b',))(values), (2,))
+        self.assertEqual(_values_getter(('c', 'a'))(values), (3, 1))
+
+    def test_update_scenario_weights(self):
+        from pyomo.pysp.ph import _values_getter, _update_scenario_weights
+        variable_ids = ('a', 'b', 'c')
+        get_values = _values_getter(variable_ids)
+        xbars = (1.0, 2.0, 3.0)
+        blend = (1, 0, 1)
+        rho = {'a': 2.0, 'b': 2.0, 'c': 0.5}
+        x = {'a': 2.0, 'b': 5.0, 'c': None}
+
+        w = {'a': 1.0, 'b': 1.0, 'c': 1.0}
+        weights = _update_scenario_weights(
+            variable_ids, get_values, w, rho, x, xbars, blend,
+            0.5, True, False)
+        self.assertEqual(weights, [2.0, 1.0, None])
+        self.assertEqual(w, {'a': 2.0, 'b': 1.0, 'c': 1.0})
+
+        w = {'a': 1.0, 'b': 1.0, 'c': 1.0}
+        weights = _update_scenario_weights(
+            variable_ids, get_values, w, rho, x, xbars, blend,
+            0.5, False, False)
+        self.assertEqual(weights, [0.0, 1.0, None])
+        self.assertEqual(w, {'a': 0.0, 'b': 1.0, 'c': 1.0})
+
+        x['c'] = 5.0
+        w = {'a': 1.0, 'b': 1.0, 'c': 1.0}
+        weights = _update_scenario_weights(
+            variable_ids, get_values, w, rho, x, xbars, (1, 1, 1),
+            1.0, True, True)
+        self.assertEqual(weights, [2.0, 6.0, 1.0])
+        self.assertEqual(w, {'a': 2.0, 'b': 6.0, 'c': 1.0})
+
 if __name__ == "__main__":
     unittest.main()
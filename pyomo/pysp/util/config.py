@@ -779,7 +779,29 @@ safe_declare_unique_option(
             "process and performs all scenario tree operations "
             "sequentially. If 'pyro' is specified, the scenario tree "
             "is fully distributed and scenario tree operations are "
-            "performed asynchronously."
+            "performed asynchronously. If 'multiprocess' is specified, "
+            "the scenario tree is distributed over a pool of "
+            "scenario tree server processes launched on this machine "
+            "and scenario tree operations are performed "
+            "asynchronously."
+        ),
+        doc=None,
+        visibility=0),
+    ap_group=_scenario_tree_options_group_title)
+
+safe_declare_unique_option(
+    common_block,
+    "multiprocess_scenariotreeservers",
+    PySPConfigValue(
+        0,
+        domain=_domain_nonnegative_integer,
+        description=(
+            "Set the number of scenario tree server processes to "
+            "launch on this machine when the 'multiprocess' scenario "
+            "tree manager is selected. The number of processes is "
+            "limited to the number of scenarios (or bundles). The "
+            "default value of 0 indicates that one process should be "
+            "launched for each processor on this machine."
         ),
         doc=None,
         visibility=0),
@@ -1845,6 +1867,26 @@ safe_declare_unique_option(
         visibility=0),
     ap_group=_solve_options_group_title)
 
+safe_declare_unique_option(
+    common_block,
+    "persistent_solver",
+    PySPConfigValue(
+        False,
+        domain=bool,
+        description=(
+            "Bind each scenario (or bundle) to the persistent "
+            "interface of the solver (e.g., gurobi_persistent when "
+            "the solver is gurobi). Each sub-problem is translated "
+            "once, and later solves only update the solver model "
+            "with the changes to the objective, variables and "
+            "constraints rather than writing a new problem file. "
+            "Requires advanced preprocessing and the serial solver "
+            "manager."
+        ),
+        doc=None,
+        visibility=0),
+    ap_group=_solve_options_group_title)
+
 safe_declare_unique_option(
     common_block,
     "solver_manager",
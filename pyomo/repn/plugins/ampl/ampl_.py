@@ -12,7 +12,7 @@
 # AMPL Problem Writer Plugin
 #
 
-__all__ = ['ProblemWriter_nl']
+__all__ = ['ProblemWriter_nl', 'NLIncrementalCache']
 
 try:
     basestring
@@ -23,7 +23,9 @@ import itertools
 import logging
 import operator
 import os
+import struct
 import time
+import weakref
 
 from pyutilib.math.util import isclose
 from pyutilib.misc import PauseGC
@@ -33,6 +35,7 @@ from pyomo.opt.base import *
 from pyomo.core.expr import current as EXPR
 from pyomo.core.expr.numvalue import (NumericConstant,
                                       native_numeric_types,
+                                      nonpyomo_leaf_types,
                                       value)
 from pyomo.core.base import *
 from pyomo.core.base import SymbolMap, Block
@@ -48,7 +51,7 @@ from pyomo.core.kernel.block import IBlock
 from pyomo.core.kernel.expression import IIdentityExpression
 from pyomo.core.kernel.variable import IVariable
 
-from six import itervalues, iteritems
+from six import itervalues, iteritems, StringIO, BytesIO, string_types
 from six.moves import xrange, zip
 
 logger = logging.getLogger('pyomo.core')
@@ -187,11 +190,18 @@ class ModelSOS(object):
                 self.ids.append(idx)
                 self.vals.append(val)
 
-        def genfilelines(self):
-            base_line = "{0} {1}\n"
-            return [base_line.format(idx, val)
+        # sosno and ref values are written without repr so that
+        # integer-valued weights stay integers in the text format
+        line_template = "{0} {1}\n"
+
+        def nonzero_items(self):
+            return [(idx, val)
                     for idx, val in zip(self.ids,self.vals) if val != 0]
 
+        def genfilelines(self):
+            return [self.line_template.format(idx, val)
+                    for idx, val in self.nonzero_items()]
+
         def is_empty(self):
             return not bool(len(self.ids))
 
@@ -260,6 +270,332 @@ class RepnWrapper(object):
         self.linear_vars = linear
         self.nonlinear_vars = nonlinear
 
+def _label_filename(OUTPUT, ext):
+    """
+    Return the name of the .row or .col file written next to the NL
+    file.  The labels are discarded when the NL file is written to a
+    stream without a name (e.g., an in-memory buffer).
+    """
+    name = getattr(OUTPUT, 'name', None)
+    if not isinstance(name, string_types):
+        return os.devnull
+    if name.endswith('.nl'):
+        return name.replace('.nl',ext)
+    return name+ext
+
+class _NLOutput(object):
+    """
+    Writes the records of a text ("g") NL file to a stream.
+
+    The writer passes the data of each record (keyletters, integers,
+    reals and names) to the methods of this class rather than
+    formatting it itself, so that _BinaryNLOutput can write the same
+    records in the binary format.  Expression graphs are written with
+    the templates in ProblemWriter_nl._op_string, which are pre-encoded
+    for the output format.
+    """
+
+    binary = False
+
+    _bound_templates = {0: "%d %r %r\n",
+                        1: "%d %r\n",
+                        2: "%d %r\n",
+                        3: "%d\n",
+                        4: "%d %r\n",
+                        5: "%d %d %d\n"}
+
+    def __init__(self, ostream):
+        self._ostream = ostream
+        # used to name the .row and .col files
+        self.name = getattr(ostream, 'name', None)
+        self.write = ostream.write
+        self.writelines = ostream.writelines
+
+    def buffer(self):
+        """Return an output of the same format that writes to memory"""
+        return _NLOutput(StringIO())
+
+    def getvalue(self):
+        return self._ostream.getvalue()
+
+    def header(self, line):
+        """Write a line of the (always text) header"""
+        self.write(line)
+
+    def segment(self, key, args=(), name=None, comment=None):
+        """Write a segment keyletter followed by its integer
+        arguments, an optional name and an optional comment"""
+        line = key + " ".join("%d" % arg for arg in args)
+        if name is not None:
+            line += " " + name
+        if comment is not None:
+            line += "\t#" + comment
+        self.write(line + "\n")
+
+    def ints(self, values):
+        self.writelines("%d\n" % value for value in values)
+
+    def pairs(self, pairs):
+        """Write (integer, real) pairs (e.g., "x", "J" and "G" lines)"""
+        self.writelines("%d %r\n" % pair for pair in pairs)
+
+    def suffix(self, kind, name, pairs, template="{0} {1!r}\n"):
+        """Write an "S" segment. The values are reals if kind has
+        the bit for real-valued suffixes (4) set."""
+        self.segment("S", (kind, len(pairs)), name=name)
+        self.writelines(template.format(*pair) for pair in pairs)
+
+    def bounds(self, bounds):
+        """Write the lines of an "r" or "b" segment. Each bound is a
+        tuple of the bound type followed by its arguments."""
+        templates = self._bound_templates
+        self.writelines(templates[bound[0]] % bound for bound in bounds)
+
+# bound (and range) types are written as a single character
+_bound_type_char = dict((i, str(i).encode('ascii')) for i in xrange(6))
+
+class _BinaryNLOutput(_NLOutput):
+    """
+    Writes the records of a binary ("b") NL file to a stream.
+
+    The header is written as text (with the leading "g" replaced by
+    "b").  In the remaining segments, keyletters and bound types are
+    written as single characters, integers as native C ints, reals as
+    native C doubles, and strings as an int length followed by the
+    characters.  There are no comments in the binary format.
+    """
+
+    binary = True
+
+    _int = struct.Struct('=i').pack
+    _int_double = struct.Struct('=id').pack
+    _bound_packers = {0: struct.Struct('=cdd').pack,
+                      1: struct.Struct('=cd').pack,
+                      2: struct.Struct('=cd').pack,
+                      3: struct.Struct('=c').pack,
+                      4: struct.Struct('=cd').pack,
+                      5: struct.Struct('=cii').pack}
+
+    def buffer(self):
+        return _BinaryNLOutput(BytesIO())
+
+    def header(self, line):
+        if line.startswith('g'):
+            line = 'b' + line[1:]
+        self.write(line.encode('utf-8'))
+
+    def segment(self, key, args=(), name=None, comment=None):
+        data = key.encode('ascii') + \
+               struct.pack('=%di' % (len(args)), *args)
+        if name is not None:
+            data += _binary_string(name)
+        self.write(data)
+
+    def ints(self, values):
+        values = list(values)
+        self.write(struct.pack('=%di' % (len(values)), *values))
+
+    def pairs(self, pairs):
+        pack = self._int_double
+        self.write(b''.join(pack(i, x) for i, x in pairs))
+
+    def suffix(self, kind, name, pairs, template=None):
+        self.segment("S", (kind, len(pairs)), name=name)
+        if kind & 4:
+            self.pairs(pairs)
+        else:
+            self.ints(itertools.chain.from_iterable(
+                (i, int(x)) for i, x in pairs))
+
+    def bounds(self, bounds):
+        packers = self._bound_packers
+        self.write(b''.join(
+            packers[bound[0]](_bound_type_char[bound[0]], *bound[1:])
+            for bound in bounds))
+
+def _binary_string(text):
+    text = text.encode('utf-8')
+    return struct.pack('=i', len(text)) + text
+
+class _BinaryOp(object):
+    """
+    The binary equivalent of an expression template in
+    ProblemWriter_nl._op_string: formatting it with % packs the
+    arguments after a fixed prefix. Arguments that are only used in
+    comments are ignored.
+    """
+
+    __slots__ = ('_prefix', '_pack', '_nargs')
+
+    def __init__(self, prefix, fmt):
+        self._prefix = prefix
+        self._pack = struct.Struct('='+fmt).pack
+        self._nargs = len(fmt)
+
+    def __mod__(self, args):
+        if type(args) is not tuple:
+            args = (args,)
+        return self._prefix + self._pack(*args[:self._nargs])
+
+class _BinaryStringArg(object):
+    """The binary equivalent of the "h" (string argument) template"""
+
+    __slots__ = ()
+
+    def __mod__(self, args):
+        return b'h' + _binary_string(args[1])
+
+def _build_op_binary(op_template):
+    """Encode the text expression templates for the binary format"""
+    _arg_formats = {"%d": 'i', "%r": 'd', "%d %d": 'ii'}
+    def _encode(template):
+        if type(template) is tuple:
+            return tuple(_encode(t) for t in template)
+        template = template.format(C="")
+        if template.startswith('h'):
+            return _BinaryStringArg()
+        prefix = b''
+        fmt = ''
+        for line in template.splitlines():
+            if line in _arg_formats:
+                # e.g., the argument count of an n-ary operator
+                fmt += _arg_formats[line]
+            elif line[1:] in _arg_formats:
+                assert not fmt
+                prefix += line[0].encode('ascii')
+                fmt = _arg_formats[line[1:]]
+            else:
+                # a keyletter with a fixed integer (e.g., "o2")
+                assert not fmt
+                prefix += line[0].encode('ascii') + \
+                          struct.pack('=i', int(line[1:]))
+        if not fmt:
+            return prefix
+        return _BinaryOp(prefix, fmt)
+    return dict((optype, _encode(template))
+                for optype, template in iteritems(op_template))
+
+class _DependencyVisitor(EXPR.SimpleExpressionVisitor):
+    """
+    Collect the variables, mutable parameters and named expressions
+    that the standard repn of an expression depends on.
+    """
+
+    def __init__(self):
+        self.seen = set()
+        self.variables = []
+        self.parameters = []
+        self.named_expressions = []
+
+    def visit(self, node):
+        if node.__class__ in nonpyomo_leaf_types or id(node) in self.seen:
+            return
+        self.seen.add(id(node))
+        if node.is_variable_type():
+            self.variables.append(node)
+        elif node.is_named_expression_type():
+            self.named_expressions.append((node, node.expr))
+        elif isinstance(node, EXPR.LinearExpression):
+            # LinearExpression objects hide their terms from the
+            # expression walkers
+            for arg in itertools.chain((node.constant,),
+                                       node.linear_coefs,
+                                       node.linear_vars):
+                self.collect(arg)
+        elif not node.is_expression_type() and not node.is_constant():
+            self.parameters.append(node)
+
+    def collect(self, expr):
+        if expr.__class__ in nonpyomo_leaf_types or \
+           not expr.is_expression_type() or expr.nargs() == 0:
+            self.visit(expr)
+        else:
+            self.xbfs(expr)
+
+class _CachedRepn(object):
+    """
+    The standard repn of an objective or constraint expression (and the
+    NL segments printed from it) kept between calls to the NL writer in
+    incremental mode.  The repn is only reused while the expression is
+    unchanged and none of the mutable parameters, fixed variables or
+    named expressions it depends on have been modified.
+    """
+
+    __slots__ = ('expr', 'repn', 'segments',
+                 '_variables', '_parameters', '_named_expressions', '_state')
+
+    _free = object()
+
+    def __init__(self, expr, repn):
+        self.expr = expr
+        self.repn = repn
+        self.segments = {}
+        visitor = _DependencyVisitor()
+        visitor.collect(expr)
+        self._variables = visitor.variables
+        self._parameters = visitor.parameters
+        self._named_expressions = visitor.named_expressions
+        self._state = self._current_state()
+
+    def _current_state(self):
+        _free = self._free
+        return (tuple(v.value if v.fixed else _free for v in self._variables),
+                tuple(value(p) for p in self._parameters))
+
+    def is_current(self, expr):
+        if expr is not self.expr:
+            return False
+        for node, node_expr in self._named_expressions:
+            if node.expr is not node_expr:
+                return False
+        return self._state == self._current_state()
+
+class NLIncrementalCache(object):
+    """
+    The repns and NL segments kept between writes of a model by the
+    incremental mode of the NL writer.  The cache is opt-in: pass it
+    as the 'incremental' io_option of every write of the model, e.g.,
+
+        cache = NLIncrementalCache()
+        model.write('model.nl', io_options={'incremental': cache})
+
+    The cache is not stored on the model, so it is not cloned or
+    pickled with it.  It holds references to the components it has
+    cached, so drop it (or call clear()) when the model is no longer
+    written.  Entries are invalidated as follows:
+
+    - The repn of an objective or constraint is regenerated if its
+      expression object, the expression of a named expression it
+      uses, or the value of a mutable parameter or fixed variable it
+      depends on has changed since the last write.
+    - Objectives and constraints that are not written (e.g., because
+      they were deactivated or removed) are dropped.
+    - The NL segments are dropped if the column ordering, the labels
+      or the format of the file have changed.
+    - The cache is cleared if it is used to write a different model.
+    """
+
+    def __init__(self):
+        self._model = None
+        self.clear()
+
+    def clear(self):
+        """Drop all cached data"""
+        self.objectives = ComponentMap()
+        self.constraints = ComponentMap()
+        # The column ordering of the last write.  Cached segments
+        # reference the NL column ids, so they are only reused when
+        # the ordering has not changed.
+        self.layout = None
+        self.layout_vars = None
+
+    def _bind(self, model):
+        # The model is held by a weak reference, so the cache does not
+        # keep it alive once all of the cached data has been dropped
+        if self._model is None or self._model() is not model:
+            self.clear()
+            self._model = weakref.ref(model)
+
 
 @WriterFactory.register('nl', 'Generate the corresponding AMPL NL file.')
 class ProblemWriter_nl(AbstractProblemWriter):
@@ -272,6 +608,7 @@ class ProblemWriter_nl(AbstractProblemWriter):
         self._ampl_obj_id = {}
         self._OUTPUT = None
         self._varID_map = None
+        self._incremental_cache = None
 
     def __call__(self,
                  model,
@@ -327,6 +664,25 @@ class ProblemWriter_nl(AbstractProblemWriter):
         include_all_variable_bounds = \
             io_options.pop("include_all_variable_bounds", False)
 
+        # An NLIncrementalCache, in which the repns and NL segments
+        # generated for each objective and constraint are kept and
+        # reused by the next write as long as neither the expression
+        # nor the mutable parameters and fixed variables it depends on
+        # have changed.  If True, the cache is kept by this writer.
+        incremental = io_options.pop("incremental", False)
+        if isinstance(incremental, NLIncrementalCache):
+            pass
+        elif incremental:
+            if self._incremental_cache is None:
+                self._incremental_cache = NLIncrementalCache()
+            incremental = self._incremental_cache
+        else:
+            incremental = None
+
+        # If True, write the NL file in the binary ("b") format
+        # rather than the text ("g") format.
+        binary = io_options.pop("binary", False)
+
         if len(io_options):
             raise ValueError(
                 "ProblemWriter_nl passed unrecognized io_options:\n\t" +
@@ -338,47 +694,66 @@ class ProblemWriter_nl(AbstractProblemWriter):
         # Generate the operator strings templates. The value of
         # symbolic_solver_labels determines whether or not to
         # include "nl comments" (the equivalent AMPL functionality
-        # is "option nl_comments 1").
-        self._op_string = {}
-        for optype in _op_template:
-            template_str = _op_template[optype]
-            comment_str = _op_comment[optype]
-            if type(template_str) is tuple:
-                op_strings = []
-                for i in xrange(len(template_str)):
+        # is "option nl_comments 1"). There are no comments in the
+        # binary format.
+        if binary:
+            self._op_string = _build_op_binary(_op_template)
+        else:
+            self._op_string = {}
+            for optype in _op_template:
+                template_str = _op_template[optype]
+                comment_str = _op_comment[optype]
+                if type(template_str) is tuple:
+                    op_strings = []
+                    for i in xrange(len(template_str)):
+                        if symbolic_solver_labels:
+                            op_strings.append(template_str[i].format(C=comment_str[i]))
+                        else:
+                            op_strings.append(template_str[i].format(C=""))
+                    self._op_string[optype] = tuple(op_strings)
+                else:
                     if symbolic_solver_labels:
-                        op_strings.append(template_str[i].format(C=comment_str[i]))
+                        self._op_string[optype] = template_str.format(C=comment_str)
                     else:
-                        op_strings.append(template_str[i].format(C=""))
-                self._op_string[optype] = tuple(op_strings)
-            else:
-                if symbolic_solver_labels:
-                    self._op_string[optype] = template_str.format(C=comment_str)
-                else:
-                    self._op_string[optype] = template_str.format(C="")
+                        self._op_string[optype] = template_str.format(C="")
 
         # making these attributes so they do not need to be
         # passed into _print_nonlinear_terms_NL
         self._symbolic_solver_labels = symbolic_solver_labels
         self._output_fixed_variable_bounds = output_fixed_variable_bounds
+        self._incremental = incremental
         # Speeds up calling name on every component when
         # writing .row and .col files (when symbolic_solver_labels is True)
         self._name_labeler = NameLabeler()
 
         # Pause the GC for the duration of this method
         with PauseGC() as pgc:
-            with open(filename,"w") as f:
-                self._OUTPUT = f
-                symbol_map = self._print_model_NL(
+            if hasattr(filename, 'write'):
+                # an in-memory buffer or an open file
+                symbol_map = self._print_model_NL_to(
+                    filename,
+                    binary,
                     model,
                     solver_capability,
                     show_section_timing=show_section_timing,
                     skip_trivial_constraints=skip_trivial_constraints,
                     file_determinism=file_determinism,
                     include_all_variable_bounds=include_all_variable_bounds)
+            else:
+                with open(filename,"wb" if binary else "w") as f:
+                    symbol_map = self._print_model_NL_to(
+                        f,
+                        binary,
+                        model,
+                        solver_capability,
+                        show_section_timing=show_section_timing,
+                        skip_trivial_constraints=skip_trivial_constraints,
+                        file_determinism=file_determinism,
+                        include_all_variable_bounds=include_all_variable_bounds)
 
         self._symbolic_solver_labels = False
         self._output_fixed_variable_bounds = False
+        self._incremental = None
         self._name_labeler = None
 
         self._OUTPUT = None
@@ -386,6 +761,14 @@ class ProblemWriter_nl(AbstractProblemWriter):
         self._op_string = None
         return filename, symbol_map
 
+    def _print_model_NL_to(self, ostream, binary, model, solver_capability,
+                           **kwds):
+        if binary:
+            self._OUTPUT = _BinaryNLOutput(ostream)
+        else:
+            self._OUTPUT = _NLOutput(ostream)
+        return self._print_model_NL(model, solver_capability, **kwds)
+
     def _print_quad_term(self, v1, v2):
         OUTPUT = self._OUTPUT
         if v1 is not v2:
@@ -437,6 +820,71 @@ class ProblemWriter_nl(AbstractProblemWriter):
                 OUTPUT.write(coef_term_str % (coef))
             self._print_quad_term(v1, v2)
 
+    def _print_nonlinear_body_NL(self, repn):
+        if repn.nonlinear_expr is not None:
+            assert not repn.is_quadratic()
+            self._print_nonlinear_terms_NL(repn.nonlinear_expr)
+        else:
+            assert repn.is_quadratic()
+            self._print_standard_quadratic_NL(repn.quadratic_vars,
+                                              repn.quadratic_coefs)
+
+    def _print_jacobian_NL(self, wrapped_repn):
+        OUTPUT = self._OUTPUT
+        self_ampl_var_id = self.ampl_var_id
+        linear_dict = dict(zip(wrapped_repn.linear_vars,
+                               wrapped_repn.repn.linear_coefs))
+        OUTPUT.pairs(
+            (self_ampl_var_id[con_var], linear_dict[con_var])
+            for con_var in sorted(linear_dict.keys()))
+        if wrapped_repn.nonlinear_vars:
+            nl_con_vars = sorted(
+                set(wrapped_repn.nonlinear_vars).difference(
+                    wrapped_repn.linear_vars))
+            OUTPUT.pairs(
+                (self_ampl_var_id[con_var], 0)
+                for con_var in nl_con_vars)
+
+    def _print_gradient_NL(self, wrapped_repn):
+        OUTPUT = self._OUTPUT
+        self_ampl_var_id = self.ampl_var_id
+        grad_entries = {}
+        for idx, obj_var in enumerate(wrapped_repn.linear_vars):
+            grad_entries[self_ampl_var_id[obj_var]] = \
+                wrapped_repn.repn.linear_coefs[idx]
+        for obj_var in wrapped_repn.nonlinear_vars:
+            if obj_var not in wrapped_repn.linear_vars:
+                grad_entries[self_ampl_var_id[obj_var]] = 0
+        OUTPUT.pairs((var_ID, grad_entries[var_ID])
+                     for var_ID in sorted(grad_entries.keys()))
+
+    def _print_segment(self, cached, key, print_fcn, *args):
+        """Print an NL segment, reusing the output cached on a _CachedRepn"""
+        if cached is None:
+            print_fcn(*args)
+            return
+        segment = cached.segments.get(key, None)
+        if segment is None:
+            OUTPUT = self._OUTPUT
+            self._OUTPUT = OUTPUT.buffer()
+            try:
+                print_fcn(*args)
+                segment = self._OUTPUT.getvalue()
+            finally:
+                self._OUTPUT = OUTPUT
+            cached.segments[key] = segment
+        self._OUTPUT.write(segment)
+
+    def _cached_repn(self, component_data, expr, old_cache, new_cache):
+        """Return the repn of expr, reusing the one from the last write
+        if nothing it depends on has changed"""
+        cached = old_cache.get(component_data, None)
+        if cached is None or not cached.is_current(expr):
+            cached = _CachedRepn(
+                expr, generate_standard_repn(expr, quadratic=False))
+        new_cache[component_data] = cached
+        return cached.repn
+
     def _print_nonlinear_terms_NL(self, exp):
         OUTPUT = self._OUTPUT
         exp_type = type(exp)
@@ -670,6 +1118,17 @@ class ProblemWriter_nl(AbstractProblemWriter):
         output_fixed_variable_bounds = self._output_fixed_variable_bounds
         symbolic_solver_labels = self._symbolic_solver_labels
 
+        # Only the repns generated (or reused) by this write are kept
+        # in the incremental cache, so components that were removed or
+        # deactivated are dropped from it.
+        cache = self._incremental
+        if cache is not None:
+            cache._bind(model)
+            previous_objectives = cache.objectives
+            previous_constraints = cache.constraints
+            cache.objectives = ComponentMap()
+            cache.constraints = ComponentMap()
+
         sorter = SortComponents.unsorted
         if file_determinism >= 1:
             sorter = sorter | SortComponents.indices
@@ -835,8 +1294,14 @@ class ProblemWriter_nl(AbstractProblemWriter):
                         max_rowname_len = len(objname)
 
                 if gen_obj_repn:
-                    repn = generate_standard_repn(active_objective.expr,
-                                                  quadratic=False)
+                    if cache is None:
+                        repn = generate_standard_repn(active_objective.expr,
+                                                      quadratic=False)
+                    else:
+                        repn = self._cached_repn(active_objective,
+                                                 active_objective.expr,
+                                                 previous_objectives,
+                                                 cache.objectives)
                     block_repn[active_objective] = repn
                     linear_vars = repn.linear_vars
                     nonlinear_vars = repn.nonlinear_vars
@@ -953,8 +1418,14 @@ class ProblemWriter_nl(AbstractProblemWriter):
                     nonlinear_vars = repn.nonlinear_vars
                 else:
                     if gen_con_repn:
-                        repn = generate_standard_repn(constraint_data.body,
-                                                      quadratic=False)
+                        if cache is None:
+                            repn = generate_standard_repn(constraint_data.body,
+                                                          quadratic=False)
+                        else:
+                            repn = self._cached_repn(constraint_data,
+                                                     constraint_data.body,
+                                                     previous_constraints,
+                                                     cache.constraints)
                         block_repn[constraint_data] = repn
                         linear_vars = repn.linear_vars
                         nonlinear_vars = repn.nonlinear_vars
@@ -1031,8 +1502,7 @@ class ProblemWriter_nl(AbstractProblemWriter):
                 _vid = getattr(constraint_data, '_vid', None)
                 if not _type is None:
                     _vid = self_varID_map[_vid]+1
-                    constraint_bounds_dict[con_ID] = \
-                        "5 {0} {1}\n".format(_type, _vid)
+                    constraint_bounds_dict[con_ID] = (5, _type, _vid)
                     if _type == 1 or _type == 2:
                         n_single_sided_ineq += 1
                     elif _type == 3:
@@ -1047,17 +1517,16 @@ class ProblemWriter_nl(AbstractProblemWriter):
                     if L == U:
                         if L is None:
                             # No constraint on body
-                            constraint_bounds_dict[con_ID] = "3\n"
+                            constraint_bounds_dict[con_ID] = (3,)
                             n_unbounded += 1
                         else:
-                            constraint_bounds_dict[con_ID] = \
-                                "4 %r\n" % (L-offset)
+                            constraint_bounds_dict[con_ID] = (4, L-offset)
                             n_equals += 1
                     elif L is None:
-                        constraint_bounds_dict[con_ID] = "1 %r\n" % (U-offset)
+                        constraint_bounds_dict[con_ID] = (1, U-offset)
                         n_single_sided_ineq += 1
                     elif U is None:
-                        constraint_bounds_dict[con_ID] = "2 %r\n" % (L-offset)
+                        constraint_bounds_dict[con_ID] = (2, L-offset)
                         n_single_sided_ineq += 1
                     elif (L > U):
                         msg = 'Constraint {0}: lower bound greater than upper' \
@@ -1066,7 +1535,7 @@ class ProblemWriter_nl(AbstractProblemWriter):
                                                     str(L), str(U)))
                     else:
                         constraint_bounds_dict[con_ID] = \
-                            "0 %r %r\n" % (L-offset, U-offset)
+                            (0, L-offset, U-offset)
                         # double sided inequality
                         # both are not none and they are valid
                         n_ranges += 1
@@ -1201,6 +1670,29 @@ class ProblemWriter_nl(AbstractProblemWriter):
         symbol_map.addSymbols([(Vars_dict[var_ID],"v%d"%column_id)
                                for column_id,var_ID in enumerate(full_var_list)])
 
+        if cache is not None:
+            # The cached NL segments are only valid if they would be
+            # printed in the same format with the same column ids and
+            # labels
+            layout = (OUTPUT.binary,
+                      symbolic_solver_labels,
+                      tuple((var_ID, id(Vars_dict[var_ID]))
+                            for var_ID in full_var_list),
+                      tuple((fcn._function, fid) for fcn, fid
+                            in itervalues(self.external_byFcn)))
+            if layout != cache.layout:
+                for cached in itertools.chain(itervalues(cache.objectives),
+                                              itervalues(cache.constraints)):
+                    cached.segments.clear()
+                cache.layout = layout
+                # Keep the variables alive so their ids are not reused
+                cache.layout_vars = [Vars_dict[var_ID]
+                                     for var_ID in full_var_list]
+            cached_objectives = cache.objectives
+            cached_constraints = cache.constraints
+        else:
+            cached_objectives = cached_constraints = ComponentMap()
+
         if show_section_timing:
             subsection_timer.report("Partition variable types")
             subsection_timer.reset()
@@ -1208,11 +1700,7 @@ class ProblemWriter_nl(AbstractProblemWriter):
 #        end_time = time.clock()
 #        print (end_time - start_time)
 
-        colfilename = None
-        if OUTPUT.name.endswith('.nl'):
-            colfilename = OUTPUT.name.replace('.nl','.col')
-        else:
-            colfilename = OUTPUT.name+'.col'
+        colfilename = _label_filename(OUTPUT, '.col')
         if symbolic_solver_labels:
             colf = open(colfilename,'w')
             colfile_line_template = "%s\n"
@@ -1232,11 +1720,11 @@ class ProblemWriter_nl(AbstractProblemWriter):
         #
         # LINE 1
         #
-        OUTPUT.write("g3 1 1 0\t# problem {0}\n".format(model.name))
+        OUTPUT.header("g3 1 1 0\t# problem {0}\n".format(model.name))
         #
         # LINE 2
         #
-        OUTPUT.write(" {0} {1} {2} {3} {4} \t# vars, constraints, "
+        OUTPUT.header(" {0} {1} {2} {3} {4} \t# vars, constraints, "
                      "objectives, ranges, eqns\n" .format(
                          len(full_var_list),
                          n_single_sided_ineq + n_ranges+n_equals+n_unbounded,
@@ -1246,7 +1734,7 @@ class ProblemWriter_nl(AbstractProblemWriter):
         #
         # LINE 3
         #
-        OUTPUT.write(" {0} {1} {2} {3} {4} {5}\t# nonlinear constrs, "
+        OUTPUT.header(" {0} {1} {2} {3} {4} {5}\t# nonlinear constrs, "
                      "objs; ccons: lin, nonlin, nd, nzlb\n".format(
                          n_nonlinear_constraints,
                          n_nonlinear_objs,
@@ -1257,11 +1745,11 @@ class ProblemWriter_nl(AbstractProblemWriter):
         #
         # LINE 4
         #
-        OUTPUT.write(" 0 0\t# network constraints: nonlinear, linear\n")
+        OUTPUT.header(" 0 0\t# network constraints: nonlinear, linear\n")
         #
         # LINE 5
         #
-        OUTPUT.write(" {0} {1} {2} \t# nonlinear vars in constraints, "
+        OUTPUT.header(" {0} {1} {2} \t# nonlinear vars in constraints, "
                      "objectives, both\n".format(
                          idx_nl_con,
                          idx_nl_obj,
@@ -1270,7 +1758,7 @@ class ProblemWriter_nl(AbstractProblemWriter):
         #
         # LINE 6
         #
-        OUTPUT.write(" 0 {0} 0 1\t# linear network variables; functions; "
+        OUTPUT.header(" 0 {0} 0 1\t# linear network variables; functions; "
                      "arith, flags\n".format(len(self.external_byFcn)))
         #
         # LINE 7
@@ -1278,7 +1766,7 @@ class ProblemWriter_nl(AbstractProblemWriter):
         n_int_nonlinear_b = len(Discrete_Nonlinear_Vars_in_Objs_and_Constraints)
         n_int_nonlinear_c = len(ConNonlinearVarsInt)
         n_int_nonlinear_o = len(ObjNonlinearVarsInt)
-        OUTPUT.write(" {0} {1} {2} {3} {4} \t# discrete variables: binary, "
+        OUTPUT.header(" {0} {1} {2} {3} {4} \t# discrete variables: binary, "
                      "integer, nonlinear (b,c,o)\n".format(
                          len(LinearVarsBool),
                          len(LinearVarsInt),
@@ -1289,19 +1777,19 @@ class ProblemWriter_nl(AbstractProblemWriter):
         # LINE 8
         #
         # objective info computed above
-        OUTPUT.write(" {0} {1} \t# nonzeros in Jacobian, obj. gradient\n".format(
+        OUTPUT.header(" {0} {1} \t# nonzeros in Jacobian, obj. gradient\n".format(
             nnz_grad_constraints,
             len(ObjVars)))
         #
         # LINE 9
         #
-        OUTPUT.write(" %d %d\t# max name lengths: constraints, variables\n"
+        OUTPUT.header(" %d %d\t# max name lengths: constraints, variables\n"
                      % (max_rowname_len, max_colname_len))
 
         #
         # LINE 10
         #
-        OUTPUT.write(" 0 0 0 0 0\t# common exprs: b,c,o,c1,o1\n")
+        OUTPUT.header(" 0 0 0 0 0\t# common exprs: b,c,o,c1,o1\n")
 
 #        end_time = time.clock()
 #        print (end_time - start_time)
@@ -1315,7 +1803,7 @@ class ProblemWriter_nl(AbstractProblemWriter):
         #
         for fcn, fid in sorted(itervalues(self.external_byFcn),
                                key=operator.itemgetter(1)):
-            OUTPUT.write("F%d 1 -1 %s\n" % (fid, fcn._function))
+            OUTPUT.segment("F", (fid, 1, -1), name=fcn._function)
 
         #
         # "S" lines
@@ -1343,8 +1831,6 @@ class ProblemWriter_nl(AbstractProblemWriter):
         sosconstraint_sosno_vals = set(var_sosno_suffix.vals)
 
         # Translate the rest of the Pyomo Suffix components
-        suffix_header_line = "S{0} {1} {2}\n"
-        suffix_line = "{0} {1!r}\n"
         var_tag = 0
         con_tag = 1
         obj_tag = 2
@@ -1366,11 +1852,10 @@ class ProblemWriter_nl(AbstractProblemWriter):
         if not ('sosno' in suffix_dict):
             # We still need to write out the SOSConstraint suffixes
             # even though these may have not been "declared" on the model
-            s_lines = var_sosno_suffix.genfilelines()
-            len_s_lines = len(s_lines)
-            if len_s_lines > 0:
-                OUTPUT.write(suffix_header_line.format(var_tag,len_s_lines,'sosno'))
-                OUTPUT.writelines(s_lines)
+            s_lines = var_sosno_suffix.nonzero_items()
+            if len(s_lines) > 0:
+                OUTPUT.suffix(var_tag, 'sosno', s_lines,
+                              template=var_sosno_suffix.line_template)
         else:
             # I am choosing not to allow a user to mix the use of the Pyomo
             # SOSConstraint component and manual sosno declarations within
@@ -1393,11 +1878,10 @@ class ProblemWriter_nl(AbstractProblemWriter):
         if not ('ref' in suffix_dict):
             # We still need to write out the SOSConstraint suffixes
             # even though these may have not been "declared" on the model
-            s_lines = var_ref_suffix.genfilelines()
-            len_s_lines = len(s_lines)
-            if len_s_lines > 0:
-                OUTPUT.write(suffix_header_line.format(var_tag,len_s_lines,'ref'))
-                OUTPUT.writelines(s_lines)
+            s_lines = var_ref_suffix.nonzero_items()
+            if len(s_lines) > 0:
+                OUTPUT.suffix(var_tag, 'ref', s_lines,
+                              template=var_ref_suffix.line_template)
         else:
             # see reason (1) in the paragraph above for why we raise this
             # exception (replacing sosno with ref).
@@ -1462,28 +1946,19 @@ class ProblemWriter_nl(AbstractProblemWriter):
 
             ################## vars
             if len(var_s_lines) > 0:
-                OUTPUT.write(suffix_header_line.format(var_tag | float_tag,
-                                                       len(var_s_lines),
-                                                       suffix_name))
-                OUTPUT.writelines(suffix_line.format(*_l)
-                                  for _l in sorted(var_s_lines,
-                                                   key=operator.itemgetter(0)))
+                OUTPUT.suffix(var_tag | float_tag,
+                              suffix_name,
+                              sorted(var_s_lines, key=operator.itemgetter(0)))
             ################## constraints
             if len(con_s_lines) > 0:
-                OUTPUT.write(suffix_header_line.format(con_tag | float_tag,
-                                                       len(con_s_lines),
-                                                       suffix_name))
-                OUTPUT.writelines(suffix_line.format(*_l)
-                                  for _l in sorted(con_s_lines,
-                                                   key=operator.itemgetter(0)))
+                OUTPUT.suffix(con_tag | float_tag,
+                              suffix_name,
+                              sorted(con_s_lines, key=operator.itemgetter(0)))
             ################## objectives
             if len(obj_s_lines) > 0:
-                OUTPUT.write(suffix_header_line.format(obj_tag | float_tag,
-                                                       len(obj_s_lines),
-                                                       suffix_name))
-                OUTPUT.writelines(suffix_line.format(*_l)
-                                  for _l in sorted(obj_s_lines,
-                                                   key=operator.itemgetter(0)))
+                OUTPUT.suffix(obj_tag | float_tag,
+                              suffix_name,
+                              sorted(obj_s_lines, key=operator.itemgetter(0)))
             ################## problems (in this case the one problem)
             if len(mod_s_lines) > 0:
                 if len(mod_s_lines) > 1:
@@ -1491,23 +1966,16 @@ class ProblemWriter_nl(AbstractProblemWriter):
                         "ProblemWriter_nl: Collected multiple values for Suffix %s "
                         "referencing model %s. This is likely a bug."
                         % (suffix_name, model.name))
-                OUTPUT.write(suffix_header_line.format(prob_tag | float_tag,
-                                                       len(mod_s_lines),
-                                                       suffix_name))
-                OUTPUT.writelines(suffix_line.format(*_l)
-                                  for _l in sorted(mod_s_lines,
-                                                   key=operator.itemgetter(0)))
+                OUTPUT.suffix(prob_tag | float_tag,
+                              suffix_name,
+                              sorted(mod_s_lines, key=operator.itemgetter(0)))
 
         del modelSOS
 
         #
         # "C" lines
         #
-        rowfilename = None
-        if OUTPUT.name.endswith('.nl'):
-            rowfilename = OUTPUT.name.replace('.nl','.row')
-        else:
-            rowfilename = OUTPUT.name+'.row'
+        rowfilename = _label_filename(OUTPUT, '.row')
         if symbolic_solver_labels:
             rowf = open(rowfilename,'w')
 
@@ -1515,22 +1983,15 @@ class ProblemWriter_nl(AbstractProblemWriter):
         for con_ID in nonlin_con_order_list:
             con_data, wrapped_repn = Constraints_dict[con_ID]
             row_id = self_ampl_con_id[con_ID]
-            OUTPUT.write("C%d" % (row_id))
+            lbl = None
             if symbolic_solver_labels:
                 lbl = name_labeler(con_data)
-                OUTPUT.write("\t#%s" % (lbl))
                 rowf.write(lbl+"\n")
-            OUTPUT.write("\n")
+            OUTPUT.segment("C", (row_id,), comment=lbl)
 
-            if wrapped_repn.repn.nonlinear_expr is not None:
-                assert not wrapped_repn.repn.is_quadratic()
-                self._print_nonlinear_terms_NL(
-                    wrapped_repn.repn.nonlinear_expr)
-            else:
-                assert wrapped_repn.repn.is_quadratic()
-                self._print_standard_quadratic_NL(
-                    wrapped_repn.repn.quadratic_vars,
-                    wrapped_repn.repn.quadratic_coefs)
+            self._print_segment(cached_constraints.get(con_data, None), 'C',
+                                self._print_nonlinear_body_NL,
+                                wrapped_repn.repn)
 
             for var_ID in set(wrapped_repn.linear_vars).union(
                     wrapped_repn.nonlinear_vars):
@@ -1542,13 +2003,12 @@ class ProblemWriter_nl(AbstractProblemWriter):
             con_vars = set(wrapped_repn.linear_vars)
             for var_ID in con_vars:
                 cu[self_ampl_var_id[var_ID]] += 1
-            OUTPUT.write("C%d" % (row_id))
+            lbl = None
             if symbolic_solver_labels:
                 lbl = name_labeler(con_data)
-                OUTPUT.write("\t#%s" % (lbl))
                 rowf.write(lbl+"\n")
-            OUTPUT.write("\n")
-            OUTPUT.write("n0\n")
+            OUTPUT.segment("C", (row_id,), comment=lbl)
+            OUTPUT.write(self._op_string[NumericConstant] % (0))
 
         if show_section_timing:
             subsection_timer.report("Write NL header and suffix lines")
@@ -1563,12 +2023,11 @@ class ProblemWriter_nl(AbstractProblemWriter):
             if not obj.is_minimizing():
                 k = 1
 
-            OUTPUT.write("O%d %d" % (self_ampl_obj_id[obj_ID], k))
+            lbl = None
             if symbolic_solver_labels:
                 lbl = name_labeler(obj)
-                OUTPUT.write("\t#%s" % (lbl))
                 rowf.write(lbl+"\n")
-            OUTPUT.write("\n")
+            OUTPUT.segment("O", (self_ampl_obj_id[obj_ID], k), comment=lbl)
 
             if wrapped_repn.repn.is_linear():
                 OUTPUT.write(self._op_string[NumericConstant]
@@ -1579,15 +2038,9 @@ class ProblemWriter_nl(AbstractProblemWriter):
                     OUTPUT.write(binary_sum_str)
                     OUTPUT.write(self._op_string[NumericConstant]
                                  % (wrapped_repn.repn.constant))
-                if wrapped_repn.repn.nonlinear_expr is not None:
-                    assert not wrapped_repn.repn.is_quadratic()
-                    self._print_nonlinear_terms_NL(
-                        wrapped_repn.repn.nonlinear_expr)
-                else:
-                    assert wrapped_repn.repn.is_quadratic()
-                    self._print_standard_quadratic_NL(
-                        wrapped_repn.repn.quadratic_vars,
-                        wrapped_repn.repn.quadratic_coefs)
+                self._print_segment(cached_objectives.get(obj, None), 'O',
+                                    self._print_nonlinear_body_NL,
+                                    wrapped_repn.repn)
 
         if symbolic_solver_labels:
             rowf.close()
@@ -1618,13 +2071,10 @@ class ProblemWriter_nl(AbstractProblemWriter):
                         pass
 
             if len(s_lines) > 0:
-                OUTPUT.write("d%d" % (len(s_lines)))
-                if symbolic_solver_labels:
-                    OUTPUT.write("\t# dual initial guess")
-                OUTPUT.write("\n")
-                OUTPUT.writelines(suffix_line.format(*_l)
-                                  for _l in sorted(s_lines,
-                                                   key=operator.itemgetter(0)))
+                OUTPUT.segment("d", (len(s_lines),),
+                               comment=(" dual initial guess"
+                                        if symbolic_solver_labels else None))
+                OUTPUT.pairs(sorted(s_lines, key=operator.itemgetter(0)))
 
         #
         # "x" lines
@@ -1635,7 +2085,7 @@ class ProblemWriter_nl(AbstractProblemWriter):
         for ampl_var_id, var_ID in enumerate(full_var_list):
             var = Vars_dict[var_ID]
             if var.value is not None:
-                x_init_list.append("%d %r\n" % (ampl_var_id, var.value))
+                x_init_list.append((ampl_var_id, var.value))
             if var.fixed:
                 if not output_fixed_variable_bounds:
                     raise ValueError(
@@ -1658,21 +2108,20 @@ class ProblemWriter_nl(AbstractProblemWriter):
             if L is not None:
                 if U is not None:
                     if L == U:
-                        var_bound_list.append("4 %r\n" % (L))
+                        var_bound_list.append((4, L))
                     else:
-                        var_bound_list.append("0 %r %r\n" % (L, U))
+                        var_bound_list.append((0, L, U))
                 else:
-                    var_bound_list.append("2 %r\n" % (L))
+                    var_bound_list.append((2, L))
             elif U is not None:
-                var_bound_list.append("1 %r\n" % (U))
+                var_bound_list.append((1, U))
             else:
-                var_bound_list.append("3\n")
+                var_bound_list.append((3,))
 
-        OUTPUT.write("x%d" % (len(x_init_list)))
-        if symbolic_solver_labels:
-            OUTPUT.write("\t# initial guess")
-        OUTPUT.write("\n")
-        OUTPUT.writelines(x_init_list)
+        OUTPUT.segment("x", (len(x_init_list),),
+                       comment=(" initial guess"
+                                if symbolic_solver_labels else None))
+        OUTPUT.pairs(x_init_list)
         del x_init_list
 
         if show_section_timing:
@@ -1682,15 +2131,15 @@ class ProblemWriter_nl(AbstractProblemWriter):
         #
         # "r" lines
         #
-        OUTPUT.write("r")
-        if symbolic_solver_labels:
-            OUTPUT.write("\t#%d ranges (rhs's)"
-                         % (len(nonlin_con_order_list) + len(lin_con_order_list)))
-        OUTPUT.write("\n")
+        OUTPUT.segment("r",
+                       comment=("%d ranges (rhs's)"
+                                % (len(nonlin_con_order_list) +
+                                   len(lin_con_order_list))
+                                if symbolic_solver_labels else None))
         # *NOTE: This iteration follows the assignment of the ampl_con_id
-        OUTPUT.writelines(constraint_bounds_dict[con_ID]
-                          for con_ID in itertools.chain(nonlin_con_order_list,
-                                                        lin_con_order_list))
+        OUTPUT.bounds(constraint_bounds_dict[con_ID]
+                      for con_ID in itertools.chain(nonlin_con_order_list,
+                                                    lin_con_order_list))
 
         if show_section_timing:
             subsection_timer.report("Write constraint bounds")
@@ -1699,12 +2148,11 @@ class ProblemWriter_nl(AbstractProblemWriter):
         #
         # "b" lines
         #
-        OUTPUT.write("b")
-        if symbolic_solver_labels:
-            OUTPUT.write("\t#%d bounds (on variables)"
-                         % (len(var_bound_list)))
-        OUTPUT.write("\n")
-        OUTPUT.writelines(var_bound_list)
+        OUTPUT.segment("b",
+                       comment=("%d bounds (on variables)"
+                                % (len(var_bound_list))
+                                if symbolic_solver_labels else None))
+        OUTPUT.bounds(var_bound_list)
         del var_bound_list
 
         if show_section_timing:
@@ -1716,14 +2164,16 @@ class ProblemWriter_nl(AbstractProblemWriter):
         #
         ktot = 0
         n1 = len(full_var_list) - 1
-        OUTPUT.write("k%d" % (n1))
-        if symbolic_solver_labels:
-            OUTPUT.write("\t#intermediate Jacobian column lengths")
-        OUTPUT.write("\n")
+        OUTPUT.segment("k", (n1,),
+                       comment=("intermediate Jacobian column lengths"
+                                if symbolic_solver_labels else None))
         ktot = 0
+        k_lines = []
         for i in xrange(n1):
             ktot += cu[i]
-            OUTPUT.write("%d\n"%(ktot))
+            k_lines.append(ktot)
+        OUTPUT.ints(k_lines)
+        del k_lines
         del cu
 
         if show_section_timing:
@@ -1740,40 +2190,17 @@ class ProblemWriter_nl(AbstractProblemWriter):
             numlinear_vars = len(wrapped_repn.linear_vars)
             if numnonlinear_vars == 0:
                 if numlinear_vars > 0:
-                    linear_dict = dict((var_ID, coef)
-                                       for var_ID, coef in
-                                       zip(wrapped_repn.linear_vars,
-                                           wrapped_repn.repn.linear_coefs))
-                    OUTPUT.write("J%d %d\n"%(nc, numlinear_vars))
-                    OUTPUT.writelines(
-                        "%d %r\n" % (self_ampl_var_id[con_var],
-                                     linear_dict[con_var])
-                        for con_var in sorted(linear_dict.keys()))
-            elif numlinear_vars == 0:
-                nl_con_vars = \
-                    sorted(wrapped_repn.nonlinear_vars)
-                OUTPUT.write("J%d %d\n"%(nc, numnonlinear_vars))
-                OUTPUT.writelines(
-                    "%d 0\n"%(self_ampl_var_id[con_var])
-                    for con_var in nl_con_vars)
+                    OUTPUT.segment("J", (nc, numlinear_vars))
+                    self._print_segment(cached_constraints.get(con_data, None),
+                                        'J', self._print_jacobian_NL,
+                                        wrapped_repn)
             else:
                 con_vars = set(wrapped_repn.nonlinear_vars)
-                nl_con_vars = sorted(
-                    con_vars.difference(
-                        wrapped_repn.linear_vars))
                 con_vars.update(wrapped_repn.linear_vars)
-                linear_dict = dict(
-                    (var_ID, coef) for var_ID, coef in
-                    zip(wrapped_repn.linear_vars,
-                        wrapped_repn.repn.linear_coefs))
-                OUTPUT.write("J%d %d\n"%(nc, len(con_vars)))
-                OUTPUT.writelines(
-                    "%d %r\n" % (self_ampl_var_id[con_var],
-                                 linear_dict[con_var])
-                    for con_var in sorted(linear_dict.keys()))
-                OUTPUT.writelines(
-                    "%d 0\n"%(self_ampl_var_id[con_var])
-                    for con_var in nl_con_vars)
+                OUTPUT.segment("J", (nc, len(con_vars)))
+                self._print_segment(cached_constraints.get(con_data, None),
+                                    'J', self._print_jacobian_NL,
+                                    wrapped_repn)
 
 
         if show_section_timing:
@@ -1786,21 +2213,14 @@ class ProblemWriter_nl(AbstractProblemWriter):
         for obj_ID, (obj, wrapped_repn) in \
                iteritems(Objectives_dict):
 
-            grad_entries = {}
-            for idx, obj_var in enumerate(
-                    wrapped_repn.linear_vars):
-                grad_entries[self_ampl_var_id[obj_var]] = \
-                    wrapped_repn.repn.linear_coefs[idx]
-            for obj_var in wrapped_repn.nonlinear_vars:
-                if obj_var not in wrapped_repn.linear_vars:
-                    grad_entries[self_ampl_var_id[obj_var]] = 0
-            len_ge = len(grad_entries)
+            obj_vars = set(wrapped_repn.nonlinear_vars)
+            obj_vars.update(wrapped_repn.linear_vars)
+            len_ge = len(obj_vars)
             if len_ge > 0:
-                OUTPUT.write("G%d %d\n" % (self_ampl_obj_id[obj_ID],
-                                           len_ge))
-                for var_ID in sorted(grad_entries.keys()):
-                    OUTPUT.write("%d %r\n" % (var_ID,
-                                              grad_entries[var_ID]))
+                OUTPUT.segment("G", (self_ampl_obj_id[obj_ID], len_ge))
+                self._print_segment(cached_objectives.get(obj, None), 'G',
+                                    self._print_gradient_NL,
+                                    wrapped_repn)
 
         if show_section_timing:
             subsection_timer.report("Write G lines")
@@ -215,16 +215,19 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
                 # Order columns by dictionary names
                 #
                 names = [variable_symbol_dictionary[id(var)] for var in x.linear_vars]
-                    
-                for i, name in sorted(enumerate(names), key=lambda x: x[1]):
-                    output.append(linear_coef_string_template % (x.linear_coefs[i], name))
+                output.extend(
+                    linear_coef_string_template % (coef, name)
+                    for name, coef in sorted(zip(names, x.linear_coefs),
+                                             key=operator.itemgetter(0)))
             else:
                 #
                 # Order columns by the value of column_order[]
                 #
-                for i, var in sorted(enumerate(x.linear_vars), key=lambda x: column_order[x[1]]):
-                    name = variable_symbol_dictionary[id(var)]
-                    output.append(linear_coef_string_template % (x.linear_coefs[i], name))
+                output.extend(
+                    linear_coef_string_template
+                    % (coef, variable_symbol_dictionary[id(var)])
+                    for var, coef in sorted(zip(x.linear_vars, x.linear_coefs),
+                                            key=lambda x: column_order[x[0]]))
         #
         # Quadratic
         #
@@ -377,6 +380,138 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
                               % (variable_symbol_map.getSymbol(vardata),
                                  weight))
 
+    def _print_constraint_rows(self,
+                               con_symbol,
+                               constraint_data,
+                               body,
+                               offset,
+                               output):
+        """
+        Prints the rows of a constraint, given the (already formatted)
+        body and the constant offset returned by _print_expr_canonical.
+        Returns the list of row labels (range constraints are written
+        as two rows).
+        """
+        labels = []
+        if constraint_data.equality:
+            assert value(constraint_data.lower) == \
+                value(constraint_data.upper)
+            label = 'c_e_%s_' % con_symbol
+            labels.append(label)
+            output.append(label)
+            output.append(':\n')
+            output.extend(body)
+            bound = constraint_data.lower
+            bound = _get_bound(bound) - offset
+            output.append(self.eq_string_template
+                              % (_no_negative_zero(bound)))
+            output.append("\n")
+        else:
+            if constraint_data.has_lb():
+                if constraint_data.has_ub():
+                    label = 'r_l_%s_' % con_symbol
+                else:
+                    label = 'c_l_%s_' % con_symbol
+                labels.append(label)
+                output.append(label)
+                output.append(':\n')
+                output.extend(body)
+                bound = constraint_data.lower
+                bound = _get_bound(bound) - offset
+                output.append(self.geq_string_template
+                                  % (_no_negative_zero(bound)))
+            else:
+                assert constraint_data.has_ub()
+
+            if constraint_data.has_ub():
+                if constraint_data.has_lb():
+                    label = 'r_u_%s_' % con_symbol
+                else:
+                    label = 'c_u_%s_' % con_symbol
+                labels.append(label)
+                output.append(label)
+                output.append(':\n')
+                output.extend(body)
+                bound = constraint_data.upper
+                bound = _get_bound(bound) - offset
+                output.append(self.leq_string_template
+                                  % (_no_negative_zero(bound)))
+            else:
+                assert constraint_data.has_lb()
+
+        return labels
+
+    def _print_variable_bounds(self,
+                               model,
+                               name_to_output,
+                               vardata,
+                               output_fixed_variable_bounds,
+                               output):
+        """
+        Prints the bounds of a variable.  Returns the section
+        ('general' or 'binary') the variable must also be listed in,
+        or None for continuous variables.
+        """
+        if name_to_output == "e":
+            raise ValueError(
+                "Attempting to write variable with name 'e' in a CPLEX LP "
+                "formatted file will cause a parse failure due to confusion with "
+                "numeric values expressed in scientific notation")
+
+        # integer and binary variables are also listed in the general /
+        # binary sections
+        if vardata.is_binary():
+            section = "binary"
+        elif vardata.is_integer():
+            section = "general"
+        elif vardata.is_continuous():
+            section = None
+        else:
+            raise TypeError("Invalid domain type for variable with name '%s'. "
+                            "Variable is not continuous, integer, or binary."
+                            % (vardata.name))
+
+        if vardata.fixed:
+            if not output_fixed_variable_bounds:
+                raise ValueError(
+                    "Encountered a fixed variable (%s) inside an active "
+                    "objective or constraint expression on model %s, which is "
+                    "usually indicative of a preprocessing error. Use the "
+                    "IO-option 'output_fixed_variable_bounds=True' to suppress "
+                    "this error and fix the variable by overwriting its bounds "
+                    "in the LP file." % (vardata.name, model.name))
+            if vardata.value is None:
+                raise ValueError("Variable cannot be fixed to a value of None.")
+            vardata_lb = value(vardata.value)
+            vardata_ub = value(vardata.value)
+
+            output.append("   ")
+            output.append(self.lb_string_template
+                                  % (_no_negative_zero(vardata_lb)))
+            output.append(name_to_output)
+            output.append(self.ub_string_template
+                                  % (_no_negative_zero(vardata_ub)))
+        else:
+            vardata_lb = _get_bound(vardata.lb)
+            vardata_ub = _get_bound(vardata.ub)
+
+            # Pyomo assumes that the default variable bounds are -inf and +inf
+            output.append("   ")
+            if vardata.has_lb():
+                output.append(self.lb_string_template
+                                  % (_no_negative_zero(vardata_lb)))
+            else:
+                output.append(" -inf <= ")
+
+            output.append(name_to_output)
+            if vardata.has_ub():
+                output.append(self.ub_string_template
+                                  % (_no_negative_zero(vardata_ub)))
+            else:
+                output.append(" <= +inf\n")
+
+        return section
+
     def _print_model_LP(self,
                         model,
                         output_file,
@@ -390,12 +525,6 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
                         force_objective_constant=False,
                         include_all_variable_bounds=False):
 
-        eq_string_template = self.eq_string_template
-        leq_string_template = self.leq_string_template
-        geq_string_template = self.geq_string_template
-        ub_string_template = self.ub_string_template
-        lb_string_template = self.lb_string_template
-
         symbol_map = SymbolMap()
         variable_symbol_map = SymbolMap()
         # NOTE: we use createSymbol instead of getSymbol because we
@@ -460,6 +589,8 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
 
         # cache - these are called all the time.
         print_expr_canonical = self._print_expr_canonical
+        print_constraint_rows = self._print_constraint_rows
+        print_variable_bounds = self._print_variable_bounds
 
         # print the model name and the source, so we know roughly where
         # it came from.
@@ -641,66 +772,22 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
             # Create symbol
             con_symbol = create_symbol_func(symbol_map, constraint_data, labeler)
 
-            if constraint_data.equality:
-                assert value(constraint_data.lower) == \
-                    value(constraint_data.upper)
-                label = 'c_e_%s_' % con_symbol
+            # The body is only formatted once, even for range
+            # constraints (which write it as two rows)
+            body = []
+            offset = print_expr_canonical(repn,
+                                          body,
+                                          object_symbol_dictionary,
+                                          variable_symbol_dictionary,
+                                          False,
+                                          column_order)
+
+            for label in print_constraint_rows(con_symbol,
+                                               constraint_data,
+                                               body,
+                                               offset,
+                                               output):
                 alias_symbol_func(symbol_map, constraint_data, label)
-                output.append(label)
-                output.append(':\n')
-                offset = print_expr_canonical(repn,
-                                              output,
-                                              object_symbol_dictionary,
-                                              variable_symbol_dictionary,
-                                              False,
-                                              column_order)
-                bound = constraint_data.lower
-                bound = _get_bound(bound) - offset
-                output.append(eq_string_template
-                                  % (_no_negative_zero(bound)))
-                output.append("\n")
-            else:
-                if constraint_data.has_lb():
-                    if constraint_data.has_ub():
-                        label = 'r_l_%s_' % con_symbol
-                    else:
-                        label = 'c_l_%s_' % con_symbol
-                    alias_symbol_func(symbol_map, constraint_data, label)
-                    output.append(label)
-                    output.append(':\n')
-                    offset = print_expr_canonical(repn,
-                                                  output,
-                                                  object_symbol_dictionary,
-                                                  variable_symbol_dictionary,
-                                                  False,
-                                                  column_order)
-                    bound = constraint_data.lower
-                    bound = _get_bound(bound) - offset
-                    output.append(geq_string_template
-                                      % (_no_negative_zero(bound)))
-                else:
-                    assert constraint_data.has_ub()
-
-                if constraint_data.has_ub():
-                    if constraint_data.has_lb():
-                        label = 'r_u_%s_' % con_symbol
-                    else:
-                        label = 'c_u_%s_' % con_symbol
-                    alias_symbol_func(symbol_map, constraint_data, label)
-                    output.append(label)
-                    output.append(':\n')
-                    offset = print_expr_canonical(repn,
-                                                  output,
-                                                  object_symbol_dictionary,
-                                                  variable_symbol_dictionary,
-                                                  False,
-                                                  column_order)
-                    bound = constraint_data.upper
-                    bound = _get_bound(bound) - offset
-                    output.append(leq_string_template
-                                      % (_no_negative_zero(bound)))
-                else:
-                    assert constraint_data.has_lb()
 
             # A simple hack to avoid caching super large files
             if len(output) > 1024:
@@ -794,61 +881,15 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
                 continue
 
             name_to_output = variable_symbol_dictionary[id(vardata)]
-            if name_to_output == "e":
-                raise ValueError(
-                    "Attempting to write variable with name 'e' in a CPLEX LP "
-                    "formatted file will cause a parse failure due to confusion with "
-                    "numeric values expressed in scientific notation")
-
-            # track the number of integer and binary variables, so we know whether
-            # to output the general / binary sections below.
-            if vardata.is_binary():
+            section = print_variable_bounds(model,
+                                            name_to_output,
+                                            vardata,
+                                            output_fixed_variable_bounds,
+                                            output)
+            if section == "binary":
                 binary_vars.append(name_to_output)
-            elif vardata.is_integer():
+            elif section == "general":
                 integer_vars.append(name_to_output)
-            elif not vardata.is_continuous():
-                raise TypeError("Invalid domain type for variable with name '%s'. "
-                                "Variable is not continuous, integer, or binary."
-                                % (vardata.name))
-
-            if vardata.fixed:
-                if not output_fixed_variable_bounds:
-                    raise ValueError(
-                        "Encountered a fixed variable (%s) inside an active "
-                        "objective or constraint expression on model %s, which is "
-                        "usually indicative of a preprocessing error. Use the "
-                        "IO-option 'output_fixed_variable_bounds=True' to suppress "
-                        "this error and fix the variable by overwriting its bounds "
-                        "in the LP file." % (vardata.name, model.name))
-                if vardata.value is None:
-                    raise ValueError("Variable cannot be fixed to a value of None.")
-                vardata_lb = value(vardata.value)
-                vardata_ub = value(vardata.value)
-
-                output.append("   ")
-                output.append(lb_string_template
-                                      % (_no_negative_zero(vardata_lb)))
-                output.append(name_to_output)
-                output.append(ub_string_template
-                                      % (_no_negative_zero(vardata_ub)))
-            else:
-                vardata_lb = _get_bound(vardata.lb)
-                vardata_ub = _get_bound(vardata.ub)
-
-                # Pyomo assumes that the default variable bounds are -inf and +inf
-                output.append("   ")
-                if vardata.has_lb():
-                    output.append(lb_string_template
-                                      % (_no_negative_zero(vardata_lb)))
-                else:
-                    output.append(" -inf <= ")
-
-                output.append(name_to_output)
-                if vardata.has_ub():
-                    output.append(ub_string_template
-                                      % (_no_negative_zero(vardata_ub)))
-                else:
-                    output.append(" <= +inf\n")
 
         if len(integer_vars) > 0:
 
@@ -182,15 +182,19 @@ class ProblemWriter_mps(AbstractProblemWriter):
             repn,
             column_data,
             quadratic_data,
-            variable_to_column):
+            column_ids):
 
         #
         # Linear
         #
         if len(repn.linear_coefs) > 0:
-            for vardata, coef in zip(repn.linear_vars, repn.linear_coefs):
-                self._referenced_variable_ids[id(vardata)] = vardata
-                column_data[variable_to_column[vardata]].append((row_label, coef))
+            linear_vars = repn.linear_vars
+            self._referenced_variable_ids.update(
+                zip(map(id, linear_vars), linear_vars))
+            for col, coef in zip(map(column_ids.__getitem__,
+                                     map(id, linear_vars)),
+                                 repn.linear_coefs):
+                column_data[col].append((row_label, coef))
 
         #
         # Quadratic
@@ -320,6 +324,9 @@ class ProblemWriter_mps(AbstractProblemWriter):
         # prepare to hold the sparse columns
         variable_to_column = ComponentMap(
             (vardata, i) for i, vardata in enumerate(variable_list))
+        # (the same, keyed by id, for the linear coefficients)
+        column_ids = dict(
+            (id(vardata), i) for i, vardata in enumerate(variable_list))
         # add one position for ONE_VAR_CONSTANT
         column_data = [[] for i in xrange(len(variable_list)+1)]
         quadobj_data = []
@@ -405,7 +412,7 @@ class ProblemWriter_mps(AbstractProblemWriter):
                     repn,
                     column_data,
                     quadobj_data,
-                    variable_to_column)
+                    column_ids)
                 if force_objective_constant or (constant != 0.0):
                     # ONE_VAR_CONSTANT
                     column_data[-1].append((objective_label, constant))
@@ -458,6 +465,8 @@ class ProblemWriter_mps(AbstractProblemWriter):
         else:
             yield_all_constraints = constraint_generator
 
+        # the rows of the constraints are written in chunks
+        row_lines = []
         for constraint_data, repn in yield_all_constraints():
 
             degree = repn.polynomial_degree()
@@ -482,13 +491,13 @@ class ProblemWriter_mps(AbstractProblemWriter):
                     value(constraint_data.upper)
                 label = 'c_e_' + con_symbol + '_'
                 alias_symbol_func(symbol_map, constraint_data, label)
-                output_file.write(" E  %s\n" % (label))
+                row_lines.append(" E  %s\n" % (label))
                 offset = extract_variable_coefficients(
                     label,
                     repn,
                     column_data,
                     quadmatrix_data,
-                    variable_to_column)
+                    column_ids)
                 bound = constraint_data.lower
                 bound = _get_bound(bound) - offset
                 rhs_data.append((label, _no_negative_zero(bound)))
@@ -499,13 +508,13 @@ class ProblemWriter_mps(AbstractProblemWriter):
                     else:
                         label = 'c_l_' + con_symbol + '_'
                     alias_symbol_func(symbol_map, constraint_data, label)
-                    output_file.write(" G  %s\n" % (label))
+                    row_lines.append(" G  %s\n" % (label))
                     offset = extract_variable_coefficients(
                         label,
                         repn,
                         column_data,
                         quadmatrix_data,
-                        variable_to_column)
+                        column_ids)
                     bound = constraint_data.lower
                     bound = _get_bound(bound) - offset
                     rhs_data.append((label, _no_negative_zero(bound)))
@@ -518,41 +527,47 @@ class ProblemWriter_mps(AbstractProblemWriter):
                     else:
                         label = 'c_u_' + con_symbol + '_'
                     alias_symbol_func(symbol_map, constraint_data, label)
-                    output_file.write(" L  %s\n" % (label))
+                    row_lines.append(" L  %s\n" % (label))
                     offset = extract_variable_coefficients(
                         label,
                         repn,
                         column_data,
                         quadmatrix_data,
-                        variable_to_column)
+                        column_ids)
                     bound = constraint_data.upper
                     bound = _get_bound(bound) - offset
                     rhs_data.append((label, _no_negative_zero(bound)))
                 else:
                     assert constraint_data.has_lb()
 
+            # A simple hack to avoid caching super large files
+            if len(row_lines) > 1024:
+                output_file.write("".join(row_lines))
+                row_lines = []
+
         if len(column_data[-1]) > 0:
             # ONE_VAR_CONSTANT = 1
-            output_file.write(" E  c_e_ONE_VAR_CONSTANT\n")
+            row_lines.append(" E  c_e_ONE_VAR_CONSTANT\n")
             column_data[-1].append(("c_e_ONE_VAR_CONSTANT",1))
             rhs_data.append(("c_e_ONE_VAR_CONSTANT",1))
+        output_file.write("".join(row_lines))
+        del row_lines
 
         #
         # COLUMNS section
         #
         column_template = "     %s %s %"+self._precision_string+"\n"
         output_file.write("COLUMNS\n")
-        cnt = 0
-        for vardata in variable_list:
-            col_entries = column_data[variable_to_column[vardata]]
-            cnt += 1
+        # the section is written in chunks
+        column_lines = []
+        for col, vardata in enumerate(variable_list):
+            col_entries = column_data[col]
             if len(col_entries) > 0:
                 var_label = variable_symbol_dictionary[id(vardata)]
-                for i, (row_label, coef) in enumerate(col_entries):
-                    output_file.write(column_template
-                                      % (var_label,
-                                         row_label,
-                                         _no_negative_zero(coef)))
+                # (coef or 0) converts any -0 to 0
+                column_lines.extend(
+                    column_template % (var_label, row_label, coef or 0)
+                    for row_label, coef in col_entries)
             elif include_all_variable_bounds:
                 # the column is empty, so add a (0 * var)
                 # term to the objective
@@ -562,29 +577,37 @@ class ProblemWriter_mps(AbstractProblemWriter):
                 #   seem to work for CPLEX 12.6, so I am
                 #   doing it this way so that it will work for both
                 var_label = variable_symbol_dictionary[id(vardata)]
-                output_file.write(column_template
-                                  % (var_label,
-                                     objective_label,
-                                     0))
-
-        assert cnt == len(column_data)-1
+                column_lines.append(column_template
+                                    % (var_label,
+                                       objective_label,
+                                       0))
+            # A simple hack to avoid caching super large files
+            if len(column_lines) > 1024:
+                output_file.write("".join(column_lines))
+                column_lines = []
+
+        assert len(variable_list) == len(column_data)-1
         if len(column_data[-1]) > 0:
             col_entries = column_data[-1]
             var_label = "ONE_VAR_CONSTANT"
-            for i, (row_label, coef) in enumerate(col_entries):
-                output_file.write(column_template
-                                  % (var_label,
-                                     row_label,
-                                     _no_negative_zero(coef)))
+            column_lines.extend(
+                column_template % (var_label,
+                                   row_label,
+                                   _no_negative_zero(coef))
+                for row_label, coef in col_entries)
+        output_file.write("".join(column_lines))
+        del column_lines
 
         #
         # RHS section
         #
         rhs_template = "     RHS %s %"+self._precision_string+"\n"
         output_file.write("RHS\n")
-        for i, (row_label, rhs) in enumerate(rhs_data):
-            # note: we have already converted any -0 to 0 by this point
-            output_file.write(rhs_template % (row_label, rhs))
+        # note: we have already converted any -0 to 0 by this point
+        for i in xrange(0, len(rhs_data), 1024):
+            output_file.write("".join(rhs_template % (row_label, rhs)
+                                      for row_label, rhs
+                                      in rhs_data[i:i+1024]))
 
         # SOS constraints
         SOSlines = StringIO()
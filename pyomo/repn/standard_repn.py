@@ -14,15 +14,18 @@ __all__ = ['StandardRepn', 'generate_standard_repn']
 
 
 import sys
+import os
 import logging
 import math
 import itertools
+import multiprocessing
 
 from pyomo.core.base import (Constraint,
                              Objective,
                              ComponentMap)
 
 import pyomo.common
+from pyomo.common.timing import timing_scope
 from pyutilib.misc import Bunch
 from pyutilib.math.util import isclose as isclose_default
 
@@ -359,6 +362,19 @@ def generate_standard_repn(expr, idMap=None, compute_values=True, verbose=False,
             repn.constant = C_
             return repn
 
+        #
+        # The expression is a sum.  Use the single-pass linear logic,
+        # which falls back to the general recursive logic for the
+        # remaining terms once a nonlinear term is found.
+        #
+        elif expr.__class__ is EXPR.SumExpression:
+            with timing_scope('generate_standard_repn'):
+                ans = _generate_linear_sum_repn(expr, idMap, compute_values,
+                                                verbose, quadratic, repn)
+                if ans is None:
+                    return repn
+                return _finalize_standard_repn(ans, idMap, quadratic, repn)
+
         #
         # Unknown expression object
         #
@@ -379,13 +395,110 @@ def generate_standard_repn(expr, idMap=None, compute_values=True, verbose=False,
         #                        verbose=verbose,
         #                        repn=repn)
         #else:
-        return _generate_standard_repn(expr,
+        # Only sums and the general case are timed: the other cases
+        # are cheap enough that timing them would distort the
+        # measurements.
+        with timing_scope('generate_standard_repn'):
+            return _generate_standard_repn(expr,
                                 idMap=idMap,
                                 compute_values=compute_values,
                                 verbose=verbose,
                                 quadratic=quadratic,
                                 repn=repn)
 
+##-----------------------------------------------------------------------
+##
+## Logic for _generate_linear_sum_repn
+##
+##-----------------------------------------------------------------------
+
+def _generate_linear_sum_repn(expr, idMap, compute_values, verbose, quadratic, repn):
+    """
+    Collect a SumExpression in a single pass, assuming its terms are
+    linear.
+
+    Linear terms are accumulated directly into one dictionary of
+    coefficients, which avoids the temporary Results objects and the
+    dictionary merging done by the recursive collectors.  If every term
+    is linear, then repn is populated and None is returned.  Otherwise,
+    the remaining terms are handed to _collect_sum and the resulting
+    Results object is returned so the caller can finish the repn.
+    """
+    varkeys = idMap[None]
+    linear = {}
+    C_ = 0
+
+    for i, e_ in enumerate(itertools.islice(expr._args_, expr.nargs())):
+        if e_.__class__ is EXPR.MonomialTermExpression:
+            c, v = e_._args_
+            if compute_values and not c.__class__ in native_numeric_types:
+                c = value(c)
+        elif e_.__class__ in native_numeric_types:
+            C_ += e_
+            continue
+        elif e_.is_variable_type():
+            c, v = 1, e_
+        elif not e_.is_potentially_variable():
+            if compute_values:
+                C_ += value(e_)
+            else:
+                C_ += e_
+            continue
+        else:
+            #
+            # A nonlinear term: collect the rest of the sum with the
+            # general recursive logic.
+            #
+            ans = Results(constant=C_)
+            ans.linear = linear
+            return _collect_sum(expr, 1, idMap, compute_values, verbose,
+                                quadratic, ans, i)
+
+        if v.fixed:
+            if compute_values:
+                C_ += c*value(v)
+            else:
+                C_ += c*v
+            continue
+        id_ = id(v)
+        if id_ in varkeys:
+            key = varkeys[id_]
+        else:
+            key = len(idMap) - 1
+            varkeys[id_] = key
+            idMap[key] = v
+        if key in linear:
+            linear[key] += c
+        else:
+            linear[key] = c
+    #
+    # Drop terms whose coefficients cancelled out.  When values are
+    # computed the coefficients are all numbers, so the common case
+    # (no zeros) is a single scan.
+    #
+    if compute_values:
+        if 0 in itervalues(linear):
+            keys = [key for key in linear if linear[key] != 0]
+        else:
+            keys = list(linear)
+    else:
+        keys = []
+        for key in linear:
+            c = linear[key]
+            if c.__class__ in native_numeric_types:
+                if c == 0:
+                    continue
+            elif c.is_constant():
+                if value(c) == 0:
+                    continue
+            keys.append(key)
+
+    repn.constant = C_
+    repn.linear_vars = tuple(idMap[key] for key in keys)
+    repn.linear_coefs = tuple(linear[key] for key in keys)
+    return None
+
+
 ##-----------------------------------------------------------------------
 ##
 ## Logic for _generate_standard_repn
@@ -431,12 +544,14 @@ Results = ResultsWithQuadratics
 
 
 #@profile
-def _collect_sum(exp, multiplier, idMap, compute_values, verbose, quadratic):
-    ans = Results()
+def _collect_sum(exp, multiplier, idMap, compute_values, verbose, quadratic,
+                 ans=None, start=0):
+    if ans is None:
+        ans = Results()
     nonl = []
     varkeys = idMap[None]
 
-    for e_ in itertools.islice(exp._args_, exp.nargs()):
+    for e_ in itertools.islice(exp._args_, start, exp.nargs()):
         if e_.__class__ is EXPR.MonomialTermExpression:
             lhs, v = e_._args_
             if compute_values and not lhs.__class__ in native_numeric_types:
@@ -948,6 +1063,10 @@ def _generate_standard_repn(expr, idMap=None, compute_values=True, verbose=False
         # Call generic recursive logic
         #
         ans = _collect_standard_repn(expr, 1, idMap, compute_values, verbose, quadratic)
+    return _finalize_standard_repn(ans, idMap, quadratic, repn)
+
+
+def _finalize_standard_repn(ans, idMap, quadratic, repn):
     #
     # Create the final object here from 'ans'
     #
@@ -1385,13 +1504,33 @@ def preprocess_block_objectives(block, idMap=None):
 
         block_repn[objective_data] = repn
 
-def preprocess_block_constraints(block, idMap=None):
+def preprocess_block_constraints(block, idMap=None, processes=None):
+    """
+    Generate the standard repn of the active constraints declared on a
+    block.
+
+    If processes is greater than one (and no idMap is given), the
+    repns are generated by a pool of forked worker processes, each
+    handling a slice of the constraints.  Workers only return the
+    repns of linear constraint bodies; the remaining repns are
+    generated by this process.  The repns are the same as the ones
+    generated by the serial path.
+
+    The problem writers do not call this function.  To have the LP or
+    MPS writer use the repns generated here, call it on each block and
+    set block._gen_con_repn = False before writing the model.
+    """
 
     # Get/Create the ComponentMap for the repn
     if not hasattr(block,'_repn'):
         block._repn = ComponentMap()
     block_repn = block._repn
 
+    if processes is not None and processes > 1 and idMap is None \
+       and _fork_context() is not None:
+        _parallel_preprocess_block_constraints(block, block_repn, processes)
+        return
+
     for constraint in block.component_objects(Constraint,
                                               active=True,
                                               descend_into=False):
@@ -1401,6 +1540,94 @@ def preprocess_block_constraints(block, idMap=None):
                               idMap=idMap,
                               block_repn=block_repn)
 
+def _fork_context():
+    if not hasattr(os, 'fork'):
+        return None
+    if hasattr(multiprocessing, 'get_context'):
+        return multiprocessing.get_context('fork')
+    return multiprocessing
+
+# The constraints being processed by _parallel_preprocess_block_constraints.
+# This is a global so that the forked workers inherit it.
+_parallel_constraint_list = None
+
+def _generate_linear_repn_terms(bounds):
+    """
+    Return (constant, variable ids, coefficients) for the linear
+    constraint bodies in a slice of _parallel_constraint_list, and None
+    for the bodies that are not linear (or fail).
+    """
+    ans = []
+    for constraint_data in _parallel_constraint_list[bounds[0]:bounds[1]]:
+        try:
+            repn = generate_standard_repn(constraint_data.body)
+        except Exception:
+            ans.append(None)
+            continue
+        if repn.nonlinear_expr is not None or len(repn.quadratic_vars):
+            ans.append(None)
+        else:
+            ans.append((repn.constant,
+                        tuple(id(v) for v in repn.linear_vars),
+                        tuple(repn.linear_coefs)))
+    return ans
+
+def _parallel_preprocess_block_constraints(block, block_repn, processes):
+    global _parallel_constraint_list
+
+    from pyomo.repn.beta.matrix import MatrixConstraint
+    constraint_list = []
+    for constraint in block.component_objects(Constraint,
+                                              active=True,
+                                              descend_into=False):
+        if isinstance(constraint, MatrixConstraint):
+            continue
+        for index, constraint_data in iteritems(constraint):
+            if not constraint_data.active:
+                continue
+            if constraint_data.body is None:
+                raise ValueError(
+                    "No expression has been defined for the body "
+                    "of constraint %s" % (constraint_data.name))
+            constraint_list.append(constraint_data)
+
+    nchunks = processes * 4
+    chunk_size = max(1, -(-len(constraint_list) // nchunks))
+    chunks = [(i, i+chunk_size)
+              for i in xrange(0, len(constraint_list), chunk_size)]
+
+    _parallel_constraint_list = constraint_list
+    try:
+        pool = _fork_context().Pool(processes)
+        try:
+            results = pool.map(_generate_linear_repn_terms, chunks)
+        finally:
+            pool.close()
+            pool.join()
+    finally:
+        _parallel_constraint_list = None
+
+    var_by_id = dict((id(v), v) for v in block.model().component_data_objects(
+        Var, descend_into=True))
+    for constraint_data, terms in zip(constraint_list,
+                                      itertools.chain(*results)):
+        if terms is not None:
+            try:
+                linear_vars = tuple(var_by_id[i] for i in terms[1])
+            except KeyError:
+                # A variable that is not declared on this model
+                terms = None
+        if terms is None:
+            preprocess_constraint_data(block,
+                                       constraint_data,
+                                       block_repn=block_repn)
+            continue
+        repn = StandardRepn()
+        repn.constant = terms[0]
+        repn.linear_vars = linear_vars
+        repn.linear_coefs = terms[2]
+        block_repn[constraint_data] = repn
+
 def preprocess_constraint(block,
                       constraint,
                       idMap=None,
@@ -19,6 +19,7 @@ currdir = dirname(abspath(__file__))+os.sep
 
 import pyutilib.th as unittest
 import pyutilib.subprocess
+from pyutilib.misc import import_file
 
 import pyomo.scripting.pyomo_main as main
 
@@ -123,11 +124,63 @@ def nlwriter_asl_test(self, name):
     os.remove(currdir+name+'.test.row')
     os.remove(currdir+name+'.test.nl')
 
+#
+# The same comparison for the binary NL format: the ASL reads the
+# binary file written by Pyomo, and the resulting JSON summary must
+# match the one for the AMPL-generated (text) nl file.
+#
+@unittest.nottest
+def nlwriter_asl_binary_test(self, name):
+    if not has_gjh_asl_json:
+        self.skipTest("'gjh_asl_json' executable not available")
+        return
+    if os.path.exists(currdir+name+'.dat'):
+        self.skipTest("binary nl test requires a concrete test model")
+        return
+    model = import_file(currdir+name+'_testCase.py').model
+    model.write(currdir+name+'.testb.nl',
+                format='nl',
+                io_options={'binary': True,
+                            'file_determinism': 3,
+                            'symbolic_solver_labels': True})
+
+    try:
+        os.remove(currdir+name+'.ampl.json')
+    except Exception:
+        pass
+    try:
+        os.remove(currdir+name+'.testb.json')
+    except Exception:
+        pass
+
+    p = pyutilib.subprocess.run(
+        'gjh_asl_json '+currdir+name+'.testb.nl rows='
+        +currdir+name+'.testb.row cols='+currdir+name+'.testb.col')
+    self.assertTrue(p[0] == 0, msg=p[1])
+
+    p = pyutilib.subprocess.run(
+        'gjh_asl_json '+currdir+name+'.ampl.nl rows='
+        +currdir+name+'.ampl.row cols='+currdir+name+'.ampl.col')
+    self.assertTrue(p[0] == 0, msg=p[1])
+
+    self.assertMatchesJsonBaseline(
+        currdir+name+'.testb.json',
+        currdir+name+'.ampl.json',
+        tolerance=1e-8)
+
+    os.remove(currdir+name+'.ampl.json')
+
+    # delete temporary test files
+    os.remove(currdir+name+'.testb.col')
+    os.remove(currdir+name+'.testb.row')
+    os.remove(currdir+name+'.testb.nl')
+
 # add test methods to classes
 for f in glob.glob(currdir+'*_testCase.py'):
     name = re.split('[._]',os.path.basename(f))[0]
     BaselineTests.add_fn_test(fn=nlwriter_baseline_test, name=name)
     ASLTests.add_fn_test(fn=nlwriter_asl_test, name=name)
+    ASLTests.add_fn_test(fn=nlwriter_asl_binary_test, name=name+'_binary')
 
 if __name__ == "__main__":
     unittest.main()
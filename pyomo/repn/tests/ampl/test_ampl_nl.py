@@ -11,17 +11,143 @@
 # Test the canonical expressions
 #
 
+import glob
+import io
 import os
 import random
+import struct
 
 import pyutilib.th as unittest
+from pyutilib.misc import import_file
 
 from pyomo.common.getGSL import find_GSL
 from pyomo.environ import *
+from pyomo.repn.plugins.ampl import ProblemWriter_nl, NLIncrementalCache
 import pyomo.opt
 
+from six import itervalues
+
 thisdir = os.path.dirname(os.path.abspath(__file__))
 
+def _text_nl_records(text):
+    """Split the body of a text NL file (without comments) into
+    records of keyletters, numbers and names"""
+    records = []
+    for line in text.split('\n')[10:]:
+        if not line:
+            continue
+        if line[0] == 'h':
+            records.append(['h', line.split(':', 1)[1]])
+            continue
+        if line[0].isalpha():
+            fields = [line[0]] + line[1:].split()
+        else:
+            fields = line.split()
+        record = []
+        for field in fields:
+            try:
+                record.append(float(field))
+            except ValueError:
+                record.append(field)
+        records.append(record)
+    return records
+
+# operators with a fixed number of arguments, by ASL opcode
+_nl_op_nargs = dict([(op, 2) for op in (0, 1, 2, 3, 5, 21, 22, 23, 24)] +
+                    [(op, 1) for op in (13, 14, 15, 16)] +
+                    [(op, 1) for op in range(37, 54)] +
+                    [(35, 3)])
+
+def _binary_nl_records(data):
+    """Decode the body of a binary NL file the way the ASL reads it,
+    returning the records in the form used by _text_nl_records"""
+    header = data.split(b'\n', 10)
+    n_vars, n_cons, n_objs = [int(x) for x in header[1].split()[:3]]
+    body = header[10]
+    records = []
+    pos = [0]
+
+    def read(fmt):
+        size = struct.calcsize('=' + fmt)
+        values = struct.unpack('=' + fmt, body[pos[0]:pos[0] + size])
+        pos[0] += size
+        return [float(x) if not isinstance(x, bytes) else x.decode('ascii')
+                for x in values]
+    def read_string():
+        n = int(read('i')[0])
+        text = body[pos[0]:pos[0] + n].decode('utf-8')
+        pos[0] += n
+        return text
+    def read_expr():
+        key = read('c')[0]
+        if key == 'o':
+            op = read('i')
+            records.append(['o'] + op)
+            if op[0] == 54:
+                n = read('i')
+                records.append(n)
+            else:
+                n = [_nl_op_nargs[int(op[0])]]
+            for i in range(int(n[0])):
+                read_expr()
+        elif key == 'v':
+            records.append(['v'] + read('i'))
+        elif key == 'n':
+            records.append(['n'] + read('d'))
+        elif key == 'h':
+            records.append(['h', read_string()])
+        elif key == 'f':
+            args = read('ii')
+            records.append(['f'] + args)
+            for i in range(int(args[1])):
+                read_expr()
+        else:
+            raise ValueError("Unexpected expression key %r" % (key,))
+    def read_bounds(n):
+        formats = {'0': 'dd', '1': 'd', '2': 'd',
+                   '3': '', '4': 'd', '5': 'ii'}
+        for i in range(n):
+            bound_type = read('c')[0]
+            records.append([float(bound_type)] +
+                           read(formats[bound_type]))
+
+    while pos[0] < len(body):
+        key = read('c')[0]
+        if key == 'F':
+            records.append(['F'] + read('iii') + [read_string()])
+        elif key == 'S':
+            kind, n = read('ii')
+            records.append(['S', kind, n, read_string()])
+            for i in range(int(n)):
+                records.append(read('id' if int(kind) & 4 else 'ii'))
+        elif key in 'CO':
+            records.append([key] + read('i' if key == 'C' else 'ii'))
+            read_expr()
+        elif key in 'dx':
+            n = read('i')
+            records.append([key] + n)
+            for i in range(int(n[0])):
+                records.append(read('id'))
+        elif key == 'r':
+            records.append(['r'])
+            read_bounds(n_cons)
+        elif key == 'b':
+            records.append(['b'])
+            read_bounds(n_vars)
+        elif key == 'k':
+            n = read('i')
+            records.append(['k'] + n)
+            for i in range(int(n[0])):
+                records.append(read('i'))
+        elif key in 'JG':
+            args = read('ii')
+            records.append([key] + args)
+            for i in range(int(args[1])):
+                records.append(read('id'))
+        else:
+            raise ValueError("Unexpected segment key %r" % (key,))
+    return records
+
 class TestNLWriter(unittest.TestCase):
 
     def _cleanup(self, fname):
@@ -188,6 +314,189 @@ class TestNLWriter(unittest.TestCase):
             delete=True)
         self._cleanup(test_fname)
 
+    def test_incremental(self):
+        m = ConcreteModel()
+        m.p = Param(initialize=2, mutable=True)
+        m.x = Var([1,2,3], initialize=1, bounds=(0,10))
+        m.e = Expression(expr=m.x[1]*m.x[2])
+        m.o = Objective(expr=m.p*m.x[1]**2 + m.x[2] + m.e)
+        m.c1 = Constraint(expr=exp(m.p*m.x[1]) + m.x[3] <= 5)
+        m.c2 = Constraint(expr=m.x[2] + m.p*m.x[3] >= 1)
+        m.c3 = Constraint(expr=m.x[1] + m.x[2] + m.x[3] == m.p)
+
+        baseline_fname, test_fname = self._get_fnames()
+        baseline_fname = test_fname + '.full'
+        cache = NLIncrementalCache()
+
+        def check(**io_options):
+            self._cleanup(test_fname)
+            self._cleanup(baseline_fname)
+            m.write(baseline_fname, format='nl', io_options=io_options)
+            io_options['incremental'] = cache
+            m.write(test_fname, format='nl', io_options=io_options)
+            self.assertFileEqualsBaseline(
+                test_fname,
+                baseline_fname,
+                delete=True)
+
+        check()
+        check()
+        cached = cache.constraints[m.c2]
+        check()
+        self.assertIs(cache.constraints[m.c2], cached)
+        # the cache is not kept on the model
+        self.assertFalse(any(isinstance(val, NLIncrementalCache)
+                             for val in itervalues(m.__dict__)))
+
+        # mutable parameter and variable bound changes
+        m.p = 3
+        m.x[1].setub(5)
+        check()
+        self.assertIsNot(cache.constraints[m.c2], cached)
+        # fixed variables and new expressions
+        m.x[3].fix(2)
+        check(output_fixed_variable_bounds=True)
+        m.x[3].unfix()
+        m.e.expr = m.x[1] + m.x[3]
+        check()
+        m.c1.set_value(m.x[1]**3 <= 2)
+        check(symbolic_solver_labels=True)
+        # removed constraints are dropped from the cache
+        m.c2.deactivate()
+        check()
+        self.assertNotIn(m.c2, cache.constraints)
+        m.del_component(m.c1)
+        check()
+
+        # the cache is cleared when it is used with another model
+        m2 = m.clone()
+        self._cleanup(test_fname)
+        m2.write(test_fname, format='nl', io_options={'incremental': cache})
+        self.assertNotIn(m.c3, cache.constraints)
+        self.assertIn(m2.c3, cache.constraints)
+        cache.clear()
+        self.assertEqual(len(cache.constraints), 0)
+
+        # incremental=True keeps the cache in the writer
+        writer = ProblemWriter_nl()
+        self._cleanup(test_fname)
+        writer(m, test_fname, lambda x: True, {'incremental': True})
+        cached = writer._incremental_cache.constraints[m.c3]
+        self._cleanup(test_fname)
+        writer(m, test_fname, lambda x: True, {'incremental': True})
+        self.assertIs(writer._incremental_cache.constraints[m.c3], cached)
+        self._cleanup(test_fname)
+        self._cleanup(baseline_fname)
+
+    def _binary_model(self):
+        m = ConcreteModel()
+        m.x = Var(bounds=(0,None), initialize=1)
+        m.y = Var(bounds=(-1,1))
+        m.z = Var(within=Integers, bounds=(None,5))
+        m.w = Var(bounds=(2,2))
+        m.u = Var()
+        m.o = Objective(expr=m.x**2 + 2*m.y + sin(m.u)*m.x*m.y*m.z)
+        m.c1 = Constraint(expr=inequality(-1, m.x + 3*m.y, 4))
+        m.c2 = Constraint(expr=m.x*m.y + m.z + m.w == 1)
+        m.c3 = Constraint(expr=exp(m.x) + m.x*m.y + m.y*m.z + m.z*m.u <= 10)
+        m.c4 = Constraint(expr=m.y - m.u >= -3)
+        m.v = Var([1, 2, 3], bounds=(0, 1))
+        m.sos = SOSConstraint(var=m.v, weights={1: 1, 2: 2, 3: 3}, sos=1)
+        m.c5 = Constraint(expr=sum(m.v[i] for i in m.v) <= m.x)
+        m.dual = Suffix(direction=Suffix.EXPORT)
+        m.dual[m.c1] = 0.5
+        m.priority = Suffix(direction=Suffix.EXPORT, datatype=Suffix.INT)
+        m.priority[m.z] = 3
+        return m
+
+    def test_binary(self):
+        # The binary records must carry the same data as the text
+        # records when decoded the way the ASL reads binary NL files
+        m = self._binary_model()
+        text = io.StringIO()
+        pyomo.opt.WriterFactory('nl')(
+            m, text, lambda x: True, {'binary': False})
+        data = io.BytesIO()
+        pyomo.opt.WriterFactory('nl')(
+            m, data, lambda x: True, {'binary': True})
+        text = text.getvalue()
+        data = data.getvalue()
+
+        text_header = text.split('\n', 10)
+        binary_header = data.split(b'\n', 10)
+        self.assertEqual(binary_header[0].decode('utf-8'),
+                         'b' + text_header[0][1:])
+        for i in range(1, 10):
+            self.assertEqual(binary_header[i].decode('utf-8'),
+                             text_header[i])
+
+        records = _text_nl_records(text)
+        self.assertEqual(_binary_nl_records(data), records)
+        # All segment types and bound types were exercised
+        keys = set(r[0] for r in records if isinstance(r[0], str))
+        for key in 'SCOdrbkJGxovn':
+            self.assertIn(key, keys)
+        r_start = records.index(['r'])
+        bound_types = set(r[0] for r in records[r_start+1:]
+                          if not isinstance(r[0], str))
+        bound_types.discard(None)
+        self.assertTrue(set([0, 1, 2, 3, 4]).issubset(bound_types))
+
+    def test_binary_test_cases(self):
+        for fname in sorted(glob.glob(os.path.join(thisdir,
+                                                   '*_testCase.py'))):
+            m = import_file(fname).model
+            text = io.StringIO()
+            pyomo.opt.WriterFactory('nl')(
+                m, text, lambda x: True, {'file_determinism': 3})
+            data = io.BytesIO()
+            pyomo.opt.WriterFactory('nl')(
+                m, data, lambda x: True, {'binary': True,
+                                          'file_determinism': 3})
+            self.assertEqual(_binary_nl_records(data.getvalue()),
+                             _text_nl_records(text.getvalue()),
+                             msg=os.path.basename(fname))
+
+    def test_binary_bound_types(self):
+        # Bound types are written as a single ASCII character
+        m = ConcreteModel()
+        m.x = Var(bounds=(-1,1))
+        m.c = Constraint(expr=inequality(-1, m.x, 4))
+        data = io.BytesIO()
+        pyomo.opt.WriterFactory('nl')(
+            m, data, lambda x: True, {'binary': True})
+        body = data.getvalue().split(b'\n', 10)[10]
+        i = struct.Struct('=i').pack
+        d = struct.Struct('=d').pack
+        self.assertIn(b'r' + b'0' + d(-1) + d(4) +
+                      b'b' + b'0' + d(-1) + d(1) +
+                      b'k' + i(0) +
+                      b'J' + i(0) + i(1) + i(0) + d(1), body)
+
+    def test_buffer(self):
+        m = ConcreteModel()
+        m.x = Var(bounds=(0,None), initialize=1)
+        m.y = Var(bounds=(-1,1))
+        m.o = Objective(expr=m.x**2 + 2*m.y)
+        m.c = Constraint(expr=inequality(-1, m.x + 3*m.y, 4))
+
+        baseline_fname, test_fname = self._get_fnames()
+        for binary, ostream in ((False, io.StringIO()), (True, io.BytesIO())):
+            self._cleanup(test_fname)
+            m.write(test_fname, format='nl',
+                    io_options={'binary': binary,
+                                'symbolic_solver_labels': True})
+            with open(test_fname, 'rb' if binary else 'r') as f:
+                data = f.read()
+            self._cleanup(test_fname)
+
+            fname, symbol_map = pyomo.opt.WriterFactory('nl')(
+                m, ostream, lambda x: True,
+                {'binary': binary, 'symbolic_solver_labels': True})
+            self.assertIs(fname, ostream)
+            self.assertEqual(ostream.getvalue(), data)
+            self.assertIs(symbol_map.bySymbol['v0'](), m.x)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -169,5 +169,18 @@ class TestMPSOrdering(unittest.TestCase):
         row_order[model.con4[2]] = -1
         self._check_baseline(model, row_order=row_order)
 
+    def test_columns(self):
+        model = ConcreteModel()
+        model.a = Var(bounds=(0, 1))
+        model.b = Var(within=Integers)
+        model.c = Var()
+        # unreferenced
+        model.d = Var(bounds=(-1, None))
+        model.obj = Objective(expr=3*model.a - 0.0*model.b + 5)
+        model.con1 = Constraint(expr=-0.0*model.a + 2*model.c - model.b >= -3)
+        model.con2 = Constraint(expr=(-2, model.a + 0.5*model.c + 1, 7))
+        model.con3 = Constraint(expr=model.b - 2.5*model.c == 4)
+        self._check_baseline(model, include_all_variable_bounds=True)
+
 if __name__ == "__main__":
     unittest.main()
@@ -4084,6 +4084,42 @@ class Test(unittest.TestCase):
         rep = generate_standard_repn(e, compute_values=False)
         self.assertEqual(str(rep.to_expression()), "(1 + <vtype>)*<vtype>")
 
+    def test_linear_sum(self):
+        m = ConcreteModel()
+        m.x = Var()
+        m.y = Var()
+        m.z = Var(initialize=4)
+        m.z.fixed = True
+        m.p = Param(mutable=True, initialize=2)
+
+        # A purely linear sum, with repeated and cancelling terms
+        e = 3*m.x + m.p*m.y + m.x - m.p*m.y + m.z + 5
+        rep = generate_standard_repn(e)
+        self.assertTrue(rep.is_linear())
+        self.assertEqual(len(rep.linear_vars), 1)
+        baseline = { None:9, id(m.x):4 }
+        self.assertEqual(baseline, repn_to_dict(rep))
+
+        rep = generate_standard_repn(e, compute_values=False)
+        self.assertEqual(len(rep.linear_vars), 2)
+        self.assertEqual(str(rep.to_expression()), "z + 5 + 4*x + (p - p)*y")
+
+        # A nonlinear term after the linear terms
+        e = 3*m.x + m.y + m.x*m.y + m.x + m.z
+        rep = generate_standard_repn(e)
+        self.assertTrue(rep.is_quadratic())
+        baseline = { None:4, id(m.x):4, id(m.y):1, (id(m.x),id(m.y)):1 }
+        if id(m.x) > id(m.y):
+            baseline[id(m.y),id(m.x)] = baseline.pop((id(m.x),id(m.y)))
+        self.assertEqual(baseline, repn_to_dict(rep))
+
+        e = 3*m.x + m.y + sin(m.x) + m.x
+        rep = generate_standard_repn(e)
+        self.assertTrue(rep.is_nonlinear())
+        baseline = { id(m.x):4, id(m.y):1 }
+        self.assertEqual(baseline, repn_to_dict(rep))
+        self.assertEqual(str(rep.nonlinear_expr), "sin(x)")
+
     def test_error1(self):
         class Foo(object):
             pass
@@ -4091,5 +4127,76 @@ class Test(unittest.TestCase):
         e = Foo()
         self.assertRaises(AttributeError, generate_standard_repn, e)
 
+    def test_preprocess_block_constraints_processes(self):
+        from pyomo.repn.standard_repn import preprocess_block_constraints
+        other = ConcreteModel()
+        other.a = Var()
+        m = ConcreteModel()
+        m.p = Param(initialize=3, mutable=True)
+        m.x = Var(range(10))
+        m.y = Var()
+        m.c = Constraint(range(10), rule=lambda m, i:
+                         (i+1)*m.x[i] + m.p*m.y + i >= 0)
+        m.d = Constraint(expr=m.x[0]*m.y + m.x[1] == 1)
+        m.e = Constraint(expr=other.a + m.y <= 2)
+        m.f = Constraint(expr=m.y <= 2)
+        m.f.deactivate()
+        preprocess_block_constraints(m, processes=2)
+        self.assertEqual(len(m._repn), 12)
+        for c in (m.d, m.e) + tuple(m.c.values()):
+            self.assertEqual(repn_to_dict(m._repn[c]),
+                             repn_to_dict(generate_standard_repn(c.body)))
+        self.assertTrue(m._repn[m.d].is_quadratic())
+        self.assertIs(m._repn[m.e].linear_vars[0], other.a)
+
+    def test_preprocess_block_constraints_processes_serial(self):
+        # the parallel and serial paths give the same repns (and the
+        # same LP file) for the same model
+        from pyomo.repn.standard_repn import preprocess_block_constraints
+        def _model():
+            m = ConcreteModel()
+            m.p = Param(initialize=3, mutable=True)
+            m.x = Var(range(20), bounds=(0, None))
+            m.y = Var()
+            m.c = Constraint(range(20), rule=lambda m, i:
+                             (i+1)*m.x[i] - m.p*m.y + i <= 10)
+            m.d = Constraint(expr=m.x[0]*m.y + m.x[1] == 1)
+            m.e = Constraint(expr=sin(m.y) + m.x[2] >= -1)
+            m.o = Objective(expr=sum(m.x.values()))
+            return m
+        m = _model()
+        preprocess_block_constraints(m)
+        serial = m._repn
+        del m._repn
+        preprocess_block_constraints(m, processes=3)
+        self.assertEqual(len(m._repn), len(serial))
+        for c in m.component_data_objects(Constraint):
+            self.assertEqual(repn_to_dict(m._repn[c]),
+                             repn_to_dict(serial[c]))
+            self.assertEqual(m._repn[c].polynomial_degree(),
+                             serial[c].polynomial_degree())
+
+        # the LP writer reuses the repns (m.e is not quadratic)
+        m._gen_con_repn = False
+        m.e.deactivate()
+        m_serial = _model()
+        m_serial.e.deactivate()
+        lp_parallel = pyutilib.services.TempfileManager.create_tempfile(
+            suffix='.lp')
+        lp_serial = pyutilib.services.TempfileManager.create_tempfile(
+            suffix='.lp')
+        try:
+            m.write(lp_parallel,
+                    io_options={'symbolic_solver_labels': True})
+            m_serial.write(lp_serial,
+                           io_options={'symbolic_solver_labels': True})
+            with open(lp_parallel) as f:
+                parallel_lines = f.readlines()
+            with open(lp_serial) as f:
+                serial_lines = f.readlines()
+        finally:
+            pyutilib.services.TempfileManager.clear_tempfiles()
+        self.assertEqual(parallel_lines, serial_lines)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,275 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+
+
+__all__ = []
+
+import os
+import sys
+import time
+import multiprocessing
+import traceback
+
+import pyutilib.misc
+import pyutilib.services
+from pyomo.opt.base import OptSolver, SolverFactory
+from pyomo.opt.solver import SystemCallSolver
+from pyomo.opt.parallel.manager import (ActionManagerError,
+                                        ActionStatus,
+                                        ActionHandle)
+from pyomo.opt.parallel.async_solver import (AsynchronousSolverManager,
+                                             SolverManagerFactory)
+from pyomo.core.base.block import _BlockData
+import pyomo.core.base.suffix
+
+import six
+from six.moves import queue
+
+
+def _solve_problem_file(data):
+    """
+    Solve a problem file in a worker process.  This mirrors the task
+    processing of the pyro_mip_server.  Returns a tuple (ok, results),
+    where results is either the results object or the traceback of
+    the error that occured.
+    """
+    try:
+        time_start = time.time()
+        with pyutilib.services.TempfileManager.push():
+            with SolverFactory(data.opt) as opt:
+                for key, value in data.solver_options.items():
+                    setattr(opt.options, key, value)
+
+                problem_filename_suffix = os.path.split(data.filename)[1]
+                temp_problem_filename = \
+                    pyutilib.services.TempfileManager.\
+                    create_tempfile(suffix="."+problem_filename_suffix)
+                with open(temp_problem_filename, 'w') as f:
+                    f.write(data.file)
+
+                if data.warmstart_filename is not None:
+                    warmstart_filename_suffix = \
+                        os.path.split(data.warmstart_filename)[1]
+                    temp_warmstart_filename = \
+                        pyutilib.services.TempfileManager.\
+                        create_tempfile(suffix="."+warmstart_filename_suffix)
+                    with open(temp_warmstart_filename, 'w') as f:
+                        f.write(data.warmstart_file)
+                    data.kwds['warmstart_file'] = temp_warmstart_filename
+
+                results = opt.solve(temp_problem_filename, **data.kwds)
+        results.pyomo_solve_time = time.time()-time_start
+        return True, results
+    except:
+        return False, "".join(traceback.format_exception(*sys.exc_info()))
+
+
+@SolverManagerFactory.register('pool', doc="Execute solvers asynchronously using a pool of local processes")
+class SolverManager_Pool(AsynchronousSolverManager):
+    """
+    A solver manager that keeps up to a fixed number of solves in
+    flight using a pool of local worker processes.  Problem files are
+    written by this process (as for the 'pyro' solver manager) and
+    each worker executes the solver and returns the results object.
+
+    Keyword Arguments
+    -----------------
+    processes: int
+        The maximum number of solves executed concurrently.  The
+        default is the number of cores on this machine.
+    """
+
+    def __init__(self, **kwds):
+        self._processes = kwds.pop('processes', None)
+        if self._processes is None:
+            self._processes = multiprocessing.cpu_count()
+        self._pool = None
+        self._opt_data = {}
+        self._args = {}
+        self._completed = queue.Queue()
+        self._num_pending = 0
+        AsynchronousSolverManager.__init__(self, **kwds)
+
+    def clear(self):
+        """
+        Clear manager state
+        """
+        super(SolverManager_Pool, self).clear()
+        self.close()
+        self._opt_data = {}
+        self._args = {}
+        self._completed = queue.Queue()
+        self._num_pending = 0
+
+    def close(self):
+        """
+        Terminate the worker processes.
+        """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def __exit__(self, t, v, traceback):
+        self.close()
+
+    def _get_task_data(self, ah, *args, **kwds):
+
+        opt = kwds.pop('solver', kwds.pop('opt', None))
+        if opt is None:
+            raise ActionManagerError(
+                "No solver passed to %s, use keyword option 'solver'"
+                % (type(self).__name__) )
+        if isinstance(opt, six.string_types):
+            opt = SolverFactory(opt, solver_io=kwds.pop('solver_io', None))
+
+        #
+        # The following block of code is taken from the OptSolver.solve()
+        # method, which we do not directly invoke with this interface
+        #
+        for arg in args:
+            if isinstance(arg, _BlockData):
+                if not arg.is_constructed():
+                    raise RuntimeError(
+                        "Attempting to solve model=%s with unconstructed "
+                        "component(s)" % (arg.name))
+                # import suffixes must be on the top-level model
+                model_suffixes = list(name for (name,comp) \
+                                      in pyomo.core.base.suffix.\
+                                      active_import_suffix_generator(arg))
+                if len(model_suffixes) > 0:
+                    kwds_suffixes = kwds.setdefault('suffixes',[])
+                    for name in model_suffixes:
+                        if name not in kwds_suffixes:
+                            kwds_suffixes.append(name)
+
+        ephemeral_solver_options = {}
+        ephemeral_solver_options.update(kwds.pop('options', {}))
+        ephemeral_solver_options.update(
+            OptSolver._options_string_to_dict(kwds.pop('options_string', '')))
+
+        #
+        # Write the problem file in a temporary file context that is
+        # removed as soon as the file has been read, so the contexts of
+        # concurrent solves never overlap.
+        #
+        with pyutilib.services.TempfileManager.push():
+            opt._presolve(*args, **kwds)
+            with open(opt._problem_files[0], 'r') as f:
+                problem_file_string = f.read()
+            warm_start_file_string = None
+            warm_start_file_name = None
+            if hasattr(opt,  "_warm_start_solve"):
+                if opt._warm_start_solve  and \
+                   (opt._warm_start_file_name is not None):
+                    warm_start_file_name = opt._warm_start_file_name
+                    with open(warm_start_file_name, 'r') as f:
+                        warm_start_file_string = f.read()
+            if isinstance(opt, SystemCallSolver):
+                # the system call solvers push a context in _presolve
+                pyutilib.services.TempfileManager.pop(
+                    remove=not opt._keepfiles)
+
+        solver_options = {}
+        for key in opt.options:
+            solver_options[key]=opt.options[key]
+        solver_options.update(ephemeral_solver_options)
+
+        data = pyutilib.misc.Bunch(opt=opt.type,
+                                   file=problem_file_string,
+                                   filename=opt._problem_files[0],
+                                   warmstart_file=warm_start_file_string,
+                                   warmstart_filename=warm_start_file_name,
+                                   kwds=kwds,
+                                   solver_options=solver_options)
+
+        self._args[ah.id] = args
+        self._opt_data[ah.id] = (opt._smap_id,
+                                 opt._load_solutions,
+                                 opt._select_index,
+                                 opt._default_variable_value)
+
+        return data
+
+    def _perform_queue(self, ah, *args, **kwds):
+        """
+        Perform the queue operation.  This method returns the ActionHandle,
+        and the ActionHandle status indicates whether the queue was successful.
+        """
+        data = self._get_task_data(ah, *args, **kwds)
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(processes=self._processes)
+        completed = self._completed
+        ah_id = ah.id
+        callbacks = {}
+        if not six.PY2:
+            # Errors raised outside of _solve_problem_file (e.g., when
+            # the task data cannot be pickled) are reported here rather
+            # than through the result; without this callback the task
+            # would never complete.
+            callbacks['error_callback'] = \
+                lambda error: completed.put((ah_id, (False, error)))
+        self._pool.apply_async(
+            _solve_problem_file, (data,),
+            callback=lambda result: completed.put((ah_id, result)),
+            **callbacks)
+        self._num_pending += 1
+        return ah
+
+    def _perform_wait_any(self):
+        """
+        Perform the wait_any operation.  This method returns an
+        ActionHandle with the results of waiting.  If None is returned
+        then the ActionManager assumes that it can call this method again.
+        Note that an ActionHandle can be returned with a dummy value,
+        to indicate an error.
+        """
+        if self._num_pending == 0:
+            return ActionHandle(error=True,
+                                explanation=("No queued evaluations available "
+                                             "in the 'pool' solver manager"))
+        ah_id, (ok, results) = self._completed.get()
+        self._num_pending -= 1
+        ah = self.event_handle[ah_id]
+
+        (smap_id,
+         load_solutions,
+         select_index,
+         default_variable_value) = self._opt_data.pop(ah_id)
+        args = self._args.pop(ah_id)
+
+        if not ok:
+            ah.status = ActionStatus.error
+            if isinstance(results, BaseException):
+                # the task could not be sent to (or run by) the pool
+                raise results
+            raise RuntimeError(
+                "Worker process reported a processing error "
+                "for task with id=%s. Reason: \n%s" % (ah_id, results))
+
+        # Tag the results object with the symbol map id.
+        results._smap_id = smap_id
+
+        if len(args) and isinstance(args[0], _BlockData):
+            _model = args[0]
+            if load_solutions:
+                _model.solutions.load_from(
+                    results,
+                    select=select_index,
+                    default_variable_value=default_variable_value)
+                results._smap_id = None
+                results.solution.clear()
+            else:
+                results._smap = _model.solutions.symbol_map[smap_id]
+                _model.solutions.delete_symbol_map(smap_id)
+
+        self.results[ah_id] = results
+        ah.status = ActionStatus.done
+        return ah
@@ -226,28 +226,46 @@ class CPLEXDirect(DirectSolver):
         return cplex_expr, referenced_vars
 
     def _add_var(self, var):
-        varname = self._symbol_map.getSymbol(var, self._labeler)
-        vtype = self._cplex_vtype_from_var(var)
-        if var.has_lb():
-            lb = value(var.lb)
-        else:
-            lb = -self._cplex.infinity
-        if var.has_ub():
-            ub = value(var.ub)
-        else:
-            ub = self._cplex.infinity
-
-        self._solver_model.variables.add(lb=[lb], ub=[ub], types=[vtype], names=[varname])
-
-        self._pyomo_var_to_solver_var_map[var] = varname
-        self._solver_var_to_pyomo_var_map[varname] = var
-        self._pyomo_var_to_ndx_map[var] = self._ndx_count
-        self._ndx_count += 1
-        self._referenced_variables[var] = 0
-
-        if var.is_fixed():
-            self._solver_model.variables.set_lower_bounds(varname, var.value)
-            self._solver_model.variables.set_upper_bounds(varname, var.value)
+        self._add_vars((var,))
+
+    def _add_vars(self, var_seq):
+        lbs = []
+        ubs = []
+        types = []
+        names = []
+        new_vars = []
+        for var in var_seq:
+            varname = self._symbol_map.getSymbol(var, self._labeler)
+            vtype = self._cplex_vtype_from_var(var)
+            if var.is_fixed():
+                lb = var.value
+                ub = var.value
+            else:
+                if var.has_lb():
+                    lb = value(var.lb)
+                else:
+                    lb = -self._cplex.infinity
+                if var.has_ub():
+                    ub = value(var.ub)
+                else:
+                    ub = self._cplex.infinity
+            lbs.append(lb)
+            ubs.append(ub)
+            types.append(vtype)
+            names.append(varname)
+            new_vars.append((var, varname))
+
+        if not new_vars:
+            return
+        # Load all of the columns with a single call
+        self._solver_model.variables.add(lb=lbs, ub=ubs, types=types, names=names)
+
+        for var, varname in new_vars:
+            self._pyomo_var_to_solver_var_map[var] = varname
+            self._solver_var_to_pyomo_var_map[varname] = var
+            self._pyomo_var_to_ndx_map[var] = self._ndx_count
+            self._ndx_count += 1
+            self._referenced_variables[var] = 0
 
     def _set_instance(self, model, kwds={}):
         self._pyomo_var_to_ndx_map = ComponentMap()
@@ -281,65 +299,77 @@ class CPLEXDirect(DirectSolver):
                             % (var.name, self._pyomo_model.name,))
 
     def _add_constraint(self, con):
-        if not con.active:
-            return None
-
-        if is_fixed(con.body):
-            if self._skip_trivial_constraints:
-                return None
-
-        conname = self._symbol_map.getSymbol(con, self._labeler)
+        self._add_constraints((con,))
+
+    def _add_constraints(self, con_seq):
+        lin_exprs = []
+        senses = []
+        rhs = []
+        range_values = []
+        names = []
+        linear_cons = []
+        for con in con_seq:
+            if not con.active:
+                continue
+
+            if is_fixed(con.body):
+                if self._skip_trivial_constraints:
+                    continue
+
+            conname = self._symbol_map.getSymbol(con, self._labeler)
+
+            if con._linear_canonical_form:
+                cplex_expr, referenced_vars = self._get_expr_from_pyomo_repn(
+                    con.canonical_form(),
+                    self._max_constraint_degree)
+            else:
+                cplex_expr, referenced_vars = self._get_expr_from_pyomo_expr(
+                    con.body,
+                    self._max_constraint_degree)
+
+            if con.has_lb():
+                if not is_fixed(con.lower):
+                    raise ValueError("Lower bound of constraint {0} "
+                                     "is not constant.".format(con))
+            if con.has_ub():
+                if not is_fixed(con.upper):
+                    raise ValueError("Upper bound of constraint {0} "
+                                     "is not constant.".format(con))
+
+            # Note: CPLEX ignores the range value of rows that are
+            # not ranged
+            my_range = 0.0
+            if con.equality:
+                my_sense = 'E'
+                my_rhs = value(con.lower) - cplex_expr.offset
+            elif con.has_lb() and con.has_ub():
+                my_sense = 'R'
+                lb = value(con.lower)
+                ub = value(con.upper)
+                my_rhs = ub - cplex_expr.offset
+                my_range = lb - ub
+                self._range_constraints.add(con)
+            elif con.has_lb():
+                my_sense = 'G'
+                my_rhs = value(con.lower) - cplex_expr.offset
+            elif con.has_ub():
+                my_sense = 'L'
+                my_rhs = value(con.upper) - cplex_expr.offset
+            else:
+                raise ValueError("Constraint does not have a lower "
+                                 "or an upper bound: {0} \n".format(con))
+
+            if len(cplex_expr.q_coefficients) == 0:
+                # Linear rows are collected and loaded together
+                lin_exprs.append([cplex_expr.variables,
+                                  cplex_expr.coefficients])
+                senses.append(my_sense)
+                rhs.append(my_rhs)
+                range_values.append(my_range)
+                names.append(conname)
+                linear_cons.append((con, conname, referenced_vars))
+                continue
 
-        if con._linear_canonical_form:
-            cplex_expr, referenced_vars = self._get_expr_from_pyomo_repn(
-                con.canonical_form(),
-                self._max_constraint_degree)
-        else:
-            cplex_expr, referenced_vars = self._get_expr_from_pyomo_expr(
-                con.body,
-                self._max_constraint_degree)
-
-        if con.has_lb():
-            if not is_fixed(con.lower):
-                raise ValueError("Lower bound of constraint {0} "
-                                 "is not constant.".format(con))
-        if con.has_ub():
-            if not is_fixed(con.upper):
-                raise ValueError("Upper bound of constraint {0} "
-                                 "is not constant.".format(con))
-
-        if con.equality:
-            my_sense = 'E'
-            my_rhs = [value(con.lower) - cplex_expr.offset]
-            my_range = []
-        elif con.has_lb() and con.has_ub():
-            my_sense = 'R'
-            lb = value(con.lower)
-            ub = value(con.upper)
-            my_rhs = [ub - cplex_expr.offset]
-            my_range = [lb - ub]
-            self._range_constraints.add(con)
-        elif con.has_lb():
-            my_sense = 'G'
-            my_rhs = [value(con.lower) - cplex_expr.offset]
-            my_range = []
-        elif con.has_ub():
-            my_sense = 'L'
-            my_rhs = [value(con.upper) - cplex_expr.offset]
-            my_range = []
-        else:
-            raise ValueError("Constraint does not have a lower "
-                             "or an upper bound: {0} \n".format(con))
-
-        if len(cplex_expr.q_coefficients) == 0:
-            self._solver_model.linear_constraints.add(
-                lin_expr=[[cplex_expr.variables,
-                           cplex_expr.coefficients]],
-                senses=my_sense,
-                rhs=my_rhs,
-                range_values=my_range,
-                names=[conname])
-        else:
             if my_sense == 'R':
                 raise ValueError("The CPLEXDirect interface does not "
                                  "support quadratic range constraints: "
@@ -351,9 +381,22 @@ class CPLEXDirect(DirectSolver):
                            cplex_expr.q_variables2,
                            cplex_expr.q_coefficients],
                 sense=my_sense,
-                rhs=my_rhs[0],
+                rhs=my_rhs,
                 name=conname)
-
+            self._record_constraint(con, conname, referenced_vars)
+
+        if not linear_cons:
+            return
+        self._solver_model.linear_constraints.add(
+            lin_expr=lin_exprs,
+            senses=senses,
+            rhs=rhs,
+            range_values=range_values,
+            names=names)
+        for con, conname, referenced_vars in linear_cons:
+            self._record_constraint(con, conname, referenced_vars)
+
+    def _record_constraint(self, con, conname, referenced_vars):
         for var in referenced_vars:
             self._referenced_variables[var] += 1
         self._vars_referenced_by_con[con] = referenced_vars
@@ -72,6 +72,15 @@ class CPLEXPersistent(PersistentSolver, CPLEXDirect):
         del self._pyomo_var_to_ndx_map[pyomo_var]
         self._solver_model.variables.delete(solver_var)
 
+    def _set_coefficients(self, coefficients):
+        self._solver_model.linear_constraints.set_coefficients(
+            [(self._pyomo_con_to_solver_con_map[con], self._pyomo_var_to_solver_var_map[var], val)
+             for con, var, val in coefficients])
+
+    def _set_rhs(self, rhs):
+        self._solver_model.linear_constraints.set_rhs(
+            [(self._pyomo_con_to_solver_con_map[con], val) for con, val in rhs])
+
     def _warm_start(self):
         CPLEXDirect._warm_start(self)
 
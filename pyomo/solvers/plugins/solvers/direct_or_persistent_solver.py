@@ -21,6 +21,16 @@ from pyomo.core.kernel.component_set import ComponentSet
 from pyomo.opt.base.formats import ResultsFormat
 from pyutilib.misc import Options
 
+
+def _binding_constraints(con_seq):
+    for con in con_seq:
+        if (not con.has_lb()) and \
+           (not con.has_ub()):
+            assert not con.equality
+            continue  # non-binding, so skip
+        yield con
+
+
 class DirectOrPersistentSolver(OptSolver):
     """
     This is a base class for both direct and persistent solvers. Direct solver interfaces do not use any file io.
@@ -198,25 +208,20 @@ class DirectOrPersistentSolver(OptSolver):
             self._labeler = NumericLabeler('x')
 
     def _add_block(self, block):
-        for var in block.component_data_objects(
-                ctype=pyomo.core.base.var.Var,
-                descend_into=True,
-                active=True,
-                sort=True):
-            self._add_var(var)
+        self._add_vars(block.component_data_objects(
+            ctype=pyomo.core.base.var.Var,
+            descend_into=True,
+            active=True,
+            sort=True))
 
         for sub_block in block.block_data_objects(descend_into=True,
                                                   active=True):
-            for con in sub_block.component_data_objects(
+            self._add_constraints(_binding_constraints(
+                sub_block.component_data_objects(
                     ctype=pyomo.core.base.constraint.Constraint,
                     descend_into=False,
                     active=True,
-                    sort=True):
-                if (not con.has_lb()) and \
-                   (not con.has_ub()):
-                    assert not con.equality
-                    continue  # non-binding, so skip
-                self._add_constraint(con)
+                    sort=True)))
 
             for con in sub_block.component_data_objects(
                     ctype=pyomo.core.base.sos.SOSConstraint,
@@ -256,6 +261,16 @@ class DirectOrPersistentSolver(OptSolver):
         raise NotImplementedError("This method should be implemented "
                                   "by subclasses")
 
+    """ Subclasses may override this method to load the variables in bulk."""
+    def _add_vars(self, var_seq):
+        for var in var_seq:
+            self._add_var(var)
+
+    """ Subclasses may override this method to load the constraints in bulk."""
+    def _add_constraints(self, con_seq):
+        for con in con_seq:
+            self._add_constraint(con)
+
     """ This method should be implemented by subclasses."""
     def _get_expr_from_pyomo_repn(self, repn, max_degree=None):
         raise NotImplementedError("This method should be implemented "
@@ -201,26 +201,52 @@ class GurobiDirect(DirectSolver):
         return gurobi_expr, referenced_vars
 
     def _add_var(self, var):
-        varname = self._symbol_map.getSymbol(var, self._labeler)
-        vtype = self._gurobi_vtype_from_var(var)
-        if var.has_lb():
-            lb = value(var.lb)
-        else:
-            lb = -self._gurobipy.GRB.INFINITY
-        if var.has_ub():
-            ub = value(var.ub)
+        self._add_vars((var,))
+
+    def _add_vars(self, var_seq):
+        lbs = []
+        ubs = []
+        vtypes = []
+        names = []
+        new_vars = []
+        for var in var_seq:
+            varname = self._symbol_map.getSymbol(var, self._labeler)
+            vtype = self._gurobi_vtype_from_var(var)
+            if var.is_fixed():
+                lb = var.value
+                ub = var.value
+            else:
+                if var.has_lb():
+                    lb = value(var.lb)
+                else:
+                    lb = -self._gurobipy.GRB.INFINITY
+                if var.has_ub():
+                    ub = value(var.ub)
+                else:
+                    ub = self._gurobipy.GRB.INFINITY
+            lbs.append(lb)
+            ubs.append(ub)
+            vtypes.append(vtype)
+            names.append(varname)
+            new_vars.append(var)
+
+        if not new_vars:
+            return
+        if hasattr(self._solver_model, 'addVars'):
+            # Gurobi 7.0 and later can add all of the columns at once
+            gurobipy_vars = self._solver_model.addVars(
+                len(new_vars), lb=lbs, ub=ubs, vtype=vtypes)
+            gurobipy_vars = [gurobipy_vars[i] for i in range(len(new_vars))]
+            self._solver_model.setAttr('VarName', gurobipy_vars, names)
         else:
-            ub = self._gurobipy.GRB.INFINITY
-
-        gurobipy_var = self._solver_model.addVar(lb=lb, ub=ub, vtype=vtype, name=varname)
+            gurobipy_vars = [
+                self._solver_model.addVar(lb=lb, ub=ub, vtype=vtype, name=varname)
+                for lb, ub, vtype, varname in zip(lbs, ubs, vtypes, names)]
 
-        self._pyomo_var_to_solver_var_map[var] = gurobipy_var
-        self._solver_var_to_pyomo_var_map[gurobipy_var] = var
-        self._referenced_variables[var] = 0
-
-        if var.is_fixed():
-            gurobipy_var.setAttr('lb', var.value)
-            gurobipy_var.setAttr('ub', var.value)
+        for var, gurobipy_var in zip(new_vars, gurobipy_vars):
+            self._pyomo_var_to_solver_var_map[var] = gurobipy_var
+            self._solver_var_to_pyomo_var_map[gurobipy_var] = var
+            self._referenced_variables[var] = 0
 
     def _set_instance(self, model, kwds={}):
         self._range_constraints = set()
@@ -263,67 +289,79 @@ class GurobiDirect(DirectSolver):
         self._solver_model.update()
 
     def _add_constraint(self, con):
-        if not con.active:
-            return None
-
-        if is_fixed(con.body):
-            if self._skip_trivial_constraints:
-                return None
-
-        conname = self._symbol_map.getSymbol(con, self._labeler)
-
-        if con._linear_canonical_form:
-            gurobi_expr, referenced_vars = self._get_expr_from_pyomo_repn(
-                con.canonical_form(),
-                self._max_constraint_degree)
-        #elif isinstance(con, LinearCanonicalRepn):
-        #    gurobi_expr, referenced_vars = self._get_expr_from_pyomo_repn(
-        #        con,
-        #        self._max_constraint_degree)
-        else:
-            gurobi_expr, referenced_vars = self._get_expr_from_pyomo_expr(
-                con.body,
-                self._max_constraint_degree)
-
-        if con.has_lb():
-            if not is_fixed(con.lower):
-                raise ValueError("Lower bound of constraint {0} "
-                                 "is not constant.".format(con))
-        if con.has_ub():
-            if not is_fixed(con.upper):
-                raise ValueError("Upper bound of constraint {0} "
-                                 "is not constant.".format(con))
-
-        if con.equality:
-            gurobipy_con = self._solver_model.addConstr(lhs=gurobi_expr,
-                                                        sense=self._gurobipy.GRB.EQUAL,
-                                                        rhs=value(con.lower),
-                                                        name=conname)
-        elif con.has_lb() and con.has_ub():
-            gurobipy_con = self._solver_model.addRange(gurobi_expr,
-                                                       value(con.lower),
-                                                       value(con.upper),
-                                                       name=conname)
-            self._range_constraints.add(con)
-        elif con.has_lb():
-            gurobipy_con = self._solver_model.addConstr(lhs=gurobi_expr,
-                                                        sense=self._gurobipy.GRB.GREATER_EQUAL,
-                                                        rhs=value(con.lower),
-                                                        name=conname)
-        elif con.has_ub():
-            gurobipy_con = self._solver_model.addConstr(lhs=gurobi_expr,
-                                                        sense=self._gurobipy.GRB.LESS_EQUAL,
-                                                        rhs=value(con.upper),
-                                                        name=conname)
-        else:
-            raise ValueError("Constraint does not have a lower "
-                             "or an upper bound: {0} \n".format(con))
-
-        for var in referenced_vars:
-            self._referenced_variables[var] += 1
-        self._vars_referenced_by_con[con] = referenced_vars
-        self._pyomo_con_to_solver_con_map[con] = gurobipy_con
-        self._solver_con_to_pyomo_con_map[gurobipy_con] = con
+        self._add_constraints((con,))
+
+    def _add_constraints(self, con_seq):
+        # addLConstr (Gurobi 9.0 and later) skips the construction of
+        # a temporary constraint object for each linear row
+        addLConstr = getattr(self._solver_model, 'addLConstr', None)
+        for con in con_seq:
+            if not con.active:
+                continue
+
+            if is_fixed(con.body):
+                if self._skip_trivial_constraints:
+                    continue
+
+            conname = self._symbol_map.getSymbol(con, self._labeler)
+
+            if con._linear_canonical_form:
+                gurobi_expr, referenced_vars = self._get_expr_from_pyomo_repn(
+                    con.canonical_form(),
+                    self._max_constraint_degree)
+            #elif isinstance(con, LinearCanonicalRepn):
+            #    gurobi_expr, referenced_vars = self._get_expr_from_pyomo_repn(
+            #        con,
+            #        self._max_constraint_degree)
+            else:
+                gurobi_expr, referenced_vars = self._get_expr_from_pyomo_expr(
+                    con.body,
+                    self._max_constraint_degree)
+
+            if con.has_lb():
+                if not is_fixed(con.lower):
+                    raise ValueError("Lower bound of constraint {0} "
+                                     "is not constant.".format(con))
+            if con.has_ub():
+                if not is_fixed(con.upper):
+                    raise ValueError("Upper bound of constraint {0} "
+                                     "is not constant.".format(con))
+
+            if con.equality:
+                sense = self._gurobipy.GRB.EQUAL
+                rhs = value(con.lower)
+            elif con.has_lb() and con.has_ub():
+                sense = None
+                self._range_constraints.add(con)
+            elif con.has_lb():
+                sense = self._gurobipy.GRB.GREATER_EQUAL
+                rhs = value(con.lower)
+            elif con.has_ub():
+                sense = self._gurobipy.GRB.LESS_EQUAL
+                rhs = value(con.upper)
+            else:
+                raise ValueError("Constraint does not have a lower "
+                                 "or an upper bound: {0} \n".format(con))
+
+            if sense is None:
+                gurobipy_con = self._solver_model.addRange(gurobi_expr,
+                                                           value(con.lower),
+                                                           value(con.upper),
+                                                           name=conname)
+            elif addLConstr is not None and \
+                 gurobi_expr.__class__ is not self._gurobipy.QuadExpr:
+                gurobipy_con = addLConstr(gurobi_expr, sense, rhs, conname)
+            else:
+                gurobipy_con = self._solver_model.addConstr(lhs=gurobi_expr,
+                                                            sense=sense,
+                                                            rhs=rhs,
+                                                            name=conname)
+
+            for var in referenced_vars:
+                self._referenced_variables[var] += 1
+            self._vars_referenced_by_con[con] = referenced_vars
+            self._pyomo_con_to_solver_con_map[con] = gurobipy_con
+            self._solver_con_to_pyomo_con_map[gurobipy_con] = con
 
     def _add_sos_constraint(self, con):
         if not con.active:
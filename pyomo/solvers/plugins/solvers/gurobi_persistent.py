@@ -90,6 +90,23 @@ class GurobiPersistent(PersistentSolver, GurobiDirect):
         PersistentSolver.add_sos_constraint(self, con)
         self._solver_model.update()
 
+    def update(self):
+        """
+        Push the changes made to the Pyomo model since the last update to the solver's model.
+        """
+        PersistentSolver.update(self)
+        self._solver_model.update()
+
+    def _set_coefficients(self, coefficients):
+        for con, var, val in coefficients:
+            self._solver_model.chgCoeff(self._pyomo_con_to_solver_con_map[con],
+                                        self._pyomo_var_to_solver_var_map[var], val)
+
+    def _set_rhs(self, rhs):
+        self._solver_model.setAttr('RHS',
+                                   [self._pyomo_con_to_solver_con_map[con] for con, val in rhs],
+                                   [val for con, val in rhs])
+
     def _warm_start(self):
         GurobiDirect._warm_start(self)
 
@@ -22,11 +22,90 @@ import logging
 from pyomo.core.base.constraint import Constraint
 from pyomo.core.base.var import Var
 from pyomo.core.base.sos import SOSConstraint
+from pyomo.core.expr.current import identify_mutable_parameters, \
+    identify_variables
+from pyomo.core.expr.numvalue import value, native_numeric_types
+from pyomo.core.kernel.component_map import ComponentMap
+from pyomo.core.kernel.component_set import ComponentSet
+from pyomo.repn import generate_standard_repn
+from pyomo.solvers.plugins.solvers.direct_or_persistent_solver import \
+    _binding_constraints
 
 
 logger = logging.getLogger('pyomo.solvers')
 
 
+def _var_state(var):
+    if var.is_fixed():
+        return (True, var.value, None, None,
+                var.is_binary(), var.is_integer())
+    return (False, None,
+            value(var.lb) if var.has_lb() else None,
+            value(var.ub) if var.has_ub() else None,
+            var.is_binary(), var.is_integer())
+
+def _parameter_state(body, params, variables, lb, ub, old_state):
+    """
+    Return the state of an expression (as a tuple).  The first
+    element holds the objects that define the expression, which are
+    compared by identity.  The mutable parameters and variables are
+    only collected when these objects change.  Fixed variables are
+    written to the solver as constants, so the state records
+    (id(var), var.fixed, var.value if var.fixed else None) for each
+    variable.
+    """
+    if params is None or variables is None:
+        if old_state is not None and \
+           all(a is b for a, b in zip(old_state[0], body)):
+            params = old_state[1]
+            variables = old_state[2]
+        else:
+            params = tuple(p for b in body
+                           for p in identify_mutable_parameters(b))
+            variables = tuple(ComponentSet(
+                v for b in body
+                for v in identify_variables(b, include_fixed=True)))
+    return (body, params, variables,
+            tuple(value(p) for p in params), lb, ub,
+            tuple((id(v), v.fixed, v.value if v.fixed else None)
+                  for v in variables))
+
+def _constraint_state(con, old_state):
+    if con._linear_canonical_form:
+        # The body of a linear constraint is generated from its
+        # variables and coefficients (which are replaced, not modified,
+        # when the terms of the constraint change)
+        body = (con._variables, con._coefficients)
+        params = tuple(c for c in con._coefficients
+                       if c.__class__ not in native_numeric_types)
+        variables = tuple(con._variables)
+    else:
+        body = (con.body,)
+        params = variables = None
+    return _parameter_state(
+        body, params, variables,
+        value(con.lower) if con.has_lb() else None,
+        value(con.upper) if con.has_ub() else None,
+        old_state)
+
+def _objective_state(obj, old_state):
+    return _parameter_state((obj, obj.expr), None, None, obj.sense, None,
+                            old_state)
+
+def _rhs_bound(con):
+    """Return the bound that is the right-hand side of a (non-range)
+    constraint in the solver, or None for range constraints"""
+    if con.equality or not con.has_ub():
+        return con.lower
+    elif not con.has_lb():
+        return con.upper
+    return None
+
+def _changed(old_state, state):
+    return any(a is not b for a, b in zip(old_state[0], state[0])) or \
+        old_state[3:] != state[3:]
+
+
 class PersistentSolver(DirectOrPersistentSolver):
     """
     A base class for persistent solvers. Direct solver interfaces do not use any file io.
@@ -50,6 +129,22 @@ class PersistentSolver(DirectOrPersistentSolver):
     def __init__(self, **kwds):
         DirectOrPersistentSolver.__init__(self, **kwds)
 
+        self._auto_update = False
+        """A bool. If True, then the changes made to the Pyomo model are pushed to the solver before each solve."""
+
+        self._var_state = ComponentMap()
+        self._con_state = ComponentMap()
+        self._obj_state = None
+        """The state of the model components at the last update (used to detect changes)."""
+
+        self._param_values = ComponentMap()
+        self._param_to_coefs = ComponentMap()
+        self._param_to_rhs = ComponentMap()
+        self._con_rhs = ComponentMap()
+        """A reverse index from each mutable parameter to the coefficients (constraint, variable, coefficient
+        expression) and right-hand sides (constraints) of the linear constraints that it appears in. This is used
+        to update those coefficients in place when the parameter value changes."""
+
     def _presolve(self, **kwds):
         DirectOrPersistentSolver._presolve(self, **kwds)
 
@@ -76,8 +171,137 @@ class PersistentSolver(DirectOrPersistentSolver):
             If False then an error will be raised if a fixed variable is used in one of the solver constraints.
             This is useful for catching bugs. Ordinarily a fixed variable should appear as a constant value in the
             solver constraints. If True, then the error will not be raised.
+        auto_update: bool
+            If True, then the changes made to the Pyomo model (new, removed or deactivated constraints, modified
+            constraint bodies and bounds, variable bounds, domains and fixed values, mutable parameter values,
+            and the objective) are detected and pushed to the solver before each solve (see the update method).
         """
-        return self._set_instance(model, kwds)
+        self._auto_update = kwds.pop('auto_update', False)
+        self._var_state = ComponentMap()
+        self._con_state = ComponentMap()
+        self._obj_state = None
+        self._param_values = ComponentMap()
+        self._param_to_coefs = ComponentMap()
+        self._param_to_rhs = ComponentMap()
+        self._con_rhs = ComponentMap()
+        ans = self._set_instance(model, kwds)
+        # record the state of the model, so that the update() called
+        # by solve finds the changes made after this point.  Without
+        # auto_update, the state is recorded by the first explicit call
+        # to update().
+        if self._auto_update:
+            self.update()
+        return ans
+
+    def update(self):
+        """
+        Push the changes made to the Pyomo model since the last update to the solver's model.
+
+        Only the variables, constraints and objective that changed are updated; all other model components are
+        left intact. When the value of a mutable parameter changes, the coefficients and right-hand sides of the
+        linear constraints that it appears in are updated in place; other changes to a constraint are applied by
+        removing the constraint and adding it again. Fixed variables are written to the solver as constants, so
+        the constraints and objective that contain a variable are also updated when it is fixed, unfixed, or its
+        fixed value changes. This method is called by solve if the auto_update option was passed to set_instance.
+
+        If the auto_update option was not passed to set_instance, the state of the model is recorded by the first
+        call to this method: the components already loaded in the solver are taken as unchanged, so only the
+        changes made after that call are pushed by later calls.
+        """
+        if self._pyomo_model is None:
+            raise RuntimeError('You must call set_instance before calling update.')
+        model = self._pyomo_model
+
+        # constraints that can be updated in place because only the
+        # values of their mutable parameters changed
+        changed_params = [p for p, val in self._param_values.items()
+                          if value(p) != val]
+        param_cons = ComponentSet()
+        for p in changed_params:
+            for con, var, coef in self._param_to_coefs.get(p, ()):
+                param_cons.add(con)
+            param_cons.update(self._param_to_rhs.get(p, ()))
+
+        # variables
+        current_vars = ComponentSet()
+        new_vars = []
+        for var in model.component_data_objects(
+                ctype=Var, descend_into=True, active=True, sort=True):
+            current_vars.add(var)
+            state = _var_state(var)
+            if var not in self._pyomo_var_to_solver_var_map:
+                new_vars.append(var)
+            elif var in self._var_state and self._var_state[var] != state:
+                self.update_var(var)
+            self._var_state[var] = state
+        if new_vars:
+            self._add_vars(new_vars)
+
+        # constraints
+        current_cons = ComponentSet()
+        new_cons = []
+        updated_cons = ComponentSet()
+        for con in _binding_constraints(model.component_data_objects(
+                ctype=Constraint, descend_into=True, active=True, sort=True)):
+            current_cons.add(con)
+            old_state = self._con_state.get(con, None)
+            state = _constraint_state(con, old_state)
+            if con not in self._pyomo_con_to_solver_con_map:
+                new_cons.append(con)
+            elif old_state is None:
+                self._index_constraint(con, state)
+            elif _changed(old_state, state):
+                if con in param_cons and \
+                   _rhs_bound(con) is self._con_rhs[con][0] and \
+                   all(a is b for a, b in zip(old_state[0], state[0])) and \
+                   (old_state[4] is None) == (state[4] is None) and \
+                   (old_state[5] is None) == (state[5] is None) and \
+                   old_state[6] == state[6]:
+                    updated_cons.add(con)
+                else:
+                    self.remove_constraint(con)
+                    new_cons.append(con)
+            self._con_state[con] = state
+        for con in list(self._con_state):
+            if con not in current_cons:
+                if con in self._pyomo_con_to_solver_con_map:
+                    self.remove_constraint(con)
+                del self._con_state[con]
+        if new_cons:
+            self._add_constraints(new_cons)
+            for con in new_cons:
+                if con in self._pyomo_con_to_solver_con_map:
+                    self._index_constraint(con, self._con_state[con])
+        if changed_params:
+            self._update_params(changed_params, updated_cons)
+
+        for con in model.component_data_objects(
+                ctype=SOSConstraint, descend_into=True, active=True, sort=True):
+            if con not in self._pyomo_con_to_solver_con_map:
+                self._add_sos_constraint(con)
+
+        # objective
+        obj = None
+        for obj in model.component_data_objects(
+                ctype=Objective, descend_into=True, active=True):
+            break
+        if obj is not None:
+            old_state = self._obj_state
+            if old_state is not None and old_state[0][0] is not obj:
+                old_state = None
+            state = _objective_state(obj, old_state)
+            if obj is not self._objective or \
+               (old_state is not None and _changed(old_state, state)):
+                self._set_objective(obj)
+            self._obj_state = state
+
+        # variables that were removed from the model
+        for var in list(self._var_state):
+            if var not in current_vars:
+                if var in self._pyomo_var_to_solver_var_map and \
+                   self._referenced_variables[var] == 0:
+                    self.remove_var(var)
+                del self._var_state[var]
 
     def add_block(self, block):
         """Add a single Pyomo Block to the solver's model.
@@ -243,6 +467,8 @@ class PersistentSolver(DirectOrPersistentSolver):
         del self._vars_referenced_by_con[con]
         del self._pyomo_con_to_solver_con_map[con]
         del self._solver_con_to_pyomo_con_map[solver_con]
+        if con in self._con_rhs:
+            self._unindex_constraint(con)
 
     def remove_sos_constraint(self, con):
         """Remove a single SOS constraint from the solver's model.
@@ -299,6 +525,105 @@ class PersistentSolver(DirectOrPersistentSolver):
         del self._pyomo_var_to_solver_var_map[var]
         del self._solver_var_to_pyomo_var_map[solver_var]
 
+    """ This method should be implemented by subclasses."""
+    def _set_coefficients(self, coefficients):
+        """
+        Set the coefficients of variables in linear constraints in the solver's model.
+
+        Parameters
+        ----------
+        coefficients: list of (constraint, variable, value) tuples
+        """
+        raise NotImplementedError('This method should be implemented by subclasses.')
+
+    """ This method should be implemented by subclasses."""
+    def _set_rhs(self, rhs):
+        """
+        Set the right-hand sides of linear (non-range) constraints in the solver's model.
+
+        Parameters
+        ----------
+        rhs: list of (constraint, value) tuples
+        """
+        raise NotImplementedError('This method should be implemented by subclasses.')
+
+    def _index_constraint(self, con, state):
+        """
+        Record the coefficients and right-hand side of a linear constraint that depend on mutable parameters.
+        """
+        bound = _rhs_bound(con)
+        if bound is None:
+            # range constraints are added again when they change
+            return
+        if not state[1] and bound.__class__ in native_numeric_types:
+            return
+        if con._linear_canonical_form:
+            repn = con.canonical_form(compute_values=False)
+        else:
+            repn = generate_standard_repn(con.body, compute_values=False, quadratic=False)
+        if not repn.is_linear():
+            return
+
+        params = ComponentSet()
+        for v, c in zip(repn.linear_vars, repn.linear_coefs):
+            if c.__class__ in native_numeric_types:
+                continue
+            for p in identify_mutable_parameters(c):
+                params.add(p)
+                self._param_to_coefs.setdefault(p, []).append((con, v, c))
+        constant = repn.constant
+        rhs_params = ComponentSet()
+        for e in (bound, constant):
+            if e.__class__ not in native_numeric_types:
+                rhs_params.update(identify_mutable_parameters(e))
+        if not params and not rhs_params:
+            return
+        for p in rhs_params:
+            self._param_to_rhs.setdefault(p, ComponentSet()).add(con)
+        params.update(rhs_params)
+        for p in params:
+            self._param_values[p] = value(p)
+        self._con_rhs[con] = (bound, constant, params)
+
+    def _unindex_constraint(self, con):
+        bound, constant, params = self._con_rhs.pop(con)
+        for p in params:
+            coefs = self._param_to_coefs.get(p, None)
+            if coefs is not None:
+                coefs[:] = [x for x in coefs if x[0] is not con]
+                if not coefs:
+                    del self._param_to_coefs[p]
+            rhs = self._param_to_rhs.get(p, None)
+            if rhs is not None:
+                rhs.discard(con)
+                if not rhs:
+                    del self._param_to_rhs[p]
+            if p not in self._param_to_coefs and p not in self._param_to_rhs:
+                del self._param_values[p]
+
+    def _update_params(self, params, cons):
+        """
+        Update the coefficients and right-hand sides of the constraints in cons that depend on the mutable
+        parameters in params in the solver's model. Both are updated in one call to the solver.
+        """
+        coefficients = ComponentMap()
+        for p in params:
+            if p not in self._param_values:
+                continue
+            self._param_values[p] = value(p)
+            for con, var, coef in self._param_to_coefs.get(p, ()):
+                if con in cons:
+                    coefficients.setdefault(con, ComponentMap())[var] = coef
+        if coefficients:
+            self._set_coefficients([(con, var, value(coef))
+                                    for con, coefs in coefficients.items()
+                                    for var, coef in coefs.items()])
+        if cons:
+            # the bounds are read from the constraints, not from the
+            # index, which only records the objects they depend on
+            self._set_rhs([(con, value(_rhs_bound(con)) - value(self._con_rhs[con][1]))
+                           for con in cons])
+
     """ This method should be implemented by subclasses."""
     def update_var(self, var):
         """
@@ -346,6 +671,9 @@ class PersistentSolver(DirectOrPersistentSolver):
 
         self.available(exception_flag=True)
 
+        if self._auto_update:
+            self.update()
+
         # Collect suffix names to try and import from solution.
         if isinstance(self._pyomo_model, _BlockData):
             model_suffixes = list(name for (name, comp) in active_import_suffix_generator(self._pyomo_model))
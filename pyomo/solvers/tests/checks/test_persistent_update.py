@@ -0,0 +1,340 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+#
+# Test PersistentSolver.update() against a persistent solver that keeps
+# its model in Python
+#
+
+import itertools
+
+import pyutilib.th as unittest
+
+from pyomo.environ import (ConcreteModel, Var, Param, Objective,
+                           Constraint, NonNegativeReals, Binary,
+                           maximize, value)
+from pyomo.core.kernel.component_set import ComponentSet
+from pyomo.repn import generate_standard_repn
+from pyomo.solvers.plugins.solvers.persistent_solver import PersistentSolver
+
+
+class _RecordingPersistent(PersistentSolver):
+    """
+    A persistent solver whose "solver model" is a set of Python dicts
+    (columns, rows and the objective), so that the tests can check
+    what the PersistentSolver methods pushed to it.  Like the Gurobi
+    and CPLEX interfaces, fixed variables are written as constants and
+    the constant of a row is moved to its right-hand side.
+    """
+
+    def __init__(self, **kwds):
+        kwds['type'] = 'recording_persistent'
+        PersistentSolver.__init__(self, **kwds)
+        self._python_api_exists = True
+        self._ids = itertools.count()
+        # the calls made to the solver model
+        self.calls = []
+
+    def _set_instance(self, model, kwds={}):
+        PersistentSolver._set_instance(self, model, kwds)
+        self._solver_model = {'cols': {}, 'rows': {}, 'obj': None}
+        self._add_block(model)
+
+    def _col(self, var):
+        if var.is_fixed():
+            return [var.value, var.value, var.is_binary()]
+        return [value(var.lb) if var.has_lb() else None,
+                value(var.ub) if var.has_ub() else None,
+                var.is_binary()]
+
+    def _add_var(self, var):
+        col = next(self._ids)
+        self._symbol_map.getSymbol(var, self._labeler)
+        self._solver_model['cols'][col] = self._col(var)
+        self._pyomo_var_to_solver_var_map[var] = col
+        self._solver_var_to_pyomo_var_map[col] = var
+        self._referenced_variables[var] = 0
+
+    def _remove_var(self, solver_var):
+        self.calls.append('remove_var')
+        del self._solver_model['cols'][solver_var]
+
+    def update_var(self, var):
+        self.calls.append('update_var')
+        self._solver_model['cols'][self._pyomo_var_to_solver_var_map[var]] = \
+            self._col(var)
+
+    def _terms(self, expr):
+        repn = generate_standard_repn(expr, quadratic=True)
+        coefs = {}
+        for v, c in zip(repn.linear_vars, repn.linear_coefs):
+            key = (self._pyomo_var_to_solver_var_map[v],)
+            coefs[key] = coefs.get(key, 0) + c
+        for (v1, v2), c in zip(repn.quadratic_vars, repn.quadratic_coefs):
+            key = tuple(sorted((self._pyomo_var_to_solver_var_map[v1],
+                                self._pyomo_var_to_solver_var_map[v2])))
+            coefs[key] = coefs.get(key, 0) + c
+        referenced_vars = ComponentSet(
+            v for vs in repn.quadratic_vars for v in vs)
+        referenced_vars.update(repn.linear_vars)
+        return coefs, value(repn.constant), referenced_vars
+
+    def _add_constraint(self, con):
+        self.calls.append('add_constraint')
+        self._symbol_map.getSymbol(con, self._labeler)
+        coefs, constant, referenced_vars = self._terms(con.body)
+        row = next(self._ids)
+        self._solver_model['rows'][row] = [
+            coefs,
+            value(con.lower) - constant if con.has_lb() else None,
+            value(con.upper) - constant if con.has_ub() else None]
+        self._pyomo_con_to_solver_con_map[con] = row
+        self._solver_con_to_pyomo_con_map[row] = con
+        self._vars_referenced_by_con[con] = referenced_vars
+        for var in referenced_vars:
+            self._referenced_variables[var] += 1
+
+    def _remove_constraint(self, solver_con):
+        self.calls.append('remove_constraint')
+        del self._solver_model['rows'][solver_con]
+
+    def _set_coefficients(self, coefficients):
+        self.calls.append('set_coefficients')
+        for con, var, val in coefficients:
+            row = self._solver_model['rows'][
+                self._pyomo_con_to_solver_con_map[con]]
+            row[0][(self._pyomo_var_to_solver_var_map[var],)] = val
+
+    def _set_rhs(self, rhs):
+        self.calls.append('set_rhs')
+        for con, val in rhs:
+            row = self._solver_model['rows'][
+                self._pyomo_con_to_solver_con_map[con]]
+            if con.equality:
+                row[1] = row[2] = val
+            elif con.has_lb():
+                row[1] = val
+            else:
+                row[2] = val
+
+    def _set_objective(self, obj):
+        self.calls.append('set_objective')
+        if self._objective is not None:
+            for var in self._vars_referenced_by_obj:
+                self._referenced_variables[var] -= 1
+        coefs, constant, referenced_vars = self._terms(obj.expr)
+        self._solver_model['obj'] = [obj.sense, coefs, constant]
+        for var in referenced_vars:
+            self._referenced_variables[var] += 1
+        self._objective = obj
+        self._vars_referenced_by_obj = referenced_vars
+
+    def _add_sos_constraint(self, con):
+        raise NotImplementedError
+
+    def snapshot(self):
+        """The solver model, with the columns and rows named after the
+        Pyomo components"""
+        cols = self._solver_model['cols']
+        names = dict((col, self._solver_var_to_pyomo_var_map[col].name)
+                     for col in cols)
+        def _terms(coefs):
+            return sorted((tuple(names[col] for col in key), c)
+                          for key, c in coefs.items() if c != 0)
+        obj = self._solver_model['obj']
+        return {
+            'cols': dict((names[col], tuple(data))
+                         for col, data in cols.items()),
+            'rows': dict((self._solver_con_to_pyomo_con_map[row].name,
+                          (_terms(data[0]), data[1], data[2]))
+                         for row, data in self._solver_model['rows'].items()),
+            'obj': None if obj is None else (obj[0], _terms(obj[1]), obj[2])}
+
+
+def _fresh_snapshot(model):
+    opt = _RecordingPersistent()
+    opt.set_instance(model)
+    return opt.snapshot()
+
+
+class TestPersistentUpdate(unittest.TestCase):
+
+    def _model(self):
+        m = ConcreteModel()
+        m.x = Var(within=NonNegativeReals)
+        m.y = Var(bounds=(-1, 1))
+        m.z = Var(within=Binary)
+        m.p = Param(mutable=True, initialize=2)
+        m.c1 = Constraint(expr=m.x + m.p*m.y >= 1)
+        m.c2 = Constraint(expr=m.x*m.y + m.z <= 4)
+        m.c3 = Constraint(expr=m.x - m.y == m.p)
+        m.o = Objective(expr=m.x + 3*m.y + m.z)
+        return m
+
+    def _update(self, m, opt):
+        opt.calls = []
+        opt.update()
+        self.assertEqual(opt.snapshot(), _fresh_snapshot(m))
+
+    def test_no_change(self):
+        m = self._model()
+        opt = _RecordingPersistent()
+        opt.set_instance(m, auto_update=True)
+        self._update(m, opt)
+        self.assertEqual(opt.calls, [])
+
+    def test_lazy_state(self):
+        # without auto_update, set_instance does not record the state
+        # of the model; the first update() takes what is loaded as
+        # unchanged
+        m = self._model()
+        opt = _RecordingPersistent()
+        opt.set_instance(m)
+        self.assertEqual(len(opt._con_state), 0)
+        self.assertEqual(len(opt._var_state), 0)
+        self.assertIsNone(opt._obj_state)
+        self._update(m, opt)
+        self.assertEqual(opt.calls, [])
+        self.assertEqual(len(opt._con_state), 3)
+
+        m.y.setub(0.5)
+        m.p = 5
+        self._update(m, opt)
+        self.assertEqual(opt.snapshot()['cols']['y'], (-1, 0.5, False))
+        self.assertEqual(opt.snapshot()['rows']['c1'][0],
+                         [(('x',), 1), (('y',), 5)])
+
+    def test_constraint_body(self):
+        m = self._model()
+        opt = _RecordingPersistent()
+        opt.set_instance(m, auto_update=True)
+        m.c1.set_value(2*m.x + m.y >= 1)
+        self._update(m, opt)
+        self.assertEqual(opt.snapshot()['rows']['c1'][0],
+                         [(('x',), 2), (('y',), 1)])
+        self.assertEqual(opt.calls, ['remove_constraint', 'add_constraint'])
+
+    def test_constraint_bounds(self):
+        m = self._model()
+        opt = _RecordingPersistent()
+        opt.set_instance(m, auto_update=True)
+        m.c2.set_value((-3, m.c2.body, 5))
+        self._update(m, opt)
+        self.assertEqual(opt.snapshot()['rows']['c2'][1:], (-3, 5))
+
+    def test_objective(self):
+        m = self._model()
+        opt = _RecordingPersistent()
+        opt.set_instance(m, auto_update=True)
+        m.o.expr = m.x - m.y
+        self._update(m, opt)
+        self.assertEqual(opt.snapshot()['obj'][1],
+                         [(('x',), 1), (('y',), -1)])
+        self.assertEqual(opt.calls, ['set_objective'])
+
+        m.o.sense = maximize
+        self._update(m, opt)
+        self.assertEqual(opt.snapshot()['obj'][0], maximize)
+
+    def test_fix_unfix(self):
+        m = self._model()
+        opt = _RecordingPersistent()
+        opt.set_instance(m, auto_update=True)
+
+        # a linear, a nonlinear and the objective depend on y
+        m.y.fix(0.5)
+        self._update(m, opt)
+        snapshot = opt.snapshot()
+        self.assertEqual(snapshot['cols']['y'], (0.5, 0.5, False))
+        self.assertEqual(snapshot['rows']['c1'], ([(('x',), 1)], 0.0, None))
+        self.assertEqual(snapshot['rows']['c2'],
+                         ([(('x',), 0.5), (('z',), 1)], None, 4))
+        self.assertEqual(snapshot['obj'][1:], ([(('x',), 1), (('z',), 1)],
+                                               1.5))
+
+        # a new fixed value
+        m.y.fix(-1)
+        self._update(m, opt)
+        self.assertEqual(opt.snapshot()['rows']['c1'],
+                         ([(('x',), 1)], 3, None))
+
+        m.y.unfix()
+        self._update(m, opt)
+        self.assertEqual(opt.snapshot()['rows']['c1'],
+                         ([(('x',), 1), (('y',), 2)], 1, None))
+
+    def test_param_coefficient(self):
+        m = self._model()
+        opt = _RecordingPersistent()
+        opt.set_instance(m, auto_update=True)
+        m.p = 5
+        self._update(m, opt)
+        snapshot = opt.snapshot()
+        self.assertEqual(snapshot['rows']['c1'][0],
+                         [(('x',), 1), (('y',), 5)])
+        self.assertEqual(snapshot['rows']['c3'][1:], (5, 5))
+        # both rows are updated in place
+        self.assertEqual(opt.calls, ['set_coefficients', 'set_rhs'])
+
+    def test_param_rhs(self):
+        m = self._model()
+        m.q = Param(mutable=True, initialize=1)
+        m.c4 = Constraint(expr=m.x + m.z + m.q <= 2*m.q + 3)
+        opt = _RecordingPersistent()
+        opt.set_instance(m, auto_update=True)
+        m.q = 4
+        self._update(m, opt)
+        self.assertEqual(opt.snapshot()['rows']['c4'][1:], (None, 7))
+        self.assertEqual(opt.calls, ['set_rhs'])
+
+    def test_param_rhs_new_bound(self):
+        # the right-hand side is read from the constraint, not from
+        # the bound that was indexed when the constraint was added
+        m = self._model()
+        m.q = Param(mutable=True, initialize=1)
+        m.c4 = Constraint(expr=m.x + m.z <= m.q)
+        opt = _RecordingPersistent()
+        opt.set_instance(m, auto_update=True)
+        m.c4.set_value(m.c4.body <= m.q + 10)
+        m.q = 2
+        self._update(m, opt)
+        self.assertEqual(opt.snapshot()['rows']['c4'][1:], (None, 12))
+
+        # ... and the new bound is indexed
+        m.q = 3
+        self._update(m, opt)
+        self.assertEqual(opt.snapshot()['rows']['c4'][1:], (None, 13))
+        self.assertEqual(opt.calls, ['set_rhs'])
+
+    def test_param_removed_constraint(self):
+        m = self._model()
+        opt = _RecordingPersistent()
+        opt.set_instance(m, auto_update=True)
+        m.c1.deactivate()
+        self._update(m, opt)
+        self.assertNotIn('c1', opt.snapshot()['rows'])
+        self.assertEqual(opt.calls, ['remove_constraint'])
+
+        m.p = 7
+        self._update(m, opt)
+        self.assertEqual(opt.snapshot()['rows']['c3'][1:], (7, 7))
+        self.assertEqual(opt.calls, ['set_rhs'])
+
+        m.c3.deactivate()
+        self._update(m, opt)
+        self.assertEqual(opt._param_to_coefs.get(m.p), None)
+        self.assertEqual(opt._param_to_rhs.get(m.p), None)
+        m.p = 8
+        self._update(m, opt)
+        self.assertEqual(opt.calls, [])
+
+        m.c1.activate()
+        self._update(m, opt)
+        self.assertEqual(opt.snapshot()['rows']['c1'][0],
+                         [(('x',), 1), (('y',), 8)])
@@ -0,0 +1,95 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+
+import six
+
+import pyutilib.th as unittest
+
+from pyomo.environ import (ConcreteModel, Var, Objective, Constraint,
+                           SolverManagerFactory, value)
+from pyomo.opt import check_available_solvers
+from pyomo.opt.parallel.manager import (ActionManagerError, ActionStatus,
+                                        FailedActionHandle)
+from pyomo.solvers.plugins.smanager.pool import SolverManager_Pool
+
+glpk_available = bool(check_available_solvers('glpk'))
+
+
+def _model(k):
+    m = ConcreteModel()
+    m.x = Var(bounds=(0, None))
+    m.y = Var(bounds=(0, None))
+    m.c = Constraint(expr=m.x + m.y >= k)
+    m.o = Objective(expr=m.x + 2*m.y)
+    return m
+
+
+class _Unpicklable(object):
+    def __reduce__(self):
+        raise TypeError("this task cannot be pickled")
+
+
+class _UnpicklableTaskPool(SolverManager_Pool):
+    """A pool solver manager whose tasks cannot be sent to the workers"""
+
+    def _get_task_data(self, ah, *args, **kwds):
+        self._args[ah.id] = args
+        self._opt_data[ah.id] = (None, False, 0, None)
+        return _Unpicklable()
+
+
+class TestPoolSolverManager(unittest.TestCase):
+
+    def test_no_solver(self):
+        with SolverManagerFactory('pool', processes=2) as mngr:
+            with self.assertRaises(ActionManagerError):
+                mngr.queue(_model(1))
+
+    def test_no_queued_solves(self):
+        with SolverManagerFactory('pool', processes=2) as mngr:
+            self.assertEqual(mngr.wait_any(), FailedActionHandle)
+
+    @unittest.skipIf(six.PY2, "Pool.apply_async has no error_callback")
+    def test_unpicklable_task(self):
+        with _UnpicklableTaskPool(processes=1) as mngr:
+            ah = mngr.queue(_model(1))
+            with self.assertRaisesRegexp(TypeError, "cannot be pickled"):
+                mngr.wait_any()
+            self.assertEqual(ah.status, ActionStatus.error)
+            # the failed task is no longer pending
+            self.assertEqual(mngr.wait_any(), FailedActionHandle)
+
+    @unittest.skipIf(not glpk_available, "glpk is not available")
+    def test_solve_all(self):
+        models = [_model(k) for k in range(4)]
+        with SolverManagerFactory('pool', processes=2) as mngr:
+            mngr.solve_all('glpk', models)
+        for k, m in enumerate(models):
+            self.assertAlmostEqual(value(m.x), k)
+            self.assertAlmostEqual(value(m.y), 0)
+
+    @unittest.skipIf(not glpk_available, "glpk is not available")
+    def test_wait_any(self):
+        models = [_model(k) for k in range(4)]
+        with SolverManagerFactory('pool', processes=2) as mngr:
+            ahs = dict((mngr.queue(m, opt='glpk'), m) for m in models)
+            self.assertEqual(mngr.num_queued(), 4)
+            while mngr.num_queued():
+                ah = mngr.wait_any()
+                results = mngr.get_results(ah)
+                self.assertEqual(str(results.solver.termination_condition),
+                                 'optimal')
+                m = ahs.pop(ah)
+                self.assertAlmostEqual(value(m.o), value(m.c.lower))
+            self.assertEqual(len(ahs), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
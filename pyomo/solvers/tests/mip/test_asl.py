@@ -20,6 +20,7 @@ import pyutilib.common
 from pyomo.core import ConcreteModel
 import pyomo.opt
 from pyomo.opt import ResultsFormat, ProblemFormat
+from pyomo.solvers.plugins.solvers.ASL import ASL
 
 old_ignore_time = None
 old_tempdir = None
@@ -141,5 +142,83 @@ class mip_all(mock_all):
         self.do_setup(True)
 
 
+class _SolWriterASL(ASL):
+    """An ASL solver that writes a *.sol file with the values 1, 2, ..."""
+
+    def __init__(self, **kwds):
+        ASL.__init__(self, **kwds)
+        self._assert_available = True
+
+    def executable(self):
+        return "mock"
+
+    def _execute_command(self, cmd):
+        with open(self._problem_files[0]) as f:
+            f.readline()
+            n, m = [int(t) for t in f.readline().split()[:2]]
+        with open(self._soln_file, 'w') as f:
+            f.write("mock: solved\n\nOptions\n3\n1\n1\n0\n")
+            f.write("%d\n%d\n%d\n%d\n" % (m, m, n, n))
+            for i in range(m):
+                f.write("%d\n" % (-i-1))
+            for i in range(n):
+                f.write("%d\n" % (i+1))
+            f.write("objno 0 0\n")
+        return [0, ""]
+
+
+class TestDirectLoad(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        import pyomo.environ
+
+    def _model(self):
+        from pyomo.environ import Var, Constraint, Objective, Suffix
+        model = ConcreteModel()
+        model.x = Var([1,2,3])
+        model.c = Constraint([1,2], rule=lambda m,i: m.x[i] >= m.x[i+1])
+        model.o = Objective(expr=sum(model.x.values()))
+        model.dual = Suffix(direction=Suffix.IMPORT)
+        return model
+
+    def _solve(self, model, save_results):
+        opt = _SolWriterASL(type='asl')
+        opt.options.solver = 'mock'
+        results = opt.solve(model,
+                            save_results=save_results,
+                            symbolic_solver_labels=True)
+        return results
+
+    def test_direct_load(self):
+        model = self._model()
+        model.x[3].fix(0)
+        model.dual[model.c[1]] = 100
+        results = self._solve(model, False)
+        self.assertEqual(str(results.solver.termination_condition),
+                         'optimal')
+        self.assertEqual(len(results.solution), 0)
+        self.assertEqual(len(model.solutions.symbol_map), 0)
+        self.assertEqual(model.x[1].value, 1)
+        self.assertEqual(model.x[2].value, 2)
+        self.assertFalse(model.x[1].stale)
+        self.assertEqual(model.x[3].value, 0)
+        self.assertEqual(model.dual[model.c[1]], -1)
+        self.assertEqual(model.dual[model.c[2]], -2)
+
+    def test_direct_load_matches_results(self):
+        model = self._model()
+        self._solve(model, True)
+        values = dict((k, v.value) for k, v in model.x.items())
+        duals = dict((k, model.dual[v]) for k, v in model.c.items())
+
+        model = self._model()
+        self._solve(model, False)
+        self.assertEqual(values,
+                         dict((k, v.value) for k, v in model.x.items()))
+        self.assertEqual(duals,
+                         dict((k, model.dual[v]) for k, v in model.c.items()))
+
+
 if __name__ == "__main__":
     unittest.main()